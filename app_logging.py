@@ -0,0 +1,146 @@
+import collections
+import logging
+import os
+import sys
+import threading
+
+# Parent of every application logger ("eventhub.ui", "eventhub.datastore", ...)
+ROOT_NAME = "eventhub"
+
+# Level of every module unless overridden; debug output is off by default
+LEVEL_ENV = "EVENTHUB_LOG_LEVEL"
+DEFAULT_LEVEL = logging.WARNING
+
+# Per-module levels, e.g. EVENTHUB_LOG_LEVELS="ui=DEBUG,datastore=INFO"
+MODULE_LEVELS_ENV = "EVENTHUB_LOG_LEVELS"
+
+# Records kept in memory for diagnostics
+BUFFER_ENV = "EVENTHUB_LOG_BUFFER"
+BUFFER_CAPACITY = 1000
+
+FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last capacity log records in memory.
+
+    The message of a record is resolved when it arrives (its arguments may
+    change afterwards), but the full line is only formatted when lines() or
+    dump() asks for it.
+    """
+
+    def __init__(self, capacity=BUFFER_CAPACITY):
+        super().__init__()
+        self._records = collections.deque(maxlen=capacity)
+        self._records_lock = threading.Lock()
+
+    def emit(self, record):
+        try:
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+                record.exc_info = None
+        except Exception:
+            self.handleError(record)
+            return
+        with self._records_lock:
+            self._records.append(record)
+
+    def records(self):
+        with self._records_lock:
+            return list(self._records)
+
+    def lines(self):
+        """Return the buffered records formatted as log lines, oldest first."""
+        return [self.format(record) for record in self.records()]
+
+    def dump(self, path):
+        """Write the buffered lines to a file."""
+        with open(path, "w", encoding="utf-8") as f:
+            for line in self.lines():
+                f.write(line + "\n")
+
+    def clear(self):
+        with self._records_lock:
+            self._records.clear()
+
+
+def get_logger(name):
+    """Return the logger of an application module (pass __name__)."""
+    if name == "__main__":
+        name = os.path.splitext(os.path.basename(sys.argv[0] or "main"))[0]
+    return logging.getLogger(f"{ROOT_NAME}.{name}")
+
+
+def parse_level(value, default=DEFAULT_LEVEL):
+    """Turn a level name ("debug") or number ("10") into a logging level."""
+    if value is None or not str(value).strip():
+        return default
+    value = str(value).strip()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    if not isinstance(level, int):
+        print(f"Error: unknown log level {value!r}", file=sys.stderr)
+        return default
+    return level
+
+
+def parse_module_levels(text):
+    """Parse "module=LEVEL,module=LEVEL" into {module: level}."""
+    levels = {}
+    for item in (text or "").split(","):
+        if "=" not in item:
+            continue
+        module, value = item.split("=", 1)
+        if module.strip():
+            levels[module.strip()] = parse_level(value, default=None)
+    return {module: level for module, level in levels.items() if level is not None}
+
+
+def set_level(level, module=None):
+    """Set the level of every application logger, or of one module's logger."""
+    name = ROOT_NAME if module is None else f"{ROOT_NAME}.{module}"
+    logging.getLogger(name).setLevel(parse_level(level))
+
+
+def configure(level=None, module_levels=None, capacity=None, stream=None):
+    """Set up the application loggers: a console handler plus the ring buffer.
+
+    Arguments left as None are read from the environment. Can be called
+    again to change the configuration; the buffered records are kept.
+    """
+    global ring_buffer
+    root = logging.getLogger(ROOT_NAME)
+    root.setLevel(parse_level(os.environ.get(LEVEL_ENV) if level is None else level))
+    root.propagate = False
+    if module_levels is None:
+        module_levels = parse_module_levels(os.environ.get(MODULE_LEVELS_ENV))
+    for module, module_level in module_levels.items():
+        set_level(module_level, module)
+
+    formatter = logging.Formatter(FORMAT)
+    for handler in list(root.handlers):
+        if not isinstance(handler, RingBufferHandler):
+            root.removeHandler(handler)
+    console = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    console.setFormatter(formatter)
+    root.addHandler(console)
+
+    if capacity is None:
+        capacity = int(os.environ.get(BUFFER_ENV) or BUFFER_CAPACITY)
+    if ring_buffer is None or ring_buffer._records.maxlen != capacity:
+        buffered = ring_buffer.records() if ring_buffer is not None else []
+        if ring_buffer is not None:
+            root.removeHandler(ring_buffer)
+        ring_buffer = RingBufferHandler(capacity)
+        ring_buffer.setFormatter(formatter)
+        for record in buffered[-capacity:]:
+            ring_buffer._records.append(record)
+        root.addHandler(ring_buffer)
+    return root
+
+
+ring_buffer = None
+configure()
@@ -0,0 +1,15 @@
+"""Benchmarks of EventHub on generated data.
+
+dataset generates data files at a chosen scale, storage times the core
+operations on them, rendering times the heaviest views offscreen,
+waiting_room simulates an on-sale rush through the admission queue,
+checkin times gate scans on one large event and report writes and
+compares the JSON results:
+
+    python -m benchmarks.dataset --scale small --data-dir /tmp/eventhub-small
+    python -m benchmarks.storage --data-dir /tmp/eventhub-small --output storage.json
+    python -m benchmarks.storage --data-dir /tmp/eventhub-small --baseline storage.json
+    python -m benchmarks.rendering --scales tiny,small --output rendering.json
+    python -m benchmarks.waiting_room --buyers 5000 --rate 50 --spread 10
+    python -m benchmarks.checkin --tickets 20000 --signed
+"""
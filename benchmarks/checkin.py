@@ -0,0 +1,100 @@
+"""Times gate check-in on one generated event with many tickets.
+
+Every ticket is scanned once for its whole group, then a sample is scanned
+again (duplicates) and some unknown codes are tried. The gate's clock is
+simulated, one second per scan, so the duplicate window does not hide the
+re-scans; decisions and log writes are timed for real. With --signed the
+tickets carry signed tokens (verified offline) instead of their plain
+codes. Merging the scan log into tickets.json is timed at the end.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.dataset import generate_dataset
+from benchmarks.report import print_results, results_document, summarize, write_results
+from datastore import JsonBackend, store
+from services.checkin import CheckInGate, merge_scan_logs
+from services.ticket_tokens import tokens
+
+
+class Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+def run(tickets, signed=False, sync=True, seed=0):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as data_dir:
+        generate_dataset(data_dir, "tiny", seed, events=1, tickets=tickets, notifications=10, reviews=10)
+        store.set_backend(JsonBackend(data_dir))
+        event = store.events()[0]
+        if signed:
+            # Generated events may be over already: issue tokens that do not expire
+            for ticket in store.tickets():
+                tokens.reissue(ticket)
+            store.save("tickets", store.tickets())
+
+        sold = [t for t in store.tickets() if t["status"] == "valid"]
+        start = time.perf_counter()
+        gate = CheckInGate(event["event_id"], "bench", sync=sync, clock=Clock())
+        opened = time.perf_counter() - start
+
+        decisions = {"admitted": [], "duplicate": [], "rejected": []}
+        start = time.perf_counter()
+        for ticket in sold:
+            decisions["admitted"].append(gate.scan(ticket["qr_code"], ticket["quantity_bought"])["ms"] / 1000)
+        for ticket in rng.sample(sold, min(len(sold), 1000)):
+            decisions["duplicate"].append(gate.scan(ticket["qr_code"])["ms"] / 1000)
+        for n in range(1000):
+            decisions["rejected"].append(gate.scan(f"TKT-unknown-{n}")["ms"] / 1000)
+        elapsed = time.perf_counter() - start
+        gate.close()
+
+        start = time.perf_counter()
+        merged = merge_scan_logs(event["event_id"])
+        merge_time = time.perf_counter() - start
+
+    scans = sum(len(samples) for samples in decisions.values())
+    all_ms = sorted(s * 1000 for samples in decisions.values() for s in samples)
+    results = {f"checkin.scan_{name}": summarize(samples) for name, samples in decisions.items()}
+    results["checkin.open_gate"] = summarize([opened])
+    results["checkin.merge"] = summarize([merge_time], tickets_updated=merged)
+    return results_document("checkin", results, simulation={
+        "tickets": len(sold),
+        "signed": signed,
+        "sync": sync,
+        "scans": scans,
+        "scans_per_minute": round(scans / elapsed * 60),
+        "decision_p99_ms": round(all_ms[int(0.99 * (len(all_ms) - 1))], 3),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark gate check-in on a generated event.")
+    parser.add_argument("--tickets", type=int, default=20_000, help="tickets of the event")
+    parser.add_argument("--signed", action="store_true", help="scan signed tokens instead of plain codes")
+    parser.add_argument("--no-sync", action="store_true", help="do not flush every scan to disk")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    document = run(args.tickets, args.signed, not args.no_sync, args.seed)
+    print_results(document)
+    print()
+    for name, value in document["simulation"].items():
+        print(f"{name:<40}{value:>12}")
+    if args.output:
+        write_results(args.output, document)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
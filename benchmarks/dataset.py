@@ -0,0 +1,266 @@
+"""Synthetic EventHub data files in the schemas the application uses."""
+
+import argparse
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+from datastore import COLLECTIONS
+
+# Record counts of each scale
+SCALES = {
+    "tiny": {"users": 200, "events": 100, "tickets": 2_000, "notifications": 5_000, "reviews": 500, "services": 100},
+    "small": {"users": 2_000, "events": 1_000, "tickets": 50_000, "notifications": 200_000, "reviews": 5_000, "services": 500},
+    "medium": {"users": 20_000, "events": 5_000, "tickets": 250_000, "notifications": 1_000_000, "reviews": 25_000, "services": 2_000},
+    "large": {"users": 100_000, "events": 10_000, "tickets": 1_000_000, "notifications": 5_000_000, "reviews": 100_000, "services": 5_000},
+}
+
+# Password of every generated user (emails are user<id>@example.com)
+PASSWORD = "12"
+
+LOCATIONS = ["Αθήνα", "Θεσσαλονίκη", "Πάτρα", "Ηράκλειο", "Λάρισα", "Βόλος", "Ιωάννινα", "Χανιά",
+             "Καλαμάτα", "Καβάλα", "Αλεξανδρούπολη", "Κέρκυρα", "Τρίκαλα", "Ξάνθη"]
+EVENT_TYPES = ["Ιδιωτικό", "All-day Festival", "Multi-day Festival", "Συναυλία", "Κινηματογραφικό",
+               "Επαγγελματικό", "Συνέδριο", "Διασκέδαση", "Αθλητικό", "Καλλιτεχνικό", "Εκπαιδευτικό",
+               "Φιλανθρωπικό", "Θρησκευτικό", "Οικογενειακό", "Διαδικτυακό", "Κοινωνικό", "Πολιτικό",
+               "Εθελοντικό", "Εμπορικό", "Gaming"]
+TICKET_TYPES = ["Early Bird", "Regular", "VIP", "Zone A", "Zone B", "Backstage Pass", "Arena",
+                "All-day Pass", "One-day Pass", "Multi-day Pass"]
+SERVICE_TYPES = ["Ενοικίαση Χώρου", "Catering", "DJ", "Φωτογραφία", "Ηχητικός Εξοπλισμός", "Φωτισμός",
+                 "Διακόσμηση", "Ασφάλεια", "Parking", "Άλλο"]
+PRICING_TYPES = ["Ανά Άτομο", "Ανά Ώρα", "Ανά Ημέρα", "Πακέτο"]
+NOTIFICATION_CATEGORIES = ["Ticket Purchases", "Ticket Transfers", "Event Reviews", "Service Reviews",
+                           "Collaboration Requests"]
+NAMES = ["Γιώργος", "Μαρία", "Νίκος", "Ελένη", "Κώστας", "Άννα", "Δημήτρης", "Σοφία", "John", "Jane"]
+SURNAMES = ["Παπαδόπουλος", "Νικολάου", "Γεωργίου", "Ιωάννου", "Doe", "Taylor", "Plane", "Smith"]
+IMAGES = ["event_images/test_event.jpeg", "event_images/test_event_2.jpeg"]
+
+
+def generate_dataset(data_dir, scale="small", seed=0, today=None, **counts):
+    """Write every data file of a synthetic EventHub into data_dir.
+
+    counts overrides the record counts of the scale (users, events, tickets,
+    notifications, reviews, services). Events are spread over a year either
+    side of today. The same seed always generates the same data. Returns the
+    record counts written.
+    """
+    counts = {**SCALES[scale], **counts}
+    rng = random.Random(seed)
+    today = today or datetime.now()
+    os.makedirs(data_dir, exist_ok=True)
+
+    users = _users(rng, counts["users"])
+    organizers = [u for u in users if u["type"] == "Organizer"]
+    attendees = [u for u in users if u["type"] == "Attendee"]
+    vendors = [u for u in users if u["type"] == "Vendor"]
+    events = _events(rng, counts["events"], organizers, today)
+    services = _services(rng, counts["services"], vendors, events)
+
+    _write(data_dir, "users", users)
+    _write(data_dir, "events", events)
+    _write(data_dir, "tickets", _tickets(rng, counts["tickets"], attendees, events, today))
+    _write(data_dir, "notifications", _notifications(rng, counts["notifications"], users, today))
+    _write(data_dir, "services", services)
+    _write_reviews(data_dir, rng, counts["reviews"], attendees, organizers, events, services, today)
+    _write(data_dir, "collaboration_requests", [])
+    _write(data_dir, "transfer_requests", [])
+    return counts
+
+
+def user_email(user_id):
+    return f"user{user_id}@example.com"
+
+
+def _users(rng, count):
+    users = []
+    for user_id in range(1, count + 1):
+        # One organizer and one vendor in every twenty users
+        kind = "Organizer" if user_id % 20 == 1 else "Vendor" if user_id % 20 == 2 else "Attendee"
+        users.append({
+            "user_id": user_id,
+            "email": user_email(user_id),
+            "password": PASSWORD,
+            "name": rng.choice(NAMES),
+            "surname": rng.choice(SURNAMES),
+            "type": kind,
+            "phone": f"69{rng.randrange(10**8):08d}",
+        })
+    return users
+
+
+def _events(rng, count, organizers, today):
+    events = []
+    for event_id in range(1, count + 1):
+        organizer = rng.choice(organizers)
+        start = today + timedelta(days=rng.randint(-365, 365), minutes=rng.randrange(0, 24 * 60, 15))
+        end = start + timedelta(days=rng.choice((0, 0, 0, 1, 2)))
+        sale_end = start - timedelta(hours=1)
+        events.append({
+            "event_id": event_id,
+            "title": f"Εκδήλωση {event_id}",
+            "start_date": start.strftime("%d/%m/%Y"),
+            "end_date": end.strftime("%d/%m/%Y"),
+            "start_time": start.strftime("%H:%M"),
+            "location": rng.choice(LOCATIONS),
+            "type": rng.choice(EVENT_TYPES),
+            "description": f"Περιγραφή της εκδήλωσης {event_id}.",
+            "image": rng.choice(IMAGES),
+            "organizer_id": organizer["user_id"],
+            "organizer": f"{organizer['name']} {organizer['surname']}",
+            "ticket_types": [
+                {"type": ticket_type, "price": float(rng.randrange(5, 150)), "total_quantity": rng.randrange(50, 5000)}
+                for ticket_type in rng.sample(TICKET_TYPES, rng.randint(1, 3))
+            ],
+            "ticket_availability": sale_end.strftime("%d/%m/%Y %H:%M"),
+            "ticket_cancel_availability": (start - timedelta(days=1)).strftime("%d/%m/%Y %H:%M"),
+        })
+    return events
+
+
+def _tickets(rng, count, attendees, events, today):
+    for ticket_id in range(1, count + 1):
+        user = rng.choice(attendees)
+        event = rng.choice(events)
+        ticket_type = rng.choice(event["ticket_types"])
+        start = datetime.strptime(event["start_date"], "%d/%m/%Y")
+        used = start < today and rng.random() < 0.5
+        ticket = {
+            "ticket_id": ticket_id,
+            "event_id": event["event_id"],
+            "user_id": user["user_id"],
+            "ticket_type": ticket_type["type"],
+            "price": ticket_type["price"],
+            "quantity_bought": rng.randint(1, 4),
+            "purchase_date": (start - timedelta(days=rng.randint(1, 60))).strftime("%d/%m/%Y %H:%M:%S"),
+            "status": "used" if used else "valid",
+            "qr_code": f"TKT-{ticket_id}-{event['event_id']}-{user['user_id']}",
+        }
+        if used:
+            ticket["used_date"] = event["start_date"]
+        yield ticket
+
+
+def _notifications(rng, count, users, today):
+    for number in range(count):
+        user = rng.choice(users)
+        sent = today - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+        category = rng.choice(NOTIFICATION_CATEGORIES)
+        yield {
+            "notification_id": f"notif_{number + 1}",
+            "user_id": user["user_id"],
+            "title": category,
+            "message": f"Ειδοποίηση {number} για τον χρήστη {user['user_id']}.",
+            "timestamp": sent.strftime("%d/%m/%Y %H:%M:%S"),
+            "read": rng.random() < 0.8,
+            "category": category,
+        }
+
+
+def _services(rng, count, vendors, events):
+    services = []
+    for service_id in range(1, count + 1):
+        vendor = rng.choice(vendors)
+        # A third of the services are assigned to an event
+        event = rng.choice(events) if rng.random() < 1 / 3 else None
+        services.append({
+            "service_id": service_id,
+            "name": f"Υπηρεσία {service_id}",
+            "type": rng.choice(SERVICE_TYPES),
+            "description": f"Περιγραφή της υπηρεσίας {service_id}.",
+            "start_date": "01/01/2025",
+            "end_date": "31/12/2026",
+            "pricing_type": rng.choice(PRICING_TYPES),
+            "price": str(rng.randrange(20, 2000)),
+            "min_capacity": "0",
+            "max_capacity": str(rng.randrange(50, 1000)),
+            "media_path": rng.choice(IMAGES),
+            "vendor_id": vendor["user_id"],
+            "vendor_name": f"{vendor['name']} {vendor['surname']}",
+            "event_id": event["event_id"] if event else None,
+            "event_title": event["title"] if event else None,
+            "status": "assigned" if event else "available",
+        })
+    return services
+
+
+def _write_reviews(data_dir, rng, count, attendees, organizers, events, services, today):
+    event_reviews = []
+    vendor_reviews = []
+    for number in range(count):
+        created = (today - timedelta(days=rng.randrange(365))).strftime("%d/%m/%Y %H:%M")
+        review = {
+            "rating": rng.randint(1, 5),
+            "comments": f"Σχόλιο αξιολόγησης {number}.",
+            "suggestions": "",
+            "created_at": created,
+            "updated_at": created,
+            "status": "active",
+            "notification_status": {"organizer_notified": False, "vendor_notified": False, "notification_sent_at": None},
+            "metadata": {"client_version": "1.0", "platform": "desktop", "language": "el"},
+        }
+        event = rng.choice(events)
+        # Three in every ten reviews are organizers reviewing a vendor
+        if number % 10 < 3 and services:
+            service = rng.choice(services)
+            reviewer = rng.choice(organizers)
+            review.update({
+                "id": len(vendor_reviews) + 1,
+                "review_type": "vendor",
+                "user": {"id": reviewer["user_id"], "name": reviewer["name"], "surname": reviewer["surname"]},
+                "vendor_id": service["vendor_id"],
+                "event_id": event["event_id"],
+                "service_details": {"service_type": service["type"], "service_date": event["end_date"]},
+            })
+            vendor_reviews.append(review)
+        else:
+            reviewer = rng.choice(attendees)
+            review.update({
+                "id": len(event_reviews) + 1,
+                "review_type": "event",
+                "user": {"id": reviewer["user_id"], "name": reviewer["name"], "surname": reviewer["surname"]},
+                "event_id": event["event_id"],
+                "event_data": {"title": event["title"], "organizer_id": event["organizer_id"], "date": event["start_date"]},
+            })
+            event_reviews.append(review)
+    reviews = {
+        "event_reviews": event_reviews,
+        "vendor_reviews": vendor_reviews,
+        "metadata": {"last_updated": today.strftime("%d/%m/%Y %H:%M"), "version": "1.0"},
+    }
+    with open(os.path.join(data_dir, COLLECTIONS["reviews"][0]), "w", encoding="utf-8") as f:
+        json.dump(reviews, f, ensure_ascii=False, indent=4)
+
+
+def _write(data_dir, name, records):
+    """Write a collection's records one at a time, so large ones never sit in memory as one string."""
+    file_path, key, _ = COLLECTIONS[name]
+    indent = " " * (8 if key else 4)
+    with open(os.path.join(data_dir, file_path), "w", encoding="utf-8") as f:
+        f.write(f'{{\n    "{key}": [' if key else "[")
+        separator = "\n"
+        for record in records:
+            text = json.dumps(record, ensure_ascii=False, indent=4)
+            f.write(separator + indent + text.replace("\n", "\n" + indent))
+            separator = ",\n"
+        closing = "\n    ]\n}" if key else "\n]"
+        f.write(closing if separator == ",\n" else closing.lstrip("\n").replace("    ]", "]", 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic EventHub data files.")
+    parser.add_argument("--data-dir", required=True, help="directory to write the data files to")
+    parser.add_argument("--scale", choices=SCALES, default="small", help="record counts to generate")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name}", type=int, help=f"number of {name} (overrides the scale)")
+    args = parser.parse_args()
+
+    overrides = {name: getattr(args, name) for name in SCALES["small"] if getattr(args, name) is not None}
+    counts = generate_dataset(args.data_dir, args.scale, args.seed, **overrides)
+    for name, count in counts.items():
+        print(f"{name}: {count} records")
+
+
+if __name__ == "__main__":
+    main()
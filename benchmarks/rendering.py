@@ -0,0 +1,195 @@
+"""Offscreen rendering benchmark of EventHub's heaviest views.
+
+Builds EventManagementApp on generated datasets of increasing size and
+times each view from the call that fills it until the window has processed
+its events and been painted. Runs with QT_QPA_PLATFORM=offscreen, so no
+display or GPU is needed. Besides wall time, every result records the
+Python memory allocated while building the view (tracemalloc; Qt's own C++
+allocations are not included) and the number of widgets in the window.
+"""
+
+import os
+
+# Must be set before the QApplication is created
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import contextlib
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from benchmarks.dataset import SCALES, generate_dataset
+from benchmarks.report import (
+    TOLERANCE, compare, load_results, print_results, results_document, summarize, time_call, write_results
+)
+from benchmarks.storage import use_data_dir
+from datastore import COLLECTIONS, store
+from image_loader import image_loader
+from ui import EventManagementApp, NotificationsTab
+
+WINDOW_SIZE = (1280, 800)
+
+
+def measure(window, build, repeat=3, **extra):
+    """Time build() until the window is laid out and painted.
+
+    One untimed run first fills the image cache, so the timed runs measure
+    widgets rather than image decoding.
+    """
+    def render():
+        build()
+        QApplication.processEvents()
+        window.grab()
+
+    render()
+    _settle()
+    samples = time_call(render, repeat)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    render()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    _settle()
+
+    return summarize(
+        samples,
+        widgets=len(window.findChildren(QWidget)),
+        alloc_peak_kb=round((peak - before) / 1024, 1),
+        alloc_retained_kb=round((after - before) / 1024, 1),
+        **extra,
+    )
+
+
+def run_scale(scale, data_dir, repeat=3):
+    """Benchmark every view on one dataset and return {"<view>@<scale>": result}."""
+    use_data_dir(data_dir)
+    results = {}
+    events = store.events()
+    users = store.users()
+    tickets = store.ticket_index()
+    notifications = store.notification_index()
+
+    # Guest: the events browser
+    window = _open_window()
+    window.tabs.setCurrentWidget(window.events_tab)
+    results[f"display_grid@{scale}"] = measure(window, lambda: window.display_grid(events), repeat, records=len(events))
+    results[f"display_list@{scale}"] = measure(window, lambda: window.display_list(events), repeat, records=len(events))
+    _close_window(window)
+
+    # Attendee with the most tickets
+    attendees = [u for u in users if u["type"] == "Attendee"]
+    attendee = max(attendees, key=lambda u: len(tickets.by_user(u["user_id"])))
+    window = _open_window(attendee)
+    window.tabs.setCurrentWidget(window.private_tabs["My Tickets"])
+    results[f"display_my_tickets@{scale}"] = measure(
+        window, window.display_my_tickets, repeat, records=len(tickets.by_user(attendee["user_id"])))
+    notifications_tab = window.findChild(NotificationsTab)
+    window.tabs.setCurrentWidget(notifications_tab)
+    results[f"load_notifications@{scale}"] = measure(
+        window, notifications_tab.load_notifications, repeat,
+        records=len(notifications.visible(attendee["user_id"])))
+    _close_window(window)
+
+    # Organizer with the most events
+    organizers = [u for u in users if u["type"] == "Organizer"]
+    events_by_organizer = {}
+    for event in events:
+        events_by_organizer.setdefault(event["organizer_id"], []).append(event)
+    organizer = max(organizers, key=lambda u: len(events_by_organizer.get(u["user_id"], [])))
+    organizer_events = events_by_organizer.get(organizer["user_id"], [])
+    window = _open_window(organizer)
+    results[f"show_organizer_my_events_tab@{scale}"] = measure(
+        window, window.show_organizer_my_events_tab, repeat, records=len(organizer_events))
+    if organizer_events:
+        event = organizer_events[0]
+        window.show_available_vendors(event)
+        results[f"display_filtered_vendors@{scale}"] = measure(
+            window, lambda: window.display_filtered_vendors(event), repeat,
+            records=sum(1 for s in store.services() if not s.get("event_id")))
+    _close_window(window)
+    return results
+
+
+def run(scales, data_root=None, repeat=3, seed=0):
+    """Run the benchmark at every scale and return the results document.
+
+    Datasets are kept in data_root/<scale> (generated when missing); without
+    a data_root they are generated in a temporary directory and removed.
+    """
+    app = QApplication.instance() or QApplication(sys.argv)
+    root = data_root or tempfile.mkdtemp(prefix="eventhub-rendering-")
+    results = {}
+    try:
+        for scale in scales:
+            data_dir = os.path.join(root, scale)
+            if not os.path.exists(os.path.join(data_dir, COLLECTIONS["users"][0])):
+                print(f"Generating a {scale} dataset in {data_dir}")
+                generate_dataset(data_dir, scale, seed)
+            results.update(run_scale(scale, data_dir, repeat))
+    finally:
+        if data_root is None:
+            shutil.rmtree(root, ignore_errors=True)
+    return results_document("rendering", results, platform_plugin=app.platformName(), repeat=repeat,
+                            scales={scale: SCALES[scale] for scale in scales})
+
+
+def _open_window(user=None):
+    window = EventManagementApp()
+    window.resize(*WINDOW_SIZE)
+    window.show()
+    if user is not None:
+        # Sign in without the login tab's message boxes
+        window.current_user = dict(user, type=user["type"].lower())
+        window.redirect_to_dashboard(window.current_user["type"])
+    QApplication.processEvents()
+    return window
+
+
+def _close_window(window):
+    window.close()
+    window.deleteLater()
+    _settle()
+
+
+def _settle():
+    # Let background image loads and deferred deletions finish between measurements
+    image_loader().pool.waitForDone()
+    QApplication.processEvents()
+    QApplication.sendPostedEvents(None, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EventHub's heaviest views offscreen.")
+    parser.add_argument("--scales", default="tiny,small",
+                        help=f"comma-separated dataset scales to run ({', '.join(SCALES)})")
+    parser.add_argument("--data-root", help="keep the generated datasets in this directory")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs of every view")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="results of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed slowdown against the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scales: {', '.join(unknown)}")
+
+    # Keep the application's debug output out of the results
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        document = run(scales, args.data_root, args.repeat, args.seed)
+    regressions = compare(document, load_results(args.baseline), args.tolerance) if args.baseline else []
+    print_results(document, regressions)
+    if args.output:
+        write_results(args.output, document)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
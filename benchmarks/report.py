@@ -0,0 +1,94 @@
+"""Timing helpers and the JSON results shared by the benchmarks."""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+# Default regression threshold: slower than the baseline by this fraction...
+TOLERANCE = 0.25
+# ...and by at least this many milliseconds (shorter differences are noise)
+NOISE_MS = 1.0
+
+
+def time_call(fn, repeat=1, setup=None):
+    """Call fn repeat times and return the wall times in seconds.
+
+    setup, if given, runs untimed before every call and its return value is
+    passed to fn.
+    """
+    samples = []
+    for _ in range(repeat):
+        args = (setup(),) if setup is not None else ()
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples, **extra):
+    """Return the statistics of a list of wall times (seconds) in milliseconds."""
+    ms = [s * 1000 for s in samples]
+    summary = {
+        "runs": len(ms),
+        "min_ms": round(min(ms), 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "max_ms": round(max(ms), 3),
+    }
+    summary.update(extra)
+    return summary
+
+
+def results_document(benchmark, results, **info):
+    """Wrap benchmark results with what is needed to compare them later."""
+    return {
+        "benchmark": benchmark,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        **info,
+        "results": results,
+    }
+
+
+def write_results(path, document):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False, indent=4)
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(document, baseline, tolerance=TOLERANCE, noise_ms=NOISE_MS, metric="median_ms"):
+    """Return the results that got slower than in a baseline document.
+
+    Each regression is (name, baseline value, current value). Results
+    missing from either document are not compared.
+    """
+    regressions = []
+    for name, result in document["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None or metric not in before or metric not in result:
+            continue
+        if result[metric] > before[metric] * (1 + tolerance) and result[metric] - before[metric] > noise_ms:
+            regressions.append((name, before[metric], result[metric]))
+    return regressions
+
+
+def print_results(document, regressions=()):
+    slower = {name for name, _, _ in regressions}
+    print(f"{'benchmark':<40}{'runs':>6}{'min ms':>12}{'median ms':>12}{'max ms':>12}")
+    for name, result in document["results"].items():
+        mark = "  SLOWER" if name in slower else ""
+        print(f"{name:<40}{result['runs']:>6}{result['min_ms']:>12.3f}{result['median_ms']:>12.3f}{result['max_ms']:>12.3f}{mark}")
+    for name, before, after in regressions:
+        print(f"Regression: {name} {before:.3f} ms -> {after:.3f} ms")
@@ -0,0 +1,180 @@
+"""Times EventHub's core data operations on a generated dataset.
+
+Purchases, refunds and transfers write to the data files, so the dataset
+changes slightly with every run. The results are written as JSON; with a
+baseline, the run fails if an operation got slower.
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from benchmarks.dataset import PASSWORD, PRICING_TYPES, SCALES, SERVICE_TYPES, generate_dataset, user_email
+from benchmarks.report import (
+    TOLERANCE, compare, load_results, print_results, results_document, summarize, time_call, write_results
+)
+from datastore import COLLECTIONS, JsonBackend, store
+from ticket_management import TicketManagementMixin
+from ui import EventManagementApp
+import services
+
+LOADED = ("users", "events", "tickets", "notifications", "services", "reviews")
+INDEXED = ("events", "tickets", "notifications")
+
+
+def use_data_dir(data_dir, storage="json"):
+    """Point the shared store at the data files in data_dir."""
+    if storage == "sqlite":
+        from migrate_to_sqlite import migrate
+        from sqlite_backend import SqliteBackend
+        db_path = os.path.join(data_dir, "eventhub.db")
+        if not os.path.exists(db_path):
+            migrate(data_dir, db_path)
+        backend = SqliteBackend(db_path)
+    else:
+        backend = JsonBackend(data_dir)
+    store.set_backend(backend)
+    store.data_dir = data_dir
+
+
+def run(data_dir, repeat=5, storage="json", seed=0):
+    """Run every storage benchmark on the data in data_dir and return the results document."""
+    use_data_dir(data_dir, storage)
+    rng = random.Random(seed)
+    results = {}
+
+    # Cold loads and index builds run once: repeating them would only time the cache
+    for name in LOADED:
+        store.invalidate(name)
+        results[f"load_{name}"] = summarize(time_call(lambda: store.load(name)))
+    for name in INDEXED:
+        results[f"index_{name}"] = summarize(time_call(lambda: store.index(name)))
+
+    users = store.users()
+    events = store.events()
+    attendees = [u for u in users if u["type"] == "Attendee"]
+    ticket_index = store.ticket_index()
+    # The attendee with the most tickets is the worst case of My Tickets
+    heaviest = max(attendees, key=lambda u: len(ticket_index.by_user(u["user_id"])))
+    upcoming = [e for e in events if _start(e) > datetime.now() + timedelta(days=2)]
+
+    results["login"] = summarize(time_call(lambda: _login(users[-1]), repeat))
+    results["filter_events"] = summarize(time_call(_filter_events, repeat, lambda: _filter(rng)))
+    results["my_tickets"] = summarize(time_call(lambda: _my_tickets(heaviest), repeat),
+                                      tickets=len(ticket_index.by_user(heaviest["user_id"])))
+    results["notification_poll"] = summarize(time_call(_poll_notifications, repeat, lambda: rng.choice(users)))
+    results["vendor_filter"] = summarize(time_call(_filter_vendors, repeat, lambda: rng))
+
+    # Write paths: every purchase is refunded afterwards, so availability is kept
+    buyer = rng.choice(attendees)
+    purchases = []
+    results["purchase"] = summarize(time_call(
+        lambda event: purchases.append(_purchase(buyer, event)), repeat, lambda: rng.choice(upcoming)))
+    results["refund"] = summarize(time_call(
+        lambda item: services.refund_tickets(buyer["user_id"], item[0], {item[1]: 1}), repeat, purchases.pop))
+    results["transfer_acceptance"] = summarize(time_call(
+        lambda request: services.respond_to_transfer(request["request_id"], True), repeat,
+        lambda: _transfer_request(rng, buyer, attendees, upcoming)))
+
+    counts = {name: len(_records(name)) for name in LOADED}
+    return results_document("storage", results, storage=storage, repeat=repeat, counts=counts)
+
+
+def _start(event):
+    return datetime.strptime(event["start_date"], "%d/%m/%Y")
+
+
+def _records(name):
+    if name == "reviews":
+        reviews = store.reviews()
+        return reviews["event_reviews"] + reviews["vendor_reviews"]
+    return store.records(name)
+
+
+def _login(user):
+    # The login tab's lookup: a scan of the users for a matching email and password
+    return EventManagementApp.authenticate_user(SimpleNamespace(), user_email(user["user_id"]), PASSWORD)
+
+
+def _filter(rng):
+    today = datetime.now().date()
+    from_date = today - timedelta(days=rng.randint(0, 365))
+    to_date = from_date + timedelta(days=rng.randint(7, 365))
+    index = store.event_index()
+    location = rng.choice([None] + index.values("location"))
+    event_type = rng.choice([None, None] + index.values("type"))
+    return from_date, to_date, location, event_type
+
+
+def _filter_events(params):
+    # What the events tab does on every filter change
+    index = store.event_index()
+    index.match(*params)
+    index.facet_counts(*params)
+
+
+def _my_tickets(user):
+    tickets = store.ticket_index().by_user(user["user_id"])
+    return TicketManagementMixin.group_tickets_by_event(SimpleNamespace(events=store.events()), tickets)
+
+
+def _poll_notifications(user):
+    # What a change of notifications costs: badge, category counts, newest unread and the list
+    index = store.notification_index()
+    index.unread_count(user["user_id"])
+    index.category_counts(user["user_id"])
+    index.newest_unread(user["user_id"])
+    index.visible(user["user_id"])
+
+
+def _filter_vendors(rng):
+    services.filter_vendor_services(
+        rng.sample(SERVICE_TYPES, 3), rng.sample(PRICING_TYPES, 2), 0, rng.randrange(200, 2000), rng.choice((None, 3)))
+
+
+def _purchase(user, event):
+    ticket_type = event["ticket_types"][0]
+    services.purchase_tickets(user["user_id"], event["event_id"],
+                              [{"type": ticket_type["type"], "quantity": 1, "price": ticket_type["price"]}])
+    return event["event_id"], ticket_type["type"]
+
+
+def _transfer_request(rng, sender, attendees, events):
+    event = rng.choice(events)
+    _purchase(sender, event)
+    ticket = store.ticket_index().find(sender["user_id"], event["event_id"], event["ticket_types"][0]["type"])
+    recipient = rng.choice([a for a in attendees[:50] if a is not sender])
+    return services.request_transfer(sender, recipient, event, [{"ticket": dict(ticket), "quantity": 1}], "1")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EventHub's data operations on generated data.")
+    parser.add_argument("--data-dir", required=True,
+                        help="dataset directory (generated at --scale if it has no data files)")
+    parser.add_argument("--scale", choices=SCALES, default="small", help="size of a generated dataset")
+    parser.add_argument("--storage", choices=("json", "sqlite"), default="json", help="storage backend")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of every operation")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="results of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed slowdown against the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.data_dir, COLLECTIONS["users"][0])):
+        print(f"Generating a {args.scale} dataset in {args.data_dir}")
+        generate_dataset(args.data_dir, args.scale, args.seed)
+
+    document = run(args.data_dir, args.repeat, args.storage, args.seed)
+    regressions = compare(document, load_results(args.baseline), args.tolerance) if args.baseline else []
+    print_results(document, regressions)
+    if args.output:
+        write_results(args.output, document)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
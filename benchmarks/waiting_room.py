@@ -0,0 +1,157 @@
+"""Replays an on-sale rush through the waiting room on a simulated clock.
+
+Buyers arrive over --spread seconds, join the queue of one event and poll
+their status the way the purchase dialog does (sooner when the estimate is
+short). Joining goes through the real WaitingRoom and its file in a
+temporary directory, so the join times are real; waiting is simulated.
+
+Reports the admission throughput against the configured rate, the waits,
+how far the estimate given at join was off, how late buyers noticed their
+admission between polls, and fairness: pairs of buyers admitted in the
+opposite order of their arrival (0 for a FIFO).
+"""
+
+import argparse
+import heapq
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.report import print_results, results_document, summarize, write_results
+from services.waiting_room import WaitingRoom
+
+EVENT_ID = 1
+
+# Clients poll again after their estimated wait, within these bounds (seconds)
+MIN_POLL = 0.25
+MAX_POLL = 5.0
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def inversions(order):
+    """Count the pairs of a sequence that are out of order (merge sort)."""
+    if len(order) < 2:
+        return 0, order
+    middle = len(order) // 2
+    left_count, left = inversions(order[:middle])
+    right_count, right = inversions(order[middle:])
+    merged = []
+    count = left_count + right_count
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i += 1
+        else:
+            merged.append(right[j])
+            count += len(left) - i
+            j += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return count, merged
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def simulate(buyers, rate, spread, seed=0, room_dir=None):
+    """Run one rush and return (statistics, join wall times in seconds)."""
+    rng = random.Random(seed)
+    clock = Clock()
+    with tempfile.TemporaryDirectory(dir=room_dir) as directory:
+        room = WaitingRoom(os.path.join(directory, "waiting_rooms.json"), clock=clock)
+        room.open(EVENT_ID, rate)
+
+        arrivals = sorted(rng.uniform(0, spread) for _ in range(buyers))
+        tokens = {}  # buyer -> token
+        promised = {}  # buyer -> estimated wait at join
+        due = {}  # buyer -> when the room admits the buyer, from the last estimate
+        noticed = {}  # buyer -> simulated time the buyer saw the admission
+        join_times = []
+        polls = 0
+
+        # (time, order, buyer, action): joins first, then polls
+        queue = [(arrival, 0, buyer, "join") for buyer, arrival in enumerate(arrivals)]
+        heapq.heapify(queue)
+        while queue:
+            at, _, buyer, action = heapq.heappop(queue)
+            clock.now = at
+            if action == "join":
+                start = time.perf_counter()
+                tokens[buyer] = room.join(EVENT_ID)
+                join_times.append(time.perf_counter() - start)
+            state = room.status(EVENT_ID, tokens[buyer])
+            polls += 1
+            if action == "join":
+                promised[buyer] = state["eta_seconds"]
+            if state["admitted"]:
+                due.setdefault(buyer, at)
+                noticed[buyer] = at
+                continue
+            due[buyer] = at + state["eta_seconds"]
+            delay = min(MAX_POLL, max(MIN_POLL, state["eta_seconds"]))
+            heapq.heappush(queue, (at + delay, 1, buyer, "poll"))
+
+    waits = [due[b] - arrivals[b] for b in range(buyers)]
+    eta_errors = [abs(waits[b] - promised[b]) for b in range(buyers)]
+    notice_delays = [noticed[b] - due[b] for b in range(buyers)]
+    # Buyers are numbered in arrival order
+    admission_order = sorted(range(buyers), key=lambda b: due[b])
+    makespan = max(due.values()) - min(arrivals)
+    stats = {
+        "buyers": buyers,
+        "rate": rate,
+        "spread_s": spread,
+        "makespan_s": round(makespan, 3),
+        "throughput_per_s": round(buyers / makespan, 3) if makespan > 0 else float(buyers),
+        "wait_p50_s": round(percentile(waits, 0.5), 3),
+        "wait_p95_s": round(percentile(waits, 0.95), 3),
+        "wait_max_s": round(max(waits), 3),
+        "eta_error_mean_s": round(statistics.fmean(eta_errors), 3),
+        "eta_error_p95_s": round(percentile(eta_errors, 0.95), 3),
+        "notice_delay_p95_s": round(percentile(notice_delays, 0.95), 3),
+        "order_inversions": inversions(admission_order)[0],
+        "polls_per_buyer": round(polls / buyers, 2),
+    }
+    return stats, join_times
+
+
+def run(buyers, rate, spread, seed=0):
+    stats, join_times = simulate(buyers, rate, spread, seed)
+    results = {"waiting_room.join": summarize(join_times)}
+    return results_document("waiting_room", results, simulation=stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate an on-sale rush through the waiting room.")
+    parser.add_argument("--buyers", type=int, default=2000, help="buyers arriving")
+    parser.add_argument("--rate", type=float, default=20.0, help="buyers admitted per second")
+    parser.add_argument("--spread", type=float, default=10.0, help="seconds over which the buyers arrive")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    document = run(args.buyers, args.rate, args.spread, args.seed)
+    print_results(document)
+    print()
+    for name, value in document["simulation"].items():
+        print(f"{name:<40}{value:>12}")
+    if args.output:
+        write_results(args.output, document)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import argparse
+import sys
+
+from services.checkin import CheckInGate, merge_scan_logs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check guests in at a gate, without the EventHub window.")
+    parser.add_argument("event_id", type=int)
+    parser.add_argument("--gate", default="gate", help="name of this gate (its scan log is scans/<gate>.jsonl)")
+    parser.add_argument("--no-sync", action="store_true", help="do not flush every scan to disk")
+    parser.add_argument("--merge", action="store_true", help="write the logged admissions into tickets.json and exit")
+    args = parser.parse_args()
+
+    if args.merge:
+        print(f"Event {args.event_id}: {merge_scan_logs(args.event_id)} tickets updated")
+        return
+
+    # A barcode scanner types each code followed by Enter; "CODE 3" admits a group of 3
+    with CheckInGate(args.event_id, args.gate, sync=not args.no_sync) as gate:
+        print(f"Gate {args.gate} open for event {args.event_id}; scan a code (Ctrl-D to close)", flush=True)
+        for line in sys.stdin:
+            parts = line.split()
+            if not parts:
+                continue
+            count = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 1
+            decision = gate.scan(parts[0], max(1, count))
+            text = f"{decision['result'].upper()} {decision['admitted']}"
+            if decision.get("ticket_type"):
+                text += f" {decision['ticket_type']}, {decision['remaining']} left"
+            if decision["reason"]:
+                text += f" - {decision['reason']}"
+            print(text, flush=True)
+
+
+if __name__ == "__main__":
+    main()
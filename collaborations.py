@@ -1,13 +1,17 @@
-import json
 from datetime import datetime
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                            QPushButton, QWidget, QScrollArea, QMessageBox)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
+from datastore import store
+from services.ids import ids
+from app_logging import get_logger
+
+log = get_logger(__name__)
 
 class CollaborationRequest:
     def __init__(self, event_id, organizer_id, vendor_id, service_id, status="pending"):
-        self.request_id = f"req_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        self.request_id = f"req_{ids.next_id('collaboration_requests')}"
         self.event_id = event_id
         self.organizer_id = organizer_id
         self.vendor_id = vendor_id
@@ -28,65 +32,46 @@ class CollaborationRequest:
 
 def save_collaboration_request(request):
     try:
-        # Load existing requests
-        try:
-            with open("collaboration_requests.json", "r") as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            data = {"requests": []}
-        
-        # Add new request
-        data["requests"].append(request.to_dict())
-        
-        # Save updated data
-        with open("collaboration_requests.json", "w") as f:
-            json.dump(data, f, indent=4)
+        # Add and save the new request
+        store.append("collaboration_requests", request.to_dict())
         
         return True
     except Exception as e:
-        print(f"Error saving collaboration request: {e}")
+        log.error("Error saving collaboration request: %s", e)
         return False
 
 def get_pending_requests_for_vendor(vendor_id):
     try:
-        with open("collaboration_requests.json", "r") as f:
-            data = json.load(f)
-            return [req for req in data["requests"] if req["vendor_id"] == vendor_id and req["status"] == "pending"]
-    except FileNotFoundError:
-        return []
+        return [req for req in store.collaboration_requests() if req["vendor_id"] == vendor_id and req["status"] == "pending"]
     except Exception as e:
-        print(f"Error getting pending requests: {e}")
+        log.error("Error getting pending requests: %s", e)
         return []
 
 def update_request_status(request_id, new_status):
     try:
-        with open("collaboration_requests.json", "r") as f:
-            data = json.load(f)
+        data = store.load("collaboration_requests")
         
         for request in data["requests"]:
             if request["request_id"] == request_id:
                 request["status"] = new_status
                 break
         
-        with open("collaboration_requests.json", "w") as f:
-            json.dump(data, f, indent=4)
+        store.save("collaboration_requests", data)
         
         if new_status == "accepted":
             # Update services.json to connect vendor to event
-            with open("services.json", "r") as f:
-                services_data = json.load(f)
+            services_data = store.load("services")
             
             for service in services_data["services"]:
                 if service["service_id"] == request["service_id"]:
                     service["event_id"] = request["event_id"]
                     break
             
-            with open("services.json", "w") as f:
-                json.dump(services_data, f, indent=4)
+            store.save("services", services_data)
         
         return True
     except Exception as e:
-        print(f"Error updating request status: {e}")
+        log.error("Error updating request status: %s", e)
         return False
 
 class CollaborationRequestDetailsDialog(QDialog):
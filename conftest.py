@@ -0,0 +1,37 @@
+import copy
+
+import pytest
+
+from datastore import JsonBackend, store, write_json
+
+EVENT = {
+    "event_id": 1,
+    "title": "Test Concert",
+    "start_date": "30/12/2099",
+    "end_date": "31/12/2099",
+    "start_time": "20:00",
+    "location": "Athens",
+    "type": "Concert",
+    "organizer_id": 1,
+    "ticket_types": [
+        {"type": "Regular", "price": 20.0, "total_quantity": 5},
+        {"type": "VIP", "price": 50.0, "total_quantity": 2},
+    ],
+}
+
+USERS = [
+    {"user_id": 1, "email": "org", "name": "Olga", "surname": "Organizer", "type": "Organizer"},
+    {"user_id": 2, "email": "jack", "name": "Jack", "surname": "Taylor", "type": "Attendee", "credit": "0"},
+    {"user_id": 3, "email": "maria", "name": "Maria", "surname": "Papadopoulou", "type": "Attendee", "credit": "0"},
+]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A data directory with three users and one event, used by the shared store."""
+    write_json(str(tmp_path / "users.json"), copy.deepcopy(USERS))
+    write_json(str(tmp_path / "events.json"), [copy.deepcopy(EVENT)])
+    write_json(str(tmp_path / "tickets.json"), [])
+    store.set_backend(JsonBackend(str(tmp_path)))
+    yield tmp_path
+    store.set_backend(JsonBackend("."))
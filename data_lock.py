@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_NAME = ".eventhub.lock"
+
+# How long a writer waits for another process before giving up
+LOCK_TIMEOUT = 10.0
+POLL_SECONDS = 0.005
+
+
+class DataDirLock:
+    """An exclusive lock on a data directory, held across processes.
+
+    Every process (box office terminal, kiosk, script) that runs against the
+    same data directory locks the same file, so read-check-write sequences
+    on the shared files are serialized. The lock is reentrant within a
+    process and is released by the operating system if the process dies.
+    """
+
+    def __init__(self, directory, name=LOCK_NAME):
+        self.path = os.path.join(directory, name)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def acquire(self, timeout=LOCK_TIMEOUT):
+        """Wait for the lock; raises TimeoutError after timeout seconds (None waits forever)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._thread_lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError(f"Timed out waiting for {self.path}")
+        try:
+            if self._depth == 0:
+                self._lock_file(deadline)
+            self._depth += 1
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def release(self):
+        if self._depth == 1:
+            self._unlock_file()
+        self._depth -= 1
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def _lock_file(self, deadline):
+        f = open(self.path, "a+b")
+        try:
+            while not self._try_lock(f):
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for {self.path}: another process is writing")
+                time.sleep(POLL_SECONDS)
+        except BaseException:
+            f.close()
+            raise
+        self._file = f
+
+    def _try_lock(self, f):
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock_file(self):
+        f, self._file = self._file, None
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            f.close()
+
+
+_locks = {}
+_locks_lock = threading.Lock()
+
+
+def data_dir_lock(directory):
+    """Return the process-wide DataDirLock of a directory.
+
+    Locks on one file taken through two different handles would block each
+    other even within one process, so every caller shares one instance.
+    """
+    key = os.path.abspath(directory)
+    with _locks_lock:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = DataDirLock(key)
+        return lock
@@ -0,0 +1,511 @@
+import atexit
+import contextlib
+import copy
+import json
+import os
+import threading
+
+from app_logging import get_logger
+from data_lock import LOCK_TIMEOUT, data_dir_lock
+from event_bus import bus as default_bus
+from event_filter import EventFilterIndex
+from json_writer import GroupCommitWriter, atomic_write_json, dump_json, file_signature
+from metrics import metrics
+from notification_index import NotificationIndex
+from notification_log import NotificationLog
+from ticket_index import TicketIndex
+
+log = get_logger(__name__)
+
+# Every JSON document the application reads or writes.
+# name -> (file path, key of the wrapped list or None, empty document)
+COLLECTIONS = {
+    "users": ("users.json", None, []),
+    "events": ("events.json", None, []),
+    "tickets": ("tickets.json", None, []),
+    "notifications": ("notifications.json", "notifications", {"notifications": []}),
+    "services": ("services.json", "services", {"services": []}),
+    "collaboration_requests": ("collaboration_requests.json", "requests", {"requests": []}),
+    "transfer_requests": ("ticket_transfer_requests.json", "transfer_requests", {"transfer_requests": []}),
+    "reviews": ("reviews.json", None, {"event_reviews": [], "vendor_reviews": [], "metadata": {}}),
+}
+
+# File name -> collection name
+FILE_NAMES = {file_path: name for name, (file_path, _, _) in COLLECTIONS.items()}
+
+# Collections with secondary indexes kept in step with their records
+INDEXES = {
+    "events": EventFilterIndex,
+    "tickets": TicketIndex,
+    "notifications": NotificationIndex,
+}
+
+
+def read_json(path, default):
+    """Read a JSON file, falling back to a copy of default if it is missing or corrupt."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            if metrics.enabled:
+                metrics.add_bytes(os.path.basename(path), read=f.tell())
+            return data
+    except FileNotFoundError:
+        return copy.deepcopy(default)
+    except json.JSONDecodeError as e:
+        log.error("Error loading %s: %s", path, e)
+        return copy.deepcopy(default)
+
+
+def write_json(path, data):
+    """Atomically write a JSON document the way the data files are formatted."""
+    atomic_write_json(path, data)
+
+
+class JsonBackend:
+    """Stores every collection in its own JSON file (the original layout).
+
+    Files are replaced atomically through a GroupCommitWriter; with a
+    write_delay, saves of the same file within that window are flushed once.
+    Notifications are kept as a snapshot plus an append-only NotificationLog,
+    so adding or marking one notification appends one line.
+    """
+
+    def __init__(self, data_dir=".", write_delay=0.0):
+        self.data_dir = data_dir
+        self.writer = GroupCommitWriter(data_dir, write_delay)
+        self.notification_log = NotificationLog(
+            self.path_for(COLLECTIONS["notifications"][0]), self.writer, COLLECTIONS["notifications"][2])
+        self._versions = {}  # name -> number of saves through this backend
+
+    def path_for(self, file_path):
+        """Resolve a data file name against the data directory."""
+        if os.path.isabs(file_path):
+            return file_path
+        return os.path.join(self.data_dir, file_path)
+
+    def paths(self, name):
+        """Return the files a collection is stored in."""
+        if name == "notifications":
+            return self.notification_log.paths()
+        return (self.path_for(COLLECTIONS[name][0]),)
+
+    def signature(self, name):
+        paths = self.paths(name)
+        on_disk = tuple(file_signature(path) for path in paths)
+        if all(self.writer.is_pending(path) or self.writer.written.get(path) == signature
+               for path, signature in zip(paths, on_disk)):
+            # Our own saves, written or still queued: nothing new to read
+            version = self._versions.get(name, 0)
+            if name == "notifications":
+                return ("saved", version, self.notification_log.generation)
+            return ("saved", version)
+        return on_disk
+
+    def load(self, name):
+        if name == "notifications":
+            return self.notification_log.load()
+        file_path, _, empty = COLLECTIONS[name]
+        path = self.path_for(file_path)
+        text = self.writer.pending_text(path)
+        if text is not None:
+            return json.loads(text)
+        return read_json(path, empty)
+
+    def save(self, name, data):
+        self._versions[name] = self._versions.get(name, 0) + 1
+        if name == "notifications":
+            self.notification_log.save(data)
+            return
+        self.writer.write(self.path_for(COLLECTIONS[name][0]), data)
+
+    def apply(self, name, data, inserted=(), updated=(), deleted=()):
+        if name == "notifications":
+            self._versions[name] = self._versions.get(name, 0) + 1
+            self.notification_log.append(inserted, updated, deleted)
+            return
+        # A JSON file can only be rewritten as a whole
+        self.save(name, data)
+
+    def begin(self):
+        self.writer.begin()
+
+    def commit(self):
+        self.writer.commit()
+        if not self.writer.in_transaction():
+            self.notification_log.commit()
+
+    def rollback(self):
+        self.writer.rollback()
+        self.notification_log.rollback()
+
+    def flush(self):
+        self.writer.flush()
+
+    def write_file(self, path, text):
+        """Replace a file that is not a collection; inside a transaction it is journaled with the collections."""
+        self.writer.write_text(path, text)
+
+    def pending_text(self, path):
+        return self.writer.pending_text(path)
+
+    def compact(self):
+        """Fold the notifications log into its snapshot."""
+        self.notification_log.compact()
+
+    def close(self):
+        self.notification_log.compact()
+        self.writer.close()
+
+
+class DataStore:
+    """Keeps parsed documents in memory and re-reads them only when the backend reports a change.
+
+    Documents returned by the accessors are the cached objects themselves, so
+    callers that modify one must save it back (or call invalidate) afterwards.
+
+    Every write is published on the event bus under the collection name with
+    a payload of {"inserted", "updated", "deleted"} record lists (None for a
+    whole-document save or a change made by another process). Inside a
+    transaction the events are held back until the commit.
+    """
+
+    def __init__(self, backend=None, data_dir=".", bus=None):
+        self.data_dir = data_dir
+        self.backend = backend if backend is not None else JsonBackend(data_dir)
+        self.bus = bus if bus is not None else default_bus
+        self._cache = {}  # name or file path -> (signature, document)
+        self._indexes = {}  # name -> index over the cached records
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
+        self._held_events = []  # events published inside the open transaction
+        self._changed = set()  # collections saved inside the open transaction
+
+    def path_for(self, file_path):
+        """Resolve a data file name against the data directory."""
+        if os.path.isabs(file_path):
+            return file_path
+        return os.path.join(self.data_dir, file_path)
+
+    def load_file(self, file_path, default=None):
+        """Return the parsed contents of a data file, re-reading it only if it changed."""
+        name = FILE_NAMES.get(os.path.basename(file_path))
+        if name is not None:
+            return self.load(name)
+
+        path = self.path_for(file_path)
+        with self._lock:
+            signature = file_signature(path)
+            cached = self._cache.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            data = read_json(path, default if default is not None else [])
+            self._cache[path] = (signature, data)
+            return data
+
+    def save_file(self, file_path, data):
+        """Write a data file and keep the document as the cached copy."""
+        name = FILE_NAMES.get(os.path.basename(file_path))
+        if name is not None:
+            self.save(name, data)
+            return
+
+        path = self.path_for(file_path)
+        with self._lock:
+            write_json(path, data)
+            self._cache[path] = (file_signature(path), data)
+
+    def write_file(self, file_path, data):
+        """Write a JSON side file (one that is not a collection) as part of the open transaction, if any.
+
+        The JSON backend commits it atomically with the collections. SQLite
+        writes it just before its COMMIT, so a crash in between leaves the
+        file ahead of the rows, never behind them.
+        """
+        self.backend.write_file(self.path_for(file_path), dump_json(data))
+
+    def pending_file(self, file_path):
+        """Return the text written to a side file in an uncommitted transaction, or None.
+
+        Does not take the store lock, so it is safe to call while holding
+        another component's lock.
+        """
+        return self.backend.pending_text(self.path_for(file_path))
+
+    def invalidate(self, name=None):
+        """Drop one cached document (or all of them) so the next load re-reads it."""
+        with self._lock:
+            if name is None:
+                self._cache.clear()
+                self._indexes.clear()
+            elif name in COLLECTIONS:
+                self._cache.pop(name, None)
+                self._indexes.pop(name, None)
+            else:
+                key = FILE_NAMES.get(os.path.basename(name)) or self.path_for(name)
+                self._cache.pop(key, None)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Group the saves made inside the block into one commit across all collections.
+
+        If the block raises, nothing is written and the cached documents of
+        the collections saved inside it are dropped, since the callers'
+        in-place changes were not committed. A block that raises before
+        saving anything (a sold out check, say) leaves the cache alone.
+        """
+        with self._lock:
+            self.backend.begin()
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth = 0
+                self._held_events = []
+                self.backend.rollback()
+                for name in self._changed:
+                    self._cache.pop(name, None)
+                    self._indexes.pop(name, None)
+                self._changed.clear()
+                raise
+            self._transaction_depth -= 1
+            self.backend.commit()
+            if self._transaction_depth == 0:
+                self._changed.clear()
+                events, self._held_events = self._held_events, []
+                for name, payload in events:
+                    self.bus.publish(name, payload)
+
+    @contextlib.contextmanager
+    def exclusive(self, timeout=LOCK_TIMEOUT):
+        """A transaction that also holds the cross-process lock of the data directory.
+
+        Documents loaded inside the block are re-read if another process
+        changed them, and the commit reaches the disk before the lock is
+        released, so check-then-write sequences (such as selling the last
+        tickets of an event) cannot interleave with other terminals. Raises
+        TimeoutError if the lock is not free within timeout seconds.
+        """
+        lock = data_dir_lock(self.backend.data_dir)
+        with metrics.timer("storage.lock_wait"):
+            lock.acquire(timeout)
+        try:
+            with self.transaction():
+                yield self
+        finally:
+            lock.release()
+
+    def refresh(self, name):
+        """Reload a collection if another process changed it; returns True (and publishes) if it did."""
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached is None or cached[0] == self.backend.signature(name):
+                return False
+            self._indexes.pop(name, None)
+            self.load(name)
+            self._publish(name, None, None, None)
+            return True
+
+    def _publish(self, name, inserted, updated, deleted):
+        payload = {"inserted": inserted, "updated": updated, "deleted": deleted}
+        if self._transaction_depth:
+            self._held_events.append((name, payload))
+        else:
+            self.bus.publish(name, payload)
+
+    def flush(self):
+        """Write any saves the backend is still holding back."""
+        with self._lock:
+            self.backend.flush()
+
+    def close(self):
+        """Flush pending writes and release the backend."""
+        with self._lock:
+            self.backend.close()
+
+    def set_backend(self, backend):
+        """Switch to another storage backend and forget everything cached."""
+        with self._lock:
+            self.backend.close()
+            self.backend = backend
+            self._cache.clear()
+            self._indexes.clear()
+
+    # Named collections
+
+    def load(self, name):
+        """Return the whole document of a named collection."""
+        _, key, empty = COLLECTIONS[name]
+        with self._lock:
+            signature = self.backend.signature(name)
+            cached = self._cache.get(name)
+            if cached is not None and cached[0] == signature:
+                metrics.count(f"storage.cache_hit.{name}")
+                return cached[1]
+
+            with metrics.timer(f"storage.load.{name}"):
+                data = self.backend.load(name)
+            # A backend may refresh the cached document in place: reindex it
+            self._indexes.pop(name, None)
+            if key is not None:
+                if not isinstance(data, dict):
+                    # Unexpected shape on disk: start from an empty document
+                    data = copy.deepcopy(empty)
+                data.setdefault(key, [])
+            self._cache[name] = (signature, data)
+            return data
+
+    def save(self, name, data):
+        """Save the whole document of a named collection."""
+        with self._lock, metrics.timer(f"storage.save.{name}"):
+            if self._transaction_depth:
+                self._changed.add(name)
+            self.backend.save(name, data)
+            self._cache[name] = (self.backend.signature(name), data)
+            # Records may have changed in place: rebuild the index on next use
+            self._indexes.pop(name, None)
+            self._publish(name, None, None, None)
+
+    def apply(self, name, inserted=(), updated=(), deleted=()):
+        """Persist row changes the caller already made to the cached records of a collection.
+
+        inserted records must already be in the list, deleted ones already removed
+        from it and updated ones modified in place. Backends that support it write
+        only those rows; the JSON backend rewrites the file.
+        """
+        inserted, updated, deleted = list(inserted), list(updated), list(deleted)
+        with self._lock:
+            if self._transaction_depth:
+                self._changed.add(name)
+            data = self.load(name)
+            with metrics.timer(f"storage.apply.{name}"):
+                self.backend.apply(name, data, inserted, updated, deleted)
+            self._cache[name] = (self.backend.signature(name), data)
+
+            index = self._indexes.get(name)
+            if index is not None and index.source is self.records(name):
+                index.apply(inserted, updated, deleted)
+            self._publish(name, inserted, updated, deleted)
+
+    def append(self, name, record):
+        """Add one record to a collection and persist it."""
+        with self._lock:
+            self.records(name).append(record)
+            self.apply(name, inserted=[record])
+
+    def update(self, name, record):
+        """Persist a record of a collection that was modified in place."""
+        self.apply(name, updated=[record])
+
+    def remove(self, name, record):
+        """Remove one record (matched by identity) from a collection and persist it."""
+        with self._lock:
+            records = self.records(name)
+            for i, r in enumerate(records):
+                if r is record:
+                    del records[i]
+                    break
+            self.apply(name, deleted=[record])
+
+    def records(self, name):
+        """Return the list of records of a named collection."""
+        _, key, _ = COLLECTIONS[name]
+        data = self.load(name)
+        return data[key] if key is not None else data
+
+    def save_records(self, name, records):
+        """Replace the list of records of a named collection."""
+        _, key, _ = COLLECTIONS[name]
+        if key is None:
+            self.save(name, records)
+            return
+        data = self.load(name)
+        data[key] = records
+        self.save(name, data)
+
+    def index(self, name):
+        """Return the secondary index of a collection, rebuilding it if the records were reloaded."""
+        with self._lock:
+            records = self.records(name)
+            index = self._indexes.get(name)
+            if index is None or index.source is not records:
+                index = INDEXES[name](records)
+                self._indexes[name] = index
+            return index
+
+    # Typed accessors
+
+    def users(self):
+        """Return the list of users."""
+        return self.records("users")
+
+    def events(self):
+        """Return the list of events."""
+        return self.records("events")
+
+    def event_index(self):
+        """Return the EventFilterIndex over the current events."""
+        return self.index("events")
+
+    def tickets(self):
+        """Return the list of tickets."""
+        return self.records("tickets")
+
+    def ticket_index(self):
+        """Return the TicketIndex over the current tickets."""
+        return self.index("tickets")
+
+    def notifications(self):
+        """Return the list of notifications."""
+        return self.records("notifications")
+
+    def notification_index(self):
+        """Return the NotificationIndex over the current notifications."""
+        return self.index("notifications")
+
+    def services(self):
+        """Return the list of vendor services."""
+        return self.records("services")
+
+    def collaboration_requests(self):
+        """Return the list of collaboration requests."""
+        return self.records("collaboration_requests")
+
+    def transfer_requests(self):
+        """Return the list of ticket transfer requests."""
+        return self.records("transfer_requests")
+
+    def reviews(self):
+        """Return the reviews document (event_reviews, vendor_reviews, metadata)."""
+        return self.load("reviews")
+
+    def find_user(self, user_id):
+        """Return the user with the given id, or None."""
+        return next((u for u in self.users() if u["user_id"] == user_id), None)
+
+    def find_event(self, event_id):
+        """Return the event with the given id, or None."""
+        return next((e for e in self.events() if e["event_id"] == event_id), None)
+
+
+def create_backend(data_dir="."):
+    """Create the backend selected with EVENTHUB_STORAGE ("json" or "sqlite").
+
+    For JSON files, EVENTHUB_WRITE_DELAY (seconds) enables group commit.
+    """
+    kind = os.environ.get("EVENTHUB_STORAGE", "json").lower()
+    if kind == "sqlite":
+        from sqlite_backend import SqliteBackend
+        db_path = os.environ.get("EVENTHUB_DB", os.path.join(data_dir, "eventhub.db"))
+        return SqliteBackend(db_path)
+    if kind != "json":
+        log.warning("Unknown EVENTHUB_STORAGE '%s', using JSON files", kind)
+    try:
+        write_delay = float(os.environ.get("EVENTHUB_WRITE_DELAY", "0"))
+    except ValueError:
+        log.warning("Invalid EVENTHUB_WRITE_DELAY, writing immediately")
+        write_delay = 0.0
+    return JsonBackend(data_dir, write_delay)
+
+
+store = DataStore(create_backend())
+atexit.register(store.close)
@@ -0,0 +1,279 @@
+from PyQt5.QtWidgets import QListView, QStyle, QStyledItemDelegate
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPainterPath
+from PyQt5.QtCore import QAbstractListModel, QEvent, QModelIndex, QRect, QRectF, QSize, Qt, pyqtSignal
+
+from image_cache import image_cache
+from image_loader import PLACEHOLDER_TEXT, image_loader
+
+EventRole = Qt.UserRole + 1
+
+# Card geometry
+MARGIN = 15
+LIST_IMAGE_SIZE = 180
+LIST_CARD_HEIGHT = LIST_IMAGE_SIZE + 2 * MARGIN
+GRID_IMAGE_HEIGHT = 160
+GRID_CARD_HEIGHT = 370
+BUTTON_SIZE = QSize(130, 36)
+SPACING = 10
+
+
+class EventListModel(QAbstractListModel):
+    """The events shown in the Events tab, one row per event dictionary."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._events = []
+
+    def set_events(self, events):
+        self.beginResetModel()
+        self._events = list(events)
+        self.endResetModel()
+
+    def event_at(self, row):
+        return self._events[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._events)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._events):
+            return None
+        event = self._events[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return event.get("title", "")
+        if role == EventRole:
+            return event
+        return None
+
+
+class EventCardDelegate(QStyledItemDelegate):
+    """Paints an event card (image, details and a "Περισσότερα" button).
+
+    Cards are painted straight onto the view instead of being built from
+    widgets, so only the cards that are on screen cost anything.
+    Clicking the button emits detailsRequested with the event.
+    """
+
+    detailsRequested = pyqtSignal(object)
+    imageRequested = pyqtSignal(object, int, int, int)  # path, width, height, row
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mode = "grid"
+        self.tile_width = 300
+        self.title_font = QFont("Helvetica", 16, QFont.Bold)
+        self.text_font = QFont("Helvetica")
+        self.text_font.setPixelSize(14)
+        self.button_font = QFont("Helvetica")
+        self.button_font.setPixelSize(14)
+
+    def sizeHint(self, option, index):
+        if self.mode == "grid":
+            return QSize(self.tile_width, GRID_CARD_HEIGHT)
+        return QSize(self.tile_width, LIST_CARD_HEIGHT)
+
+    def paint(self, painter, option, index):
+        event = index.data(EventRole)
+        if event is None:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        card = option.rect.adjusted(2, 2, -2, -4)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        # Shadow and card background
+        shadow = QPainterPath()
+        shadow.addRoundedRect(QRectF(card.translated(0, 2)), 8, 8)
+        painter.fillPath(shadow, QColor(0, 0, 0, 30))
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(card), 8, 8)
+        painter.fillPath(path, QColor("white"))
+        if hovered:
+            painter.setPen(QColor("#D91656"))
+            painter.drawPath(path)
+
+        image_rect, text_rect, button_rect = self._layout(card)
+        self._paint_image(painter, event, image_rect, index.row())
+        self._paint_text(painter, event, text_rect)
+        self._paint_button(painter, button_rect, hovered)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            _, _, button_rect = self._layout(option.rect.adjusted(2, 2, -2, -4))
+            if button_rect.contains(event.pos()):
+                self.detailsRequested.emit(index.data(EventRole))
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    # Helpers
+
+    def _layout(self, card):
+        """Return the image, text and button rectangles of a card."""
+        inner = card.adjusted(MARGIN, MARGIN, -MARGIN, -MARGIN)
+        if self.mode == "grid":
+            image_rect = QRect(inner.left(), inner.top(), inner.width(), GRID_IMAGE_HEIGHT)
+            button_rect = QRect(inner.left() + (inner.width() - BUTTON_SIZE.width()) // 2,
+                                inner.bottom() - BUTTON_SIZE.height() + 1, BUTTON_SIZE.width(), BUTTON_SIZE.height())
+            text_rect = QRect(inner.left(), image_rect.bottom() + 11, inner.width(),
+                              button_rect.top() - image_rect.bottom() - 20)
+        else:
+            image_rect = QRect(inner.left(), inner.top(), LIST_IMAGE_SIZE, LIST_IMAGE_SIZE)
+            button_rect = QRect(inner.right() - BUTTON_SIZE.width() + 1,
+                                inner.center().y() - BUTTON_SIZE.height() // 2, BUTTON_SIZE.width(), BUTTON_SIZE.height())
+            text_rect = QRect(image_rect.right() + 21, inner.top(),
+                              button_rect.left() - image_rect.right() - 40, inner.height())
+        return image_rect, text_rect, button_rect
+
+    def _paint_image(self, painter, event, rect, row):
+        background = QPainterPath()
+        background.addRoundedRect(QRectF(rect), 4, 4)
+        painter.fillPath(background, QColor("#f5f5f5"))
+        path = event.get("image")
+        pixmap = image_cache.find(path, rect.width(), rect.height()) if path else None
+        if pixmap is None and path and image_cache.signature(path) is not None:
+            # Not decoded yet: ask for it in the background and paint a placeholder
+            self.imageRequested.emit(path, rect.width(), rect.height(), row)
+            message = PLACEHOLDER_TEXT
+        elif pixmap is None or pixmap.isNull():
+            message = "No Image"
+        else:
+            message = None
+        if message is not None:
+            painter.setFont(self.text_font)
+            painter.setPen(QColor("#666"))
+            painter.drawText(rect, Qt.AlignCenter, message)
+            return
+        x = rect.left() + (rect.width() - pixmap.width()) // 2
+        y = rect.top() + (rect.height() - pixmap.height()) // 2
+        painter.drawPixmap(x, y, pixmap)
+
+    def _paint_text(self, painter, event, rect):
+        painter.setFont(self.title_font)
+        painter.setPen(QColor("#333"))
+        metrics = QFontMetrics(self.title_font)
+        title = metrics.elidedText(event.get("title", ""), Qt.ElideRight, rect.width())
+        painter.drawText(QRect(rect.left(), rect.top(), rect.width(), metrics.height()), Qt.AlignLeft | Qt.AlignVCenter, title)
+
+        painter.setFont(self.text_font)
+        painter.setPen(QColor("#666"))
+        text_metrics = QFontMetrics(self.text_font)
+        lines = [
+            f"Ημερομηνία: {event.get('start_date', '')} {event.get('start_time', '')}",
+            f"Τοποθεσία: {event.get('location', '')}",
+            f"Τύπος: {event.get('type', '')}",
+        ]
+        y = rect.top() + metrics.height() + 5
+        for line in lines:
+            if y + text_metrics.height() > rect.bottom() + 1:
+                break
+            line = text_metrics.elidedText(line, Qt.ElideRight, rect.width())
+            painter.drawText(QRect(rect.left(), y, rect.width(), text_metrics.height()), Qt.AlignLeft | Qt.AlignVCenter, line)
+            y += text_metrics.height() + 5
+
+    def _paint_button(self, painter, rect, hovered):
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(rect), 4, 4)
+        painter.fillPath(path, QColor("#640D5F" if hovered else "#D91656"))
+        painter.setFont(self.button_font)
+        painter.setPen(QColor("white"))
+        painter.drawText(rect, Qt.AlignCenter, "Περισσότερα")
+
+
+class EventBrowser(QListView):
+    """Scrollable grid or list of event cards backed by an EventListModel.
+
+    Only the visible cards are painted, so thousands of events scroll
+    smoothly without paging. Card images are loaded in the background by
+    the ImageLoader; requests for cards scrolled out of view are cancelled.
+    """
+
+    detailsRequested = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns = 3
+        self.event_model = EventListModel(self)
+        self.delegate = EventCardDelegate(self)
+        self.setModel(self.event_model)
+        self.setItemDelegate(self.delegate)
+        self.delegate.detailsRequested.connect(self.detailsRequested)
+        self.activated.connect(lambda index: self.detailsRequested.emit(index.data(EventRole)))
+
+        self._image_requests = {}  # (path, width, height) -> (ticket, row)
+        self.delegate.imageRequested.connect(self._request_image)
+        self.verticalScrollBar().valueChanged.connect(self._cancel_hidden_images)
+        self.event_model.modelReset.connect(self._cancel_all_images)
+
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setMouseTracking(True)
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(20)
+        self.setMovement(QListView.Static)
+        self.setResizeMode(QListView.Adjust)
+        self.setSpacing(SPACING // 2)
+        self.setStyleSheet("QListView { background: transparent; border: none; }")
+        self.set_mode("grid")
+
+    def set_events(self, events):
+        self.event_model.set_events(events)
+
+    def set_mode(self, mode, columns=None):
+        """Show the cards as a grid of tiles ("grid") or one per row ("list")."""
+        if columns is not None:
+            self.columns = max(1, columns)
+        self.delegate.mode = mode
+        if mode == "grid":
+            self.setViewMode(QListView.IconMode)
+            self.setFlow(QListView.LeftToRight)
+            self.setWrapping(True)
+        else:
+            self.setViewMode(QListView.ListMode)
+            self.setFlow(QListView.TopToBottom)
+            self.setWrapping(False)
+        self.setMovement(QListView.Static)
+        self._update_card_size()
+
+    def pending_images(self):
+        """Return how many card images are still being loaded."""
+        return len(self._image_requests)
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        self._update_card_size()
+
+    def _update_card_size(self):
+        width = self.viewport().width()
+        if self.delegate.mode == "grid":
+            self.delegate.tile_width = max(200, width // self.columns - SPACING)
+        else:
+            self.delegate.tile_width = width - SPACING
+        # Cached uniform item sizes are dropped when the layout is redone
+        self.doItemsLayout()
+        self.viewport().update()
+
+    def _request_image(self, path, width, height, row):
+        key = (path, width, height)
+        if key in self._image_requests:
+            return
+        self._image_requests[key] = (None, row)
+        ticket = image_loader().load(path, width, height, lambda pixmap: self._image_ready(key))
+        if key in self._image_requests:
+            self._image_requests[key] = (ticket, row)
+
+    def _image_ready(self, key):
+        self._image_requests.pop(key, None)
+        self.viewport().update()
+
+    def _cancel_hidden_images(self):
+        visible = self.viewport().rect()
+        for key, (ticket, row) in list(self._image_requests.items()):
+            if not self.visualRect(self.event_model.index(row)).intersects(visible):
+                image_loader().cancel(ticket)
+                del self._image_requests[key]
+
+    def _cancel_all_images(self):
+        for ticket, _ in self._image_requests.values():
+            image_loader().cancel(ticket)
+        self._image_requests.clear()
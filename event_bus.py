@@ -0,0 +1,44 @@
+import threading
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+
+class EventBus:
+    """In-process publish/subscribe.
+
+    Subscribers are called synchronously in the publishing thread with
+    (topic, payload); code that touches widgets should hand the call over to
+    the GUI thread (see NotificationWatcher). A failing subscriber is
+    reported and does not stop the others.
+    """
+
+    def __init__(self):
+        self._subscribers = {}  # topic -> list of callbacks
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic, callback):
+        """Call callback(topic, payload) for every event published on topic."""
+        with self._lock:
+            self._subscribers.setdefault(topic, []).append(callback)
+        return callback
+
+    def unsubscribe(self, topic, callback):
+        with self._lock:
+            callbacks = self._subscribers.get(topic, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def publish(self, topic, payload=None):
+        """Deliver an event to the subscribers of topic."""
+        with self._lock:
+            callbacks = list(self._subscribers.get(topic, []))
+        for callback in callbacks:
+            try:
+                callback(topic, payload if payload is not None else {})
+            except Exception as e:
+                log.error("Error delivering '%s' event: %s", topic, e)
+
+
+bus = EventBus()
@@ -0,0 +1,149 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+
+# Events whose start_date cannot be parsed sort after every real date
+UNDATED = date.max.toordinal() + 1
+
+FACETS = ("location", "type")
+
+
+def date_ordinal(value):
+    """Return the ordinal of a "dd/mm/yyyy" date (or a date), or UNDATED."""
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        day, month, year = value.split("/")
+        return date(int(year), int(month), int(day)).toordinal()
+    except (AttributeError, ValueError):
+        return UNDATED
+
+
+class EventFilterIndex:
+    """Filters events by date range, location and type without scanning them.
+
+    Every (location, type) combination, with None standing for "any", has
+    its own list of event keys sorted by (start date ordinal, start time).
+    A query is therefore one dictionary lookup plus two bisections, filters
+    combine with AND, and results come back in chronological order.
+    """
+
+    def __init__(self, events):
+        self.source = events
+        self.rebuild()
+
+    def rebuild(self):
+        """Index every event of the source list from scratch."""
+        self._seq = 0
+        self._keys = {}  # id(event) -> (sort key, facet values)
+        self._events = {}  # sort key -> event
+        self._facets = {}  # (location or None, type or None) -> sorted keys
+        entries = []
+        for event in self.source:
+            self._seq += 1
+            entries.append((self._sort_key(event) + (self._seq,), self._facet_values(event), event))
+        # Sort once; appending in order keeps every facet list sorted
+        entries.sort(key=lambda entry: entry[0])
+        for key, values, event in entries:
+            self._keys[id(event)] = (key, values)
+            self._events[key] = event
+            for combination in self._combinations(values):
+                self._facets.setdefault(combination, []).append(key)
+
+    def apply(self, inserted=(), updated=(), deleted=()):
+        """Bring the index up to date after events were added, changed or removed."""
+        for event in deleted:
+            self._discard(event)
+        for event in updated:
+            entry = self._keys.get(id(event))
+            if entry is None or entry[0][:2] != self._sort_key(event) or entry[1] != self._facet_values(event):
+                self._discard(event)
+                self._add(event)
+        for event in inserted:
+            self._add(event)
+
+    # Lookups
+
+    def match(self, from_date=None, to_date=None, location=None, event_type=None):
+        """Return the events matching every given filter, ordered by start date.
+
+        Dates may be date objects or "dd/mm/yyyy" strings and are inclusive;
+        None leaves a filter out.
+        """
+        keys, start, end = self._range(from_date, to_date, location, event_type)
+        return [self._events[key] for key in keys[start:end]]
+
+    def count(self, from_date=None, to_date=None, location=None, event_type=None):
+        _, start, end = self._range(from_date, to_date, location, event_type)
+        return end - start
+
+    def facet_counts(self, from_date=None, to_date=None, location=None, event_type=None):
+        """Return {"location": {value: n}, "type": {value: n}}.
+
+        Each facet is counted with the other filters applied, so the numbers
+        say how many events choosing that value would show.
+        """
+        counts = {"location": {}, "type": {}}
+        for value in self.values("location"):
+            n = self.count(from_date, to_date, value, event_type)
+            if n:
+                counts["location"][value] = n
+        for value in self.values("type"):
+            n = self.count(from_date, to_date, location, value)
+            if n:
+                counts["type"][value] = n
+        return counts
+
+    def values(self, facet):
+        """Return the values present for a facet ("location" or "type")."""
+        position = FACETS.index(facet)
+        return [combination[position] for combination in self._facets
+                if combination[position] is not None and combination[1 - position] is None]
+
+    # Helpers
+
+    def _range(self, from_date, to_date, location, event_type):
+        """Return (sorted keys, start, end) of the matching slice."""
+        keys = self._facets.get((location, event_type), [])
+        start = 0
+        end = len(keys)
+        if from_date is not None:
+            start = bisect_left(keys, (date_ordinal(from_date),))
+        if to_date is not None:
+            # Sorts after every key of that day; UNDATED events only match without an upper bound
+            end = bisect_right(keys, (date_ordinal(to_date), chr(0x10FFFF)))
+        return keys, start, max(start, end)
+
+    def _sort_key(self, event):
+        return (date_ordinal(event.get("start_date")), event.get("start_time") or "")
+
+    def _facet_values(self, event):
+        return tuple(event.get(facet) for facet in FACETS)
+
+    def _combinations(self, values):
+        location, event_type = values
+        return ((None, None), (location, None), (None, event_type), (location, event_type))
+
+    def _add(self, event):
+        self._seq += 1
+        key = self._sort_key(event) + (self._seq,)
+        values = self._facet_values(event)
+        self._keys[id(event)] = (key, values)
+        self._events[key] = event
+        for combination in self._combinations(values):
+            insort(self._facets.setdefault(combination, []), key)
+
+    def _discard(self, event):
+        entry = self._keys.pop(id(event), None)
+        if entry is None:
+            return
+        key, values = entry
+        del self._events[key]
+        for combination in self._combinations(values):
+            keys = self._facets.get(combination)
+            if keys is None:
+                continue
+            position = bisect_left(keys, key)
+            if position < len(keys) and keys[position] == key:
+                del keys[position]
+            if not keys:
+                del self._facets[combination]
@@ -0,0 +1,244 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from PyQt5.QtGui import QImageReader, QPixmap, QPixmapCache
+from PyQt5.QtCore import QSize, Qt
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+# Thumbnails of event and service images, generated when an image is uploaded
+THUMBNAIL_DIR = "thumbnails"
+THUMBNAIL_SIZE = QSize(400, 400)  # Large enough for every card and preview in the UI
+
+# Pixmaps kept by the in-memory LRU before they fall back to QPixmapCache
+CACHE_BYTES = 48 * 1024 * 1024
+
+# How long a file's (mtime, size) is trusted before it is checked again
+STAT_SECONDS = 2.0
+
+
+def image_signature(path):
+    """Return (mtime, size) of an image file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def fit_size(size, width, height):
+    """Return size scaled to fit inside width x height, keeping the aspect ratio."""
+    return size.scaled(width, height, Qt.KeepAspectRatio)
+
+
+def read_image(path, width=None, height=None):
+    """Decode an image, letting the decoder shrink it to fit width x height.
+
+    JPEGs are decoded directly at the reduced size, so the full image is
+    never held in memory. Returns a null QImage if the file cannot be read.
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    if width and height and reader.size().isValid():
+        target = fit_size(reader.size(), width, height)
+        if target.width() < reader.size().width():
+            reader.setScaledSize(target)
+    image = reader.read()
+    if image.isNull():
+        log.error("Error loading image %s: %s", path, reader.errorString())
+    return image
+
+
+def thumbnail_path(path, signature, thumbnail_dir=THUMBNAIL_DIR):
+    """Return where the thumbnail of a version of an image is stored."""
+    # PNGs keep their transparency; everything else becomes a JPEG
+    extension = "png" if path.lower().endswith(".png") else "jpg"
+    return os.path.join(thumbnail_dir, f"{_path_digest(path)}_{signature[0]}_{signature[1]}.{extension}")
+
+
+def _path_digest(path):
+    return hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+
+
+def ensure_thumbnail(path, thumbnail_dir=THUMBNAIL_DIR):
+    """Create the on-disk thumbnail of an image if it does not exist yet.
+
+    Returns the thumbnail path, or None if the image cannot be read.
+    """
+    signature = image_signature(path)
+    if signature is None:
+        return None
+    thumb = thumbnail_path(path, signature, thumbnail_dir)
+    if os.path.exists(thumb):
+        return thumb
+
+    image = read_image(path, THUMBNAIL_SIZE.width(), THUMBNAIL_SIZE.height())
+    if image.isNull():
+        return None
+    if image.width() > THUMBNAIL_SIZE.width() or image.height() > THUMBNAIL_SIZE.height():
+        image = image.scaled(THUMBNAIL_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    try:
+        os.makedirs(thumbnail_dir, exist_ok=True)
+        tmp_path = f"{thumb}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if not image.save(tmp_path, thumb.rsplit(".", 1)[1].upper(), 85):
+            log.error("Error saving thumbnail of %s", path)
+            return None
+        os.replace(tmp_path, thumb)
+    except OSError as e:
+        log.error("Error saving thumbnail of %s: %s", path, e)
+        return None
+    _remove_old_thumbnails(path, thumb, thumbnail_dir)
+    return thumb
+
+
+def _remove_old_thumbnails(path, current, thumbnail_dir):
+    """Delete thumbnails of earlier versions of an image."""
+    prefix = _path_digest(path) + "_"
+    for name in os.listdir(thumbnail_dir):
+        old = os.path.join(thumbnail_dir, name)
+        if name.startswith(prefix) and old != current and not name.endswith(".tmp"):
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def load_image(path, width, height, thumbnail_dir=THUMBNAIL_DIR):
+    """Return the image at path scaled to fit width x height (a null QImage on failure).
+
+    Sizes the thumbnail covers are decoded from it; larger ones from the
+    original. Works on QImage only, so it may run on any thread.
+    """
+    source = path
+    if width <= THUMBNAIL_SIZE.width() and height <= THUMBNAIL_SIZE.height():
+        source = ensure_thumbnail(path, thumbnail_dir) or path
+    image = read_image(source, width, height)
+    if image.isNull():
+        return image
+    if image.width() != width and image.height() != height:
+        image = image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return image
+
+
+class ImageCache:
+    """Scaled pixmaps of event and service images.
+
+    Pixmaps are keyed by (path, width, height, file signature), so an image
+    replaced on disk is loaded again. The most recently used ones are kept in
+    an LRU bounded by max_bytes; pixmaps evicted from it move to QPixmapCache,
+    which keeps them while Qt's own budget allows. Must be used on the GUI
+    thread (QPixmap).
+    """
+
+    def __init__(self, max_bytes=CACHE_BYTES, thumbnail_dir=THUMBNAIL_DIR):
+        self.max_bytes = max_bytes
+        self.thumbnail_dir = thumbnail_dir
+        self._pixmaps = OrderedDict()  # key -> QPixmap, least recently used first
+        self._bytes = 0
+        self._signatures = {}  # path -> (checked at, signature)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, path, width, height):
+        """Return the cache key of a scaled image, or None if the file does not exist."""
+        signature = self.signature(path)
+        if signature is None:
+            return None
+        return (os.path.abspath(path), width, height, signature)
+
+    def find(self, path, width, height):
+        """Return the cached pixmap, or None if it has not been loaded yet."""
+        key = self.key(path, width, height)
+        if key is None:
+            return None
+        return self.lookup(key)
+
+    def lookup(self, key):
+        """Return the pixmap cached under a key(), or None."""
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            self.hits += 1
+            return pixmap
+        pixmap = QPixmapCache.find(self._qt_key(key))
+        if pixmap is not None and not pixmap.isNull():
+            self.hits += 1
+            self.insert(key, pixmap)
+            return pixmap
+        return None
+
+    def pixmap(self, path, width, height):
+        """Return the image at path scaled to fit width x height.
+
+        Returns a null QPixmap if there is no image or it cannot be loaded.
+        """
+        if not path:
+            return QPixmap()
+        key = self.key(path, width, height)
+        if key is None:
+            return QPixmap()
+        pixmap = self.lookup(key)
+        if pixmap is not None:
+            return pixmap
+        self.misses += 1
+        image = load_image(path, width, height, self.thumbnail_dir)
+        pixmap = QPixmap.fromImage(image) if not image.isNull() else QPixmap()
+        self.insert(key, pixmap)
+        return pixmap
+
+    def insert(self, key, pixmap):
+        """Add a loaded pixmap (a null one remembers that the file cannot be read)."""
+        previous = self._pixmaps.pop(key, None)
+        if previous is not None:
+            self._bytes -= self._cost(previous)
+        self._pixmaps[key] = pixmap
+        self._bytes += self._cost(pixmap)
+        while self._bytes > self.max_bytes and len(self._pixmaps) > 1:
+            old_key, old = self._pixmaps.popitem(last=False)
+            self._bytes -= self._cost(old)
+            if not old.isNull():
+                QPixmapCache.insert(self._qt_key(old_key), old)
+
+    def invalidate(self, path=None):
+        """Forget cached pixmaps of one image (or of all images)."""
+        if path is None:
+            self._pixmaps.clear()
+            self._bytes = 0
+            self._signatures.clear()
+            return
+        path = os.path.abspath(path)
+        self._signatures.pop(path, None)
+        for key in [k for k in self._pixmaps if k[0] == path]:
+            self._bytes -= self._cost(self._pixmaps.pop(key))
+
+    def signature(self, path):
+        """Return the file signature of path, re-checking it at most every STAT_SECONDS."""
+        path = os.path.abspath(path)
+        now = time.monotonic()
+        entry = self._signatures.get(path)
+        if entry is None or now - entry[0] > STAT_SECONDS:
+            entry = (now, image_signature(path))
+            self._signatures[path] = entry
+        return entry[1]
+
+    # Helpers
+
+    def _qt_key(self, key):
+        path, width, height, (mtime, size) = key
+        return f"image-cache:{path}:{width}x{height}:{mtime}:{size}"
+
+    def _cost(self, pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+image_cache = ImageCache()
+
+
+def cached_pixmap(path, width, height):
+    """Return the image at path scaled to fit width x height, from the shared cache."""
+    return image_cache.pixmap(path, width, height)
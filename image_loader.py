@@ -0,0 +1,172 @@
+import atexit
+
+from PyQt5 import sip
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtCore import QCoreApplication, QObject, QRunnable, Qt, QThreadPool, pyqtSignal
+
+from app_logging import get_logger
+from image_cache import image_cache, load_image
+
+log = get_logger(__name__)
+
+# Text shown in an image label until its picture has been loaded
+PLACEHOLDER_TEXT = "Φόρτωση..."
+
+
+class _TaskSignals(QObject):
+    finished = pyqtSignal(object, QImage)  # cache key, image (null on failure)
+
+
+class LoadImageTask(QRunnable):
+    """Decodes and scales one image on a pool thread.
+
+    Works on QImage only (QPixmap must stay on the GUI thread). A task
+    cancelled before it starts does nothing.
+    """
+
+    def __init__(self, key, path, width, height, thumbnail_dir, signals):
+        super().__init__()
+        self.setAutoDelete(False)  # the loader keeps it until it is finished or cancelled
+        self.key = key
+        self.path = path
+        self.width = width
+        self.height = height
+        self.thumbnail_dir = thumbnail_dir
+        self.signals = signals
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:
+            return
+        try:
+            image = load_image(self.path, self.width, self.height, self.thumbnail_dir)
+        except Exception as e:
+            log.error("Error loading image %s: %s", self.path, e)
+            image = QImage()
+        if not self.cancelled:
+            self.signals.finished.emit(self.key, image)
+
+
+class ImageLoader(QObject):
+    """Loads images on a QThreadPool and hands them to the GUI thread.
+
+    load() answers straight from the ImageCache when it can; otherwise the
+    image is decoded in the background and the callback receives the
+    QPixmap on the GUI thread. Requests for the same image share one task,
+    and cancel() drops a request whose widget has gone away (a task nobody
+    waits for any more is taken off the queue).
+    """
+
+    def __init__(self, cache=image_cache, max_threads=None, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._signals = _TaskSignals()
+        self._signals.finished.connect(self._on_finished, Qt.QueuedConnection)
+        self._tasks = {}  # cache key -> (task, {ticket: callback})
+        self._tickets = {}  # ticket -> cache key
+        self._next_ticket = 0
+
+    def load(self, path, width, height, callback):
+        """Call callback(pixmap) with the image scaled to fit width x height.
+
+        Returns None if the callback was already called (cached or missing
+        image), otherwise a ticket that can be passed to cancel().
+        """
+        key = self.cache.key(path, width, height) if path else None
+        if key is None:
+            callback(QPixmap())
+            return None
+        pixmap = self.cache.lookup(key)
+        if pixmap is not None:
+            callback(pixmap)
+            return None
+
+        entry = self._tasks.get(key)
+        if entry is None:
+            task = LoadImageTask(key, path, width, height, self.cache.thumbnail_dir, self._signals)
+            entry = (task, {})
+            self._tasks[key] = entry
+            self.pool.start(task)
+        self._next_ticket += 1
+        entry[1][self._next_ticket] = callback
+        self._tickets[self._next_ticket] = key
+        return self._next_ticket
+
+    def cancel(self, ticket):
+        """Forget a request; its task is dropped if no other request needs it."""
+        key = self._tickets.pop(ticket, None)
+        if key is None:
+            return
+        task, callbacks = self._tasks[key]
+        callbacks.pop(ticket, None)
+        if not callbacks:
+            task.cancelled = True
+            self.pool.tryTake(task)
+            del self._tasks[key]
+
+    def pending(self):
+        """Return how many requests are still waiting for their image."""
+        return len(self._tickets)
+
+    def shutdown(self):
+        """Cancel every request and wait for running tasks to end."""
+        if sip.isdeleted(self.pool):
+            return  # the application is already gone
+        for ticket in list(self._tickets):
+            self.cancel(ticket)
+        self.pool.clear()
+        self.pool.waitForDone()
+
+    def _on_finished(self, key, image):
+        entry = self._tasks.pop(key, None)
+        if entry is None:
+            return  # cancelled meanwhile
+        pixmap = QPixmap.fromImage(image) if not image.isNull() else QPixmap()
+        self.cache.insert(key, pixmap)
+        for ticket, callback in entry[1].items():
+            self._tickets.pop(ticket, None)
+            try:
+                callback(pixmap)
+            except Exception as e:
+                log.error("Error delivering image %s: %s", key[0], e)
+
+
+_loader = None
+
+
+def image_loader():
+    """Return the application's ImageLoader, creating it on first use."""
+    global _loader
+    if _loader is None:
+        _loader = ImageLoader()
+        # Pool threads must not outlive the objects they report to
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(_loader.shutdown)
+        atexit.register(_loader.shutdown)
+    return _loader
+
+
+def load_into_label(label, path, width, height, missing_text=""):
+    """Show the image at path in label once it is loaded, with a placeholder meanwhile.
+
+    The request is cancelled if the label is destroyed first (a card that
+    was scrolled away or a tab that was rebuilt).
+    """
+    def deliver(pixmap):
+        if sip.isdeleted(label):
+            return
+        if pixmap.isNull():
+            label.setText(missing_text)
+        else:
+            label.setPixmap(pixmap)
+
+    loader = image_loader()
+    ticket = loader.load(path, width, height, deliver)
+    if ticket is not None:
+        label.setText(PLACEHOLDER_TEXT)
+        label.destroyed.connect(lambda: loader.cancel(ticket))
+    return ticket
@@ -0,0 +1,126 @@
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QCoreApplication, QObject, Qt, pyqtSignal
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+
+class IoExecutor(QObject):
+    """Runs file reads and writes off the GUI thread.
+
+    submit() hands a function to a worker thread and returns its
+    concurrent.futures.Future. on_success(result) or on_error(exception) is
+    then called on the GUI thread. With the default single worker, jobs run
+    one at a time in the order they were submitted, so writes to the data
+    files keep their order.
+
+    busyChanged(busy, description) fires when the first job starts and the
+    last one ends, for a busy cursor or status message. progress(description,
+    done, total) carries the progress of jobs submitted with
+    report_progress=True.
+    """
+
+    busyChanged = pyqtSignal(bool, str)
+    progress = pyqtSignal(str, int, int)
+    _finished = pyqtSignal(int, object, object)  # job, result, exception
+
+    def __init__(self, max_workers=1, parent=None):
+        super().__init__(parent)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="eventhub-io")
+        self._jobs = {}  # job -> (future, description, on_success, on_error), in submission order
+        self._next_job = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        # Jobs finish on a worker thread: deliver their callbacks on ours
+        self._finished.connect(self._on_finished, Qt.QueuedConnection)
+
+    def submit(self, fn, *args, on_success=None, on_error=None, description="", report_progress=False, **kwargs):
+        """Run fn(*args, **kwargs) on a worker thread and return its Future.
+
+        With report_progress=True, fn also receives progress=callable(done, total).
+        """
+        if report_progress:
+            kwargs["progress"] = lambda done, total: self.progress.emit(description, done, total)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("I/O executor is shut down")
+            self._next_job += 1
+            future = self._pool.submit(self._run, self._next_job, fn, args, kwargs)
+            first = not self._jobs
+            self._jobs[self._next_job] = (future, description, on_success, on_error)
+        if first:
+            self.busyChanged.emit(True, description)
+        return future
+
+    def is_busy(self):
+        with self._lock:
+            return bool(self._jobs)
+
+    def wait(self):
+        """Block until every submitted job has run (for scripts and shutdown).
+
+        Their callbacks are delivered the next time the event loop runs.
+        """
+        with self._lock:
+            futures = [job[0] for job in self._jobs.values()]
+        for future in futures:
+            try:
+                future.result()
+            except Exception:
+                pass  # reported by its callbacks
+
+    def shutdown(self):
+        """Finish the queued jobs and stop the worker threads."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._pool.shutdown(wait=True)
+
+    def _run(self, job, fn, args, kwargs):
+        # Report before the future completes, so that after wait() the
+        # callbacks only need the event loop to run
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self._finished.emit(job, None, e)
+            raise
+        self._finished.emit(job, result, None)
+        return result
+
+    def _on_finished(self, job, result, error):
+        with self._lock:
+            _, description, on_success, on_error = self._jobs.pop(job, (None, "", None, None))
+            idle = not self._jobs
+            next_description = next(iter(self._jobs.values()))[1] if self._jobs else ""
+        try:
+            if error is not None:
+                if on_error is not None:
+                    on_error(error)
+                else:
+                    log.error("Error in background job '%s': %s", description, error)
+            elif on_success is not None:
+                on_success(result)
+        except Exception as e:
+            log.error("Error in completion of background job '%s': %s", description, e)
+        self.busyChanged.emit(not idle, next_description)
+
+
+_executor = None
+
+
+def io_executor():
+    """Return the application's IoExecutor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = IoExecutor()
+        # Queued writes must reach the disk before the application exits
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(_executor.shutdown)
+        atexit.register(_executor.shutdown)
+    return _executor
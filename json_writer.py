@@ -0,0 +1,291 @@
+import json
+import os
+import tempfile
+import threading
+
+from app_logging import get_logger
+from metrics import metrics
+
+log = get_logger(__name__)
+
+JOURNAL_NAME = ".eventhub-journal.json"
+
+
+def file_signature(path):
+    """Return (mtime, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def dump_json(data):
+    """Serialize a document the way the data files are formatted."""
+    return json.dumps(data, ensure_ascii=False, indent=4)
+
+
+def write_temp(path, text):
+    """Write text to a synced temporary file next to path and return its name."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        # mkstemp creates private files: keep the permissions of the file being replaced
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+            if metrics.enabled:
+                metrics.add_bytes(os.path.basename(path), written=f.tell())
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    return tmp_path
+
+
+def sync_directory(directory):
+    """Make renames inside a directory durable (a no-op where directories cannot be opened)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path, text):
+    """Replace a file with text so readers see either the old or the new contents, never a torn file."""
+    tmp_path = write_temp(path, text)
+    os.replace(tmp_path, path)
+    sync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def atomic_write_json(path, data):
+    """Atomically replace a JSON file."""
+    atomic_write_text(path, dump_json(data))
+
+
+def commit_files(files, journal_path):
+    """Replace several files together.
+
+    Every new file is written and synced first, then a journal listing the
+    renames is written, then the renames are done and the journal removed.
+    If the process dies half way, recover() finishes the renames on the next
+    start, so either all files change or none do.
+    """
+    if len(files) == 1:
+        path, text = next(iter(files.items()))
+        atomic_write_text(path, text)
+        return
+
+    renames = []
+    try:
+        for path, text in files.items():
+            renames.append([write_temp(path, text), path])
+    except Exception:
+        for tmp_path, _ in renames:
+            os.remove(tmp_path)
+        raise
+
+    atomic_write_text(journal_path, json.dumps({"renames": renames}))
+    for tmp_path, path in renames:
+        os.replace(tmp_path, path)
+    for directory in {os.path.dirname(os.path.abspath(path)) for _, path in renames}:
+        sync_directory(directory)
+    os.remove(journal_path)
+
+
+def recover(journal_path):
+    """Finish a multi-file commit that was interrupted. Returns the files that were completed."""
+    try:
+        with open(journal_path, "r", encoding="utf-8") as f:
+            renames = json.load(f).get("renames", [])
+    except FileNotFoundError:
+        return []
+    except (json.JSONDecodeError, AttributeError) as e:
+        # The journal itself is written atomically, so this should not happen
+        log.error("Error reading write journal %s: %s", journal_path, e)
+        return []
+
+    completed = []
+    for tmp_path, path in renames:
+        if os.path.exists(tmp_path):
+            os.replace(tmp_path, path)
+            completed.append(path)
+    os.remove(journal_path)
+    return completed
+
+
+def append_text(path, text):
+    """Append text to a file and sync it.
+
+    A crash can leave a partial last line; it is terminated before the next
+    append so later lines stay readable.
+    """
+    with open(path, "ab") as f:
+        if f.tell() > 0:
+            with open(path, "rb") as tail:
+                tail.seek(-1, os.SEEK_END)
+                if tail.read(1) != b"\n":
+                    f.write(b"\n")
+        data = text.encode("utf-8")
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    metrics.add_bytes(os.path.basename(path), written=len(data))
+
+
+class GroupCommitWriter:
+    """Writes JSON files atomically, coalescing writes that arrive within a short delay.
+
+    With delay=0 every write goes straight to disk. With a delay, writes to
+    the same file within that window collapse into one flush, done by a
+    background timer. Between begin() and commit() writes are held back and
+    then committed to all files together. Appends (for log files) are queued
+    the same way and written after the replaced files.
+    """
+
+    def __init__(self, data_dir=".", delay=0.0):
+        self.data_dir = data_dir
+        self.delay = delay
+        self.journal_path = os.path.join(data_dir, JOURNAL_NAME)
+        self.written = {}  # path -> file signature right after our last write
+        self._pending = ({}, {})  # (path -> text to replace, path -> texts to append) for the next flush
+        self._transaction = None  # the same pair for the open transaction
+        self._depth = 0
+        self._timer = None
+        self._lock = threading.RLock()
+        recover(self.journal_path)
+
+    def write(self, path, data):
+        """Queue (or perform) an atomic write of a JSON document."""
+        self.write_text(path, dump_json(data))
+
+    def write_text(self, path, text):
+        """Queue (or perform) an atomic replacement of a file."""
+        with self._lock:
+            if self._transaction is None and self.delay <= 0:
+                self._write_files({path: text}, {})
+                return
+            replaces, appends = self._batch()
+            replaces[path] = text
+            appends.pop(path, None)  # superseded by the new contents
+            self._schedule()
+
+    def append(self, path, text):
+        """Queue (or perform) an append to a file."""
+        with self._lock:
+            if self._transaction is None and self.delay <= 0:
+                self._write_files({}, {path: [text]})
+                return
+            _, appends = self._batch()
+            appends.setdefault(path, []).append(text)
+            self._schedule()
+
+    def is_pending(self, path):
+        """Return True if a write to path has not reached the disk yet."""
+        with self._lock:
+            batches = [self._pending] + ([self._transaction] if self._transaction is not None else [])
+            return any(path in replaces or path in appends for replaces, appends in batches)
+
+    def pending_text(self, path):
+        """Return the newest unwritten contents of a replaced file, or None."""
+        with self._lock:
+            if self._transaction is not None and path in self._transaction[0]:
+                return self._transaction[0][path]
+            return self._pending[0].get(path)
+
+    def in_transaction(self):
+        with self._lock:
+            return self._transaction is not None
+
+    def begin(self):
+        with self._lock:
+            self._depth += 1
+            if self._depth == 1:
+                self._transaction = ({}, {})
+
+    def commit(self):
+        with self._lock:
+            if self._depth == 0:
+                return
+            self._depth -= 1
+            if self._depth > 0:
+                return
+            replaces, appends = self._take_pending()
+            for path, text in self._transaction[0].items():
+                replaces[path] = text
+                appends.pop(path, None)
+            for path, texts in self._transaction[1].items():
+                appends.setdefault(path, []).extend(texts)
+            self._transaction = None
+            self._write_files(replaces, appends)
+
+    def rollback(self):
+        with self._lock:
+            self._depth = 0
+            self._transaction = None
+
+    def flush(self):
+        """Write everything queued outside a transaction."""
+        with self._lock:
+            replaces, appends = self._take_pending()
+            try:
+                self._write_files(replaces, appends)
+            except Exception:
+                # Keep the writes queued so a later flush retries them
+                for path, text in replaces.items():
+                    self._pending[0].setdefault(path, text)
+                for path, texts in appends.items():
+                    self._pending[1][path] = texts + self._pending[1].get(path, [])
+                raise
+
+    def close(self):
+        with self._lock:
+            if self._transaction is not None:
+                log.error("Closing the writer with an open transaction, discarding it")
+                self.rollback()
+            self.flush()
+
+    def _batch(self):
+        return self._transaction if self._transaction is not None else self._pending
+
+    def _take_pending(self):
+        self._cancel_timer()
+        replaces, appends = self._pending
+        self._pending = ({}, {})
+        return replaces, appends
+
+    def _schedule(self):
+        if self._transaction is None and self._timer is None:
+            self._timer = threading.Timer(self.delay, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+            try:
+                self.flush()
+            except OSError as e:
+                log.error("Error flushing data files: %s", e)
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _write_files(self, replaces, appends):
+        if replaces:
+            commit_files(replaces, self.journal_path)
+        for path, texts in appends.items():
+            append_text(path, "".join(texts))
+        for path in list(replaces) + list(appends):
+            self.written[path] = file_signature(path)
@@ -1,11 +1,16 @@
-import json
 from datetime import datetime
 import math
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                            QTextEdit, QPushButton, QMessageBox, QWidget)
 from PyQt5.QtCore import Qt, QPointF, pyqtSignal, QRectF
 from PyQt5.QtGui import QPainter, QColor, QPen, QPolygonF, QPainterPath
-import os
+from datastore import store
+from io_executor import io_executor
+from services import review_block_reason, submit_review as save_review
+from services.review import EVENT_NOT_COMPLETED
+from app_logging import get_logger
+
+log = get_logger(__name__)
 
 class StarRating(QWidget):
     # Signal emitted when rating changes
@@ -197,117 +202,32 @@ class LeaveReviewModal(QDialog):
         self.setLayout(layout)
     
     def can_leave_review(self):
-        if self.review_type == "event":
-            # Load tickets to check if user has attended
-            with open("tickets.json", "r", encoding='utf-8') as f:
-                tickets = json.load(f)
-            
-            # Load events to check if event has passed
-            with open("events.json", "r", encoding='utf-8') as f:
-                events = json.load(f)
-            
-            event = next((e for e in events if e["event_id"] == self.event_id), None)
-            if not event:
-                return False
-                
-            # Check if event date has passed
-            try:
-                event_date = datetime.strptime(event["start_date"], "%d/%m/%Y").date()
-                if event_date > datetime.now().date():
-                    return False
-            except ValueError as e:
-                print(f"Date parsing error: {e}")
-                return False
-                
-            # Check if user has ticket
-            user_ticket = any(t["user_id"] == self.user_id and t["event_id"] == self.event_id for t in tickets)
-            return user_ticket
-            
-        elif self.review_type == "vendor":
-            # Load events to check if event is completed
-            with open("events.json", "r", encoding='utf-8') as f:
-                events = json.load(f)
-            
-            event = next((e for e in events if e["event_id"] == self.event_id), None)
-            if not event:
-                return False
-                
-            # Check if event has ended (only check event end date, not service dates)
-            try:
-                # Debug current time
-                current_date = datetime.now().date()
-                print(f"\nDebug - Current system date: {current_date}")
-                
-                # Debug event dates
-                print(f"Debug - Raw event end date from JSON: {event['end_date']}")
-                event_end_date = datetime.strptime(event["end_date"], "%d/%m/%Y").date()
-                print(f"Debug - Parsed event end date: {event_end_date}")
-                
-                # Debug comparison
-                print(f"Debug - Current date <= Event end date? {current_date <= event_end_date}")
-                print(f"Debug - Current date > Event end date? {current_date > event_end_date}")
-                
-                # The event must be completely over (end date must be in the past)
-                if current_date <= event_end_date:
-                    print("Debug - Cannot review: Event hasn't completed yet")
-                    QMessageBox.warning(None, "Προσοχή", 
-                                      f"Η εκδήλωση δεν έχει ολοκληρωθεί ακόμα!\n\n"
-                                      f"Σημερινή ημερομηνία: {current_date.strftime('%d/%m/%Y')}\n"
-                                      f"Ημερομηνία λήξης: {event_end_date.strftime('%d/%m/%Y')}")
-                    return False
-                else:
-                    print("Debug - Can review: Event has completed")
-
-            except ValueError as e:
-                print(f"Date parsing error: {e}")
-                return False
-                
-            # Check if user is the organizer of the event
-            print(f"\nDebug - Checking organizer")
-            print(f"Debug - Event organizer_id: {event.get('organizer_id')}")
-            print(f"Debug - Current user_id: {self.user_id}")
-            if event.get("organizer_id") != self.user_id:
-                print("Debug - User is not the organizer")
-                return False
-            else:
-                print("Debug - User is the organizer")
-                
-            # Check if vendor is assigned to this event (ignore service dates)
-            try:
-                with open("services.json", "r", encoding='utf-8') as f:
-                    services = json.load(f)
-                    vendor_service = next(
-                        (s for s in services["services"] 
-                         if s.get("vendor_id") == self.vendor_id and s.get("event_id") == self.event_id),
-                        None
-                    )
-                    print(f"Debug - Found vendor service: {vendor_service is not None}")
-                    if vendor_service is None:
-                        print("Debug - No vendor service found for this event")
-                        return False
-                    return True
-            except Exception as e:
-                print(f"Debug - Error checking vendor service: {str(e)}")
-                return False
-            
-        return False
+        reason = review_block_reason(self.review_type, self.user_id, self.event_id, self.vendor_id)
+        log.debug("Review block reason: %s", reason)
+        if reason == EVENT_NOT_COMPLETED:
+            event = store.find_event(self.event_id)
+            QMessageBox.warning(None, "Προσοχή", 
+                              f"Η εκδήλωση δεν έχει ολοκληρωθεί ακόμα!\n\n"
+                              f"Σημερινή ημερομηνία: {datetime.now().strftime('%d/%m/%Y')}\n"
+                              f"Ημερομηνία λήξης: {event['end_date']}")
+        return reason is None
     
     def submit_review(self):
-        print("\nDebug - Starting submit_review")
+        log.debug("Starting submit_review")
         
         if not self.star_rating.get_rating():
-            print("Debug - No star rating provided")
+            log.debug("No star rating provided")
             QMessageBox.warning(self, "Σφάλμα", "Παρακαλώ δώστε μια βαθμολογία (1-5 αστέρια)")
             return
 
         if not self.comments.toPlainText().strip():
-            print("Debug - No comments provided")
+            log.debug("No comments provided")
             QMessageBox.warning(self, "Σφάλμα", "Παρακαλώ γράψτε ένα σχόλιο για την εμπειρία σας")
             return
 
-        print("Debug - About to check can_leave_review")
+        log.debug("About to check can_leave_review")
         can_review = self.can_leave_review()
-        print(f"Debug - can_leave_review returned: {can_review}")
+        log.debug("can_leave_review returned: %s", can_review)
         
         if not can_review:
             error_msg = "Δεν μπορείτε να αφήσετε κριτική: "
@@ -316,165 +236,35 @@ class LeaveReviewModal(QDialog):
             else:
                 error_msg += "Η εκδήλωση δεν έχει ολοκληρωθεί ακόμα."
             
-            print(f"Debug - Cannot leave review: {error_msg}")
+            log.debug("Cannot leave review: %s", error_msg)
             QMessageBox.warning(self, "Σφάλμα", error_msg)
             self.reject()
             return
             
         try:
-            # Initialize or load reviews.json
-            reviews_file = "reviews.json"
-            reviews_template = {
-                "event_reviews": [],
-                "vendor_reviews": [],
-                "metadata": {
-                    "last_updated": datetime.now().strftime("%d/%m/%Y %H:%M"),
-                    "version": "1.0"
-                }
-            }
-            
-            try:
-                # Try to read existing reviews
-                if os.path.exists(reviews_file):
-                    with open(reviews_file, "r", encoding='utf-8') as f:
-                        reviews = json.load(f)
-                    # Ensure all required keys exist
-                    if "event_reviews" not in reviews:
-                        reviews["event_reviews"] = []
-                    if "vendor_reviews" not in reviews:
-                        reviews["vendor_reviews"] = []
-                    if "metadata" not in reviews:
-                        reviews["metadata"] = reviews_template["metadata"]
-                else:
-                    # Create new reviews file with template
-                    reviews = reviews_template
-                    with open(reviews_file, "w", encoding='utf-8') as f:
-                        json.dump(reviews, f, indent=4, ensure_ascii=False)
-            except (json.JSONDecodeError, FileNotFoundError):
-                # If file is corrupted or any other error occurs, create new
-                reviews = reviews_template
-                with open(reviews_file, "w", encoding='utf-8') as f:
-                    json.dump(reviews, f, indent=4, ensure_ascii=False)
+            # The review is saved and its notification sent on the I/O thread
+            self.setEnabled(False)
+            io_executor().submit(
+                save_review, self.review_type, self.parent().current_user, self.event_id,
+                self.star_rating.get_rating(), self.comments.toPlainText(), self.suggestions.toPlainText(),
+                vendor_id=self.vendor_id,
+                on_success=lambda _: self.on_review_saved(),
+                on_error=self.on_review_failed,
+                description="Υποβολή κριτικής...",
+            )
 
-            # Get current timestamp
-            current_time = datetime.now().strftime("%d/%m/%Y %H:%M")
-                
-            new_review = {
-                "id": len(reviews[f"{self.review_type}_reviews"]) + 1,
-                "review_type": self.review_type,
-                "rating": self.star_rating.get_rating(),
-                "comments": self.comments.toPlainText().strip(),
-                "suggestions": self.suggestions.toPlainText().strip(),
-                "created_at": current_time,
-                "updated_at": current_time,
-                "status": "active",
-                "user": {
-                    "id": self.user_id,
-                    "name": self.parent().current_user.get("name", ""),
-                    "surname": self.parent().current_user.get("surname", "")
-                },
-                "notification_status": {
-                    "organizer_notified": False,
-                    "vendor_notified": False,
-                    "notification_sent_at": None
-                },
-                "metadata": {
-                    "client_version": "1.0",
-                    "platform": "desktop",
-                    "language": "el"
-                }
-            }
+        except Exception as e:
+            self.on_review_failed(e)
 
-            # Add event-specific or vendor-specific data
-            if self.review_type == "event":
-                with open("events.json", "r", encoding='utf-8') as f:
-                    events = json.load(f)
-                event = next((e for e in events if e["event_id"] == self.event_id), None)
-                
-                if event:
-                    new_review.update({
-                        "event_id": self.event_id,
-                        "event_data": {
-                            "title": event.get("title", ""),
-                            "organizer_id": event.get("organizer_id", ""),
-                            "date": event.get("start_date", "")
-                        }
-                    })
-            else:  # vendor review
-                new_review.update({
-                    "vendor_id": self.vendor_id,
-                    "event_id": self.event_id,
-                    "service_details": {
-                        "service_type": "",
-                        "service_date": datetime.now().strftime("%d/%m/%Y")
-                    }
-                })
-                
-            # Add the review and update metadata
-            reviews[f"{self.review_type}_reviews"].append(new_review)
-            reviews["metadata"]["last_updated"] = current_time
-            
-            # Save the updated reviews
-            with open(reviews_file, "w", encoding='utf-8') as f:
-                json.dump(reviews, f, indent=4, ensure_ascii=False)
+    def on_review_saved(self):
+        log.debug("Notification sent successfully")
+        QMessageBox.information(self, "Επιτυχία", "Η κριτική υποβλήθηκε με επιτυχία!")
+        self.accept()
 
-            # Send notification to the reviewed entity
-            if self.review_type == "vendor":
-                # Get vendor name for notification
-                with open("users.json", "r", encoding='utf-8') as f:
-                    users = json.load(f)
-                    vendor = next((u for u in users if u["user_id"] == self.vendor_id), None)
-                    vendor_name = f"{vendor['name']} {vendor['surname']}" if vendor else "Vendor"
-                
-                self.parent().add_notification(
-                    self.vendor_id,
-                    "Νέα Αξιολόγηση",
-                    f"Λάβατε νέα αξιολόγηση από τον διοργανωτή {self.parent().current_user['name']} {self.parent().current_user['surname']}.",
-                    category="Service Reviews",
-                    additional_data={
-                        "review_data": {
-                            "rating": self.star_rating.get_rating(),
-                            "comments": self.comments.toPlainText().strip(),
-                            "suggestions": self.suggestions.toPlainText().strip(),
-                            "reviewer_name": f"{self.parent().current_user['name']} {self.parent().current_user['surname']}",
-                            "review_type": self.review_type
-                        }
-                    }
-                )
-                print(f"Debug - Sent notification to vendor {self.vendor_id}")
-                
-            else:  # event review
-                # Get event organizer ID
-                with open("events.json", "r", encoding='utf-8') as f:
-                    events = json.load(f)
-                    event = next((e for e in events if e["event_id"] == self.event_id), None)
-                    if event:
-                        self.parent().add_notification(
-                            event["organizer_id"],
-                            "Νέα Αξιολόγηση Εκδήλωσης",
-                            f"Η εκδήλωση '{event['title']}' έλαβε νέα αξιολόγηση από έναν συμμετέχοντα.",
-                            category="Event Reviews",
-                            additional_data={
-                                "review_data": {
-                                    "rating": self.star_rating.get_rating(),
-                                    "comments": self.comments.toPlainText().strip(),
-                                    "suggestions": self.suggestions.toPlainText().strip(),
-                                    "reviewer_name": f"{self.parent().current_user['name']} {self.parent().current_user['surname']}",
-                                    "review_type": self.review_type,
-                                    "event_title": event['title']
-                                }
-                            }
-                        )
-                        print(f"Debug - Sent notification to organizer {event['organizer_id']}")
-                
-            print("Debug - Notification sent successfully")
-                
-            QMessageBox.information(self, "Επιτυχία", "Η κριτική υποβλήθηκε με επιτυχία!")
-            self.accept()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Σφάλμα", f"Αποτυχία υποβολής κριτικής: {str(e)}")
-            print(f"Error details: {str(e)}")  # For debugging
+    def on_review_failed(self, e):
+        self.setEnabled(True)
+        QMessageBox.critical(self, "Σφάλμα", f"Αποτυχία υποβολής κριτικής: {str(e)}")
+        log.error("Error details: %s", e)
             
     def handle_cancel(self):
         reply = QMessageBox.question(self, "Επιβεβαίωση Ακύρωσης", 
@@ -0,0 +1,201 @@
+import atexit
+import bisect
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+# Upper bounds of the latency buckets, in milliseconds (the last bucket is open)
+BUCKET_BOUNDS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# EVENTHUB_METRICS=1 turns collection on and dumps to this file on exit;
+# any other value (except 0) is taken as the file to dump to
+METRICS_ENV = "EVENTHUB_METRICS"
+DEFAULT_FILE = "metrics.json"
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+class Histogram:
+    """Latency samples kept as counts in fixed log-scale buckets."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if self.min_ms is None or ms < self.min_ms:
+            self.min_ms = ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, fraction):
+        """Return the upper bound of the bucket holding the given fraction of samples."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                # Never report more than the slowest sample actually seen
+                return min(BUCKET_BOUNDS_MS[i], self.max_ms) if i < len(BUCKET_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self):
+        buckets = {}
+        for i, n in enumerate(self.counts):
+            if n:
+                label = f"<={BUCKET_BOUNDS_MS[i]}" if i < len(BUCKET_BOUNDS_MS) else f">{BUCKET_BOUNDS_MS[-1]}"
+                buckets[label] = n
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min_ms or 0.0, 3),
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": round(self.percentile(0.5), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "buckets": buckets,
+        }
+
+
+class MetricsRegistry:
+    """Call counts, latency histograms and bytes read/written, by name.
+
+    Nothing is recorded while the registry is disabled: timer() then returns
+    a shared no-op context manager and timed() functions cost one attribute
+    check per call. Recording is thread-safe, so the I/O thread and the GUI
+    thread can share one registry.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._counters = {}
+            self._timings = {}  # name -> Histogram
+            self._bytes = {}  # name -> [read, written]
+            self._started = datetime.now()
+
+    def count(self, name, n=1):
+        """Add n to a counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def observe(self, name, seconds):
+        """Record one call of name that took the given number of seconds."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._timings.get(name)
+            if histogram is None:
+                histogram = self._timings[name] = Histogram()
+            histogram.observe(seconds * 1000.0)
+
+    def add_bytes(self, name, read=0, written=0):
+        """Record bytes read from or written to a file (or any other named stream)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            totals = self._bytes.get(name)
+            if totals is None:
+                totals = self._bytes[name] = [0, 0]
+            totals[0] += read
+            totals[1] += written
+
+    def timer(self, name):
+        """Context manager timing its block under name."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(name)
+
+    @contextlib.contextmanager
+    def _timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """Decorator timing every call of a function under name.
+
+        Qt hands extra signal arguments (such as clicked's checked flag) to
+        callables that accept them, so connect timed methods through a lambda.
+        """
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def snapshot(self):
+        """Return everything recorded so far as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "started": self._started.strftime("%d/%m/%Y %H:%M:%S"),
+                "taken": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+                "counters": dict(sorted(self._counters.items())),
+                "timings": {name: h.snapshot() for name, h in sorted(self._timings.items())},
+                "bytes": {name: {"read": r, "written": w} for name, (r, w) in sorted(self._bytes.items())},
+            }
+
+    def dump(self, path=DEFAULT_FILE):
+        """Write a snapshot to a JSON file."""
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=4)
+        except OSError as e:
+            log.error("Error writing metrics to %s: %s", path, e)
+
+
+def _configured_file():
+    value = os.environ.get(METRICS_ENV, "").strip()
+    if value in ("", "0"):
+        return None
+    return DEFAULT_FILE if value == "1" else value
+
+
+metrics = MetricsRegistry()
+_dump_file = _configured_file()
+if _dump_file is not None:
+    metrics.enable()
+    atexit.register(lambda: metrics.dump(_dump_file))
+
+# Shorthands for instrumenting code
+timer = metrics.timer
+timed = metrics.timed
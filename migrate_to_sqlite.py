@@ -0,0 +1,42 @@
+import argparse
+import os
+
+from datastore import COLLECTIONS, JsonBackend
+from sqlite_backend import SqliteBackend
+
+
+def migrate(data_dir=".", db_path=None):
+    """Copy every JSON data file into a SQLite database and return the number of records per collection."""
+    if db_path is None:
+        db_path = os.path.join(data_dir, "eventhub.db")
+
+    source = JsonBackend(data_dir)
+    target = SqliteBackend(db_path)
+    counts = {}
+    try:
+        for name in COLLECTIONS:
+            data = source.load(name)
+            target.save(name, data)
+            if isinstance(data, list):
+                counts[name] = len(data)
+            else:
+                counts[name] = sum(len(v) for v in data.values() if isinstance(v, list))
+    finally:
+        target.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate the EventHub JSON data files to SQLite.")
+    parser.add_argument("--data-dir", default=".", help="directory containing the JSON data files")
+    parser.add_argument("--db", default=None, help="SQLite database to create (default: <data-dir>/eventhub.db)")
+    args = parser.parse_args()
+
+    counts = migrate(args.data_dir, args.db)
+    for name, count in counts.items():
+        print(f"{name}: {count} records")
+    print("Set EVENTHUB_STORAGE=sqlite to run the application on the database.")
+
+
+if __name__ == "__main__":
+    main()
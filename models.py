@@ -1,6 +1,8 @@
 import json
 import os
 
+from datastore import store
+
 # File paths
 USERS_FILE = "users.json"
 EVENTS_FILE = "events.json"
@@ -15,18 +17,12 @@ if not os.path.exists(EVENTS_FILE):
         json.dump([], f)
 
 def load_file(file_path):
-    """Load data from a JSON file."""
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"Error loading {file_path}: {e}")
-        return []
+    """Load data from a JSON file (served from the in-memory data store)."""
+    return store.load_file(file_path, [])
 
 def save_file(file_path, data):
     """Save data to a JSON file."""
-    with open(file_path, "w") as f:
-        json.dump(data, f, indent=4)
+    store.save_file(file_path, data)
 
 def load_users():
     """Load users from the JSON file."""
@@ -46,17 +42,8 @@ def save_events(events):
 
 def load_services():
     """Load services from services.json file."""
-    if os.path.exists("services.json"):
-        try:
-            with open("services.json", "r", encoding='utf-8') as f:
-                return json.load(f)  # Return the entire object with services key
-        except json.JSONDecodeError:
-            print("Error reading services.json. Returning empty structure.")
-            return {"services": []}
-    return {"services": []}
+    return store.load("services")  # Return the entire object with services key
 
 def save_services(services):
     """Save services to services.json file."""
-    data = {"services": services}  # Wrap services in the correct structure
-    with open("services.json", "w", encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
\ No newline at end of file
+    store.save_records("services", services)
\ No newline at end of file
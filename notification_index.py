@@ -0,0 +1,119 @@
+class NotificationIndex:
+    """Per-user indexes over the notifications list.
+
+    Keeps each user's visible (not deleted) notifications and their unread
+    ones, overall and by category, so badge counts are plain dictionary
+    reads. Buckets map id(notification) -> notification like
+    TicketIndex; notification_id is not guaranteed unique, so lookups by id
+    return the first notification indexed with it.
+    """
+
+    def __init__(self, notifications):
+        self.source = notifications
+        self.rebuild()
+
+    def rebuild(self):
+        """Index every notification of the source list from scratch."""
+        self._by_id = {}
+        self._visible = {}  # user_id -> bucket
+        self._unread = {}  # user_id -> bucket, in the order notifications were added
+        self._unread_by_category = {}  # user_id -> category -> bucket
+        self._keys = {}  # id(notification) -> keys it is indexed under
+        for notification in self.source:
+            self._add(notification)
+
+    def apply(self, inserted=(), updated=(), deleted=()):
+        """Bring the indexes up to date after notifications were added, changed or removed."""
+        for notification in deleted:
+            self._discard(notification)
+        for notification in updated:
+            if self._keys.get(id(notification)) != self._keys_of(notification):
+                self._discard(notification)
+                self._add(notification)
+        for notification in inserted:
+            self._add(notification)
+
+    # Lookups
+
+    def find(self, notification_id):
+        """Return the notification with the given id, or None."""
+        bucket = self._by_id.get(notification_id)
+        if not bucket:
+            return None
+        return next(iter(bucket.values()))
+
+    def visible(self, user_id, category=None):
+        """Return a user's notifications that have not been deleted."""
+        notifications = self._visible.get(user_id, {}).values()
+        if category is None:
+            return list(notifications)
+        return [n for n in notifications if n.get("category") == category]
+
+    def unread(self, user_id, category=None):
+        """Return a user's unread notifications, optionally of one category."""
+        if category is not None:
+            return list(self._unread_by_category.get(user_id, {}).get(category, {}).values())
+        return list(self._unread.get(user_id, {}).values())
+
+    def unread_count(self, user_id, category=None):
+        """Return how many unread notifications a user has (in a category)."""
+        if category is not None:
+            return len(self._unread_by_category.get(user_id, {}).get(category, {}))
+        return len(self._unread.get(user_id, {}))
+
+    def newest_unread(self, user_id):
+        """Return the user's most recently added unread notification, or None."""
+        bucket = self._unread.get(user_id)
+        if not bucket:
+            return None
+        return next(reversed(bucket.values()))
+
+    def category_counts(self, user_id):
+        """Return {category: unread count} for a user."""
+        return {category: len(bucket) for category, bucket in self._unread_by_category.get(user_id, {}).items()}
+
+    # Helpers
+
+    def _keys_of(self, notification):
+        deleted = notification.get("deleted", False)
+        unread = not notification.get("read", False) and not deleted
+        return (
+            notification.get("notification_id"),
+            notification.get("user_id"),
+            notification.get("category"),
+            not deleted,
+            unread,
+        )
+
+    def _add(self, notification):
+        keys = self._keys_of(notification)
+        notification_id, user_id, category, visible, unread = keys
+        self._keys[id(notification)] = keys
+        self._by_id.setdefault(notification_id, {})[id(notification)] = notification
+        if visible:
+            self._visible.setdefault(user_id, {})[id(notification)] = notification
+        if unread:
+            self._unread.setdefault(user_id, {})[id(notification)] = notification
+            self._unread_by_category.setdefault(user_id, {}).setdefault(category, {})[id(notification)] = notification
+
+    def _discard(self, notification):
+        keys = self._keys.pop(id(notification), None)
+        if keys is None:
+            return
+        notification_id, user_id, category, visible, unread = keys
+        self._pop(self._by_id, notification_id, notification)
+        if visible:
+            self._pop(self._visible, user_id, notification)
+        if unread:
+            self._pop(self._unread, user_id, notification)
+            categories = self._unread_by_category.get(user_id, {})
+            self._pop(categories, category, notification)
+            if not categories:
+                self._unread_by_category.pop(user_id, None)
+
+    def _pop(self, index, key, notification):
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(id(notification), None)
+            if not bucket:
+                del index[key]
@@ -0,0 +1,295 @@
+import copy
+import json
+import os
+import threading
+import uuid
+
+from app_logging import get_logger
+from data_lock import data_dir_lock
+from json_writer import dump_json, file_signature
+from metrics import metrics
+
+log = get_logger(__name__)
+
+LOG_NAME = "notifications.log.jsonl"
+
+# Fold the log into the snapshot once it grows past this many bytes
+COMPACT_BYTES = 256 * 1024
+
+# How much of the end of the log is read to find the last sequence number
+TAIL_BYTES = 64 * 1024
+
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+class NotificationLog:
+    """Notifications stored as a snapshot (notifications.json) plus an append-only JSONL log.
+
+    Each log line is one change: {"op": "create", "record": {...}},
+    {"op": "update", "id": ..., "record": {...}} (e.g. marking a notification
+    read) or {"op": "delete", "id": ...}, numbered with a sequence number.
+    The snapshot remembers the last sequence number folded into it, so
+    replaying a log that was already compacted is harmless.
+
+    Appending and compacting hold the lock of the data directory, so a
+    compaction in one process cannot drop lines another process is
+    appending. Sequence numbers continue from the last line of the log, and
+    a compacted log keeps a "base" line with the last number folded, so
+    lines of all processes are numbered in the order they were written.
+    """
+
+    def __init__(self, snapshot_path, writer, empty, log_path=None, compact_bytes=COMPACT_BYTES):
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path or os.path.join(os.path.dirname(snapshot_path), LOG_NAME)
+        self.writer = writer
+        self.empty = empty
+        self.compact_bytes = compact_bytes
+        self.origin = uuid.uuid4().hex  # marks the lines this process wrote
+        self.data = None  # the document last returned by load()
+        self.generation = 0  # bumped when data misses changes and must be reloaded
+        self._base = 0  # sequence number folded into the snapshot
+        self._seq = 0  # last sequence number seen or written
+        self._offset = 0  # bytes of the log already replayed into data
+        self._snapshot_signature = None
+        self._compacting = False
+        self._uncommitted = False  # data holds changes of an open transaction
+        self._lock = threading.RLock()
+        self._dir_lock = data_dir_lock(os.path.dirname(os.path.abspath(snapshot_path)))
+
+    def paths(self):
+        return (self.snapshot_path, self.log_path)
+
+    def load(self):
+        """Return the notifications document, replaying only the new tail of the log when possible."""
+        with self._lock:
+            if not self.writer.in_transaction():
+                self.writer.flush()
+            snapshot_signature = file_signature(self.snapshot_path)
+            unchanged = (snapshot_signature == self._snapshot_signature
+                         or snapshot_signature == self.writer.written.get(self.snapshot_path))
+            if self.data is not None and unchanged and file_size(self.log_path) >= self._offset:
+                # Only new lines from other processes; ours are already in data
+                self._replay(self.data, skip_own=True)
+                return self.data
+
+            data = self._read_snapshot()
+            self._base = data.pop("log_sequence", 0)
+            self._seq = max(self._seq, self._base)
+            self._offset = 0
+            self._snapshot_signature = snapshot_signature
+            self._replay(data, skip_own=False)
+            self.data = data
+            return data
+
+    def append(self, inserted=(), updated=(), deleted=()):
+        """Write one log line per changed notification."""
+        lines = []
+        with self._dir_lock, self._lock:
+            self._sync_sequence()
+            for record in deleted:
+                lines.append(self._line("delete", id=record.get("notification_id")))
+            for record in updated:
+                lines.append(self._line("update", id=record.get("notification_id"), record=record))
+            for record in inserted:
+                lines.append(self._line("create", record=record))
+            if lines:
+                self._uncommitted = self._uncommitted or self.writer.in_transaction()
+                self.writer.append(self.log_path, "".join(lines))
+        if file_size(self.log_path) > self.compact_bytes:
+            self.compact_in_background()
+
+    def save(self, data):
+        """Replace all notifications: write a new snapshot and empty the log."""
+        with self._lock:
+            self._uncommitted = self._uncommitted or self.writer.in_transaction()
+            self.data = data
+            self._write_snapshot(data)
+
+    def commit(self):
+        with self._lock:
+            self._uncommitted = False
+
+    def rollback(self):
+        """Forget the changes of a rolled back transaction: the next load re-reads the files."""
+        with self._lock:
+            if self._uncommitted:
+                self.data = None
+                self.generation += 1
+                self._uncommitted = False
+
+    @metrics.timed("storage.compact.notifications")
+    def compact(self):
+        """Fold the log into the snapshot.
+
+        Works from the files on disk rather than the in-memory document, which
+        the application may be changing at the same time.
+        """
+        with self._dir_lock, self._lock:
+            if self.writer.in_transaction():
+                return
+            self.writer.flush()
+            if file_size(self.log_path) == 0:
+                return
+
+            folded = self._read_snapshot()
+            base = folded.pop("log_sequence", 0)
+            with open(self.log_path, "rb") as f:
+                chunk = f.read()
+            metrics.add_bytes(os.path.basename(self.log_path), read=len(chunk))
+            end = chunk.rfind(b"\n") + 1
+            entries = list(self._entries(chunk[:end]))
+            seq = max([base] + [entry.get("seq", 0) for entry in entries])
+            self._apply_entries(folded.setdefault("notifications", []),
+                                (entry for entry in entries if entry.get("seq", 0) > base))
+            if end < self._offset or self._offset < end and self._has_foreign_lines(chunk[self._offset:end]):
+                # Lines we never replayed are now only in the snapshot: force a full reload
+                self.generation += 1
+                self.data = None
+
+            folded["log_sequence"] = seq
+            self._seq = max(self._seq, seq)
+            self.writer.write_text(self.snapshot_path, dump_json(folded))
+            self.writer.write_text(self.log_path, self._line("base", seq=seq) + chunk[end:].decode("utf-8", errors="replace"))
+            self._base = seq
+            self._offset = 0
+
+    def compact_in_background(self):
+        """Start a compaction on a worker thread unless one is already running."""
+        with self._lock:
+            if self._compacting:
+                return
+            self._compacting = True
+
+        def run():
+            try:
+                self.compact()
+            except Exception as e:
+                log.error("Error compacting notifications log: %s", e)
+            finally:
+                self._compacting = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    # Helpers
+
+    def _line(self, op, **fields):
+        if op != "base":
+            self._seq += 1
+        entry = {"seq": self._seq, "origin": self.origin, "op": op}
+        entry.update(fields)
+        return json.dumps(entry, ensure_ascii=False) + "\n"
+
+    def _sync_sequence(self):
+        """Continue after the last sequence number written to the log by any process."""
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - TAIL_BYTES))
+                chunk = f.read()
+        except FileNotFoundError:
+            return
+        # The first line may be cut off: take the last one that parses
+        for raw in reversed(chunk[:chunk.rfind(b"\n") + 1].splitlines()):
+            try:
+                self._seq = max(self._seq, json.loads(raw).get("seq", 0))
+                return
+            except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                continue
+
+    def _read_snapshot(self):
+        text = self.writer.pending_text(self.snapshot_path)
+        if text is not None:
+            return json.loads(text)
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                if metrics.enabled:
+                    metrics.add_bytes(os.path.basename(self.snapshot_path), read=f.tell())
+        except FileNotFoundError:
+            return copy.deepcopy(self.empty)
+        except json.JSONDecodeError as e:
+            log.error("Error loading %s: %s", self.snapshot_path, e)
+            return copy.deepcopy(self.empty)
+        if not isinstance(data, dict):
+            return copy.deepcopy(self.empty)
+        return data
+
+    def _write_snapshot(self, data):
+        snapshot = dict(data)
+        snapshot["log_sequence"] = self._seq
+        self.writer.write_text(self.snapshot_path, dump_json(snapshot))
+        self.writer.write_text(self.log_path, self._line("base", seq=self._seq))
+        self._base = self._seq
+        self._offset = 0
+
+    def _replay(self, data, skip_own):
+        """Apply the log lines after the current offset to data."""
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return
+        metrics.add_bytes(os.path.basename(self.log_path), read=len(chunk))
+        end = chunk.rfind(b"\n") + 1  # a partial last line is read next time
+        self._apply_entries(data.setdefault("notifications", []), self._new_entries(chunk[:end], skip_own))
+        self._offset += end
+
+    def _new_entries(self, chunk, skip_own):
+        """Yield the entries of chunk not yet in the document, noting the last sequence number."""
+        for entry in self._entries(chunk):
+            seq = entry.get("seq", 0)
+            self._seq = max(self._seq, seq)
+            if seq <= self._base or (skip_own and entry.get("origin") == self.origin):
+                continue
+            yield entry
+
+    def _entries(self, chunk):
+        for raw in chunk.splitlines():
+            if not raw.strip():
+                continue
+            try:
+                yield json.loads(raw)
+            except json.JSONDecodeError as e:
+                log.error("Error reading notifications log entry: %s", e)
+
+    def _has_foreign_lines(self, chunk):
+        return any(entry.get("origin") != self.origin for entry in self._entries(chunk))
+
+    def _apply_entries(self, notifications, entries):
+        """Apply log entries to the notifications list in place.
+
+        Updates and deletes find their notification through an id -> position
+        map built once, on the first of them; deleted positions are emptied
+        and squeezed out at the end, so the map stays valid.
+        """
+        positions = None
+        deleted = False
+        for entry in entries:
+            op = entry.get("op")
+            if op == "create":
+                if positions is not None:
+                    positions.setdefault(entry["record"].get("notification_id"), len(notifications))
+                notifications.append(entry["record"])
+                continue
+            if positions is None:
+                positions = {}
+                for i, n in enumerate(notifications):
+                    positions.setdefault(n.get("notification_id"), i)
+            if op == "update":
+                index = positions.get(entry.get("id"))
+                if index is not None:
+                    notifications[index].clear()
+                    notifications[index].update(entry["record"])
+            elif op == "delete":
+                index = positions.pop(entry.get("id"), None)
+                if index is not None:
+                    notifications[index] = None
+                    deleted = True
+        if deleted:
+            notifications[:] = [n for n in notifications if n is not None]
@@ -0,0 +1,85 @@
+import os
+
+from PyQt5.QtCore import QFileSystemWatcher, QObject, Qt, QTimer, pyqtSignal
+
+
+class NotificationWatcher(QObject):
+    """Tells the GUI when notifications change, instead of polling for them.
+
+    Changes made in this process arrive through the store's event bus;
+    changes made by other processes are noticed with a QFileSystemWatcher on
+    the data directory. Bursts of changes are coalesced into a single
+    `changed` signal delivered on the GUI thread.
+    """
+
+    changed = pyqtSignal()
+    _poke = pyqtSignal()
+
+    def __init__(self, store, topics=("notifications",), debounce_ms=250, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.topics = topics
+        self.enabled = False
+        self._dirty = False
+
+        # Bus callbacks may run on any thread: hop to ours before emitting
+        self._poke.connect(self._deliver, Qt.QueuedConnection)
+        for topic in topics:
+            store.bus.subscribe(topic, self._on_event)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._check_files)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_file_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watch_paths()
+
+    def start(self):
+        """Start delivering changes, beginning with one for the current state."""
+        self.enabled = True
+        self._on_event(None, None)
+
+    def stop(self):
+        self.enabled = False
+        self._debounce.stop()
+
+    def close(self):
+        self.stop()
+        for topic in self.topics:
+            self.store.bus.unsubscribe(topic, self._on_event)
+
+    def _on_event(self, topic, payload):
+        if self.enabled:
+            self._dirty = True
+            self._poke.emit()
+
+    def _deliver(self):
+        if self.enabled and self._dirty:
+            self._dirty = False
+            self.changed.emit()
+
+    def _on_file_changed(self, path):
+        if self.enabled:
+            self._debounce.start()
+
+    def _check_files(self):
+        # Atomic replaces swap the file, which drops it from the watcher
+        self._watch_paths()
+        for topic in self.topics:
+            self.store.refresh(topic)  # publishes if another process changed it
+
+    def _watch_paths(self):
+        backend = self.store.backend
+        paths = [os.path.abspath(self.store.data_dir)]
+        for topic in self.topics:
+            if hasattr(backend, "paths"):
+                paths.extend(backend.paths(topic))
+        if hasattr(backend, "db_path"):
+            paths.extend([backend.db_path, backend.db_path + "-wal"])
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        missing = [p for p in paths if os.path.exists(p) and p not in watched]
+        if missing:
+            self._watcher.addPaths(missing)
@@ -0,0 +1,42 @@
+import argparse
+import csv
+import json
+
+from services.scan_reconcile import reconcile_scans
+
+REPORT_COLUMNS = ["kind", "code", "event_id", "ticket_id", "quantity", "scans", "gates"]
+
+
+def write_report(path, conflicts):
+    """Write the conflicts as CSV (for a .csv path) or JSON."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+            writer.writeheader()
+            for conflict in conflicts:
+                writer.writerow({**conflict, "gates": " ".join(conflict["gates"])})
+        else:
+            json.dump(conflicts, f, ensure_ascii=False, indent=4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply the scan logs of several gates to tickets.json.")
+    parser.add_argument("files", nargs="+", help="scan exports (.csv or .jsonl)")
+    parser.add_argument("--event", type=int, help="only accept scans of this event")
+    parser.add_argument("--report", help="write the conflicts to this .csv or .json file")
+    args = parser.parse_args()
+
+    report = reconcile_scans(args.files, args.event)
+    print(f"{report['scans']} scans, {report['duplicates']} duplicates, {report['admissions']} admissions, "
+          f"{report['tickets_updated']} tickets updated")
+    kinds = {}
+    for conflict in report["conflicts"]:
+        kinds[conflict["kind"]] = kinds.get(conflict["kind"], 0) + 1
+    for kind, count in sorted(kinds.items()):
+        print(f"  {count} {kind.replace('_', ' ')}")
+    if args.report:
+        write_report(args.report, report["conflicts"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""EventHub operations that do not need a display.
+
+The dialogs call these functions; scripts, worker processes and benchmarks
+can call them directly. Each operation reads and writes through the shared
+datastore and commits the files it changes together in one transaction,
+holding the lock of the data directory (store.exclusive()) so reads and
+writes of other terminals cannot interleave. Invalid requests raise
+ValueError.
+
+The shared instances whose names match their module (ids, holds,
+waiting_room) are imported from that module, e.g.
+from services.ids import ids, so services.ids stays the module.
+"""
+
+from services.ids import IdAllocator
+from services.notifications import create_notification, mark_read, notify
+from services.purchase import SoldOutError, cart_total, check_availability, credit_to_use, purchase_tickets
+from services.holds import HoldRegistry
+from services.refund import can_cancel_tickets, refund_tickets
+from services.cancellation import cancel_event, is_cancelled
+from services.transfer import next_transfer_request_id, request_transfer, respond_to_transfer
+from services.ticket_tokens import InvalidTokenError, TicketTokens, event_expiry, tokens
+from services.review import can_leave_review, review_block_reason, submit_review
+from services.collaboration import respond_to_collaboration
+from services.vendors import filter_vendor_services, vendor_ratings
+from services.scan_reconcile import read_scans, reconcile_scans
+from services.checkin import CheckInGate, merge_scan_logs
+from services.waiting_room import NotAdmittedError, WaitingRoom
@@ -0,0 +1,136 @@
+from datetime import datetime
+
+from app_logging import get_logger
+from datastore import store
+from metrics import timed
+from services.holds import holds
+from services.notifications import create_notification
+from services.refund import REFUND_TYPES
+from services.scan_reconcile import admitted_quantity
+from services.ticket_tokens import tokens
+from services.waiting_room import waiting_room
+
+log = get_logger(__name__)
+
+# Report progress every this many tickets
+PROGRESS_STEP = 500
+
+
+def is_cancelled(event):
+    return event.get("status") == "cancelled"
+
+
+@timed("services.cancel_event")
+def cancel_event(event_id, refund_type="refund", reason="", now=None, progress=None):
+    """Cancel an event and give every ticket holder their money back.
+
+    All valid tickets of the event are cancelled and go back into the
+    event's inventory. Only guests not yet admitted are refunded: a ticket
+    that already admitted some of its guests is kept for those, as used.
+    With refund_type "credit" the value is added to each holder's credit;
+    with "refund" the money goes back through the organizer. Every holder
+    gets one notification. The event is marked cancelled, its cart holds
+    are released and its waiting room is closed, so no more tickets can be
+    reserved or bought for it. Used tickets are left alone.
+
+    The event's tickets are read in one pass over the ticket index, and
+    the tickets, event, users and notifications are saved in one
+    transaction under the data directory lock. progress(done, total), if
+    given, is called as tickets are processed (IoExecutor.submit with
+    report_progress=True passes one). The revoked QR tokens are committed
+    with the tickets.
+
+    Returns a dict with the "holders" and "tickets" refunded, the "amount"
+    and the "used" tickets that were left alone.
+    """
+    if refund_type not in REFUND_TYPES:
+        raise ValueError(f"Unknown refund type: {refund_type}")
+    now = now or datetime.now()
+
+    with store.exclusive():
+        event = store.find_event(event_id)
+        if event is None:
+            raise ValueError(f"Event {event_id} not found")
+        if is_cancelled(event):
+            raise ValueError(f"Event {event_id} is already cancelled")
+
+        event_tickets = store.ticket_index().by_event(event_id)
+        total = len(event_tickets)
+        cancelled = []
+        partial = []  # tickets that admitted some of their guests
+        refunded = {}  # ticket type -> quantity
+        holders = {}  # user id -> [tickets, amount]
+        used = 0
+        for done, ticket in enumerate(event_tickets, 1):
+            if ticket.get("status") == "used":
+                used += 1
+            elif ticket.get("status") == "valid":
+                admitted = admitted_quantity(ticket)
+                quantity = ticket.get("quantity_bought", 0) - admitted
+                if admitted:
+                    partial.append(ticket)
+                else:
+                    cancelled.append(ticket)
+                if quantity > 0:
+                    refunded[ticket["ticket_type"]] = refunded.get(ticket["ticket_type"], 0) + quantity
+                    holder = holders.setdefault(ticket["user_id"], [0, 0.0])
+                    holder[0] += quantity
+                    holder[1] += quantity * ticket.get("price", 0)
+            if progress is not None and done % PROGRESS_STEP == 0:
+                progress(done, total)
+
+        cancelled_ids = {id(t) for t in cancelled}
+        tickets = store.tickets()
+        tickets[:] = [t for t in tickets if id(t) not in cancelled_ids]
+        for ticket in partial:
+            # Keep the admitted guests only
+            ticket["quantity_bought"] = admitted_quantity(ticket)
+            ticket["status"] = "used"
+            ticket["used_date"] = now.strftime("%d/%m/%Y")
+        used += len(partial)
+        store.apply("tickets", updated=partial, deleted=cancelled)
+
+        for ticket_type in event.get("ticket_types", []):
+            ticket_type["total_quantity"] += refunded.get(ticket_type["type"], 0)
+        event["status"] = "cancelled"
+        event["cancelled_at"] = now.strftime("%d/%m/%Y %H:%M:%S")
+        store.update("events", event)
+        holds.release_event(event_id)
+        waiting_room.close(event_id)
+
+        if refund_type == "credit":
+            # One pass over the users rather than a lookup per holder
+            users = [u for u in store.users() if u["user_id"] in holders]
+            for user in users:
+                credit = float(user.get("credit", 0)) + holders[user["user_id"]][1]
+                user["credit"] = str(credit)  # Store as string
+            store.apply("users", updated=users)
+
+        notifications = [_notification(event, user_id, count, amount, refund_type, reason)
+                         for user_id, (count, amount) in holders.items()]
+        store.records("notifications").extend(notifications)
+        store.apply("notifications", inserted=notifications)
+        tokens.revoke(t.get("qr_code") for t in cancelled + partial)
+    if progress is not None:
+        progress(total, total)
+
+    amount = sum(amount for _, amount in holders.values())
+    log.info("Cancelled event %s: %d tickets of %d holders, %.2f %s", event_id,
+             len(cancelled), len(holders), amount, refund_type)
+    return {"holders": len(holders), "tickets": sum(refunded.values()), "amount": amount, "used": used}
+
+
+def _notification(event, user_id, count, amount, refund_type, reason):
+    if refund_type == "credit":
+        outcome = f"{amount:.2f}€ have been added to your credit for future purchases."
+    else:
+        outcome = f"{amount:.2f}€ will be refunded by the organizer."
+    message = f"The event '{event['title']}' has been cancelled. Your {count} ticket(s) were cancelled and {outcome}"
+    if reason:
+        message += f" Reason: {reason}"
+    return create_notification(user_id, "Event Cancelled", message, "Ticket Purchases", {
+        "type": "event_cancelled",
+        "event_id": event["event_id"],
+        "refund_type": refund_type,
+        "amount": amount,
+    })
@@ -0,0 +1,191 @@
+import glob
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from app_logging import get_logger
+from datastore import store
+from services.scan_reconcile import admitted_quantity, reconcile_scans
+from services.ticket_tokens import InvalidTokenError, PREFIX, tokens
+
+log = get_logger(__name__)
+
+SCANS_DIR = "scans"
+
+# A code scanned again this soon after admitting is a double read, not a new guest
+DUPLICATE_SECONDS = 2.0
+
+ADMITTED, PARTIAL, DUPLICATE, REJECTED = "admitted", "partial", "duplicate", "rejected"
+
+
+def scans_dir(directory=None):
+    return os.path.join(directory or store.backend.data_dir, SCANS_DIR)
+
+
+def ticket_key(ticket):
+    """Return the key scans of a ticket are counted under."""
+    return f"#{ticket['ticket_id']}"
+
+
+def read_scan_log(path):
+    """Yield the complete entries of a scan log (a line still being written is skipped)."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                log.warning("Skipping a damaged line of %s", path)
+
+
+class CheckInGate:
+    """Admits guests of one event at one gate from their QR codes.
+
+    The tickets of the event are indexed by QR code in memory when the gate
+    opens, so a scan is a dictionary lookup: signed tokens are verified
+    offline (services.ticket_tokens) and counted per ticket id, older codes
+    are looked up in the index. A ticket admits up to quantity_bought guests,
+    over one or several scans; a scan asking for more admits what is left.
+
+    Every scan is appended to scans/<gate>.jsonl under the data directory
+    and nothing else is written while the gate runs. merge_scan_logs()
+    brings the admissions into tickets.json. On opening, the gate counts
+    the admissions already in the logs of the data directory, so a
+    restarted gate keeps refusing tickets it let in.
+    """
+
+    def __init__(self, event_id, gate="gate", directory=None, sync=True, clock=time.time):
+        self.event_id = event_id
+        self.gate = gate
+        self.sync = sync
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._by_code = {}  # older QR code -> key
+        self._entries = {}  # key -> {"quantity", "admitted", "last_at", "ticket_type"}
+        self._logged = {}  # key -> [admissions in the scan logs, last admission]
+
+        for ticket in store.ticket_index().by_event(event_id):
+            if ticket.get("status") not in ("valid", "used"):
+                continue
+            key = ticket_key(ticket)
+            entry = self._entries.setdefault(key, {"quantity": 0, "admitted": 0, "last_at": None,
+                                                   "ticket_type": ticket.get("ticket_type")})
+            entry["quantity"] += ticket.get("quantity_bought", 0)
+            entry["admitted"] += admitted_quantity(ticket)
+            if not str(ticket.get("qr_code", "")).startswith(PREFIX + "."):
+                self._by_code[ticket.get("qr_code")] = key
+
+        self._replay(scans_dir(directory))
+        os.makedirs(scans_dir(directory), exist_ok=True)
+        self.log_path = os.path.join(scans_dir(directory), f"{gate}.jsonl")
+        self._log = open(self.log_path, "a", encoding="utf-8")
+
+    def close(self):
+        with self._lock:
+            self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def scan(self, code, count=1):
+        """Decide on a scan of code for count guests, log it and return the decision.
+
+        The decision is a dict with "result" (admitted, partial, duplicate or
+        rejected), how many guests were "admitted", how many the ticket has
+        "remaining", a "reason" for anything but a full admission, the
+        "ticket_type" and the decision time in "ms".
+        """
+        if count < 1:
+            raise ValueError("Invalid number of guests")
+        started = time.perf_counter()
+        code = code.strip()
+        with self._lock:
+            now = self.clock()
+            key, entry, reason = self._lookup(code)
+            if entry is None:
+                decision = {"result": REJECTED, "admitted": 0, "remaining": 0, "reason": reason}
+            else:
+                remaining = entry["quantity"] - entry["admitted"]
+                if remaining <= 0:
+                    decision = {"result": DUPLICATE, "admitted": 0, "remaining": 0,
+                                "reason": f"Already admitted at {self._time(entry['last_at'])}"}
+                elif entry["last_at"] is not None and now - entry["last_at"] < DUPLICATE_SECONDS:
+                    decision = {"result": DUPLICATE, "admitted": 0, "remaining": remaining,
+                                "reason": "Scanned twice; scan again to admit another guest"}
+                else:
+                    admitted = min(count, remaining)
+                    entry["admitted"] += admitted
+                    entry["last_at"] = now
+                    decision = {"result": ADMITTED if admitted == count else PARTIAL, "admitted": admitted,
+                                "remaining": remaining - admitted,
+                                "reason": None if admitted == count else f"Only {admitted} of {count} left on the ticket"}
+                decision["ticket_type"] = entry["ticket_type"]
+            self._append({"at": now, "gate": self.gate, "event_id": self.event_id, "code": code, "key": key,
+                          "count": count, "result": decision["result"], "admitted": decision["admitted"]})
+        decision["ms"] = (time.perf_counter() - started) * 1000.0
+        return decision
+
+    # Helpers
+
+    def _lookup(self, code):
+        """Return (key, entry, reason) of a code; entry is None if it does not admit."""
+        if code.startswith(PREFIX + "."):
+            try:
+                fields = tokens.verify(code, self.event_id)
+            except InvalidTokenError as e:
+                return None, None, str(e)
+            key = ticket_key(fields)
+            entry = self._entries.get(key)
+            if entry is None:
+                # Bought after the gate opened: the token carries what is needed
+                admitted, last_at = self._logged.get(key, (0, None))
+                entry = self._entries[key] = {"quantity": fields["quantity"], "admitted": admitted,
+                                              "last_at": last_at, "ticket_type": fields["ticket_type"]}
+            else:
+                # The token may be newer than the gate's copy of the ticket
+                entry["quantity"] = fields["quantity"]
+            return key, entry, None
+        key = self._by_code.get(code)
+        if key is None:
+            return None, None, "Unknown ticket for this event"
+        return key, self._entries[key], None
+
+    def _replay(self, directory):
+        """Count the admissions already logged by the gates of this data directory."""
+        for path in glob.glob(os.path.join(directory, "*.jsonl")):
+            for scan in read_scan_log(path):
+                if scan.get("event_id") != self.event_id or not scan.get("admitted"):
+                    continue
+                logged = self._logged.setdefault(scan["key"], [0, 0])
+                logged[0] += scan["admitted"]
+                logged[1] = max(logged[1], scan["at"])
+        for key, entry in self._entries.items():
+            if key in self._logged:
+                # tickets.json may already hold the merged admissions
+                entry["admitted"] = max(entry["admitted"], self._logged[key][0])
+                entry["last_at"] = self._logged[key][1]
+
+    def _append(self, scan):
+        self._log.write(json.dumps(scan, ensure_ascii=False) + "\n")
+        self._log.flush()
+        if self.sync:
+            os.fsync(self._log.fileno())
+
+    def _time(self, at):
+        return datetime.fromtimestamp(at).strftime("%H:%M:%S") if at else "an earlier scan"
+
+
+def merge_scan_logs(event_id=None, directory=None):
+    """Write the admissions of the gates' scan logs into tickets.json.
+
+    See reconcile_scans(): merging again, or while gates keep scanning,
+    never counts an admission twice. Returns how many tickets changed.
+    """
+    paths = sorted(glob.glob(os.path.join(scans_dir(directory), "*.jsonl")))
+    return reconcile_scans(paths, event_id)["tickets_updated"]
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from datastore import store
+from services.notifications import notify
+
+RESPONSES = ("accepted", "rejected")
+
+
+def respond_to_collaboration(notification, response, vendor):
+    """Record a vendor's response to a collaboration request.
+
+    notification is the vendor's collaboration request notification and
+    response is "accepted" or "rejected". An accepted request assigns the
+    service to the event. The organizer is notified and the request
+    notification is marked deleted, all in one commit. Returns the request.
+    """
+    if response not in RESPONSES:
+        raise ValueError(f"Unknown response: {response}")
+    collab_data = notification.get("collaboration_request", {})
+    request_id = collab_data.get("request_id")
+    if not request_id:
+        raise ValueError("Collaboration request details not found")
+
+    organizer_info = collab_data.get("organizer_info", {})
+    event_info = collab_data.get("event_info", {})
+    service_info = collab_data.get("service_info", {})
+    vendor_name = f"{vendor['name']} {vendor['surname']}"
+
+    with store.exclusive():
+        requests = store.collaboration_requests()
+        request = next((r for r in requests if r["request_id"] == request_id), None)
+        if request is None:
+            raise ValueError("Collaboration request not found")
+
+        response_date = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        request["status"] = response
+        request["response_date"] = response_date
+        store.update("collaboration_requests", request)
+
+        if response == "accepted":
+            service = next((s for s in store.services()
+                            if s["service_id"] == service_info.get("id")), None)
+            if service:
+                service["event_id"] = event_info.get("id")
+                service["status"] = "assigned"
+                service["assigned_date"] = response_date
+                store.update("services", service)
+            title = "Αίτημα Συνεργασίας Εγκρίθηκε! ✅"
+            verb = "αποδέχτηκε"
+        else:
+            title = "Αίτημα Συνεργασίας Απορρίφθηκε ❌"
+            verb = "απέρριψε"
+
+        notify(
+            organizer_info.get("id"),
+            title,
+            f"Ο vendor {vendor_name} {verb} το αίτημα συνεργασίας για την υπηρεσία '{service_info.get('name', '')}' στην εκδήλωση '{event_info.get('title', '')}'.",
+            category="Collaboration Requests",
+            additional_data={
+                "collaboration_response": {
+                    "status": response,
+                    "vendor_name": vendor_name,
+                    "service_name": service_info.get("name", ""),
+                    "event_title": event_info.get("title", ""),
+                    "response_date": response_date
+                }
+            }
+        )
+
+        # The request notification has been dealt with
+        for notif in store.notifications():
+            if notif.get("notification_id") == notification.get("notification_id"):
+                notif["deleted"] = True
+                store.update("notifications", notif)
+                break
+    return request
@@ -0,0 +1,316 @@
+import contextlib
+import heapq
+import json
+import os
+import threading
+import time
+import uuid
+
+from app_logging import get_logger
+from data_lock import data_dir_lock
+from datastore import store
+from json_writer import append_text, atomic_write_text, file_signature
+from services.purchase import SoldOutError
+
+log = get_logger(__name__)
+
+HOLDS_FILE = "ticket_holds.jsonl"
+
+# How long tickets stay reserved in a cart
+HOLD_SECONDS = 10 * 60
+
+# Rewrite the log with only the active holds once it grows past this many
+# bytes and twice its size after the last rewrite
+COMPACT_BYTES = 64 * 1024
+
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+class HoldRegistry:
+    """Tickets reserved in carts, shared by every terminal using the data directory.
+
+    A hold keeps quantity tickets of one ticket type of an event off sale
+    until it expires. The tickets held are counted per (event, ticket type)
+    and per (session, event, ticket type), so availability, with or without
+    a cart's own holds, is the event's remaining quantity minus a counter or
+    two, and expiries sit in a min-heap, so sweeping only looks at holds
+    that are due.
+
+    Every change is one line appended to ticket_holds.jsonl under the data
+    directory lock; a process replays only the lines added since it last
+    looked. Expiries are not written, each process drops expired holds by
+    the clock. Once the log grows past COMPACT_BYTES, and has doubled since
+    it was last rewritten, it is rewritten with just the active holds under
+    a new header, which tells the other processes to read it from the start.
+    """
+
+    def __init__(self, path=None, hold_seconds=HOLD_SECONDS, clock=time.time):
+        self._path = path
+        self.hold_seconds = hold_seconds
+        self.clock = clock
+        self._holds = {}  # hold id -> hold record
+        self._held = {}  # (event id, ticket type) -> tickets held
+        self._by_session = {}  # (session, event id, ticket type) -> tickets held
+        self._sessions = {}  # session -> ids of its holds
+        self._heap = []  # (expires at, hold id), possibly stale after a change
+        self._loaded = None  # (path, log id) the holds were read from
+        self._offset = 0  # bytes of the log already replayed
+        self._signature = None  # of the log when last replayed
+        self._compacted = 0  # size of the log after the last rewrite
+        self._expired = 0  # holds dropped by the clock since the last sweep()
+        self._lock = threading.RLock()
+
+    @property
+    def path(self):
+        return self._path or os.path.join(store.backend.data_dir, HOLDS_FILE)
+
+    # Queries
+
+    def held(self, event_id, ticket_type, exclude_session=None):
+        """Return how many tickets of a type are held, optionally leaving out one session's holds."""
+        with self._lock:
+            self._sync()
+            count = self._held.get((event_id, ticket_type), 0)
+            if exclude_session is not None:
+                count -= self._by_session.get((exclude_session, event_id, ticket_type), 0)
+            return count
+
+    def availability(self, event, exclude_session=None):
+        """Return {ticket type: tickets that can still be put in a cart} for an event."""
+        return {
+            t["type"]: max(0, t.get("total_quantity", 0) - self.held(event["event_id"], t["type"], exclude_session))
+            for t in event.get("ticket_types", [])
+        }
+
+    def get(self, hold_id):
+        """Return an active hold, or None if it expired or was released."""
+        with self._lock:
+            self._sync()
+            hold = self._holds.get(hold_id)
+            return dict(hold) if hold is not None else None
+
+    def session_holds(self, session, event_id=None):
+        with self._lock:
+            self._sync()
+            holds = (self._holds[hold_id] for hold_id in self._sessions.get(session, ()))
+            return [dict(h) for h in holds if event_id is None or h["event_id"] == event_id]
+
+    # Changes
+
+    def place(self, session, event_id, ticket_type, quantity):
+        """Hold quantity tickets of a type for a cart session; raises SoldOutError if too few are left."""
+        if quantity <= 0:
+            raise ValueError("Invalid quantity")
+        with self._exclusive():
+            available = self._available(event_id, ticket_type)
+            if quantity > available:
+                raise SoldOutError(ticket_type, quantity, available)
+            hold = {
+                "hold_id": uuid.uuid4().hex,
+                "session": session,
+                "event_id": event_id,
+                "ticket_type": ticket_type,
+                "quantity": quantity,
+                "expires_at": self.clock() + self.hold_seconds,
+            }
+            self._add(hold)
+            self._append([{"op": "place", "hold": hold}])
+            return dict(hold)
+
+    def change(self, hold_id, quantity):
+        """Set the quantity of a hold (0 releases it); raises SoldOutError if an increase is not available."""
+        with self._exclusive():
+            hold = self._holds.get(hold_id)
+            if hold is None:
+                raise ValueError("The reservation has expired")
+            if quantity <= 0:
+                self._remove(hold_id)
+                self._append([{"op": "release", "hold_id": hold_id}])
+                return
+            extra = quantity - hold["quantity"]
+            available = self._available(hold["event_id"], hold["ticket_type"])
+            if extra > available:
+                raise SoldOutError(hold["ticket_type"], extra, available)
+            self._resize(hold, quantity)
+            self._append([{"op": "change", "hold_id": hold_id, "quantity": quantity}])
+
+    def release(self, hold_id):
+        with self._exclusive():
+            if self._remove(hold_id) is not None:
+                self._append([{"op": "release", "hold_id": hold_id}])
+
+    def release_session(self, session, event_id=None):
+        """Release every hold of a cart session (of one event, or all)."""
+        with self._exclusive():
+            released = [hold_id for hold_id in self._sessions.get(session, ())
+                        if event_id is None or self._holds[hold_id]["event_id"] == event_id]
+            return self._release_all(released)
+
+    def release_event(self, event_id):
+        """Release every hold of an event, e.g. when it is cancelled; returns how many there were."""
+        with self._exclusive():
+            return self._release_all([h["hold_id"] for h in self._holds.values() if h["event_id"] == event_id])
+
+    def sweep(self):
+        """Drop the expired holds; returns how many expired since the last sweep."""
+        with self._lock:
+            self._sync()
+            expired, self._expired = self._expired, 0
+            return expired
+
+    # Helpers
+
+    @contextlib.contextmanager
+    def _exclusive(self):
+        """Hold the data directory lock and the registry lock, with the holds up to date."""
+        lock = data_dir_lock(os.path.dirname(os.path.abspath(self.path)))
+        lock.acquire()
+        try:
+            with self._lock:
+                self._sync()
+                yield
+        finally:
+            lock.release()
+
+    def _available(self, event_id, ticket_type):
+        event = store.find_event(event_id)
+        if event is None:
+            raise ValueError(f"Event {event_id} not found")
+        if event.get("status") == "cancelled":
+            raise ValueError(f"Event {event_id} has been cancelled")
+        remaining = next((t.get("total_quantity", 0) for t in event.get("ticket_types", [])
+                          if t["type"] == ticket_type), None)
+        if remaining is None:
+            raise ValueError(f"Event {event_id} has no '{ticket_type}' tickets")
+        return max(0, remaining - self._held.get((event_id, ticket_type), 0))
+
+    def _release_all(self, hold_ids):
+        for hold_id in hold_ids:
+            self._remove(hold_id)
+        if hold_ids:
+            self._append([{"op": "release", "hold_id": hold_id} for hold_id in hold_ids])
+        return len(hold_ids)
+
+    def _count(self, hold, quantity):
+        """Add quantity (negative to take away) to the counters a hold is part of."""
+        for counts, key in ((self._held, (hold["event_id"], hold["ticket_type"])),
+                            (self._by_session, (hold["session"], hold["event_id"], hold["ticket_type"]))):
+            counts[key] = counts.get(key, 0) + quantity
+            if counts[key] <= 0:
+                del counts[key]
+
+    def _add(self, hold):
+        self._holds[hold["hold_id"]] = hold
+        self._sessions.setdefault(hold["session"], set()).add(hold["hold_id"])
+        self._count(hold, hold["quantity"])
+        heapq.heappush(self._heap, (hold["expires_at"], hold["hold_id"]))
+
+    def _resize(self, hold, quantity):
+        self._count(hold, quantity - hold["quantity"])
+        hold["quantity"] = quantity
+
+    def _remove(self, hold_id):
+        hold = self._holds.pop(hold_id, None)
+        if hold is not None:
+            self._count(hold, -hold["quantity"])
+            session_holds = self._sessions[hold["session"]]
+            session_holds.discard(hold_id)
+            if not session_holds:
+                del self._sessions[hold["session"]]
+        return hold  # its heap entry is skipped when it comes up
+
+    def _sweep(self):
+        now = self.clock()
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, hold_id = heapq.heappop(self._heap)
+            hold = self._holds.get(hold_id)
+            if hold is not None and hold["expires_at"] == expires_at:
+                self._remove(hold_id)
+                self._expired += 1
+
+    def _reset(self, loaded):
+        self._holds, self._held, self._by_session, self._sessions, self._heap = {}, {}, {}, {}, []
+        self._loaded = loaded
+        self._offset = 0
+        self._signature = None
+
+    def _sync(self):
+        """Replay the lines other processes appended to the log, then drop expired holds."""
+        path = self.path
+        if self._loaded is None or self._loaded[0] != path:
+            self._reset((path, None))
+        signature = file_signature(path)
+        if signature != self._signature:
+            self._replay(path)
+            self._signature = signature
+        self._sweep()
+
+    def _replay(self, path):
+        try:
+            with open(path, "rb") as f:
+                header = f.readline()
+                log_id = self._log_id(header)
+                if log_id != self._loaded[1]:
+                    # Compacted (or first read): start over
+                    self._reset((path, log_id))
+                    self._offset = len(header)
+                f.seek(self._offset)
+                chunk = f.read()
+                if self._offset == len(header):
+                    self._compacted = len(header) + len(chunk)
+        except FileNotFoundError:
+            self._reset((path, None))
+            return
+        end = chunk.rfind(b"\n") + 1  # a partial last line is read next time
+        for raw in chunk[:end].splitlines():
+            try:
+                self._apply(json.loads(raw))
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                log.error("Error reading a line of %s: %s", path, e)
+        self._offset += end
+
+    def _log_id(self, header):
+        try:
+            entry = json.loads(header)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+        return entry.get("log") if isinstance(entry, dict) else None
+
+    def _apply(self, entry):
+        op = entry["op"]
+        if op == "place":
+            if entry["hold"]["hold_id"] not in self._holds:
+                self._add(dict(entry["hold"]))
+        elif op == "change":
+            hold = self._holds.get(entry["hold_id"])
+            if hold is not None:
+                self._resize(hold, entry["quantity"])
+        elif op == "release":
+            self._remove(entry["hold_id"])
+
+    def _append(self, entries):
+        """Append changes to the log (the caller holds the lock and is in sync with the file)."""
+        path = self.path
+        if self._loaded[1] is None or self._offset > max(COMPACT_BYTES, 2 * self._compacted):
+            self._compact(path)
+        else:
+            append_text(path, "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries))
+            self._offset = file_size(path)
+        self._signature = file_signature(path)
+
+    def _compact(self, path):
+        """Rewrite the log as a new header and the active holds."""
+        log_id = uuid.uuid4().hex
+        lines = [json.dumps({"log": log_id})]
+        lines.extend(json.dumps({"op": "place", "hold": h}, ensure_ascii=False) for h in self._holds.values())
+        atomic_write_text(path, "\n".join(lines) + "\n")
+        self._loaded = (path, log_id)
+        self._offset = self._compacted = file_size(path)
+
+
+holds = HoldRegistry()
@@ -0,0 +1,138 @@
+import json
+import os
+import re
+import threading
+
+from app_logging import get_logger
+from data_lock import data_dir_lock
+from datastore import store
+from json_writer import atomic_write_json
+
+log = get_logger(__name__)
+
+SEQUENCES_FILE = "id_sequences.json"
+
+# How many IDs a process reserves at a time
+BLOCK_SIZE = 50
+
+# Sequence -> (collection, list key or None, ID field), used once to seed a
+# sequence from the records saved before it existed (None: starts at 1)
+SEQUENCES = {
+    "tickets": ("tickets", None, "ticket_id"),
+    "events": ("events", None, "event_id"),
+    "services": ("services", "services", "service_id"),
+    "notifications": ("notifications", "notifications", "notification_id"),
+    "collaboration_requests": ("collaboration_requests", "requests", "request_id"),
+    "transfer_requests": ("transfer_requests", "transfer_requests", "request_id"),
+    "event_reviews": ("reviews", "event_reviews", "id"),
+    "vendor_reviews": ("reviews", "vendor_reviews", "id"),
+    "ticket_tokens": None,
+}
+
+_DIGITS = re.compile(r"(\d+)$")
+
+
+class IdAllocator:
+    """Monotonic record IDs shared by every process using the data directory.
+
+    id_sequences.json keeps, per sequence, the last ID handed out to any
+    process. A process reserves a block of BLOCK_SIZE IDs at a time under
+    the data directory lock and then hands them out from memory, so minting
+    an ID neither scans the records nor touches the file until the block
+    runs out. Two processes never get the same ID; IDs left in a block when
+    a process exits are skipped, so sequences can have gaps.
+
+    A sequence missing from the file starts after the largest ID already in
+    its collection (the trailing digits of string IDs such as "notif_17").
+    """
+
+    def __init__(self, path=None, block_size=BLOCK_SIZE):
+        self._path = path
+        self.block_size = block_size
+        self._blocks = {}  # (sequences file, sequence) -> [next id, last id reserved]
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        return self._path or os.path.join(store.backend.data_dir, SEQUENCES_FILE)
+
+    def next_id(self, sequence):
+        """Return the next ID of a sequence."""
+        return self.next_ids(sequence, 1)[0]
+
+    def next_ids(self, sequence, count):
+        """Return count new IDs of a sequence, in increasing order."""
+        if sequence not in SEQUENCES:
+            raise ValueError(f"Unknown ID sequence '{sequence}'")
+        if count <= 0:
+            return []
+        path = self.path
+        with self._lock:
+            ids = self._take(path, sequence, count)
+        if ids is not None:
+            return ids
+        # The data directory lock is taken before our own, as store.exclusive() callers hold it already
+        with data_dir_lock(os.path.dirname(os.path.abspath(path))), self._lock:
+            ids = self._take(path, sequence, count)
+            if ids is None:
+                # Reserve enough for the request, and a block beyond it
+                first, last = self._reserve(path, sequence, count + self.block_size - 1)
+                block = self._blocks.get((path, sequence))
+                if block is not None and block[1] + 1 == first:
+                    first = block[0]  # the file was not advanced by anyone else
+                self._blocks[(path, sequence)] = [first, last]
+                ids = self._take(path, sequence, count)
+            return ids
+
+    def _take(self, path, sequence, count):
+        """Hand out count IDs from the reserved block, or return None if it has too few."""
+        block = self._blocks.get((path, sequence))
+        if block is None or block[1] - block[0] + 1 < count:
+            return None
+        ids = list(range(block[0], block[0] + count))
+        block[0] += count
+        return ids
+
+    def _reserve(self, path, sequence, size):
+        """Advance a sequence in the file by size; returns the (first, last) IDs reserved.
+
+        The caller holds the data directory lock.
+        """
+        sequences = self._read(path)
+        start = sequences.get(sequence)
+        if start is None:
+            start = self._seed(sequence)
+        sequences[sequence] = start + size
+        atomic_write_json(path, {"sequences": sequences})
+        return start + 1, start + size
+
+    def _read(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f).get("sequences", {})
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, AttributeError) as e:
+            log.error("Error loading %s: %s", path, e)
+            return {}
+
+    def _seed(self, sequence):
+        """Return the largest ID saved in a sequence's collection (0 if none)."""
+        if SEQUENCES[sequence] is None:
+            return 0
+        name, key, field = SEQUENCES[sequence]
+        data = store.load(name)
+        records = data.get(key, []) if key is not None else data
+        largest = 0
+        for record in records:
+            value = record.get(field)
+            if isinstance(value, str):
+                match = _DIGITS.search(value)
+                value = int(match.group(1)) if match else None
+            if isinstance(value, int) and value > largest:
+                largest = value
+        log.debug("Seeded ID sequence %s at %d", sequence, largest)
+        return largest
+
+
+ids = IdAllocator()
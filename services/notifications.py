@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from datastore import store
+from services.ids import ids
+
+
+def create_notification(user_id, title, message, category=None, additional_data=None):
+    """Return a new unread notification for a user."""
+    notification = {
+        "notification_id": f"notif_{ids.next_id('notifications')}",
+        "user_id": user_id,
+        "title": title,
+        "message": message,
+        "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+        "read": False,
+        "category": category
+    }
+
+    # Add additional data if provided
+    if additional_data:
+        notification.update(additional_data)
+    return notification
+
+
+def mark_read(notification_id):
+    """Mark a notification read and save it; returns the notification, or None if it is gone."""
+    notification = store.notification_index().find(notification_id)
+    if notification is not None and not notification.get("read", False):
+        notification["read"] = True
+        store.update("notifications", notification)
+    return notification
+
+
+def notify(user_id, title, message, category=None, additional_data=None):
+    """Create a notification for a user and save it."""
+    notification = create_notification(user_id, title, message, category, additional_data)
+    store.append("notifications", notification)
+    return notification
@@ -0,0 +1,170 @@
+import time
+from datetime import datetime
+
+from app_logging import get_logger
+from datastore import store
+from metrics import timed
+from services.ids import ids
+from services.ticket_tokens import event_expiry, tokens
+
+log = get_logger(__name__)
+
+
+class SoldOutError(ValueError):
+    """Raised when an event has fewer tickets of a type left than the cart asks for."""
+
+    def __init__(self, ticket_type, requested, available):
+        super().__init__(f"Only {available} '{ticket_type}' tickets are left ({requested} requested)")
+        self.ticket_type = ticket_type
+        self.requested = requested
+        self.available = available
+
+
+def cart_total(items):
+    """Return the price of cart items ({"type", "quantity", "price"})."""
+    return sum(item["price"] * item["quantity"] for item in items)
+
+
+def credit_to_use(credit, total_price):
+    """Return how much of a user's credit goes towards a purchase."""
+    return max(0.0, min(float(credit or 0), total_price))
+
+
+@timed("services.purchase_tickets")
+def purchase_tickets(user_id, event_id, items, use_credit=False, now=None, session=None, admission=None):
+    """Buy the cart items of an event for a user.
+
+    Runs as one transaction under the data directory lock, so terminals
+    sharing the data files are served one at a time: availability is checked
+    against the event as it is on disk, then the tickets are written, the
+    credit debited and the availability reduced, all in one commit. Raises
+    SoldOutError (and changes nothing) if a ticket type has too few tickets
+    left. Tickets held in other carts do not count as left; the holds of
+    the buyer's cart session are released once the purchase is committed.
+    If the event has an open waiting room, admission must be a token the
+    room has admitted (NotAdmittedError otherwise).
+
+    Valid tickets the user already holds of a type are topped up, the others
+    are created. With use_credit, the user's credit pays for as much of the
+    purchase as it covers.
+
+    Returns a dict with the changed "tickets", the "total_price" left to pay,
+    the "credit_used", the user's "credit" afterwards, and "latency_ms" and
+    "lock_wait_ms" of the purchase.
+    """
+    if not items:
+        raise ValueError("The cart is empty")
+    now = now or datetime.now()
+    total_price = cart_total(items)
+    started = time.perf_counter()
+    # services.holds and services.waiting_room import this module
+    from services.holds import holds
+    from services.waiting_room import waiting_room
+
+    with store.exclusive():
+        locked = time.perf_counter()
+        # Every check runs before the first write: a rejected checkout saves
+        # nothing, so its rollback leaves the store's cache untouched
+        waiting_room.check(event_id, admission)
+        event = store.find_event(event_id)
+        if event is None:
+            raise ValueError(f"Event {event_id} not found")
+        if event.get("status") == "cancelled":
+            raise ValueError(f"Event {event_id} has been cancelled")
+        held = {t["type"]: holds.held(event_id, t["type"], exclude_session=session) for t in event.get("ticket_types", [])}
+        check_availability(event, items, held)
+
+        user = store.find_user(user_id)
+        credit = float(user.get("credit", 0)) if user else 0.0
+        credit_used = 0.0
+        if use_credit and credit > 0:
+            credit_used = credit_to_use(credit, total_price)
+            credit -= credit_used
+            if user is not None:
+                user["credit"] = str(credit)  # Store as string
+                store.update("users", user)
+
+        tickets, replaced = _add_tickets(user_id, event, items, now)
+        _take_availability(event, items)
+        tokens.revoke(replaced)
+    if session is not None:
+        holds.release_session(session, event_id)
+
+    latency_ms = (time.perf_counter() - started) * 1000.0
+    lock_wait_ms = (locked - started) * 1000.0
+    log.info("Purchase of %s tickets for event %s by user %s took %.1f ms (%.1f ms waiting for the lock)",
+             sum(item["quantity"] for item in items), event_id, user_id, latency_ms, lock_wait_ms)
+    return {
+        "tickets": tickets,
+        "total_price": total_price - credit_used,
+        "credit_used": credit_used,
+        "credit": credit,
+        "latency_ms": latency_ms,
+        "lock_wait_ms": lock_wait_ms,
+    }
+
+
+def check_availability(event, items, held=None):
+    """Raise SoldOutError unless the event has enough tickets left for every cart item.
+
+    held maps ticket types to tickets reserved by other carts.
+    """
+    requested = {}
+    for item in items:
+        requested[item["type"]] = requested.get(item["type"], 0) + item["quantity"]
+    held = held or {}
+    available = {t["type"]: max(0, t.get("total_quantity", 0) - held.get(t["type"], 0))
+                 for t in event.get("ticket_types", [])}
+    for ticket_type, quantity in requested.items():
+        if ticket_type not in available:
+            raise ValueError(f"Event {event.get('event_id')} has no '{ticket_type}' tickets")
+        if quantity > available[ticket_type]:
+            raise SoldOutError(ticket_type, quantity, available[ticket_type])
+
+
+def _add_tickets(user_id, event, items, now):
+    """Add the items to the user's tickets; returns (changed tickets, tokens they no longer carry)."""
+    tickets = store.tickets()
+    index = store.ticket_index()
+    event_id = event["event_id"]
+    expires = event_expiry(event)
+
+    inserted = []
+    updated = []
+    replaced = []
+
+    for item in items:
+        # Check if user already has tickets of this type for this event
+        existing_ticket = index.find(user_id, event_id, item["type"], "valid")
+
+        if existing_ticket:
+            existing_ticket["quantity_bought"] += item["quantity"]
+            replaced.append(tokens.reissue(existing_ticket, expires))
+            updated.append(existing_ticket)
+        else:
+            new_ticket = {
+                "ticket_id": ids.next_id("tickets"),
+                "event_id": event_id,
+                "user_id": user_id,
+                "ticket_type": item["type"],
+                "quantity_bought": item["quantity"],
+                "price": item["price"],
+                "purchase_date": now.strftime("%d/%m/%Y %H:%M:%S"),
+                "status": "valid"
+            }
+            new_ticket["qr_code"] = tokens.issue(new_ticket, expires)
+            tickets.append(new_ticket)
+            inserted.append(new_ticket)
+
+    # Save only the tickets that changed
+    store.apply("tickets", inserted=inserted, updated=updated)
+    return inserted + updated, replaced
+
+
+def _take_availability(event, items):
+    for item in items:
+        for ticket_type in event.get("ticket_types", []):
+            if ticket_type["type"] == item["type"]:
+                # check_availability made sure this stays at or above 0
+                ticket_type["total_quantity"] -= item["quantity"]
+    store.update("events", event)
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from datastore import store
+from metrics import timed
+from services.ticket_tokens import event_expiry, tokens
+
+REFUND_TYPES = ("refund", "credit")
+
+
+def can_cancel_tickets(event, now=None):
+    """Return whether tickets of an event can still be cancelled.
+
+    Raises ValueError if the event's cancellation deadline cannot be read.
+    """
+    cancel_date_str = event.get("ticket_cancel_availability")
+    if not cancel_date_str:
+        return True
+    cancel_date = datetime.strptime(cancel_date_str, "%d/%m/%Y %H:%M")
+    return (now or datetime.now()) <= cancel_date
+
+
+@timed("services.refund_tickets")
+def refund_tickets(user_id, event_id, quantities, refund_type="refund"):
+    """Cancel some of a user's valid tickets of an event.
+
+    quantities maps ticket types to how many tickets to cancel. Cancelled
+    tickets go back on sale. With refund_type "credit" their value is added
+    to the user's credit; with "refund" the money goes back through the
+    organizer. Tickets, availability and credit are committed together.
+
+    Returns a dict with the "refunded" quantity per type, the "amount" and
+    the user's "credit" afterwards (None for a "refund").
+    """
+    if refund_type not in REFUND_TYPES:
+        raise ValueError(f"Unknown refund type: {refund_type}")
+    remaining = {ticket_type: quantity for ticket_type, quantity in quantities.items() if quantity > 0}
+    if not remaining:
+        raise ValueError("No tickets selected")
+
+    with store.exclusive():
+        tickets = store.tickets()
+        removed = []
+        updated = []
+        refunded = {}
+        amount = 0
+        event = store.find_event(event_id)
+        expires = event_expiry(event) if event is not None else 0
+        replaced = []  # tokens the cancelled tickets no longer carry
+
+        for ticket in list(store.ticket_index().by_user_event(user_id, event_id)):
+            ticket_type = ticket["ticket_type"]
+            quantity = min(remaining.get(ticket_type, 0), ticket["quantity_bought"])
+            if ticket["status"] != "valid" or quantity <= 0:
+                continue
+            if quantity == ticket["quantity_bought"]:
+                # Remove the entire ticket
+                removed.append(ticket)
+                replaced.append(ticket.get("qr_code"))
+            else:
+                ticket["quantity_bought"] -= quantity
+                replaced.append(tokens.reissue(ticket, expires))
+                updated.append(ticket)
+            remaining[ticket_type] -= quantity
+            refunded[ticket_type] = refunded.get(ticket_type, 0) + quantity
+            amount += quantity * ticket.get("price", 0)
+
+        if not refunded:
+            raise ValueError("No valid tickets to cancel")
+
+        removed_ids = {id(t) for t in removed}
+        tickets[:] = [t for t in tickets if id(t) not in removed_ids]
+        store.apply("tickets", updated=updated, deleted=removed)
+
+        # Put the cancelled tickets back on sale
+        if event is not None:
+            for ticket_type in event["ticket_types"]:
+                ticket_type["total_quantity"] += refunded.get(ticket_type["type"], 0)
+            store.update("events", event)
+
+        credit = None
+        if refund_type == "credit":
+            user = store.find_user(user_id)
+            if user is not None:
+                credit = float(user.get("credit", 0)) + amount
+                user["credit"] = str(credit)  # Store as string
+                store.update("users", user)
+        tokens.revoke(replaced)
+
+    return {"refunded": refunded, "amount": amount, "credit": credit}
@@ -0,0 +1,174 @@
+from datetime import datetime
+
+from datastore import store
+from services.ids import ids
+from services.notifications import notify
+
+REVIEW_TYPES = ("event", "vendor")
+
+# Why a review cannot be left (review_block_reason)
+EVENT_NOT_FOUND = "event_not_found"
+INVALID_DATE = "invalid_date"
+EVENT_NOT_HELD = "event_not_held"  # the event has not taken place yet
+NO_TICKET = "no_ticket"
+EVENT_NOT_COMPLETED = "event_not_completed"  # vendor reviews wait for the event's end
+NOT_ORGANIZER = "not_organizer"
+VENDOR_NOT_ASSIGNED = "vendor_not_assigned"
+
+
+def review_block_reason(review_type, user_id, event_id, vendor_id=None, today=None):
+    """Return why a user cannot leave a review, or None if they can.
+
+    Attendees review events that have started and they hold a ticket for.
+    Organizers review vendors assigned to their events once the event has
+    ended.
+    """
+    if review_type not in REVIEW_TYPES:
+        raise ValueError(f"Unknown review type: {review_type}")
+    today = today or datetime.now().date()
+
+    event = store.find_event(event_id)
+    if not event:
+        return EVENT_NOT_FOUND
+
+    if review_type == "event":
+        try:
+            event_date = datetime.strptime(event["start_date"], "%d/%m/%Y").date()
+        except ValueError:
+            return INVALID_DATE
+        if event_date > today:
+            return EVENT_NOT_HELD
+        if not store.ticket_index().has_ticket(user_id, event_id):
+            return NO_TICKET
+        return None
+
+    # The event must be completely over (only its end date counts, not service dates)
+    try:
+        event_end_date = datetime.strptime(event["end_date"], "%d/%m/%Y").date()
+    except ValueError:
+        return INVALID_DATE
+    if today <= event_end_date:
+        return EVENT_NOT_COMPLETED
+    if event.get("organizer_id") != user_id:
+        return NOT_ORGANIZER
+    vendor_service = next(
+        (s for s in store.services()
+         if s.get("vendor_id") == vendor_id and s.get("event_id") == event_id),
+        None
+    )
+    if vendor_service is None:
+        return VENDOR_NOT_ASSIGNED
+    return None
+
+
+def can_leave_review(review_type, user_id, event_id, vendor_id=None, today=None):
+    """Return whether a user can review an event or a vendor."""
+    return review_block_reason(review_type, user_id, event_id, vendor_id, today) is None
+
+
+def submit_review(review_type, reviewer, event_id, rating, comments, suggestions="", vendor_id=None):
+    """Save a review and notify the reviewed organizer or vendor.
+
+    reviewer is the user leaving the review. Returns the new review.
+    """
+    if not 1 <= rating <= 5:
+        raise ValueError("The rating must be between 1 and 5 stars")
+    comments = comments.strip()
+    if not comments:
+        raise ValueError("A review needs comments")
+    suggestions = suggestions.strip()
+    reason = review_block_reason(review_type, reviewer["user_id"], event_id, vendor_id)
+    if reason is not None:
+        raise ValueError(f"Cannot leave this review: {reason}")
+
+    reviewer_name = f"{reviewer.get('name', '')} {reviewer.get('surname', '')}"
+    with store.exclusive():
+        reviews = _load_reviews()
+        current_time = datetime.now().strftime("%d/%m/%Y %H:%M")
+        new_review = {
+            "id": ids.next_id(f"{review_type}_reviews"),
+            "review_type": review_type,
+            "rating": rating,
+            "comments": comments,
+            "suggestions": suggestions,
+            "created_at": current_time,
+            "updated_at": current_time,
+            "status": "active",
+            "user": {
+                "id": reviewer["user_id"],
+                "name": reviewer.get("name", ""),
+                "surname": reviewer.get("surname", "")
+            },
+            "notification_status": {
+                "organizer_notified": False,
+                "vendor_notified": False,
+                "notification_sent_at": None
+            },
+            "metadata": {
+                "client_version": "1.0",
+                "platform": "desktop",
+                "language": "el"
+            }
+        }
+
+        event = store.find_event(event_id)
+        if review_type == "event":
+            new_review.update({
+                "event_id": event_id,
+                "event_data": {
+                    "title": event.get("title", ""),
+                    "organizer_id": event.get("organizer_id", ""),
+                    "date": event.get("start_date", "")
+                }
+            })
+        else:
+            new_review.update({
+                "vendor_id": vendor_id,
+                "event_id": event_id,
+                "service_details": {
+                    "service_type": "",
+                    "service_date": datetime.now().strftime("%d/%m/%Y")
+                }
+            })
+
+        reviews[f"{review_type}_reviews"].append(new_review)
+        reviews["metadata"]["last_updated"] = current_time
+        store.save("reviews", reviews)
+
+        review_data = {
+            "rating": rating,
+            "comments": comments,
+            "suggestions": suggestions,
+            "reviewer_name": reviewer_name,
+            "review_type": review_type
+        }
+        if review_type == "vendor":
+            notify(
+                vendor_id,
+                "Νέα Αξιολόγηση",
+                f"Λάβατε νέα αξιολόγηση από τον διοργανωτή {reviewer_name}.",
+                category="Service Reviews",
+                additional_data={"review_data": review_data}
+            )
+        else:
+            review_data["event_title"] = event["title"]
+            notify(
+                event["organizer_id"],
+                "Νέα Αξιολόγηση Εκδήλωσης",
+                f"Η εκδήλωση '{event['title']}' έλαβε νέα αξιολόγηση από έναν συμμετέχοντα.",
+                category="Event Reviews",
+                additional_data={"review_data": review_data}
+            )
+    return new_review
+
+
+def _load_reviews():
+    reviews = store.reviews()
+    # Ensure all required keys exist
+    reviews.setdefault("event_reviews", [])
+    reviews.setdefault("vendor_reviews", [])
+    reviews.setdefault("metadata", {
+        "last_updated": datetime.now().strftime("%d/%m/%Y %H:%M"),
+        "version": "1.0"
+    })
+    return reviews
@@ -0,0 +1,233 @@
+import csv
+import heapq
+import json
+import os
+from datetime import datetime
+
+from app_logging import get_logger
+from datastore import store
+from services.ticket_tokens import InvalidTokenError, PREFIX, tokens
+
+log = get_logger(__name__)
+
+# Column names scanner exports use for each field, in order of preference
+CODE_FIELDS = ("code", "qr_code", "qr", "barcode")
+TIME_FIELDS = ("at", "timestamp", "scanned_at", "time")
+GATE_FIELDS = ("gate", "device", "scanner")
+COUNT_FIELDS = ("admitted", "count", "quantity")
+
+TIME_FORMATS = ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%Y-%m-%d %H:%M:%S")
+
+# Conflict kinds
+DOUBLE_ENTRY = "double_entry"  # more admissions than the ticket has guests
+REFUNDED = "refunded"  # a signed ticket that was cancelled, refunded or transferred
+UNKNOWN = "unknown"  # a code no ticket carries (older codes of refunded tickets end up here)
+WRONG_EVENT = "wrong_event"
+INVALID = "invalid"  # a forged or damaged signed code
+
+
+def _field(row, names, default=None):
+    for name in names:
+        value = row.get(name)
+        if value not in (None, ""):
+            return value
+    return default
+
+
+def parse_time(value):
+    """Return epoch seconds of a scan time: a number, ISO 8601 or the app's date format."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        pass
+    for time_format in TIME_FORMATS:
+        try:
+            return datetime.strptime(value, time_format).timestamp()
+        except ValueError:
+            continue
+    raise ValueError(f"Unreadable scan time: {value}")
+
+
+def read_scans(path):
+    """Yield the scans of a CSV or JSONL export one at a time as (code, at, gate, count).
+
+    Rows that admitted nobody (gate logs also record rejected scans) and
+    rows that cannot be read are skipped.
+    """
+    gate_default = os.path.splitext(os.path.basename(path))[0]
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        rows = csv.DictReader(f) if path.lower().endswith(".csv") else _json_lines(f, path)
+        line = 0
+        previous = None
+        warned = False
+        try:
+            for row in rows:
+                line += 1
+                try:
+                    code = _field(row, CODE_FIELDS)
+                    count = int(_field(row, COUNT_FIELDS, 1))
+                    at = parse_time(_field(row, TIME_FIELDS))
+                except (AttributeError, TypeError, ValueError) as e:
+                    log.warning("Skipping row %d of %s: %s", line, path, e)
+                    continue
+                if previous is not None and at < previous and not warned:
+                    log.warning("%s is not in scan order at row %d: repeated scans may be counted twice", path, line)
+                    warned = True
+                previous = at
+                if code and count > 0:
+                    yield str(code).strip(), at, str(_field(row, GATE_FIELDS, gate_default)), count
+        except csv.Error as e:
+            log.error("Stopped reading %s at row %d: %s", path, line + 1, e)
+
+
+def _json_lines(f, path):
+    """Yield the objects of a JSONL file, skipping damaged lines and a line still being written."""
+    for line in f:
+        if not line.endswith("\n"):
+            break
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                log.warning("Skipping a damaged line of %s", path)
+
+
+def reconcile_scans(paths, event_id=None):
+    """Apply the admissions in scanner exports of several gates to tickets.json.
+
+    The files are streamed once, row by row, merged in time order (gate
+    exports are in scan order). A scan repeated with the same code and time
+    (the same export read twice, or a scan in two files) then comes right
+    after the first one and is counted once, so only the latest admission
+    of each code is remembered and memory grows with the codes, not the
+    scans. Admissions are summed per ticket; a ticket's
+    admitted_quantity becomes the larger of what tickets.json and the scans
+    say, so reconciling the same files again changes nothing. Fully
+    admitted tickets get status "used" and the used_date of their last
+    admission. Every changed ticket is saved in one transaction.
+
+    Returns a report: how many "scans" were read, "duplicates" dropped,
+    "admissions" counted, "tickets_updated", and the "conflicts" found, each
+    a dict with its "kind" (double entry, refunded, unknown, wrong event or
+    invalid), the "code", the "gates" and what else is known.
+    """
+    by_code = {}  # code -> [guests, last admission, gates]
+    report = {"scans": 0, "duplicates": 0, "admissions": 0, "tickets_updated": 0, "conflicts": []}
+
+    scans = heapq.merge(*(read_scans(path) for path in paths), key=lambda scan: scan[1])
+    for code, at, gate, count in scans:
+        report["scans"] += 1
+        totals = by_code.get(code)
+        if totals is None:
+            totals = by_code[code] = [0, None, set()]
+        elif totals[1] == at:
+            report["duplicates"] += 1
+            continue
+        totals[0] += count
+        totals[1] = at if totals[1] is None else max(totals[1], at)
+        totals[2].add(gate)
+        report["admissions"] += count
+
+    conflicts = report["conflicts"]
+    updated = []
+    with store.exclusive():
+        resolver = _TicketResolver(store.ticket_index(), event_id)
+        by_ticket = {}  # (event id, ticket id) -> [guests, last admission, gates, first code]
+        for code, (guests, last_at, gates) in by_code.items():
+            keys, conflict = resolver.resolve(code)
+            if conflict is not None:
+                conflicts.append({"kind": conflict, "code": code, "scans": guests, "gates": sorted(gates)})
+                continue
+            for key in keys:
+                totals = by_ticket.setdefault(key, [0, 0.0, set(), code])
+                totals[0] += guests
+                totals[1] = max(totals[1], last_at)
+                totals[2].update(gates)
+
+        for key, (guests, last_at, gates, code) in by_ticket.items():
+            tickets = resolver.tickets(*key)
+            quantity = sum(t.get("quantity_bought", 0) for t in tickets)
+            if guests > quantity:
+                conflicts.append({"kind": DOUBLE_ENTRY, "code": code, "event_id": key[0], "ticket_id": key[1],
+                                  "quantity": quantity, "scans": guests, "gates": sorted(gates)})
+            updated.extend(_admit(tickets, guests, last_at))
+        if updated:
+            store.apply("tickets", updated=updated)
+
+    report["tickets_updated"] = len(updated)
+    log.info("Reconciled %d scans (%d duplicates) into %d tickets, %d conflicts",
+             report["scans"], report["duplicates"], len(updated), len(conflicts))
+    return report
+
+
+def admitted_quantity(ticket):
+    """Return how many guests a ticket has admitted so far."""
+    if ticket.get("status") == "used":
+        return ticket.get("admitted_quantity", ticket.get("quantity_bought", 0))
+    return ticket.get("admitted_quantity", 0)
+
+
+class _TicketResolver:
+    """Finds the tickets scanned codes belong to, indexing each event's tickets by id once."""
+
+    def __init__(self, index, event_id=None):
+        self.index = index
+        self.event_id = event_id
+        self._by_event = {}  # event id -> {ticket id: tickets}
+
+    def tickets(self, event_id, ticket_id):
+        """Return the valid or used tickets of an event with a ticket id."""
+        by_id = self._by_event.get(event_id)
+        if by_id is None:
+            by_id = self._by_event[event_id] = {}
+            for ticket in self.index.by_event(event_id):
+                if ticket.get("status") in ("valid", "used"):
+                    by_id.setdefault(ticket["ticket_id"], []).append(ticket)
+        return by_id.get(ticket_id, [])
+
+    def resolve(self, code):
+        """Return ({(event id, ticket id)}, None) for a code, or (None, conflict kind)."""
+        if code.startswith(PREFIX + "."):
+            try:
+                fields = tokens.decode(code)
+            except InvalidTokenError:
+                return None, INVALID
+            if self.event_id is not None and fields["event_id"] != self.event_id:
+                return None, WRONG_EVENT
+            if tokens.is_revoked(fields["token_id"]) or not self.tickets(fields["event_id"], fields["ticket_id"]):
+                return None, REFUNDED
+            return {(fields["event_id"], fields["ticket_id"])}, None
+        tickets = [t for t in self.index.by_qr_code(code) if t.get("status") in ("valid", "used")]
+        if not tickets:
+            return None, UNKNOWN
+        keys = {(t["event_id"], t["ticket_id"]) for t in tickets
+                if self.event_id is None or t["event_id"] == self.event_id}
+        if not keys:
+            return None, WRONG_EVENT
+        return keys, None
+
+
+def _admit(tickets, guests, last_at):
+    """Record guests admitted on tickets sharing an id; returns the tickets that changed."""
+    changed = []
+    for ticket in tickets:
+        # Several tickets can share an id in older data: fill them in order
+        quantity = ticket.get("quantity_bought", 0)
+        share = min(quantity, guests)
+        guests -= share
+        if share <= admitted_quantity(ticket):
+            continue
+        ticket["admitted_quantity"] = share
+        if share == quantity:
+            ticket["status"] = "used"
+            ticket["used_date"] = datetime.fromtimestamp(last_at).strftime("%d/%m/%Y")
+        changed.append(ticket)
+    return changed
+
@@ -0,0 +1,243 @@
+import base64
+import contextlib
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app_logging import get_logger
+from data_lock import data_dir_lock
+from datastore import store
+from json_writer import atomic_write_json, file_signature
+from services.ids import ids
+
+log = get_logger(__name__)
+
+KEY_FILE = "ticket_key.json"
+REVOKED_FILE = "revoked_tokens.json"
+
+PREFIX = "EH1"
+SIGNATURE_BYTES = 12
+
+# Tokens stay valid this long after the last day of their event
+EXPIRY_GRACE = timedelta(days=1)
+
+# Signature of a revocation file that must be read again (None means missing)
+STALE = object()
+
+
+class InvalidTokenError(ValueError):
+    """Raised for a ticket token that is forged, malformed, expired or revoked."""
+
+
+def event_expiry(event):
+    """Return when tokens of an event expire (epoch seconds), or 0 if the event has no readable end date."""
+    end_date = event.get("end_date") or event.get("start_date")
+    try:
+        end = datetime.strptime(end_date, "%d/%m/%Y")
+    except (TypeError, ValueError):
+        return 0
+    return int((end + timedelta(days=1) + EXPIRY_GRACE).timestamp())
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class TicketTokens:
+    """Signed QR payloads that a gate can verify without the ticket files.
+
+    A token carries a token id, the ticket id, event, ticket type, quantity
+    and expiry, signed with HMAC-SHA256 under the key in ticket_key.json:
+
+        EH1.<base64 "token|ticket|event|quantity|expires|type">.<signature>
+
+    Verifying one needs only that key and the revocation set, so scanners
+    keep working from a copy of the two files when the main store is out of
+    reach. When a ticket is refunded, transferred or changes quantity its
+    old token is revoked and the ticket gets a new one; revoked_tokens.json
+    keeps the revoked token ids until their tokens expire.
+    """
+
+    def __init__(self, directory=None, clock=time.time):
+        self._directory = directory
+        self.clock = clock
+        self._key = None
+        self._key_path = None
+        self._revoked = {}  # token id -> expires (0 = never)
+        self._signature = STALE  # of revoked_tokens.json when last read
+        self._lock = threading.RLock()
+
+    @property
+    def directory(self):
+        return self._directory or store.backend.data_dir
+
+    # Issuing
+
+    def issue(self, ticket, expires=0):
+        """Return a new signed token for a ticket as it is now."""
+        fields = [ids.next_id("ticket_tokens"), ticket["ticket_id"], ticket["event_id"],
+                  ticket["quantity_bought"], int(expires), ticket["ticket_type"]]
+        payload = _b64encode("|".join(str(f) for f in fields).encode("utf-8"))
+        return f"{PREFIX}.{payload}.{self._sign(payload, self._signing_key())}"
+
+    def reissue(self, ticket, expires=0):
+        """Give a ticket a new token and return its old one (to revoke in the same transaction)."""
+        old = ticket.get("qr_code")
+        ticket["qr_code"] = self.issue(ticket, expires)
+        return old
+
+    # Verifying
+
+    def decode(self, token):
+        """Return the fields of a well-signed token without checking expiry or revocation."""
+        try:
+            prefix, payload, signature = token.split(".")
+        except (AttributeError, ValueError):
+            raise InvalidTokenError("Not a ticket token") from None
+        key = self._verifying_key()
+        if prefix != PREFIX or key is None or not hmac.compare_digest(signature, self._sign(payload, key)):
+            raise InvalidTokenError("Invalid ticket signature")
+        try:
+            token_id, ticket_id, event_id, quantity, expires, ticket_type = \
+                _b64decode(payload).decode("utf-8").split("|", 5)
+            return {
+                "token_id": int(token_id),
+                "ticket_id": int(ticket_id),
+                "event_id": int(event_id),
+                "quantity": int(quantity),
+                "expires": int(expires),
+                "ticket_type": ticket_type,
+            }
+        except ValueError:
+            raise InvalidTokenError("Malformed ticket token") from None
+
+    def verify(self, token, event_id=None):
+        """Return the fields of a token that admits to an event; raises InvalidTokenError otherwise."""
+        fields = self.decode(token)
+        if event_id is not None and fields["event_id"] != event_id:
+            raise InvalidTokenError(f"Ticket is for event {fields['event_id']}")
+        if fields["expires"] and self.clock() > fields["expires"]:
+            raise InvalidTokenError("Ticket has expired")
+        if self.is_revoked(fields["token_id"]):
+            raise InvalidTokenError("Ticket has been cancelled or transferred")
+        return fields
+
+    def is_revoked(self, token_id):
+        with self._lock:
+            self._sync()
+            return token_id in self._revoked
+
+    # Revoking
+
+    def revoke(self, tokens):
+        """Revoke tokens (strings that are not tokens, like old QR codes, are skipped).
+
+        Called inside store.exclusive(), the revocations are committed with
+        the ticket changes of the same transaction (and dropped if it rolls
+        back), so a refunded or transferred code can never stay valid.
+        """
+        revoked = []
+        for token in tokens:
+            try:
+                revoked.append(self.decode(token))
+            except InvalidTokenError:
+                continue
+        if not revoked:
+            return 0
+        with self._exclusive():
+            now = self.clock()
+            self._revoked = {token_id: expires for token_id, expires in self._revoked.items()
+                             if not expires or expires >= now}
+            for fields in revoked:
+                self._revoked[fields["token_id"]] = fields["expires"]
+            self._write()
+        return len(revoked)
+
+    # Helpers
+
+    def _sign(self, payload, key):
+        digest = hmac.new(key, payload.encode("ascii"), hashlib.sha256).digest()
+        return _b64encode(digest[:SIGNATURE_BYTES])
+
+    def _signing_key(self):
+        """Return the key, creating it on first use."""
+        key = self._verifying_key()
+        if key is None:
+            with self._exclusive():
+                key = self._read_key()
+                if key is None:
+                    key = secrets.token_bytes(32)
+                    atomic_write_json(self._path(KEY_FILE), {"key": key.hex()})
+                self._key = key
+        return key
+
+    def _verifying_key(self):
+        path = self._path(KEY_FILE)
+        if self._key is None or self._key_path != path:
+            self._key = self._read_key()
+            self._key_path = path
+        return self._key
+
+    def _read_key(self):
+        try:
+            with open(self._path(KEY_FILE), "r", encoding="utf-8") as f:
+                return bytes.fromhex(json.load(f)["key"])
+        except FileNotFoundError:
+            return None
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    @contextlib.contextmanager
+    def _exclusive(self):
+        lock = data_dir_lock(self.directory)
+        lock.acquire()
+        try:
+            with self._lock:
+                self._sync()
+                yield
+        finally:
+            lock.release()
+
+    def _sync(self):
+        """Reload the revocation set if another process changed it."""
+        path = self._path(REVOKED_FILE)
+        if self._signature is STALE:
+            # Written in a transaction that has not committed yet
+            text = store.pending_file(path)
+            if text is not None:
+                self._revoked = self._parse(json.loads(text))
+                return
+        signature = file_signature(path)
+        if signature == self._signature:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._revoked = self._parse(json.load(f))
+        except FileNotFoundError:
+            self._revoked = {}
+        except (json.JSONDecodeError, KeyError, AttributeError) as e:
+            log.error("Error loading %s: %s", path, e)
+            self._revoked = {}
+        self._signature = signature
+
+    def _parse(self, data):
+        return {int(token_id): expires for token_id, expires in data["revoked"].items()}
+
+    def _write(self):
+        # Through the store, so an open transaction commits or drops it with
+        # the tickets; the file is re-read (or the pending text used) next time
+        store.write_file(self._path(REVOKED_FILE), {"revoked": self._revoked})
+        self._signature = STALE
+
+
+tokens = TicketTokens()
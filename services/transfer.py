@@ -0,0 +1,147 @@
+from datetime import datetime
+
+from datastore import store
+from services.ids import ids
+from services.notifications import notify
+from services.ticket_tokens import event_expiry, tokens
+
+
+def next_transfer_request_id():
+    """Return the ID of the next ticket transfer request."""
+    return str(ids.next_id("transfer_requests"))
+
+
+def request_transfer(sender, recipient, event, tickets, summary_text=""):
+    """Ask another attendee to accept some of a user's tickets.
+
+    tickets is a list of {"ticket", "quantity"} items. The transfer request
+    and the recipient's notification are committed together. Returns the
+    transfer request.
+    """
+    if not tickets:
+        raise ValueError("No tickets selected for transfer")
+    sender_name = sender.get("name", "Unknown")
+    sender_surname = sender.get("surname", "User")
+    sender_id = sender.get("user_id", 0)
+    recipient_id = recipient.get("user_id", 0)
+
+    with store.exclusive():
+        transfer_request_id = next_transfer_request_id()
+        transfer_request = {
+            "request_id": transfer_request_id,
+            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+            "status": "pending",
+            "sender": {
+                "user_id": sender_id,
+                "name": sender_name,
+                "surname": sender_surname
+            },
+            "recipient": {
+                "user_id": recipient_id,
+                "email": recipient.get("email", "")
+            },
+            "event": {
+                "event_id": event["event_id"],
+                "title": event["title"]
+            },
+            "tickets": tickets
+        }
+        store.append("transfer_requests", transfer_request)
+
+        notify(
+            recipient_id,
+            "Ticket Transfer Request",
+            f"You have received a ticket transfer request for '{event['title']}' from {sender_name} {sender_surname}. Tickets: {summary_text}",
+            "Ticket Transfers",
+            {
+                "type": "ticket_transfer",
+                "transfer_request_id": transfer_request_id,
+                "sender_id": sender_id,
+                "sender_name": f"{sender_name} {sender_surname}",
+                "event_title": event["title"],
+                "tickets": tickets
+            }
+        )
+    return transfer_request
+
+
+def respond_to_transfer(request_id, accept, notification_id=None):
+    """Accept or reject a ticket transfer request.
+
+    Accepted tickets move to the recipient; a partial quantity is split off
+    into a new ticket. Only tickets the sender still holds are moved. Moved
+    and split tickets get new QR tokens and their old ones are revoked, so
+    the sender's copy no longer admits. The tickets, the request, the
+    sender's notification and the removal of the recipient's notification
+    (notification_id) are committed together. Raises ValueError if the
+    request was already answered. Returns the transfer request.
+    """
+    replaced = []
+    with store.exclusive():
+        transfer_data = store.load("transfer_requests")
+        request = next((req for req in transfer_data["transfer_requests"]
+                        if req["request_id"] == request_id), None)
+        if not request:
+            raise ValueError("Transfer request not found")
+        if request.get("status") != "pending":
+            raise ValueError(f"Transfer request {request_id} has already been {request.get('status')}")
+
+        request["status"] = "accepted" if accept else "rejected"
+        request["response_date"] = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+
+        if accept:
+            tickets_data = store.tickets()
+            sender_id = request["sender"]["user_id"]
+            sender_tickets = store.ticket_index().by_user(sender_id)
+            event = store.find_event(request["event"].get("event_id"))
+            expires = event_expiry(event) if event is not None else 0
+            inserted = []
+            updated = []
+            for transfer_item in request["tickets"]:
+                ticket_data = transfer_item["ticket"]
+                quantity = transfer_item["quantity"]
+
+                # A ticket moved by an earlier item is no longer the sender's
+                ticket = next((t for t in sender_tickets if t["ticket_id"] == ticket_data["ticket_id"]
+                               and t["ticket_type"] == ticket_data["ticket_type"]
+                               and t["user_id"] == sender_id), None)
+                if ticket:
+                    if ticket["quantity_bought"] == quantity:
+                        # Transfer entire ticket
+                        ticket["user_id"] = request["recipient"]["user_id"]
+                        replaced.append(tokens.reissue(ticket, expires))
+                    else:
+                        # Split ticket and create new one for recipient
+                        new_ticket = ticket.copy()
+                        new_ticket["ticket_id"] = ids.next_id("tickets")
+                        new_ticket["user_id"] = request["recipient"]["user_id"]
+                        new_ticket["quantity_bought"] = quantity
+                        new_ticket["qr_code"] = tokens.issue(new_ticket, expires)
+                        tickets_data.append(new_ticket)
+                        inserted.append(new_ticket)
+                        ticket["quantity_bought"] -= quantity
+                        replaced.append(tokens.reissue(ticket, expires))
+                    updated.append(ticket)
+
+            store.apply("tickets", inserted=inserted, updated=updated)
+        store.save("transfer_requests", transfer_data)
+
+        if notification_id is not None:
+            notification = store.notification_index().find(notification_id)
+            if notification is not None:
+                store.remove("notifications", notification)
+
+        status_text = request["status"]
+        notify(
+            request["sender"]["user_id"],
+            f"Ticket Transfer {status_text.title()}",
+            f"Your ticket transfer request for '{request['event']['title']}' has been {status_text} by {request['recipient']['email']}.",
+            "Ticket Transfers",
+            {
+                "type": "transfer_response",
+                "transfer_request_id": request_id,
+                "status": status_text
+            }
+        )
+        tokens.revoke(replaced)
+    return request
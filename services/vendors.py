@@ -0,0 +1,45 @@
+from datastore import store
+
+
+def vendor_ratings(reviews=None):
+    """Return the average review rating of every reviewed vendor (vendor_id -> rating)."""
+    if reviews is None:
+        reviews = store.reviews()
+    totals = {}
+    for review in reviews.get("vendor_reviews", []):
+        total = totals.setdefault(review["vendor_id"], [0, 0])
+        total[0] += review["rating"]
+        total[1] += 1
+    return {vendor_id: rating / count for vendor_id, (rating, count) in totals.items()}
+
+
+def filter_vendor_services(types=(), pricing_types=(), min_cost=0, max_cost=float("inf"), min_rating=None):
+    """Return the services not yet assigned to an event that match the filters.
+
+    An empty types or pricing_types accepts every value. With min_rating,
+    only services of vendors whose average rating reaches it are kept
+    (vendors without reviews are left out). A service whose price cannot be
+    read passes the cost filter.
+    """
+    types = set(types)
+    pricing_types = set(pricing_types)
+    ratings = vendor_ratings() if min_rating is not None else None
+
+    filtered_services = []
+    for service in store.services():
+        # Services already assigned to events are not available
+        if service.get("event_id"):
+            continue
+        if types and service["type"] not in types:
+            continue
+        if pricing_types and service.get("pricing_type") not in pricing_types:
+            continue
+        try:
+            if not (min_cost <= float(service["price"]) <= max_cost):
+                continue
+        except (KeyError, TypeError, ValueError):
+            pass
+        if ratings is not None and ratings.get(service["vendor_id"], -1) < min_rating:
+            continue
+        filtered_services.append(service)
+    return filtered_services
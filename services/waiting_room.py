@@ -0,0 +1,197 @@
+import contextlib
+import hashlib
+import hmac
+import json
+import math
+import os
+import secrets
+import threading
+import time
+
+from app_logging import get_logger
+from data_lock import data_dir_lock
+from datastore import store
+from json_writer import atomic_write_json, file_signature
+
+log = get_logger(__name__)
+
+ROOMS_FILE = "waiting_rooms.json"
+
+
+class NotAdmittedError(ValueError):
+    """Raised when a buyer tries to check out before the waiting room admitted them."""
+
+
+class WaitingRoom:
+    """Admission queues for high-demand on-sales, shared by every terminal.
+
+    An event with an open room admits buyers in the order they joined, rate
+    buyers per second. Joining hands out a token carrying the buyer's place
+    in the queue, signed with the room's secret, so a token can be checked
+    without storing it: the file only keeps, per event, the rate, how many
+    tokens were handed out and how many buyers were admitted at a given
+    time. Admission capacity is not banked while nobody waits, so a burst of
+    buyers after a quiet spell still goes through at the configured rate.
+
+    Events without an open room admit everyone.
+    """
+
+    def __init__(self, path=None, clock=time.time):
+        self._path = path
+        self.clock = clock
+        self._rooms = {}  # str(event id) -> room state
+        self._signature = None
+        self._lock = threading.RLock()
+
+    @property
+    def path(self):
+        return self._path or os.path.join(store.backend.data_dir, ROOMS_FILE)
+
+    # Organizer side
+
+    def open(self, event_id, rate):
+        """Open (or re-rate) the waiting room of an event; rate is buyers admitted per second."""
+        if rate <= 0:
+            raise ValueError("The admit rate must be positive")
+        with self._exclusive():
+            now = self.clock()
+            room = self._rooms.get(str(event_id))
+            if room is None:
+                room = {"secret": secrets.token_hex(16), "issued": 0, "admitted": 0.0, "admitted_at": now}
+                self._rooms[str(event_id)] = room
+            else:
+                self._rebase(room, now)  # buyers admitted so far keep their place
+            room["rate"] = float(rate)
+            self._write()
+
+    def close(self, event_id):
+        """Close the waiting room of an event; everyone is admitted from then on."""
+        with self._exclusive():
+            if self._rooms.pop(str(event_id), None) is not None:
+                self._write()
+
+    def is_open(self, event_id):
+        with self._lock:
+            self._sync()
+            return str(event_id) in self._rooms
+
+    def summary(self, event_id):
+        """Return {"rate", "joined", "admitted", "waiting"} of an event's room, or None if it has none."""
+        with self._lock:
+            self._sync()
+            room = self._rooms.get(str(event_id))
+            if room is None:
+                return None
+            admitted = math.floor(self._admitted(room, self.clock()))
+            return {"rate": room["rate"], "joined": room["issued"], "admitted": admitted,
+                    "waiting": room["issued"] - admitted}
+
+    # Buyer side
+
+    def join(self, event_id):
+        """Put a buyer at the end of the queue and return their token (None if there is no queue)."""
+        with self._exclusive():
+            room = self._rooms.get(str(event_id))
+            if room is None:
+                return None
+            self._rebase(room, self.clock())
+            seq = room["issued"]
+            room["issued"] += 1
+            self._write()
+            return f"{event_id}.{seq}.{self._sign(room, event_id, seq)}"
+
+    def status(self, event_id, token):
+        """Return {"admitted", "position", "eta_seconds"} of a token.
+
+        position counts the buyers ahead plus the buyer (0 once admitted) and
+        eta_seconds estimates the wait at the current rate. Raises
+        NotAdmittedError for a token that does not belong to the room.
+        """
+        with self._lock:
+            self._sync()
+            room = self._rooms.get(str(event_id))
+            if room is None:
+                return {"admitted": True, "position": 0, "eta_seconds": 0.0}
+            seq = self._seq_of(room, event_id, token)
+            admitted = self._admitted(room, self.clock())
+            if seq < math.floor(admitted):
+                return {"admitted": True, "position": 0, "eta_seconds": 0.0}
+            return {
+                "admitted": False,
+                "position": seq - math.floor(admitted) + 1,
+                "eta_seconds": (seq + 1 - admitted) / room["rate"],
+            }
+
+    def is_admitted(self, event_id, token):
+        try:
+            return self.status(event_id, token)["admitted"]
+        except NotAdmittedError:
+            return False
+
+    def check(self, event_id, token):
+        """Raise NotAdmittedError unless the token may check out tickets of the event."""
+        state = self.status(event_id, token)
+        if not state["admitted"]:
+            raise NotAdmittedError(f"Still in the waiting room: position {state['position']}, "
+                                   f"about {state['eta_seconds']:.0f} s to go")
+
+    # Helpers
+
+    def _admitted(self, room, now):
+        """Return how many buyers are admitted at now (fractional: the next one is on the way)."""
+        elapsed = max(0.0, now - room["admitted_at"])
+        return min(float(room["issued"]), room["admitted"] + elapsed * room.get("rate", 1.0))
+
+    def _rebase(self, room, now):
+        room["admitted"] = self._admitted(room, now)
+        room["admitted_at"] = now
+
+    def _sign(self, room, event_id, seq):
+        message = f"{event_id}.{seq}".encode("utf-8")
+        return hmac.new(bytes.fromhex(room["secret"]), message, hashlib.sha256).hexdigest()[:16]
+
+    def _seq_of(self, room, event_id, token):
+        try:
+            token_event, seq, signature = (token or "").rsplit(".", 2)
+            seq = int(seq)
+        except ValueError:
+            raise NotAdmittedError("Invalid waiting room token") from None
+        if (token_event != str(event_id) or not 0 <= seq < room["issued"]
+                or not hmac.compare_digest(signature, self._sign(room, event_id, seq))):
+            raise NotAdmittedError("Invalid waiting room token")
+        return seq
+
+    @contextlib.contextmanager
+    def _exclusive(self):
+        lock = data_dir_lock(os.path.dirname(os.path.abspath(self.path)))
+        lock.acquire()
+        try:
+            with self._lock:
+                self._sync()
+                yield
+        finally:
+            lock.release()
+
+    def _sync(self):
+        path = self.path
+        signature = file_signature(path)
+        if signature == self._signature:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._rooms = json.load(f).get("rooms", {})
+        except FileNotFoundError:
+            self._rooms = {}
+        except (json.JSONDecodeError, AttributeError) as e:
+            log.error("Error loading %s: %s", path, e)
+            self._rooms = {}
+        self._signature = signature
+
+    def _write(self):
+        path = self.path
+        atomic_write_json(path, {"rooms": self._rooms})
+        self._signature = file_signature(path)
+
+
+waiting_room = WaitingRoom()
+
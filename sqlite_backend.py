@@ -0,0 +1,322 @@
+import json
+import os
+import sqlite3
+import threading
+
+from app_logging import get_logger
+from datastore import COLLECTIONS
+from json_writer import atomic_write_text
+from metrics import metrics
+
+log = get_logger(__name__)
+
+# collection name -> (table, indexed columns copied out of each record)
+TABLES = {
+    "users": ("users", ["user_id", "email"]),
+    "events": ("events", ["event_id", "organizer_id"]),
+    "tickets": ("tickets", ["ticket_id", "event_id", "user_id", "qr_code", "status"]),
+    "notifications": ("notifications", ["notification_id", "user_id"]),
+    "services": ("services", ["service_id", "vendor_id", "event_id"]),
+    "collaboration_requests": ("collaboration_requests", ["request_id", "event_id", "organizer_id", "vendor_id"]),
+    "transfer_requests": ("transfer_requests", ["request_id"]),
+    "reviews": ("reviews", ["id", "event_id", "vendor_id"]),
+}
+
+# Documents that hold more than one list of records
+LIST_KEYS = {
+    "reviews": ["event_reviews", "vendor_reviews"],
+}
+
+# Columns that get an index (the lookups the application does)
+INDEXED = {"user_id", "event_id", "vendor_id", "qr_code", "email", "notification_id", "request_id"}
+
+
+def list_keys(name):
+    """Return the keys of the record lists inside a collection's document (None for a bare list)."""
+    if name in LIST_KEYS:
+        return LIST_KEYS[name]
+    return [COLLECTIONS[name][1]]
+
+
+def column_value(record, column):
+    value = record.get(column)
+    if isinstance(value, (dict, list)):
+        return None
+    return value
+
+
+class SqliteBackend:
+    """Stores the collections as rows of a SQLite database (WAL mode).
+
+    Each record is kept as a JSON blob next to copies of the fields the
+    application looks records up by, so single records can be inserted,
+    updated or deleted without rewriting the whole collection. Ticket types
+    live in their own table keyed by the owning event row.
+    """
+
+    def __init__(self, db_path="eventhub.db"):
+        self.db_path = db_path
+        self.data_dir = os.path.dirname(os.path.abspath(db_path))
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._rows = {}  # name -> {id(record): (row_id, record)}
+        self._depth = 0  # nesting of open transactions
+        self._files = {}  # path -> text of side files to write when the transaction commits
+        self.create_schema()
+
+    def create_schema(self):
+        """Create the tables and indexes if they do not exist yet."""
+        with self._lock:
+            conn = self._conn
+            conn.execute("CREATE TABLE IF NOT EXISTS collection_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS documents (name TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            for table, columns in TABLES.values():
+                cols = ", ".join(f"{c}" for c in columns)
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    f"row_id INTEGER PRIMARY KEY, list_key TEXT, {cols}, data TEXT NOT NULL)"
+                )
+                for c in columns:
+                    if c in INDEXED:
+                        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{c} ON {table} ({c})")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ticket_types ("
+                "row_id INTEGER PRIMARY KEY, event_row INTEGER NOT NULL, position INTEGER NOT NULL, "
+                "type TEXT, data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ticket_types_event_row ON ticket_types (event_row)")
+
+    def close(self):
+        with self._lock:
+            if self._depth:
+                log.error("Closing the database with an open transaction, rolling it back")
+                self.rollback()
+            self._conn.close()
+
+    # Backend interface used by DataStore
+
+    def begin(self):
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+
+    def commit(self):
+        with self._lock:
+            if self._depth == 0:
+                return
+            self._depth -= 1
+            if self._depth == 0:
+                # Side files go first: a crash before the COMMIT leaves them ahead of the rows
+                files, self._files = self._files, {}
+                try:
+                    for path, text in files.items():
+                        atomic_write_text(path, text)
+                except Exception:
+                    self._depth = 1
+                    self.rollback()
+                    raise
+                self._conn.execute("COMMIT")
+
+    def rollback(self):
+        with self._lock:
+            if self._depth:
+                self._depth = 0
+                self._files = {}
+                self._conn.execute("ROLLBACK")
+                # Row ids handed out inside the transaction are gone
+                self._rows.clear()
+
+    def flush(self):
+        pass
+
+    def write_file(self, path, text):
+        with self._lock:
+            if self._depth:
+                self._files[path] = text
+                return
+        atomic_write_text(path, text)
+
+    def pending_text(self, path):
+        with self._lock:
+            return self._files.get(path)
+
+    def signature(self, name):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM collection_versions WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def load(self, name):
+        table, _ = TABLES[name]
+        keys = list_keys(name)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT row_id, list_key, data FROM {table} ORDER BY row_id").fetchall()
+            skeleton = self._conn.execute("SELECT data FROM documents WHERE name = ?", (name,)).fetchone()
+            ticket_types = self._load_ticket_types() if name == "events" else {}
+            if metrics.enabled:
+                metrics.add_bytes(f"sqlite.{table}", read=sum(len(data) for _, _, data in rows))
+
+            identity = {}
+            lists = {key: [] for key in keys}
+            for row_id, key, data in rows:
+                record = json.loads(data)
+                if name == "events":
+                    record["ticket_types"] = ticket_types.get(row_id, [])
+                lists.setdefault(key if key != "" else None, []).append(record)
+                identity[id(record)] = (row_id, record)
+            self._rows[name] = identity
+
+        if keys == [None]:
+            return lists[None]
+        document = json.loads(skeleton[0]) if skeleton else {}
+        for key in keys:
+            document[key] = lists.get(key, [])
+        return document
+
+    def save(self, name, data):
+        table, _ = TABLES[name]
+        with self._lock:
+            conn = self._conn
+            self.begin()
+            try:
+                conn.execute(f"DELETE FROM {table}")
+                if name == "events":
+                    conn.execute("DELETE FROM ticket_types")
+                identity = {}
+                for key, records in self._record_lists(name, data):
+                    for record in records:
+                        identity[id(record)] = (self._insert(name, key, record), record)
+                self._save_skeleton(name, data)
+                self._bump(name)
+            except Exception:
+                self.rollback()
+                raise
+            self.commit()
+            self._rows[name] = identity
+
+    def apply(self, name, data, inserted=(), updated=(), deleted=()):
+        with self._lock:
+            identity = self._rows.get(name)
+            if identity is None or any(id(r) not in identity for r in list(updated) + list(deleted)):
+                # Records we never loaded: fall back to rewriting the collection
+                self.save(name, data)
+                return
+
+            table, columns = TABLES[name]
+            conn = self._conn
+            self.begin()
+            try:
+                for record in deleted:
+                    row_id, _ = identity.pop(id(record))
+                    conn.execute(f"DELETE FROM {table} WHERE row_id = ?", (row_id,))
+                    if name == "events":
+                        conn.execute("DELETE FROM ticket_types WHERE event_row = ?", (row_id,))
+                for record in updated:
+                    row_id, _ = identity[id(record)]
+                    sets = ", ".join(f"{c} = ?" for c in columns)
+                    conn.execute(
+                        f"UPDATE {table} SET {sets}, data = ? WHERE row_id = ?",
+                        [column_value(record, c) for c in columns] + [self._dumps(name, record), row_id],
+                    )
+                    if name == "events":
+                        self._write_ticket_types(row_id, record)
+                for record in inserted:
+                    key = self._list_key_of(name, data, record)
+                    identity[id(record)] = (self._insert(name, key, record), record)
+                self._save_skeleton(name, data)
+                self._bump(name)
+            except Exception:
+                self.rollback()
+                raise
+            self.commit()
+
+    # Queries that use the indexes directly
+
+    def find(self, name, column, value):
+        """Return the records of a collection whose indexed column equals value."""
+        table, columns = TABLES[name]
+        if column not in columns:
+            raise ValueError(f"{column} is not a column of {table}")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM {table} WHERE {column} = ? ORDER BY row_id", (value,)
+            ).fetchall()
+        if metrics.enabled:
+            metrics.add_bytes(f"sqlite.{table}", read=sum(len(data) for (data,) in rows))
+        return [json.loads(data) for (data,) in rows]
+
+    # Helpers
+
+    def _record_lists(self, name, data):
+        keys = list_keys(name)
+        if keys == [None]:
+            return [(None, data)]
+        return [(key, data.get(key, [])) for key in keys]
+
+    def _list_key_of(self, name, data, record):
+        keys = list_keys(name)
+        if len(keys) == 1:
+            return keys[0]
+        for key in keys:
+            if any(r is record for r in data.get(key, [])):
+                return key
+        return keys[0]
+
+    def _dumps(self, name, record):
+        if name == "events":
+            record = {k: v for k, v in record.items() if k != "ticket_types"}
+        text = json.dumps(record, ensure_ascii=False)
+        metrics.add_bytes(f"sqlite.{TABLES[name][0]}", written=len(text))
+        return text
+
+    def _insert(self, name, key, record):
+        table, columns = TABLES[name]
+        placeholders = ", ".join("?" for _ in columns)
+        cursor = self._conn.execute(
+            f"INSERT INTO {table} (list_key, {', '.join(columns)}, data) VALUES (?, {placeholders}, ?)",
+            [key if key is not None else ""] + [column_value(record, c) for c in columns] + [self._dumps(name, record)],
+        )
+        row_id = cursor.lastrowid
+        if name == "events":
+            self._write_ticket_types(row_id, record)
+        return row_id
+
+    def _write_ticket_types(self, event_row, event):
+        self._conn.execute("DELETE FROM ticket_types WHERE event_row = ?", (event_row,))
+        self._conn.executemany(
+            "INSERT INTO ticket_types (event_row, position, type, data) VALUES (?, ?, ?, ?)",
+            [
+                (event_row, position, ticket_type.get("type"), json.dumps(ticket_type, ensure_ascii=False))
+                for position, ticket_type in enumerate(event.get("ticket_types", []))
+            ],
+        )
+
+    def _load_ticket_types(self):
+        grouped = {}
+        for event_row, data in self._conn.execute(
+            "SELECT event_row, data FROM ticket_types ORDER BY event_row, position"
+        ):
+            grouped.setdefault(event_row, []).append(json.loads(data))
+        return grouped
+
+    def _save_skeleton(self, name, data):
+        keys = list_keys(name)
+        if keys == [None]:
+            return
+        skeleton = {k: v for k, v in data.items() if k not in keys}
+        self._conn.execute(
+            "INSERT INTO documents (name, data) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET data = excluded.data",
+            (name, json.dumps(skeleton, ensure_ascii=False)),
+        )
+
+    def _bump(self, name):
+        self._conn.execute(
+            "INSERT INTO collection_versions (name, version) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+            (name,),
+        )
@@ -0,0 +1,74 @@
+import pytest
+
+from services import CheckInGate, purchase_tickets, refund_tickets
+from services.checkin import ADMITTED, DUPLICATE, DUPLICATE_SECONDS, PARTIAL, REJECTED
+
+
+@pytest.fixture
+def clock():
+    return [1000.0]
+
+
+@pytest.fixture
+def open_gate(data_dir, clock):
+    gates = []
+
+    def open_gate(gate="north"):
+        gates.append(CheckInGate(1, gate, sync=False, clock=lambda: clock[0]))
+        return gates[-1]
+    yield open_gate
+    for gate in gates:
+        gate.close()
+
+
+def buy(user_id, quantity):
+    result = purchase_tickets(user_id, 1, [{"type": "Regular", "price": 20.0, "quantity": quantity}])
+    return result["tickets"][0]["qr_code"]
+
+
+def test_ticket_admits_once(open_gate, clock):
+    code = buy(2, 2)
+    gate = open_gate()
+    assert gate.scan(code, 2)["result"] == ADMITTED
+    clock[0] += 60
+    decision = gate.scan(code)
+    assert (decision["result"], decision["admitted"]) == (DUPLICATE, 0)
+
+
+def test_group_is_admitted_over_several_scans(open_gate, clock):
+    code = buy(2, 3)
+    gate = open_gate()
+    assert gate.scan(code, 2)["result"] == ADMITTED
+    # A second read of the same code right away is not another guest
+    assert gate.scan(code)["result"] == DUPLICATE
+    clock[0] += DUPLICATE_SECONDS
+    decision = gate.scan(code, 2)
+    assert (decision["result"], decision["admitted"], decision["remaining"]) == (PARTIAL, 1, 0)
+    clock[0] += DUPLICATE_SECONDS
+    assert gate.scan(code)["result"] == DUPLICATE
+
+
+def test_unknown_and_cancelled_codes_are_rejected(open_gate):
+    code = buy(2, 1)
+    refund_tickets(2, 1, {"Regular": 1})
+    gate = open_gate()
+    assert gate.scan(code)["result"] == REJECTED
+    assert gate.scan("QR-unknown")["result"] == REJECTED
+
+
+def test_restarted_gate_remembers_admissions(open_gate, clock):
+    code = buy(2, 2)
+    gate = open_gate("north")
+    gate.scan(code)
+    gate.close()
+    clock[0] += 60
+
+    assert open_gate("north").scan(code, 2)["admitted"] == 1
+    clock[0] += 60
+    assert open_gate("south").scan(code)["result"] == DUPLICATE
+
+
+def test_ticket_bought_after_the_gate_opened(open_gate):
+    gate = open_gate()
+    code = buy(3, 1)
+    assert gate.scan(code)["result"] == ADMITTED
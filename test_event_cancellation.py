@@ -0,0 +1,38 @@
+import pytest
+
+from datastore import store
+from services import InvalidTokenError, cancel_event, purchase_tickets
+from services.holds import holds
+from services.ticket_tokens import tokens
+
+
+def buy(user_id, ticket_type, quantity, price):
+    result = purchase_tickets(user_id, 1, [{"type": ticket_type, "price": price, "quantity": quantity}])
+    return result["tickets"][0]["qr_code"]
+
+
+def test_cancelling_refunds_every_holder(data_dir):
+    codes = [buy(2, "Regular", 2, 20.0), buy(3, "VIP", 1, 50.0)]
+    holds.place("cart", 1, "Regular", 1)
+
+    result = cancel_event(1, refund_type="credit", reason="Storm")
+    assert result == {"holders": 2, "tickets": 3, "amount": 90.0, "used": 0}
+    assert [float(store.find_user(user_id)["credit"]) for user_id in (2, 3)] == [40.0, 50.0]
+    assert store.ticket_index().by_event(1) == []
+    assert [t["total_quantity"] for t in store.find_event(1)["ticket_types"]] == [5, 2]
+    assert holds.held(1, "Regular") == 0
+    for code in codes:
+        with pytest.raises(InvalidTokenError):
+            tokens.verify(code)
+    messages = [n["message"] for n in store.notifications() if n["user_id"] == 2]
+    assert len(messages) == 1 and "Storm" in messages[0]
+
+
+def test_cancelled_event_cannot_be_sold_or_cancelled_again(data_dir):
+    cancel_event(1)
+    with pytest.raises(ValueError):
+        purchase_tickets(2, 1, [{"type": "Regular", "price": 20.0, "quantity": 1}])
+    with pytest.raises(ValueError):
+        holds.place("cart", 1, "Regular", 1)
+    with pytest.raises(ValueError):
+        cancel_event(1)
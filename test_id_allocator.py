@@ -0,0 +1,51 @@
+import multiprocessing
+import threading
+
+from datastore import store
+from services import IdAllocator
+from services.ids import SEQUENCES_FILE
+
+
+def mint(path, count):
+    allocator = IdAllocator(path, block_size=7)
+    return [allocator.next_id("ticket_tokens") for _ in range(count)] + allocator.next_ids("ticket_tokens", 3)
+
+
+def test_processes_get_blocks_that_do_not_overlap(data_dir):
+    path = str(data_dir / SEQUENCES_FILE)
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        minted = pool.starmap(mint, [(path, 40)] * 4)
+    minted.append(mint(path, 10))
+    ids = [i for batch in minted for i in batch]
+    assert len(set(ids)) == len(ids)
+    assert all(batch == sorted(batch) for batch in minted)
+
+
+def test_sequences_start_after_the_saved_records(data_dir):
+    store.append("tickets", {"ticket_id": 41, "event_id": 1, "user_id": 2, "ticket_type": "Regular",
+                             "quantity_bought": 1, "status": "valid"})
+    allocator = IdAllocator()
+    assert allocator.next_ids("tickets", 3) == [42, 43, 44]
+    assert IdAllocator().next_id("tickets") > 44
+
+
+def test_minting_inside_a_transaction_does_not_deadlock(data_dir):
+    allocator = IdAllocator(block_size=1)
+    minted = []
+
+    def in_transactions():
+        for _ in range(50):
+            with store.exclusive():
+                minted.append(allocator.next_id("ticket_tokens"))
+
+    def outside():
+        for _ in range(50):
+            minted.append(allocator.next_id("ticket_tokens"))
+
+    threads = [threading.Thread(target=in_transactions), threading.Thread(target=outside)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=20)
+    assert not any(thread.is_alive() for thread in threads)
+    assert sorted(minted) == list(range(1, 101))
@@ -0,0 +1,57 @@
+import pytest
+
+from json_writer import GroupCommitWriter
+from notification_log import NotificationLog
+
+EMPTY = {"notifications": []}
+
+
+def notification(number, read=False):
+    return {"notification_id": f"notif_{number}", "user_id": 2, "read": read}
+
+
+@pytest.fixture
+def logs(tmp_path):
+    """Two notification logs on the same files, as two terminals would have."""
+    def open_log():
+        return NotificationLog(str(tmp_path / "notifications.json"), GroupCommitWriter(str(tmp_path)), EMPTY)
+    return open_log(), open_log()
+
+
+def test_other_terminal_replays_appended_changes(logs):
+    writer, reader = logs
+    writer.load()
+    assert reader.load() == EMPTY
+
+    writer.append(inserted=[notification(n) for n in range(1, 6)])
+    writer.append(updated=[notification(2, read=True)], deleted=[notification(4)])
+    writer.append(inserted=[notification(6)], deleted=[notification(1)])
+
+    assert reader.load()["notifications"] == [
+        notification(2, read=True), notification(3), notification(5), notification(6)]
+
+
+def test_compaction_keeps_every_change(logs):
+    writer, reader = logs
+    writer.load()
+    reader.load()
+    writer.append(inserted=[notification(n) for n in range(1, 4)])
+    reader.append(updated=[notification(3, read=True)], deleted=[notification(1)])
+    expected = [notification(2), notification(3, read=True)]
+
+    writer.compact()
+    assert writer.load()["notifications"] == expected
+    assert reader.load()["notifications"] == expected
+    with open(writer.log_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 1  # just the base line
+
+
+def test_rolled_back_append_is_forgotten(logs):
+    writer, reader = logs
+    writer.load()
+    writer.writer.begin()
+    writer.append(inserted=[notification(1)])
+    writer.writer.rollback()
+    writer.rollback()
+    assert writer.load() == EMPTY
+    assert reader.load() == EMPTY
@@ -0,0 +1,56 @@
+import json
+
+from datastore import store
+from services import CheckInGate, merge_scan_logs, purchase_tickets, reconcile_scans, refund_tickets
+from services.scan_reconcile import DOUBLE_ENTRY, REFUNDED, UNKNOWN
+
+
+def buy(user_id, ticket_type, quantity):
+    result = purchase_tickets(user_id, 1, [{"type": ticket_type, "price": 20.0, "quantity": quantity}])
+    return result["tickets"][0]
+
+
+def write_csv(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("code,timestamp,count\n")
+        f.writelines(f"{code},{at},{count}\n" for code, at, count in rows)
+    return str(path)
+
+
+def test_exports_are_merged_once(data_dir):
+    regular = buy(2, "Regular", 3)
+    vip = buy(3, "VIP", 1)
+    north = write_csv(data_dir / "north.csv", [(regular["qr_code"], "01/01/2030 19:00:00", 2),
+                                               (vip["qr_code"], "01/01/2030 19:05:00", 1)])
+    south = write_csv(data_dir / "south.csv", [(regular["qr_code"], "01/01/2030 19:02:00", 1)])
+
+    # The north export read twice: its scans are duplicates
+    report = reconcile_scans([north, south, north])
+    assert (report["scans"], report["duplicates"], report["admissions"]) == (5, 2, 4)
+    assert report["tickets_updated"] == 2 and report["conflicts"] == []
+    ticket = store.ticket_index().find(2, 1, "Regular", "used")
+    assert (ticket["admitted_quantity"], ticket["used_date"]) == (3, "01/01/2030")
+
+    assert reconcile_scans([north, south])["tickets_updated"] == 0
+
+
+def test_conflicts_are_reported(data_dir):
+    regular = buy(2, "Regular", 1)
+    refunded = buy(3, "VIP", 1)
+    refund_tickets(3, 1, {"VIP": 1})
+    export = write_csv(data_dir / "gate.csv", [(regular["qr_code"], 100, 1), (regular["qr_code"], 200, 1),
+                                               (refunded["qr_code"], 300, 1), ("QR-unknown", 400, 1)])
+    kinds = {conflict["kind"] for conflict in reconcile_scans([export])["conflicts"]}
+    assert kinds == {DOUBLE_ENTRY, REFUNDED, UNKNOWN}
+
+
+def test_gate_logs_are_merged_into_tickets(data_dir):
+    code = buy(2, "Regular", 2)["qr_code"]
+    with CheckInGate(1, "north", sync=False) as gate:
+        gate.scan(code, 2)
+        gate.scan("QR-unknown")
+    with open(gate.log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"code": code, "at": 0})[:-1])  # a line still being written
+    assert merge_scan_logs(1) == 1
+    assert store.ticket_index().find(2, 1, "Regular", "used")["admitted_quantity"] == 2
+    assert merge_scan_logs(1) == 0
@@ -0,0 +1,67 @@
+import glob
+import os
+import shutil
+
+import pytest
+
+from datastore import COLLECTIONS, DataStore, JsonBackend
+from migrate_to_sqlite import migrate
+from sqlite_backend import SqliteBackend
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def json_dir(tmp_path):
+    """A copy of the repository's JSON data files."""
+    for path in glob.glob(os.path.join(REPO_DIR, "*.json")):
+        shutil.copy(path, tmp_path)
+    return str(tmp_path)
+
+
+def test_migration_round_trip(json_dir):
+    counts = migrate(json_dir)
+    source = JsonBackend(json_dir)
+    target = SqliteBackend(os.path.join(json_dir, "eventhub.db"))
+    try:
+        for name in COLLECTIONS:
+            assert target.load(name) == source.load(name), name
+    finally:
+        target.close()
+    assert counts["events"] == len(source.load("events"))
+
+
+def test_record_changes_survive_reopening(json_dir):
+    db_path = os.path.join(json_dir, "eventhub.db")
+    migrate(json_dir)
+    store = DataStore(SqliteBackend(db_path))
+    tickets = store.tickets()
+    first, second = tickets[0], tickets[1]
+    first["status"] = "used"
+    added = dict(second, ticket_id=999999)
+    tickets.remove(second)
+    tickets.append(added)
+    with store.transaction():
+        store.apply("tickets", inserted=[added], updated=[first], deleted=[second])
+    expected = [dict(t) for t in tickets]
+    store.close()
+
+    reopened = SqliteBackend(db_path)
+    try:
+        assert reopened.load("tickets") == expected
+    finally:
+        reopened.close()
+
+
+def test_rollback_discards_rows(json_dir):
+    migrate(json_dir)
+    store = DataStore(SqliteBackend(os.path.join(json_dir, "eventhub.db")))
+    before = [dict(t) for t in store.tickets()]
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            ticket = store.tickets()[0]
+            ticket["status"] = "used"
+            store.update("tickets", ticket)
+            raise RuntimeError("abort")
+    assert store.tickets() == before
+    store.close()
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+import services.holds
+from datastore import store
+from services import HoldRegistry, SoldOutError, purchase_tickets
+from services.holds import holds
+
+
+def regular(quantity):
+    return [{"type": "Regular", "price": 20.0, "quantity": quantity}]
+
+
+@pytest.fixture
+def clock():
+    now = [1000.0]
+    return now
+
+
+@pytest.fixture
+def registries(data_dir, clock):
+    """Two registries on the same log, as two terminals would have."""
+    path = str(data_dir / services.holds.HOLDS_FILE)
+    return HoldRegistry(path, clock=lambda: clock[0]), HoldRegistry(path, clock=lambda: clock[0])
+
+
+def test_held_tickets_are_not_oversold(data_dir):
+    holds.place("cart-a", 1, "Regular", 3)
+    with pytest.raises(SoldOutError):
+        purchase_tickets(2, 1, regular(3), session="cart-b")
+    purchase_tickets(2, 1, regular(2), session="cart-b")
+    # The cart's own holds count as available to it
+    purchase_tickets(3, 1, regular(3), session="cart-a")
+
+    assert store.find_event(1)["ticket_types"][0]["total_quantity"] == 0
+    assert holds.held(1, "Regular") == 0
+    with pytest.raises(SoldOutError):
+        holds.place("cart-c", 1, "Regular", 1)
+
+
+def test_held_can_leave_out_a_session(registries):
+    first, second = registries
+    first.place("cart-a", 1, "Regular", 2)
+    first.place("cart-a", 1, "Regular", 1)
+    hold = first.place("cart-b", 1, "Regular", 1)
+    assert second.held(1, "Regular") == 4
+    assert second.held(1, "Regular", exclude_session="cart-a") == 1
+
+    second.change(hold["hold_id"], 2)
+    assert first.held(1, "Regular", exclude_session="cart-a") == 2
+    with pytest.raises(SoldOutError):
+        first.change(hold["hold_id"], 3)
+
+    assert second.release_session("cart-a") == 2
+    assert first.held(1, "Regular") == 2
+    assert first.session_holds("cart-a") == []
+
+
+def test_holds_expire_by_the_clock(registries, clock):
+    first, second = registries
+    first.place("cart-a", 1, "VIP", 2)
+    clock[0] += services.holds.HOLD_SECONDS - 1
+    assert second.held(1, "VIP") == 2
+    clock[0] += 1
+    assert second.held(1, "VIP") == 0
+    assert second.sweep() == 1
+    second.place("cart-b", 1, "VIP", 2)
+    assert first.held(1, "VIP") == 2
+
+
+def test_log_is_compacted(registries, monkeypatch):
+    monkeypatch.setattr(services.holds, "COMPACT_BYTES", 1024)
+    first, second = registries
+    kept = first.place("cart-a", 1, "VIP", 1)
+    for _ in range(100):
+        hold = second.place("cart-b", 1, "Regular", 1)
+        first.release(hold["hold_id"])
+    assert os.path.getsize(first.path) < 4 * 1024
+    assert second.get(kept["hold_id"]) == kept
+    assert second.held(1, "Regular") == 0
+    assert first.held(1, "VIP") == 1
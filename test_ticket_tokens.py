@@ -0,0 +1,71 @@
+import pytest
+
+from datastore import store
+from services import (InvalidTokenError, TicketTokens, purchase_tickets, refund_tickets, request_transfer,
+                      respond_to_transfer)
+from services.ticket_tokens import tokens
+
+
+def buy(user_id, quantity):
+    result = purchase_tickets(user_id, 1, [{"type": "Regular", "price": 20.0, "quantity": quantity}])
+    return result["tickets"][0]
+
+
+def test_tokens_verify_offline(data_dir):
+    clock = [1000.0]
+    issuer = TicketTokens(str(data_dir), clock=lambda: clock[0])
+    ticket = {"ticket_id": 7, "event_id": 1, "quantity_bought": 2, "ticket_type": "VIP"}
+    token = issuer.issue(ticket, expires=2000)
+
+    fields = TicketTokens(str(data_dir), clock=lambda: clock[0]).verify(token, event_id=1)
+    assert (fields["ticket_id"], fields["quantity"], fields["ticket_type"]) == (7, 2, "VIP")
+    prefix, payload, signature = token.split(".")
+    for bad in (f"{prefix}.{payload}.{signature[::-1]}", "QR-7", ""):
+        with pytest.raises(InvalidTokenError):
+            issuer.verify(bad)
+    with pytest.raises(InvalidTokenError):
+        issuer.verify(token, event_id=2)
+    clock[0] = 2001
+    with pytest.raises(InvalidTokenError):
+        issuer.verify(token)
+
+
+def test_refund_revokes_the_old_token(data_dir):
+    first = buy(2, 3)["qr_code"]
+    refund_tickets(2, 1, {"Regular": 1})
+    with pytest.raises(InvalidTokenError):
+        tokens.verify(first)
+    second = store.ticket_index().find(2, 1, "Regular", "valid")["qr_code"]
+    assert tokens.verify(second)["quantity"] == 2
+
+    refund_tickets(2, 1, {"Regular": 2})
+    with pytest.raises(InvalidTokenError):
+        tokens.verify(second)
+
+
+def test_transfer_revokes_the_sender_token(data_dir):
+    ticket = buy(2, 3)
+    old = ticket["qr_code"]
+    sender, recipient = store.find_user(2), store.find_user(3)
+    request = request_transfer(sender, recipient, store.find_event(1), [{"ticket": dict(ticket), "quantity": 1}])
+    assert tokens.verify(old)["quantity"] == 3
+
+    respond_to_transfer(request["request_id"], True)
+    with pytest.raises(InvalidTokenError):
+        tokens.verify(old)
+    kept = store.ticket_index().find(2, 1, "Regular", "valid")["qr_code"]
+    moved = store.ticket_index().find(3, 1, "Regular", "valid")["qr_code"]
+    assert tokens.verify(kept)["quantity"] == 2
+    assert tokens.verify(moved)["quantity"] == 1
+    with pytest.raises(ValueError):
+        respond_to_transfer(request["request_id"], True)
+
+
+def test_revocation_rolls_back_with_the_transaction(data_dir):
+    token = buy(2, 1)["qr_code"]
+    with pytest.raises(RuntimeError):
+        with store.exclusive():
+            tokens.revoke([token])
+            assert tokens.is_revoked(tokens.decode(token)["token_id"])
+            raise RuntimeError("abort")
+    assert tokens.verify(token)["quantity"] == 1
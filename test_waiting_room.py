@@ -0,0 +1,64 @@
+import pytest
+
+from services import NotAdmittedError, WaitingRoom, purchase_tickets
+from services.waiting_room import ROOMS_FILE, waiting_room
+
+
+@pytest.fixture
+def clock():
+    return [1000.0]
+
+
+@pytest.fixture
+def room(data_dir, clock):
+    return WaitingRoom(str(data_dir / ROOMS_FILE), clock=lambda: clock[0])
+
+
+def test_buyers_are_admitted_in_order_at_the_rate(room, clock):
+    room.open(1, rate=2)
+    tokens = [room.join(1) for _ in range(5)]
+    assert [room.status(1, t)["position"] for t in tokens] == [1, 2, 3, 4, 5]
+
+    clock[0] += 1
+    assert [room.is_admitted(1, t) for t in tokens] == [True, True, False, False, False]
+    with pytest.raises(NotAdmittedError):
+        room.check(1, tokens[2])
+    assert room.summary(1) == {"rate": 2.0, "joined": 5, "admitted": 2, "waiting": 3}
+
+
+def test_quiet_spells_are_not_banked(room, clock):
+    room.open(1, rate=1)
+    clock[0] += 60
+    tokens = [room.join(1) for _ in range(3)]
+    assert not room.is_admitted(1, tokens[0])
+    clock[0] += 1
+    assert [room.is_admitted(1, t) for t in tokens] == [True, False, False]
+
+
+def test_forged_tokens_are_refused(room):
+    room.open(1, rate=1)
+    token = room.join(1)
+    event_id, seq, signature = token.split(".")
+    for forged in (f"{event_id}.{seq}.{'0' * len(signature)}", f"2.{seq}.{signature}", f"{event_id}.7.{signature}"):
+        with pytest.raises(NotAdmittedError):
+            room.status(1, forged)
+
+
+def test_closed_room_admits_everyone(room):
+    assert room.join(1) is None
+    room.open(1, rate=1)
+    token = room.join(1)
+    room.close(1)
+    assert room.is_admitted(1, token)
+    assert room.is_admitted(1, None)
+
+
+def test_checkout_needs_admission(data_dir):
+    waiting_room.open(1, rate=0.001)
+    items = [{"type": "Regular", "price": 20.0, "quantity": 1}]
+    with pytest.raises(NotAdmittedError):
+        purchase_tickets(2, 1, items)
+    with pytest.raises(NotAdmittedError):
+        purchase_tickets(3, 1, items, admission=waiting_room.join(1))
+    waiting_room.close(1)
+    purchase_tickets(3, 1, items)
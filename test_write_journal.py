@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from datastore import DataStore, JsonBackend, read_json, write_json
+from json_writer import JOURNAL_NAME, GroupCommitWriter, commit_files
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_interrupted_commit_is_finished_on_restart(tmp_path, monkeypatch):
+    a, b = str(tmp_path / "a.json"), str(tmp_path / "b.json")
+    journal = str(tmp_path / JOURNAL_NAME)
+    for path in (a, b):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("old")
+
+    real_replace = os.replace
+    renames = []
+
+    def crash_after_first_file(src, dst):
+        if dst in (a, b):
+            if renames:
+                raise KeyboardInterrupt("power cut")
+            renames.append(dst)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", crash_after_first_file)
+    with pytest.raises(KeyboardInterrupt):
+        commit_files({a: "new a", b: "new b"}, journal)
+    monkeypatch.undo()
+
+    assert os.path.exists(journal)
+    assert sorted([read(a), read(b)]) == ["new a", "old"]
+
+    GroupCommitWriter(str(tmp_path))
+    assert (read(a), read(b)) == ("new a", "new b")
+    assert not os.path.exists(journal)
+
+
+def test_transaction_reaches_disk_only_on_commit(tmp_path):
+    write_json(str(tmp_path / "users.json"), [{"user_id": 1}])
+    store = DataStore(JsonBackend(str(tmp_path)))
+    with store.transaction():
+        store.append("users", {"user_id": 2})
+        store.append("events", {"event_id": 1, "ticket_types": []})
+        assert read_json(str(tmp_path / "users.json"), []) == [{"user_id": 1}]
+        assert not os.path.exists(tmp_path / "events.json")
+    assert read_json(str(tmp_path / "users.json"), []) == [{"user_id": 1}, {"user_id": 2}]
+    assert read_json(str(tmp_path / "events.json"), []) == [{"event_id": 1, "ticket_types": []}]
+    assert not os.path.exists(tmp_path / JOURNAL_NAME)
+
+
+def test_rollback_drops_only_the_changed_collections(tmp_path):
+    write_json(str(tmp_path / "users.json"), [{"user_id": 1}])
+    write_json(str(tmp_path / "events.json"), [{"event_id": 1, "ticket_types": []}])
+    store = DataStore(JsonBackend(str(tmp_path)))
+    events = store.events()
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            user = store.users()[0]
+            user["credit"] = "100"
+            store.update("users", user)
+            raise RuntimeError("abort")
+    assert store.users() == [{"user_id": 1}]
+    assert store.events() is events
+    assert read_json(str(tmp_path / "users.json"), []) == [{"user_id": 1}]
@@ -0,0 +1,100 @@
+class TicketIndex:
+    """Secondary indexes over the tickets list.
+
+    Buckets map a key to {id(ticket): ticket}, so adding and removing a
+    ticket is constant time and tickets come back in the order they were
+    indexed. ticket_id and qr_code are not unique in tickets.json, so every
+    index except the purchase key returns all matching tickets.
+    """
+
+    def __init__(self, tickets):
+        self.source = tickets
+        self.rebuild()
+
+    def rebuild(self):
+        """Index every ticket of the source list from scratch."""
+        self._by_user = {}
+        self._by_event = {}
+        self._by_user_event = {}
+        self._by_purchase = {}
+        self._by_qr = {}
+        self._keys = {}  # id(ticket) -> keys it is indexed under
+        for ticket in self.source:
+            self._add(ticket)
+
+    def apply(self, inserted=(), updated=(), deleted=()):
+        """Bring the indexes up to date after tickets were added, changed or removed."""
+        for ticket in deleted:
+            self._discard(ticket)
+        for ticket in updated:
+            if self._keys.get(id(ticket)) != self._keys_of(ticket):
+                self._discard(ticket)
+                self._add(ticket)
+        for ticket in inserted:
+            self._add(ticket)
+
+    # Lookups
+
+    def by_user(self, user_id):
+        """Return the tickets owned by a user."""
+        return list(self._by_user.get(user_id, {}).values())
+
+    def by_event(self, event_id):
+        """Return the tickets of an event."""
+        return list(self._by_event.get(event_id, {}).values())
+
+    def by_user_event(self, user_id, event_id):
+        """Return the tickets a user holds for an event."""
+        return list(self._by_user_event.get((user_id, event_id), {}).values())
+
+    def has_ticket(self, user_id, event_id):
+        """Return True if the user holds any ticket for the event."""
+        return bool(self._by_user_event.get((user_id, event_id)))
+
+    def event_ids_for_user(self, user_id):
+        """Return the ids of the events a user holds tickets for."""
+        return {self._keys[key][2] for key in self._by_user.get(user_id, {})}
+
+    def find(self, user_id, event_id, ticket_type, status="valid"):
+        """Return the first ticket matching user, event, type and status, or None."""
+        bucket = self._by_purchase.get((user_id, event_id, ticket_type, status))
+        if not bucket:
+            return None
+        return next(iter(bucket.values()))
+
+    def by_qr_code(self, qr_code):
+        """Return the tickets carrying a QR code."""
+        return list(self._by_qr.get(qr_code, {}).values())
+
+    # Helpers
+
+    def _keys_of(self, ticket):
+        user_id = ticket.get("user_id")
+        event_id = ticket.get("event_id")
+        return (
+            user_id,
+            (user_id, event_id),
+            event_id,
+            (user_id, event_id, ticket.get("ticket_type"), ticket.get("status")),
+            ticket.get("qr_code"),
+        )
+
+    def _indexes(self):
+        return (self._by_user, self._by_user_event, self._by_event, self._by_purchase, self._by_qr)
+
+    def _add(self, ticket):
+        keys = self._keys_of(ticket)
+        self._keys[id(ticket)] = keys
+        for index, key in zip(self._indexes(), keys):
+            index.setdefault(key, {})[id(ticket)] = ticket
+
+    def _discard(self, ticket):
+        keys = self._keys.pop(id(ticket), None)
+        if keys is None:
+            return
+        for index, key in zip(self._indexes(), keys):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(id(ticket), None)
+                if not bucket:
+                    del index[key]
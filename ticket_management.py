@@ -3,10 +3,11 @@ from PyQt5.QtWidgets import (
     QScrollArea, QGroupBox, QMessageBox, QDialog, QLineEdit, QDialogButtonBox,
     QGraphicsDropShadowEffect, QComboBox, QSpinBox, QFormLayout, QFileDialog
 )
-from PyQt5.QtGui import QFont, QPixmap, QColor
+from PyQt5.QtGui import QFont, QColor
 from PyQt5.QtCore import Qt
 from datetime import datetime
 import json
+import logging
 import os
 import tempfile
 import subprocess
@@ -23,6 +24,15 @@ except ImportError:
     REPORTLAB_AVAILABLE = False
 
 from ticket_refund import TicketRefundDialog
+from datastore import store
+from image_cache import cached_pixmap
+from image_loader import load_into_label
+from io_executor import io_executor
+from metrics import timed
+from services import can_cancel_tickets, request_transfer, respond_to_transfer
+from app_logging import get_logger
+
+log = get_logger(__name__)
 
 class TicketManagementMixin:
     """Mixin class to add ticket management functionality to the main UI."""
@@ -49,12 +59,8 @@ class TicketManagementMixin:
                 item.widget().deleteLater()
         
         try:
-            # Load tickets and events
-            with open("tickets.json", "r", encoding="utf-8") as f:
-                tickets = json.load(f)
-            
-            # Filter tickets for current user
-            user_tickets = [t for t in tickets if t["user_id"] == self.current_user["user_id"]]
+            # Tickets of the current user
+            user_tickets = store.ticket_index().by_user(self.current_user["user_id"])
             
             if not user_tickets:
                 no_tickets_label = QLabel("You don't have any tickets yet.")
@@ -85,7 +91,9 @@ class TicketManagementMixin:
             upcoming_tickets = []
             past_tickets = []
             
-            print(f"Debug - Current date: {current_date}")
+            debug = log.isEnabledFor(logging.DEBUG)
+            if debug:
+                log.debug("Current date: %s", current_date)
             
             for ticket in user_tickets:
                 # Get event information
@@ -93,19 +101,20 @@ class TicketManagementMixin:
                 if event:
                     try:
                         event_date = datetime.strptime(event["start_date"], "%d/%m/%Y").date()
-                        print(f"Debug - Ticket {ticket['ticket_id']}: Event {event['event_id']} ({event['title']}) on {event_date}, Status: {ticket['status']}")
                         if event_date >= current_date:
                             upcoming_tickets.append(ticket)
-                            print(f"Debug - Added to upcoming tickets")
                         else:
                             past_tickets.append(ticket)
-                            print(f"Debug - Added to past tickets")
+                        if debug:
+                            log.debug("Ticket %s: Event %s (%s) on %s, Status: %s, %s", ticket['ticket_id'], event['event_id'],
+                                      event['title'], event_date, ticket['status'], "upcoming" if event_date >= current_date else "past")
                     except ValueError as e:
-                        print(f"Debug - Date parsing error for event {event['event_id']}: {e}")
+                        if debug:
+                            log.debug("Date parsing error for event %s: %s", event['event_id'], e)
                         # If date parsing fails, put in upcoming by default
                         upcoming_tickets.append(ticket)
-                else:
-                    print(f"Debug - No event found for ticket {ticket['ticket_id']} (event_id: {ticket['event_id']})")
+                elif debug:
+                    log.debug("No event found for ticket %s (event_id: %s)", ticket['ticket_id'], ticket['event_id'])
             
             # Create left column for upcoming tickets
             left_column = QWidget()
@@ -251,9 +260,7 @@ class TicketManagementMixin:
         image_layout.setContentsMargins(0, 0, 0, 0)
         
         image_label = QLabel()
-        pixmap = QPixmap(event.get("image", "event_images/default_event.jpg"))
-        scaled_pixmap = pixmap.scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        image_label.setPixmap(scaled_pixmap)
+        load_into_label(image_label, event.get("image", "event_images/default_event.jpg"), 80, 80)
         image_label.setAlignment(Qt.AlignCenter)
         image_layout.addWidget(image_label)
         ticket_layout.addWidget(image_container)
@@ -345,9 +352,7 @@ class TicketManagementMixin:
         
         # Event Image
         image_label = QLabel()
-        pixmap = QPixmap(event.get("image", "event_images/default_event.jpg"))
-        scaled_pixmap = pixmap.scaled(300, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        image_label.setPixmap(scaled_pixmap)
+        load_into_label(image_label, event.get("image", "event_images/default_event.jpg"), 300, 200)
         content_layout.addWidget(image_label, alignment=Qt.AlignCenter)
         
         # Event Details Section
@@ -625,26 +630,21 @@ class TicketManagementMixin:
             if not event:
                 return
             
-            cancel_date_str = event.get("ticket_cancel_availability")
-            if cancel_date_str:
-                try:
-                    cancel_date = datetime.strptime(cancel_date_str, "%d/%m/%Y %H:%M")
-                    current_date = datetime.now()
-                    
-                    if current_date > cancel_date:
-                        msg = QMessageBox()
-                        msg.setIcon(QMessageBox.Warning)
-                        msg.setWindowTitle("Cancellation Not Allowed")
-                        msg.setText("Η περιοδος ακυρωσης των εισιτηριων εχει περασει")
-                        msg.exec_()
-                        return
-                except ValueError:
+            try:
+                if not can_cancel_tickets(event):
                     msg = QMessageBox()
                     msg.setIcon(QMessageBox.Warning)
-                    msg.setWindowTitle("Error")
-                    msg.setText("Error checking cancellation date.")
+                    msg.setWindowTitle("Cancellation Not Allowed")
+                    msg.setText("Η περιοδος ακυρωσης των εισιτηριων εχει περασει")
                     msg.exec_()
                     return
+            except ValueError:
+                msg = QMessageBox()
+                msg.setIcon(QMessageBox.Warning)
+                msg.setWindowTitle("Error")
+                msg.setText("Error checking cancellation date.")
+                msg.exec_()
+                return
 
             # Show the refund dialog
             dialog = TicketRefundDialog(ticket_group, self)
@@ -687,7 +687,7 @@ class TicketManagementMixin:
                     if hasattr(self, 'toolbar'):
                         self.toolbar.insertWidget(self.toolbar.actions()[-1], self.credit_label)
         except Exception as e:
-            print(f"Error updating credit display: {str(e)}")
+            log.error("Error updating credit display: %s", e)
 
     def show_event_passed_message(self):
         """Show message when trying to download ticket for passed event."""
@@ -766,74 +766,22 @@ Please present this ticket at the event entrance
 
     def handle_transfer_response(self, notification, response):
         """Handle recipient's response to a ticket transfer request."""
+        request_id = notification.get("transfer_request_id")
+        if not request_id:
+            self.on_transfer_response_failed(ValueError("Transfer request ID not found in notification"))
+            return
+
+        # Tickets and the transfer request are written on the I/O thread
+        io_executor().submit(
+            respond_to_transfer, request_id, response, notification.get("notification_id"),
+            on_success=lambda request: self.on_transfer_response_committed(response),
+            on_error=self.on_transfer_response_failed,
+            description="Μεταφορά εισιτηρίων...",
+        )
+
+    def on_transfer_response_committed(self, response):
         try:
-            # Get transfer request data
-            with open("ticket_transfer_requests.json", "r", encoding="utf-8") as f:
-                transfer_data = json.load(f)
-            
-            request_id = notification.get("transfer_request_id")
-            if not request_id:
-                raise ValueError("Transfer request ID not found in notification")
-            
-            # Find the transfer request
-            request = next((req for req in transfer_data["transfer_requests"] 
-                          if req["request_id"] == request_id), None)
-            
-            if not request:
-                raise ValueError("Transfer request not found")
-            
-            # Update request status
-            request["status"] = "accepted" if response else "rejected"
-            request["response_date"] = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-            
-            # If accepted, update ticket ownership
-            if response:
-                with open("tickets.json", "r", encoding="utf-8") as f:
-                    tickets_data = json.load(f)
-                
-                # Update each transferred ticket
-                for transfer_item in request["tickets"]:
-                    ticket_data = transfer_item["ticket"]
-                    quantity = transfer_item["quantity"]
-                    
-                    # Find and update the ticket
-                    ticket = next((t for t in tickets_data if t["ticket_id"] == ticket_data["ticket_id"]), None)
-                    if ticket:
-                        if ticket["quantity_bought"] == quantity:
-                            # Transfer entire ticket
-                            ticket["user_id"] = request["recipient"]["user_id"]
-                        else:
-                            # Split ticket and create new one for recipient
-                            new_ticket = ticket.copy()
-                            new_ticket["ticket_id"] = max(t["ticket_id"] for t in tickets_data) + 1
-                            new_ticket["user_id"] = request["recipient"]["user_id"]
-                            new_ticket["quantity_bought"] = quantity
-                            tickets_data.append(new_ticket)
-                            
-                            # Update original ticket quantity
-                            ticket["quantity_bought"] -= quantity
-                
-                # Save updated tickets
-                with open("tickets.json", "w", encoding="utf-8") as f:
-                    json.dump(tickets_data, f, ensure_ascii=False, indent=4)
-            
-            # Save updated transfer requests
-            with open("ticket_transfer_requests.json", "w", encoding="utf-8") as f:
-                json.dump(transfer_data, f, ensure_ascii=False, indent=4)
-            
-            # Send notification to original sender
             status_text = "accepted" if response else "rejected"
-            self.parent_app.add_notification(
-                request["sender"]["user_id"],
-                f"Ticket Transfer {status_text.title()}",
-                f"Your ticket transfer request for '{request['event']['title']}' has been {status_text} by {request['recipient']['email']}.",
-                "Ticket Transfers",
-                {
-                    "type": "transfer_response",
-                    "transfer_request_id": request_id,
-                    "status": status_text
-                }
-            )
             
             # Show success message
             msg = QMessageBox()
@@ -845,21 +793,25 @@ Please present this ticket at the event entrance
             # Refresh tickets display and event data
             self.display_my_tickets()
             self.refresh_event_data()
+            if "Notifications" in self.private_tabs:
+                self.private_tabs["Notifications"].load_notifications()
             
         except Exception as e:
-            print(f"Error handling transfer response: {str(e)}")
-            msg = QMessageBox()
-            msg.setIcon(QMessageBox.Critical)
-            msg.setWindowTitle("Error")
-            msg.setText(f"Error handling transfer response: {str(e)}")
-            msg.exec_()
+            self.on_transfer_response_failed(e)
+
+    def on_transfer_response_failed(self, e):
+        log.error("Error handling transfer response: %s", e)
+        msg = QMessageBox()
+        msg.setIcon(QMessageBox.Critical)
+        msg.setWindowTitle("Error")
+        msg.setText(f"Error handling transfer response: {str(e)}")
+        msg.exec_()
 
     def refresh_event_data(self):
         """Refresh event data and update UI."""
         try:
             # Reload events from file
-            with open("events.json", "r", encoding="utf-8") as f:
-                self.events = json.load(f)
+            self.events = store.events()
             
             # Update UI if we're in the events tab
             current_tab = self.tabs.tabText(self.tabs.currentIndex())
@@ -869,7 +821,7 @@ Please present this ticket at the event entrance
                 self.display_my_tickets()
                 
         except Exception as e:
-            print(f"Error refreshing event data: {str(e)}")
+            log.error("Error refreshing event data: %s", e)
 
 
 class TicketTransferDialog(QDialog):
@@ -888,16 +840,11 @@ class TicketTransferDialog(QDialog):
     def load_user_tickets(self):
         """Load all tickets for the current user for the same event."""
         try:
-            with open("tickets.json", "r", encoding="utf-8") as f:
-                tickets = json.load(f)
-            
-            # Get all tickets for this user and event
-            self.user_tickets = [
-                t for t in tickets 
-                if t["user_id"] == self.parent_app.current_user["user_id"] 
-                and t["event_id"] == self.ticket["event_id"]
-                and t["status"] == "valid"  # Only valid tickets can be transferred
-            ]
+            tickets = store.ticket_index().by_user_event(
+                self.parent_app.current_user["user_id"], self.ticket["event_id"])
+            
+            # Only valid tickets can be transferred
+            self.user_tickets = [t for t in tickets if t["status"] == "valid"]
             
         except (FileNotFoundError, json.JSONDecodeError):
             self.user_tickets = []
@@ -1125,9 +1072,9 @@ class TicketTransferDialog(QDialog):
     def transfer_tickets(self):
         """Process the ticket transfer with support for multiple tickets."""
         try:
-            print("Debug - Starting transfer_tickets method")
+            log.debug("Starting transfer_tickets method")
             recipient_email = self.email_input.text().strip()
-            print(f"Debug - Recipient email: '{recipient_email}'")
+            log.debug("Recipient email: '%s'", recipient_email)
             
             if not recipient_email:
                 msg = QMessageBox()
@@ -1137,12 +1084,12 @@ class TicketTransferDialog(QDialog):
                 msg.exec_()
                 return
             
-            print("Debug - Starting ticket collection")
+            log.debug("Starting ticket collection")
             # Collect selected tickets
             tickets_to_transfer = []
             
             if len(self.user_tickets) > 1:
-                print("Debug - Multiple ticket types detected")
+                log.debug("Multiple ticket types detected")
                 # Multiple ticket types - check selections
                 total_selected = 0
                 for ticket_type, selection_data in self.ticket_selections.items():
@@ -1175,17 +1122,17 @@ class TicketTransferDialog(QDialog):
                     msg.exec_()
                     return
             else:
-                print("Debug - Single ticket transfer")
+                log.debug("Single ticket transfer")
                 # Single ticket transfer
                 tickets_to_transfer.append({
                     'ticket': self.ticket,
                     'quantity': self.single_ticket_spinbox.value()
                 })
             
-            print(f"Debug - Tickets to transfer: {len(tickets_to_transfer)}")
+            log.debug("Tickets to transfer: %s", len(tickets_to_transfer))
             
         except Exception as e:
-            print(f"Debug - Error in ticket collection: {str(e)}")
+            log.error("Error in ticket collection: %s", e)
             msg = QMessageBox()
             msg.setIcon(QMessageBox.Critical)
             msg.setWindowTitle("Error")
@@ -1194,14 +1141,14 @@ class TicketTransferDialog(QDialog):
             return
         
         try:
-            print("Debug - Starting user lookup")
+            log.debug("Starting user lookup")
             # Check if recipient exists and is an attendee
-            with open("users.json", "r", encoding="utf-8") as f:
-                users = json.load(f)
+            users = store.users()
             
             # Debug: Print the email we're looking for
-            print(f"Debug - Looking for email: '{recipient_email}'")
-            print(f"Debug - Available emails: {[u.get('email', 'NO_EMAIL') for u in users]}")
+            log.debug("Looking for email: '%s'", recipient_email)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Available emails: %s", [u.get('email', 'NO_EMAIL') for u in users])
             
             recipient = next((u for u in users if u.get("email", "").strip().lower() == recipient_email.strip().lower()), None)
             
@@ -1214,7 +1161,7 @@ class TicketTransferDialog(QDialog):
                 return
             
             # Debug: Print recipient data
-            print(f"Debug - Found recipient: {recipient}")
+            log.debug("Found recipient: %s", recipient)
             
             if recipient.get("type") != "Attendee":
                 msg = QMessageBox()
@@ -1225,7 +1172,7 @@ class TicketTransferDialog(QDialog):
                 return
                 
         except Exception as e:
-            print(f"Debug - Error in user lookup: {str(e)}")
+            log.error("Error in user lookup: %s", e)
             msg = QMessageBox()
             msg.setIcon(QMessageBox.Critical)
             msg.setWindowTitle("Error")
@@ -1234,7 +1181,7 @@ class TicketTransferDialog(QDialog):
             return
         
         try:
-            print("Debug - Starting event lookup")
+            log.debug("Starting event lookup")
             # Create transfer notification
             event = next((e for e in self.parent_app.events if e["event_id"] == self.ticket["event_id"]), None)
             
@@ -1246,10 +1193,10 @@ class TicketTransferDialog(QDialog):
                 msg.exec_()
                 return
             
-            print(f"Debug - Found event: {event.get('title', 'NO_TITLE')}")
+            log.debug("Found event: %s", event.get('title', 'NO_TITLE'))
             
         except Exception as e:
-            print(f"Debug - Error in event lookup: {str(e)}")
+            log.error("Error in event lookup: %s", e)
             msg = QMessageBox()
             msg.setIcon(QMessageBox.Critical)
             msg.setWindowTitle("Error")
@@ -1258,7 +1205,7 @@ class TicketTransferDialog(QDialog):
             return
         
         try:
-            print("Debug - Creating transfer summary")
+            log.debug("Creating transfer summary")
             # Create summary of tickets being transferred
             transfer_summary = []
             for item in tickets_to_transfer:
@@ -1267,10 +1214,10 @@ class TicketTransferDialog(QDialog):
                 transfer_summary.append(f"{ticket['ticket_type']} (Qty: {quantity})")
             
             summary_text = ", ".join(transfer_summary)
-            print(f"Debug - Summary text: {summary_text}")
+            log.debug("Summary text: %s", summary_text)
             
         except Exception as e:
-            print(f"Debug - Error creating summary: {str(e)}")
+            log.error("Error creating summary: %s", e)
             msg = QMessageBox()
             msg.setIcon(QMessageBox.Critical)
             msg.setWindowTitle("Error")
@@ -1279,7 +1226,7 @@ class TicketTransferDialog(QDialog):
             return
         
         try:
-            print("Debug - Validating current user")
+            log.debug("Validating current user")
             # Check if current_user data is valid
             if not isinstance(self.parent_app.current_user, dict):
                 msg = QMessageBox()
@@ -1290,8 +1237,8 @@ class TicketTransferDialog(QDialog):
                 return
             
             # Debug: Print current user data
-            print(f"Debug - Current user: {self.parent_app.current_user}")
-            print(f"Debug - Recipient: {recipient}")
+            log.debug("Current user: %s", self.parent_app.current_user)
+            log.debug("Recipient: %s", recipient)
             
             # Safely access user data with fallbacks
             sender_name = self.parent_app.current_user.get('name', 'Unknown')
@@ -1299,11 +1246,11 @@ class TicketTransferDialog(QDialog):
             sender_id = self.parent_app.current_user.get('user_id', 0)
             recipient_id = recipient.get('user_id', 0)
             
-            print(f"Debug - Sender: {sender_name} {sender_surname} (ID: {sender_id})")
-            print(f"Debug - Recipient ID: {recipient_id}")
+            log.debug("Sender: %s %s (ID: %s)", sender_name, sender_surname, sender_id)
+            log.debug("Recipient ID: %s", recipient_id)
             
         except Exception as e:
-            print(f"Debug - Error validating user data: {str(e)}")
+            log.error("Error validating user data: %s", e)
             msg = QMessageBox()
             msg.setIcon(QMessageBox.Critical)
             msg.setWindowTitle("Error")
@@ -1312,96 +1259,40 @@ class TicketTransferDialog(QDialog):
             return
         
         try:
-            print("Debug - Creating notification data")
-            # Generate a unique transfer request ID
-            transfer_request_id = self.generate_transfer_request_id()
-            
-            # Create transfer request data
-            transfer_request = {
-                "request_id": transfer_request_id,
-                "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-                "status": "pending",
-                "sender": {
-                    "user_id": sender_id,
-                    "name": sender_name,
-                    "surname": sender_surname
-                },
-                "recipient": {
-                    "user_id": recipient_id,
-                    "email": recipient_email
-                },
-                "event": {
-                    "event_id": event["event_id"],
-                    "title": event["title"]
-                },
-                "tickets": tickets_to_transfer
-            }
-            
-            # Save transfer request
-            try:
-                with open("ticket_transfer_requests.json", "r", encoding="utf-8") as f:
-                    transfer_data = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError):
-                transfer_data = {"transfer_requests": []}
-            
-            transfer_data["transfer_requests"].append(transfer_request)
-            
-            with open("ticket_transfer_requests.json", "w", encoding="utf-8") as f:
-                json.dump(transfer_data, f, ensure_ascii=False, indent=4)
-            
-            # Create notification data
-            notification_data = {
-                "type": "ticket_transfer",
-                "transfer_request_id": transfer_request_id,
-                "sender_id": sender_id,
-                "sender_name": f"{sender_name} {sender_surname}",
-                "event_title": event["title"],
-                "tickets": tickets_to_transfer
-            }
-            
-            success = self.parent_app.add_notification(
-                recipient_id,
-                "Ticket Transfer Request",
-                f"You have received a ticket transfer request for '{event['title']}' from {sender_name} {sender_surname}. Tickets: {summary_text}",
-                "Ticket Transfers",
-                notification_data
+            log.debug("Creating notification data")
+            # Save the transfer request and notify the recipient on the I/O thread
+            self.setEnabled(False)
+            io_executor().submit(
+                request_transfer, self.parent_app.current_user, recipient, event, tickets_to_transfer, summary_text,
+                on_success=lambda _: self.on_transfer_saved(recipient_email, summary_text),
+                on_error=self.on_transfer_failed,
+                description="Αποστολή αιτήματος μεταφοράς...",
             )
-            
-            if not success:
-                raise Exception("Failed to create notification")
-            
-            print("Debug - Notification added successfully")
-            
-            # Show success message
-            msg = QMessageBox()
-            msg.setIcon(QMessageBox.Information)
-            msg.setWindowTitle("Transfer Request Sent")
-            msg.setText(f"Transfer request has been sent to {recipient_email}. They will receive a notification to accept or decline the transfer.\n\nTickets: {summary_text}")
-            msg.exec_()
-            
-            self.accept()
-            
+
         except Exception as e:
-            print(f"Debug - Error creating notification data: {str(e)}")
-            msg = QMessageBox()
-            msg.setIcon(QMessageBox.Critical)
-            msg.setWindowTitle("Error")
-            msg.setText(f"Error creating notification data: {str(e)}")
-            msg.exec_()
-    
-    def generate_transfer_request_id(self):
-        """Generate a unique transfer request ID."""
-        try:
-            with open("ticket_transfer_requests.json", "r", encoding="utf-8") as f:
-                transfer_data = json.load(f)
-            
-            if transfer_data["transfer_requests"]:
-                max_id = max(int(req["request_id"]) for req in transfer_data["transfer_requests"])
-                return str(max_id + 1)
-            else:
-                return "1"
-        except (FileNotFoundError, json.JSONDecodeError):
-            return "1"
+            self.on_transfer_failed(e)
+
+    def on_transfer_saved(self, recipient_email, summary_text):
+        """Confirm a sent transfer request and close the dialog."""
+        log.debug("Notification added successfully")
+        
+        # Show success message
+        msg = QMessageBox()
+        msg.setIcon(QMessageBox.Information)
+        msg.setWindowTitle("Transfer Request Sent")
+        msg.setText(f"Transfer request has been sent to {recipient_email}. They will receive a notification to accept or decline the transfer.\n\nTickets: {summary_text}")
+        msg.exec_()
+        
+        self.accept()
+
+    def on_transfer_failed(self, e):
+        self.setEnabled(True)
+        log.error("Error creating notification data: %s", e)
+        msg = QMessageBox()
+        msg.setIcon(QMessageBox.Critical)
+        msg.setWindowTitle("Error")
+        msg.setText(f"Error creating notification data: {str(e)}")
+        msg.exec_()
 
 class TicketPDFPreviewDialog(QDialog):
     """Dialog for previewing and downloading ticket PDF with enhanced styling."""
@@ -1463,9 +1354,8 @@ class TicketPDFPreviewDialog(QDialog):
         """)
         
         if self.event.get('image') and os.path.exists(self.event['image']):
-            pixmap = QPixmap(self.event['image'])
+            pixmap = cached_pixmap(self.event['image'], 600, 250)
             if not pixmap.isNull():
-                pixmap = pixmap.scaled(600, 250, Qt.KeepAspectRatio, Qt.SmoothTransformation)
                 image_label.setPixmap(pixmap)
                 image_label.setAlignment(Qt.AlignCenter)
         else:
@@ -1868,6 +1758,7 @@ class TicketPDFPreviewDialog(QDialog):
             )
             self.parent.download_ticket_text(self.ticket_group['tickets'][0], self.event)
     
+    @timed("ui.generate_professional_pdf")
     def generate_professional_pdf(self, file_path):
         """Generate a professional PDF with proper Greek character support."""
         from reportlab.lib.colors import HexColor, white, black
@@ -2009,12 +1900,13 @@ class TicketPDFPreviewDialog(QDialog):
             story.append(Spacer(1, 10))
             
             qr_data = [[self.ticket_group['tickets'][0]['qr_code']]]
-            qr_table = Table(qr_data, colWidths=[4*inch])
+            # Signed tokens are about 60 characters long
+            qr_table = Table(qr_data, colWidths=[6*inch])
             qr_table.setStyle(TableStyle([
                 ('BACKGROUND', (0, 0), (-1, -1), white),
                 ('TEXTCOLOR', (0, 0), (-1, -1), black),
                 ('FONTNAME', (0, 0), (-1, -1), 'Courier-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 16),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
                 ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
                 ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
                 ('GRID', (0, 0), (-1, -1), 2, primary_color),
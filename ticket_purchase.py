@@ -1,13 +1,28 @@
-import datetime
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QFormLayout, QComboBox,
     QLineEdit, QPushButton, QMessageBox, QHBoxLayout, QSpacerItem, QSizePolicy, QDialog,
     QGroupBox, QListWidget, QListWidgetItem, QDialogButtonBox, QListView
 )
-from PyQt5.QtGui import QFont, QPixmap, QIcon
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont, QIcon
+from PyQt5.QtCore import Qt, QTimer
 import os
-import json
+import uuid
+from datastore import store
+from image_cache import cached_pixmap
+from io_executor import io_executor
+from metrics import timed
+from services import NotAdmittedError, SoldOutError, cart_total, purchase_tickets
+from services.holds import holds
+from services.waiting_room import waiting_room
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+# How often the dialog checks its holds and the tickets left
+HOLDS_REFRESH_MS = 5000
+
+# How often a buyer in the waiting room sees their position updated
+QUEUE_REFRESH_MS = 1000
 
 class TicketPurchaseModal(QWidget):
     def __init__(self, event, user, parent=None):
@@ -23,10 +38,10 @@ class TicketPurchaseModal(QWidget):
             font-family: 'Helvetica';
         """)
 
+        # Tickets in the cart are held for this session until they are bought or expire
+        self.session = uuid.uuid4().hex
         self.cart = []
-        self.ticket_availability = {
-            ticket ['type']: ticket['total_quantity'] for ticket in self.event.get("ticket_types", [])
-        }
+        self.ticket_availability = holds.availability(self.event)
 
         layout = QVBoxLayout()
         self.setLayout(layout)
@@ -37,6 +52,14 @@ class TicketPurchaseModal(QWidget):
         title.setStyleSheet("color: #ff6f61;")
         layout.addWidget(title, alignment=Qt.AlignCenter)
 
+        # Position in the waiting room of a high-demand on-sale
+        self.queue_label = QLabel()
+        self.queue_label.setFont(QFont("Helvetica", 12))
+        self.queue_label.setStyleSheet("color: #6b5b95; padding: 5px;")
+        self.queue_label.setAlignment(Qt.AlignCenter)
+        self.queue_label.hide()
+        layout.addWidget(self.queue_label)
+
         # Credit display (if user has credit)
         user_credit = float(self.user.get("credit", 0))
         if user_credit > 0:
@@ -47,9 +70,8 @@ class TicketPurchaseModal(QWidget):
             layout.addWidget(credit_label)
 
         image_label = QLabel()
-        pixmap = QPixmap(event['image'])
+        pixmap = cached_pixmap(event['image'], 400, 200)
         if not pixmap.isNull():
-            pixmap = pixmap.scaled(400, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             image_label.setPixmap(pixmap)
             image_label.setAlignment(Qt.AlignCenter)
             layout.addWidget(image_label)
@@ -144,6 +166,7 @@ class TicketPurchaseModal(QWidget):
             }
         """)
         add_to_cart_btn.clicked.connect(self.add_to_cart)
+        self.add_to_cart_btn = add_to_cart_btn
 
         purchase_btn = QPushButton("Ολοκλήρωση Αγοράς")
         purchase_btn.setStyleSheet("""
@@ -159,7 +182,8 @@ class TicketPurchaseModal(QWidget):
                 background-color: #6d8b3a;
             }
         """)
-        purchase_btn.clicked.connect(self.purchase_ticket)
+        purchase_btn.clicked.connect(lambda: self.purchase_ticket())
+        self.purchase_btn = purchase_btn
 
         button_layout.addWidget(cancel_btn)
         button_layout.addWidget(add_to_cart_btn)
@@ -168,6 +192,75 @@ class TicketPurchaseModal(QWidget):
         layout.addLayout(button_layout)
         self.update_price_and_quantity()
 
+        # Drop expired holds from the cart and show what other carts freed or took
+        self.holds_timer = QTimer(self)
+        self.holds_timer.timeout.connect(self.check_holds)
+        self.holds_timer.start(HOLDS_REFRESH_MS)
+
+        # Buyers of an event with a waiting room shop once they are admitted
+        self.admission = None
+        self.queue_timer = QTimer(self)
+        self.queue_timer.timeout.connect(self.update_admission)
+        try:
+            self.admission = waiting_room.join(self.event["event_id"])
+        except Exception as e:
+            log.error("Error joining the waiting room: %s", e)
+        if self.admission is not None:
+            self.update_admission()
+            self.queue_timer.start(QUEUE_REFRESH_MS)
+
+    def reload_availability(self):
+        """Re-read the event and show the tickets left minus those held in carts (this one included)."""
+        self.event = store.find_event(self.event["event_id"]) or self.event
+        self.ticket_availability = holds.availability(self.event)
+        current = self.ticket_type_combo.currentIndex()
+        self.refresh_ticket_dropdown()
+        self.ticket_type_combo.setCurrentIndex(max(0, current))
+        self.update_price_and_quantity()
+
+    def check_holds(self):
+        """Remove cart items whose hold has expired, then refresh the availability."""
+        expired = [item for item in self.cart if holds.get(item["hold_id"]) is None]
+        if expired:
+            self.cart = [item for item in self.cart if item not in expired]
+            if hasattr(self, 'cart_dialog') and self.cart_dialog.isVisible():
+                self.update_cart_display()
+        self.reload_availability()
+        if expired:
+            QMessageBox.information(
+                self, "Η κράτηση έληξε",
+                "Η κράτηση για " + ", ".join(item["type"] for item in expired) + " έληξε και αφαιρέθηκε από το καλάθι.")
+        return not expired
+
+    def update_admission(self):
+        """Show the buyer's place in the waiting room; unlock the cart once admitted."""
+        try:
+            state = waiting_room.status(self.event["event_id"], self.admission)
+        except NotAdmittedError as e:
+            # The room was reopened since the buyer joined: take a new place in the queue
+            log.warning("Rejoining the waiting room: %s", e)
+            self.admission = waiting_room.join(self.event["event_id"])
+            state = waiting_room.status(self.event["event_id"], self.admission)
+        self.add_to_cart_btn.setEnabled(state["admitted"])
+        self.purchase_btn.setEnabled(state["admitted"])
+        if state["admitted"]:
+            self.queue_label.hide()
+            self.queue_timer.stop()
+            return
+        wait = state["eta_seconds"]
+        wait_text = f"{wait / 60:.0f} λεπτά" if wait >= 90 else f"{wait:.0f} δευτερόλεπτα"
+        self.queue_label.setText(f"Βρίσκεστε στην ουρά αναμονής: θέση {state['position']}, αναμονή περίπου {wait_text}")
+        self.queue_label.show()
+
+    def closeEvent(self, event):
+        self.holds_timer.stop()
+        self.queue_timer.stop()
+        try:
+            holds.release_session(self.session)
+        except Exception as e:
+            log.error("Error releasing cart holds: %s", e)
+        super().closeEvent(event)
+
     def refresh_ticket_dropdown(self):
         self.ticket_type_combo.clear()
         for ticket in self.event.get("ticket_types", []):
@@ -206,17 +299,24 @@ class TicketPurchaseModal(QWidget):
                 QMessageBox.warning(self, "Σφάλμα", "Μη έγκυρη ποσότητα.")
                 return
 
-            found = False
-            for item in self.cart:
-                if item["type"] == ticket_type:
+            # Hold the tickets before they go in the cart
+            item = next((item for item in self.cart if item["type"] == ticket_type), None)
+            try:
+                if item is not None and holds.get(item["hold_id"]) is not None:
+                    holds.change(item["hold_id"], item["quantity"] + qty)
                     item["quantity"] += qty
-                    found = True
-                    break
-
-            if not found:
-                self.cart.append({"type": ticket_type, "price": data["price"], "quantity": qty})
+                else:
+                    if item is not None:
+                        self.cart.remove(item)  # its hold expired: hold the whole quantity again
+                        qty += item["quantity"]
+                    hold = holds.place(self.session, self.event["event_id"], ticket_type, qty)
+                    self.cart.append({"type": ticket_type, "price": data["price"], "quantity": qty, "hold_id": hold["hold_id"]})
+            except SoldOutError as e:
+                self.reload_availability()
+                QMessageBox.warning(self, "Μη διαθέσιμα εισιτήρια", str(e))
+                return
 
-            self.ticket_availability[ticket_type] -= qty
+            self.ticket_availability = holds.availability(self.event)
             QMessageBox.information(self, "Προστέθηκε", "Το εισιτήριο προστέθηκε στο καλάθι.")
             self.quantity_input.clear()
             self.refresh_ticket_dropdown()
@@ -278,179 +378,104 @@ class TicketPurchaseModal(QWidget):
 
         item = self.cart[index]
         item['quantity'] -= 1
-        self.ticket_availability[item['type']] += 1
+        try:
+            holds.change(item['hold_id'], item['quantity'])
+        except ValueError:
+            pass  # the hold expired already
 
         if item['quantity'] <= 0:
             self.cart.pop(index)
+        self.ticket_availability = holds.availability(self.event)
 
         self.refresh_ticket_dropdown()
         self.update_price_and_quantity()
         self.update_cart_display()
 
+    @timed("ui.purchase_ticket")
     def purchase_ticket(self):
         if not self.cart:
             QMessageBox.warning(self, "Empty Cart", "Please add tickets to your cart before purchasing.")
             return
+        if not self.check_holds():
+            return  # the buyer was told which items expired
         
         try:
             # Calculate total price
-            total_price = sum(item["price"] * item["quantity"] for item in self.cart)
+            total_price = cart_total(self.cart)
             
             # Check if user has enough credit
             user_credit = float(self.user.get("credit", 0))
+            use_credit = False
             if user_credit > 0:
                 # Ask if user wants to use credit
-                use_credit = QMessageBox.question(
+                answer = QMessageBox.question(
                     self,
                     "Use Credit",
                     f"You have {user_credit:.2f}€ in credit. Would you like to use it for this purchase?",
                     QMessageBox.Yes | QMessageBox.No,
                     QMessageBox.Yes
                 )
-                
-                if use_credit == QMessageBox.Yes:
-                    # Calculate how much credit to use
-                    credit_to_use = min(user_credit, total_price)
-                    total_price -= credit_to_use
-                    
-                    # Update user's credit
-                    new_credit = user_credit - credit_to_use
-                    self.update_user_credit(new_credit)
+                use_credit = answer == QMessageBox.Yes
             
-            # Save tickets to tickets.json
-            if self.save_tickets_to_file():
-                # Update event ticket availability
-                self.update_event_ticket_availability()
-                
-                success_msg = QMessageBox()
-                success_msg.setIcon(QMessageBox.Information)
-                success_msg.setWindowTitle("Επιτυχία")
-                success_msg.setText("Η αγορά ολοκληρώθηκε επιτυχώς!")
-                success_msg.setStyleSheet("""
-                    QMessageBox {
-                        background-color: #f0f0f0;
-                        color: #333333;
-                    }
-                    QPushButton {
-                        background-color: #D91656;
-                        color: white;
-                        padding: 6px 20px;
-                        border-radius: 3px;
-                        min-width: 80px;
-                    }
-                    QPushButton:hover {
-                        background-color: #B31145;
-                    }
-                """)
-                success_msg.exec_()
-                
-                # Refresh parent app's event data and UI
-                if hasattr(self.parent_app, 'refresh_event_data'):
-                    self.parent_app.refresh_event_data()
-                
-                self.close()
-                
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"An error occurred during purchase: {str(e)}"
+            # The files are written on the I/O thread; the dialog waits for the result
+            self.purchase_btn.setEnabled(False)
+            io_executor().submit(
+                purchase_tickets, self.user["user_id"], self.event["event_id"], [dict(item) for item in self.cart], use_credit,
+                session=self.session, admission=self.admission,
+                on_success=self.on_purchase_committed,
+                on_error=self.on_purchase_failed,
+                description="Αγορά εισιτηρίων...",
             )
-
-    def update_user_credit(self, new_credit):
-        """Update user's credit in users.json"""
-        try:
-            with open("users.json", "r", encoding="utf-8") as f:
-                users = json.load(f)
-            
-            for user in users:
-                if user["user_id"] == self.user["user_id"]:
-                    user["credit"] = str(new_credit)  # Store as string
-                    self.user["credit"] = str(new_credit)  # Update in memory
-                    break
             
-            with open("users.json", "w", encoding="utf-8") as f:
-                json.dump(users, f, indent=4, ensure_ascii=False)
-                
         except Exception as e:
-            raise Exception(f"Failed to update user credit: {str(e)}")
-
-    def save_tickets_to_file(self):
-        """Save purchased tickets to tickets.json."""
-        try:
-            # Load existing tickets
-            try:
-                with open("tickets.json", "r", encoding="utf-8") as f:
-                    tickets = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError):
-                tickets = []
-
-            # Get the next ticket ID
-            next_ticket_id = max([t.get("ticket_id", 0) for t in tickets], default=0) + 1
-
-            # For each item in cart
-            for item in self.cart:
-                # Check if user already has tickets of this type for this event
-                existing_ticket = None
-                for ticket in tickets:
-                    if (ticket["event_id"] == self.event["event_id"] and 
-                        ticket["user_id"] == self.user["user_id"] and 
-                        ticket["ticket_type"] == item["type"] and
-                        ticket["status"] == "valid"):
-                        existing_ticket = ticket
-                        break
-
-                if existing_ticket:
-                    # Update existing ticket quantity
-                    existing_ticket["quantity_bought"] += item["quantity"]
-                else:
-                    # Create new ticket
-                    new_ticket = {
-                        "ticket_id": next_ticket_id,
-                        "event_id": self.event["event_id"],
-                        "user_id": self.user["user_id"],
-                        "ticket_type": item["type"],
-                        "quantity_bought": item["quantity"],
-                        "price": item["price"],
-                        "purchase_date": datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-                        "status": "valid",
-                        "qr_code": f"TKT-{next_ticket_id}-{self.event['event_id']}-{self.user['user_id']}"
-                    }
-                    tickets.append(new_ticket)
-                    next_ticket_id += 1
-
-            # Save updated tickets
-            with open("tickets.json", "w", encoding="utf-8") as f:
-                json.dump(tickets, f, indent=4, ensure_ascii=False)
-
-            return True
-
-        except Exception as e:
-            print(f"Error saving tickets: {str(e)}")
-            return False
-
-    def update_event_ticket_availability(self):
-        """Update the event's ticket availability in events.json."""
-        # Load events
-        try:
-            with open("events.json", "r", encoding="utf-8") as f:
-                events = json.load(f)
-        except FileNotFoundError:
-            return
+            self.on_purchase_failed(e)
+
+    def on_purchase_committed(self, result):
+        if result["credit_used"]:
+            self.user["credit"] = str(result["credit"])  # Update in memory
+
+        success_msg = QMessageBox()
+        success_msg.setIcon(QMessageBox.Information)
+        success_msg.setWindowTitle("Επιτυχία")
+        success_msg.setText("Η αγορά ολοκληρώθηκε επιτυχώς!")
+        success_msg.setStyleSheet("""
+            QMessageBox {
+                background-color: #f0f0f0;
+                color: #333333;
+            }
+            QPushButton {
+                background-color: #D91656;
+                color: white;
+                padding: 6px 20px;
+                border-radius: 3px;
+                min-width: 80px;
+            }
+            QPushButton:hover {
+                background-color: #B31145;
+            }
+        """)
+        success_msg.exec_()
         
-        # Find and update the event
-        for event in events:
-            if event["event_id"] == self.event["event_id"]:
-                # Update ticket quantities based on cart
-                for cart_item in self.cart:
-                    for ticket_type in event.get("ticket_types", []):
-                        if ticket_type["type"] == cart_item["type"]:
-                            ticket_type["total_quantity"] -= cart_item["quantity"]
-                            # Ensure quantity doesn't go below 0
-                            if ticket_type["total_quantity"] < 0:
-                                ticket_type["total_quantity"] = 0
-                break
+        # Refresh parent app's event data and UI
+        if hasattr(self.parent_app, 'refresh_event_data'):
+            self.parent_app.refresh_event_data()
         
-        # Save updated events
-        with open("events.json", "w", encoding="utf-8") as f:
-            json.dump(events, f, ensure_ascii=False, indent=4)
+        self.close()
+
+    def on_purchase_failed(self, e):
+        self.purchase_btn.setEnabled(True)
+        if isinstance(e, NotAdmittedError):
+            self.update_admission()
+            self.queue_timer.start(QUEUE_REFRESH_MS)
+            QMessageBox.information(self, "Ουρά αναμονής", str(e))
+            return
+        if isinstance(e, SoldOutError):
+            # Another terminal sold them first: show what is left now
+            self.reload_availability()
+            QMessageBox.warning(self, "Μη διαθέσιμα εισιτήρια", str(e))
+            return
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"An error occurred during purchase: {str(e)}"
+        )
@@ -4,8 +4,10 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
-import json
 from datetime import datetime
+from datastore import store
+from io_executor import io_executor
+from services import refund_tickets
 
 class TicketRefundDialog(QDialog):
     def __init__(self, ticket_group, parent=None):
@@ -181,7 +183,6 @@ class TicketRefundDialog(QDialog):
 
     def process_refund(self, refund_type):
         total_selected = 0
-        total_refund = 0
         selected_tickets = {}
 
         # Calculate totals and validate selections
@@ -189,85 +190,32 @@ class TicketRefundDialog(QDialog):
             quantity = selection_data['spinbox'].value()
             if quantity > 0:
                 total_selected += quantity
-                total_refund += quantity * selection_data['price']
                 selected_tickets[ticket_type] = quantity
 
         if total_selected == 0:
             QMessageBox.warning(self, "No Selection", "Please select at least one ticket to cancel.")
             return
 
-        try:
-            # Update tickets.json - remove or update tickets
-            with open("tickets.json", "r", encoding="utf-8") as f:
-                tickets = json.load(f)
-
-            # Keep track of tickets to update
-            tickets_to_update = []
-            
-            # Find tickets to update
-            for ticket in tickets:
-                if (ticket["user_id"] == self.parent.current_user["user_id"] and 
-                    ticket["event_id"] == self.ticket_group["event"]["event_id"] and
-                    ticket["status"] == "valid"):
-                    
-                    ticket_type = ticket["ticket_type"]
-                    if ticket_type in selected_tickets and selected_tickets[ticket_type] > 0:
-                        tickets_to_update.append(ticket)
-
-            # Update or remove tickets
-            for ticket in tickets_to_update:
-                ticket_type = ticket["ticket_type"]
-                if selected_tickets[ticket_type] >= ticket["quantity_bought"]:
-                    # Remove the entire ticket
-                    tickets.remove(ticket)
-                    selected_tickets[ticket_type] -= ticket["quantity_bought"]
-                else:
-                    # Update the quantity
-                    ticket["quantity_bought"] -= selected_tickets[ticket_type]
-                    selected_tickets[ticket_type] = 0
+        user_id = self.parent.current_user["user_id"]
+        event_id = self.ticket_group["event"]["event_id"]
 
-            # Save updated tickets
-            with open("tickets.json", "w", encoding="utf-8") as f:
-                json.dump(tickets, f, indent=4, ensure_ascii=False)
+        # The files are written on the I/O thread; the dialog waits for the result
+        self.setEnabled(False)
+        io_executor().submit(
+            refund_tickets, user_id, event_id, selected_tickets, refund_type,
+            on_success=lambda result: self.on_refund_committed(refund_type, event_id, result["credit"]),
+            on_error=self.on_refund_failed,
+            description="Ακύρωση εισιτηρίων...",
+        )
 
-            # Update event ticket availability
-            with open("events.json", "r", encoding="utf-8") as f:
-                events = json.load(f)
-
-            # Find the event and update ticket quantities
-            for event in events:
-                if event["event_id"] == self.ticket_group["event"]["event_id"]:
-                    for ticket_type in event["ticket_types"]:
-                        if ticket_type["type"] in selected_tickets:
-                            # Get the original selected quantity for this ticket type
-                            original_selected = 0
-                            for selection_data in self.ticket_selections.items():
-                                if selection_data[0] == ticket_type["type"]:
-                                    original_selected = selection_data[1]['spinbox'].value()
-                                    break
-                            # Add back the selected quantity
-                            ticket_type["total_quantity"] += original_selected
-
-            # Save updated events
-            with open("events.json", "w", encoding="utf-8") as f:
-                json.dump(events, f, indent=4, ensure_ascii=False)
+    def on_refund_committed(self, refund_type, event_id, credit):
+        """Report a committed refund and refresh the parent's views."""
+        try:
+            if credit is not None:
+                # Update in memory
+                self.parent.current_user["credit"] = str(credit)
 
-            # Update user credit if credit option selected
             if refund_type == "credit":
-                with open("users.json", "r", encoding="utf-8") as f:
-                    users = json.load(f)
-
-                for user in users:
-                    if user["user_id"] == self.parent.current_user["user_id"]:
-                        current_credit = float(user.get("credit", 0))
-                        user["credit"] = str(current_credit + total_refund)  # Store as string
-                        # Update in memory
-                        self.parent.current_user["credit"] = str(current_credit + total_refund)
-                        break
-
-                with open("users.json", "w", encoding="utf-8") as f:
-                    json.dump(users, f, indent=4, ensure_ascii=False)
-
                 success_msg = QMessageBox()
                 success_msg.setIcon(QMessageBox.Information)
                 success_msg.setWindowTitle("Success")
@@ -319,11 +267,7 @@ class TicketRefundDialog(QDialog):
                 self.parent.update_credit_display()
 
             # Get updated event data
-            updated_event = None
-            for event in events:
-                if event["event_id"] == self.ticket_group["event"]["event_id"]:
-                    updated_event = event
-                    break
+            updated_event = store.find_event(event_id)
 
             # Try to refresh the event details view - try different possible view methods
             if updated_event:
@@ -342,24 +286,28 @@ class TicketRefundDialog(QDialog):
             self.accept()
 
         except Exception as e:
-            error_msg = QMessageBox()
-            error_msg.setIcon(QMessageBox.Critical)
-            error_msg.setWindowTitle("Error")
-            error_msg.setText(f"An error occurred: {str(e)}")
-            error_msg.setStyleSheet("""
-                QMessageBox {
-                    background-color: #f0f0f0;
-                    color: #333333;
-                }
-                QPushButton {
-                    background-color: #D91656;
-                    color: white;
-                    padding: 6px 20px;
-                    border-radius: 3px;
-                    min-width: 80px;
-                }
-                QPushButton:hover {
-                    background-color: #B31145;
-                }
-            """)
-            error_msg.exec_() 
\ No newline at end of file
+            self.on_refund_failed(e)
+
+    def on_refund_failed(self, e):
+        self.setEnabled(True)
+        error_msg = QMessageBox()
+        error_msg.setIcon(QMessageBox.Critical)
+        error_msg.setWindowTitle("Error")
+        error_msg.setText(f"An error occurred: {str(e)}")
+        error_msg.setStyleSheet("""
+            QMessageBox {
+                background-color: #f0f0f0;
+                color: #333333;
+            }
+            QPushButton {
+                background-color: #D91656;
+                color: white;
+                padding: 6px 20px;
+                border-radius: 3px;
+                min-width: 80px;
+            }
+            QPushButton:hover {
+                background-color: #B31145;
+            }
+        """)
+        error_msg.exec_() 
\ No newline at end of file
@@ -6,17 +6,32 @@ import qtawesome as qta
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QLabel, QPushButton,
     QLineEdit, QComboBox, QTextEdit, QMessageBox, QHBoxLayout, QListWidget, QListWidgetItem, QFormLayout, QSpacerItem,
-    QDateEdit, QTimeEdit, QDateTimeEdit, QFileDialog, QGroupBox, QStackedWidget, QGridLayout, QScrollArea, QSizePolicy, QDialog,
-    QCheckBox, QGraphicsDropShadowEffect, QSpinBox, QMenu, QSystemTrayIcon, QDialogButtonBox
+    QDateEdit, QTimeEdit, QDateTimeEdit, QFileDialog, QGroupBox, QStackedWidget, QScrollArea, QSizePolicy, QDialog,
+    QCheckBox, QGraphicsDropShadowEffect, QSpinBox, QMenu, QSystemTrayIcon, QDialogButtonBox, QInputDialog,
+    QProgressDialog
 )
 from PyQt5.QtGui import QFont, QColor, QPixmap, QIcon, QBrush, QPalette, QImage
-from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve, QRect, QDate, QTime, QDateTime, QTimer, QSize, QPoint
+from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve, QRect, QDate, QTime, QDateTime, QSize, QPoint
 from models import load_events, save_events, load_users, save_users, load_services
+from datastore import store
+from notification_watcher import NotificationWatcher
+from event_browser import EventBrowser
+from event_filter import EventFilterIndex
+from image_cache import cached_pixmap, ensure_thumbnail, image_cache
+from io_executor import io_executor
+from metrics import timed
+from services import (cancel_event, create_notification, filter_vendor_services, is_cancelled,
+                      mark_read, respond_to_collaboration)
+from services.ids import ids
+from image_loader import load_into_label
 from datetime import date, datetime, timedelta
 from ticket_purchase import TicketPurchaseModal
 from vendor_add_services import AddServicesModal 
-from collaborations import CollaborationRequest, save_collaboration_request, get_pending_requests_for_vendor, CollaborationRequestDetailsDialog
+from collaborations import CollaborationRequest, save_collaboration_request, get_pending_requests_for_vendor
 from ticket_management import TicketManagementMixin
+from app_logging import get_logger
+
+log = get_logger(__name__)
 
 class EventManagementApp(QMainWindow, TicketManagementMixin):
     def __init__(self):
@@ -71,15 +86,16 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         # Store window references
         self.detail_window = None  # Add this line to store the detail window reference
 
-        # Pagination attributes
-        self.events_per_page = 5  # Default number of events per page
-        self.current_page = 1  # Track the current page
-        self.total_pages = 1  # Default value
+        self.filtered_events = []  # Events matching the current filters
+        self.events_filter_index = None  # Used when self.events is not the store's list
+        self.cancel_progress = None  # Progress of an event cancellation
+
+        # Refresh notifications when they change instead of polling
+        self.notification_watcher = NotificationWatcher(store, parent=self)
+        self.notification_watcher.changed.connect(self.check_notifications)
 
-        # Set up notification timer
-        self.notification_timer = QTimer()
-        self.notification_timer.timeout.connect(self.check_notifications)
-        self.notification_timer.start(5000)  # Check every 5 seconds
+        # Show when data files are being written in the background
+        io_executor().busyChanged.connect(self.show_busy)
 
         # Tabs and UI components
         self.tabs = QTabWidget()
@@ -96,21 +112,11 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         self.to_date_filter_edit = None
         self.location_filter_combobox = None
         self.type_filter_combobox = None
-        self.items_per_page_combobox = None
         self.tiles_per_row_combobox = None
 
-        # Stacked widget for grid and list modes
-        self.stacked_widget = None
-        self.grid_widget = None
-        self.grid_layout = None
-        self.list_widget = None
-        self.list_layout = None
-
-        # Pagination controls
-        self.pagination_layout = None
-        self.prev_page_btn = None
-        self.next_page_btn = None
-        self.page_label = None
+        # Event cards (grid and list modes) and the number of matching events
+        self.event_browser = None
+        self.results_label = None
 
     def setup_ui(self):
         """Set up the UI components."""
@@ -220,7 +226,6 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
     def resizeEvent(self, a0):
         """Resize the background image dynamically when the window is resized."""
         self.set_background()
-        self.adjust_grid_layout()
         super().resizeEvent(a0)
 
     # region Home Section #
@@ -352,33 +357,28 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         # Location Filter
         filter_layout.addWidget(QLabel("Τοποθεσία:"))
         self.location_filter_combobox = QComboBox()
-        self.location_filter_combobox.addItems(["Όλες", "Αθήνα", "Θεσσαλονίκη", "Πάτρα", "Ηράκλειο"])
+        self.location_filter_combobox.addItem("Όλες", None)
+        for location in ["Αθήνα", "Θεσσαλονίκη", "Πάτρα", "Ηράκλειο"]:
+            self.location_filter_combobox.addItem(location, location)
         self.location_filter_combobox.setStyleSheet("padding: 5px; border-radius: 5px; border: 1px solid #ddd;")
         filter_layout.addWidget(self.location_filter_combobox)
 
         # Type Filter
         filter_layout.addWidget(QLabel("Είδος:"))
         self.type_filter_combobox = QComboBox()
-        self.type_filter_combobox.addItems(["Όλα", "Δημόσιο", "Ιδιωτικό"])
+        self.type_filter_combobox.addItem("Όλα", None)
+        for event_type in ["Δημόσιο", "Ιδιωτικό"]:
+            self.type_filter_combobox.addItem(event_type, event_type)
         self.type_filter_combobox.setStyleSheet("padding: 5px; border-radius: 5px; border: 1px solid #ddd;")
         filter_layout.addWidget(self.type_filter_combobox)
 
-        # Items Per Page ComboBox (for List Mode)
-        filter_layout.addWidget(QLabel("Εγγραφές ανά σελίδα:"))
-        self.items_per_page_combobox = QComboBox()
-        self.items_per_page_combobox.addItems(["5", "10", "20", "50"])
-        self.items_per_page_combobox.setCurrentText("5")  # Default to 5 items per page
-        self.items_per_page_combobox.setStyleSheet("padding: 5px; border-radius: 5px; border: 1px solid #ddd;")
-        self.items_per_page_combobox.currentTextChanged.connect(self.apply_filters)
-        filter_layout.addWidget(self.items_per_page_combobox)
-
         # Tiles Per Row ComboBox (for Grid Mode)
         filter_layout.addWidget(QLabel("Πλακίδια ανά σειρά:"))
         self.tiles_per_row_combobox = QComboBox()
         self.tiles_per_row_combobox.addItems(["3", "5"])
         self.tiles_per_row_combobox.setCurrentText("3")  # Default to 3 tiles per row
         self.tiles_per_row_combobox.setStyleSheet("padding: 5px; border-radius: 5px; border: 1px solid #ddd;")
-        self.tiles_per_row_combobox.currentTextChanged.connect(self.apply_filters)
+        self.tiles_per_row_combobox.currentTextChanged.connect(lambda: self.display_events(self.filtered_events))
         filter_layout.addWidget(self.tiles_per_row_combobox)
 
         # Apply Filters Button
@@ -397,7 +397,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
                 background-color: #EB5B00;  /* Secondary color */
             }
         """)
-        apply_filters_btn.clicked.connect(self.apply_filters)
+        apply_filters_btn.clicked.connect(lambda: self.apply_filters())
         filter_layout.addWidget(apply_filters_btn)
 
         # Reset Filters Button
@@ -441,44 +441,16 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         filter_frame.setLayout(filter_layout)
         layout.addWidget(filter_frame)
 
-        # Stacked Widget for Grid and List Modes
-        self.stacked_widget = QStackedWidget()
-        layout.addWidget(self.stacked_widget)
-
-        # Grid Mode
-        self.grid_widget = QWidget()
-        self.grid_layout = QGridLayout(self.grid_widget)
-        self.stacked_widget.addWidget(self.grid_widget)
-
-        # List Mode
-        self.list_widget = QWidget()
-        self.list_layout = QVBoxLayout(self.list_widget)
-        self.stacked_widget.addWidget(self.list_widget)
-
-        # Pagination
-        self.current_page = 1
-        self.pagination_layout = QHBoxLayout()
-        self.prev_page_btn = AnimatedButton("Προηγούμενη")
-        self.prev_page_btn.setIcon(qta.icon("fa5s.arrow-left"))  # Arrow-left icon
-        self.prev_page_btn.setStyleSheet("background-color: #FFB200; color: white; padding: 10px; border-radius: 5px;")
-        self.prev_page_btn.clicked.connect(self.prev_page)
-
-        self.next_page_btn = AnimatedButton("Επόμενη")
-        self.next_page_btn.setIcon(qta.icon("fa5s.arrow-right"))  # Arrow-right icon
-        self.next_page_btn.setStyleSheet("background-color: #FFB200; color: white; padding: 10px; border-radius: 5px;")
-        self.next_page_btn.clicked.connect(self.next_page)
-
-        # Add current page and total pages label
-        self.page_label = QLabel("1/1")
-        self.page_label.setStyleSheet("font-size: 14px; color: #333;")
-
-        # Add widgets to pagination layout
-        self.pagination_layout.addWidget(self.prev_page_btn)
-        self.pagination_layout.addWidget(self.next_page_btn)
-        self.pagination_layout.addWidget(self.page_label)
-
-        # Add the pagination layout to the main layout
-        layout.addLayout(self.pagination_layout)
+        # Event cards: only the visible ones are painted, so all matches scroll in one view
+        self.event_browser = EventBrowser()
+        self.event_browser.setMinimumHeight(400)
+        self.event_browser.detailsRequested.connect(self.show_event_details)
+        layout.addWidget(self.event_browser, stretch=1)
+
+        # Number of matching events
+        self.results_label = QLabel("0 εκδηλώσεις")
+        self.results_label.setStyleSheet("font-size: 14px; color: #333;")
+        layout.addWidget(self.results_label)
 
         # Set the container as the scroll area's widget
         scroll_area.setWidget(container)
@@ -492,39 +464,14 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         if self.display_mode == "grid":
             self.display_mode = "list"
             self.toggle_display_mode_btn.setText("Εμφάνιση Πλέγματος")
-            if self.stacked_widget is not None:
-                self.stacked_widget.setCurrentIndex(1)
         else:
             self.display_mode = "grid"
             self.toggle_display_mode_btn.setText("Εμφάνιση Λίστας")
-            if self.stacked_widget is not None:
-                self.stacked_widget.setCurrentIndex(0)
 
-        # Debug: Print display mode and events
-        print(f"\nDisplay Mode Changed to: {self.display_mode}")
-        print("Current Events:")
-        if self.display_mode == "grid":
-            if self.grid_layout is not None:
-                for i in range(self.grid_layout.count()):
-                    item = self.grid_layout.itemAt(i)
-                    if item is not None:  # Check if item exists
-                        widget = item.widget()
-                        if widget is not None:  # Check if widget exists
-                            print(widget.title())
-        else:
-            if self.list_layout is not None:
-                for i in range(self.list_layout.count()):
-                    item = self.list_layout.itemAt(i)
-                    if item is not None:  # Check if item exists
-                        widget = item.widget()
-                        if widget is not None:  # Check if widget exists
-                            print(widget.title())
-
-        # Reapply filters to update the displayed events
-        self.apply_filters()
+        log.debug("Display Mode Changed to: %s", self.display_mode)
 
-        # Reapply filters to update the displayed events
-        self.apply_filters()
+        # Show the same events in the new mode
+        self.display_events(self.filtered_events)
 
     def display_events(self, events):
         if self.display_mode == "grid":
@@ -532,196 +479,28 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         else:
             self.display_list(events)
 
-    def adjust_grid_layout(self):
-        if self.grid_layout is None:
-            print("Error: grid_layout is not initialized!")
-            return  # Exit the method if grid_layout is None
-
-        window_width = self.width()
-        column_width = 320  # Approximate width of each grid item
-        num_columns = max(1, window_width // column_width)  # At least 1 column
-
-        # Set column minimum width and stretch
-        self.grid_layout.setColumnMinimumWidth(0, column_width)
-        self.grid_layout.setColumnStretch(num_columns, 1)  # Add stretch to fill space
-
     def display_grid(self, events):
-        """Display events in a grid layout."""
-        self.events = events  # Store the events for resizing
-
-        # Debug: Print events being displayed in grid mode
-        print("\nDisplaying Events in Grid Mode:")
-        for event in events:
-            print(event)
-
-        # Check if grid_layout is initialized
-        if self.grid_layout is None:
-            print("Error: grid_layout is not initialized!")
-            return  # Exit the method if grid_layout is None
-
-        # Check if tiles_per_row_combobox is initialized
-        if self.tiles_per_row_combobox is None:
-            print("Error: tiles_per_row_combobox is not initialized!")
-            return  # Exit the method if tiles_per_row_combobox is None
-
-        # Clear the grid layout
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            if item is not None:  # Check if item exists
-                widget = item.widget()
-                if widget is not None:  # Check if widget exists
-                    widget.deleteLater()
-
-        # Get the number of tiles per row
-        tiles_per_row = int(self.tiles_per_row_combobox.currentText())
+        """Display events as tiles, tiles_per_row_combobox tiles per row."""
+        if self.event_browser is None:
+            log.error("event_browser is not initialized!")
+            return
 
-        # Add events to the grid
-        row, col = 0, 0
-        for event in events:
-            event_widget = self.create_event_widget(event)
-            if event_widget is not None:  # Check if event_widget is created
-                self.grid_layout.addWidget(event_widget, row, col)
-                col += 1
-                if col == tiles_per_row:
-                    col = 0
-                    row += 1
+        tiles_per_row = int(self.tiles_per_row_combobox.currentText())
+        self.event_browser.set_mode("grid", tiles_per_row)
+        self.event_browser.set_events(events)
 
     def display_list(self, events):
-        """Display events in a list layout."""
-        # Debug: Print events being displayed in list mode
-        print("\nDisplaying Events in List Mode:")
-        for event in events:
-            print(event)
-
-        # Clear the list layout by removing all widgets
-        while self.list_layout.count():
-            item = self.list_layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
-
-        # Add new event widgets
-        for event in events:
-            event_widget = self.create_event_widget(event, is_list=True)
-            self.list_layout.addWidget(event_widget)
-
-    def create_event_widget(self, event, is_list=False):
-        """Create a widget for displaying an event in the list."""
-        event_widget = QWidget()
-        event_widget.setStyleSheet("""
-            QWidget#eventContainer {
-                background-color: white;
-                border: none;
-                border-radius: 8px;
-            }
-            QWidget#eventContainer:hover {
-                border: 1px solid #D91656;
-            }
-        """)
-        event_widget.setObjectName("eventContainer")
-        event_layout = QHBoxLayout(event_widget)
-        event_layout.setContentsMargins(15, 15, 15, 15)
-        
-        # Left side: Event image container
-        image_container = QWidget()
-        image_container.setFixedSize(180, 180)
-        image_layout = QVBoxLayout(image_container)
-        image_layout.setContentsMargins(0, 0, 0, 0)
-        image_layout.setAlignment(Qt.AlignCenter)
-        
-        image_label = QLabel()
-        image_label.setFixedSize(180, 180)
-        image_label.setStyleSheet("""
-            QLabel {
-                background-color: #f5f5f5;
-                border: none;
-                border-radius: 4px;
-            }
-        """)
-        
-        if event.get('image'):
-            pixmap = QPixmap(event['image'])
-            if not pixmap.isNull():
-                pixmap = pixmap.scaled(180, 180, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                image_label.setPixmap(pixmap)
-        else:
-                image_label.setText("No Image")
-                image_label.setAlignment(Qt.AlignCenter)
+        """Display events one per row."""
+        if self.event_browser is None:
+            log.error("event_browser is not initialized!")
+            return
 
-        image_layout.addWidget(image_label)
-        event_layout.addWidget(image_container)
-        
-        # Add some spacing between image and info
-        event_layout.addSpacing(20)
-        
-        # Middle: Event info
-        info_widget = QWidget()
-        info_widget.setStyleSheet("border: none;")
-        info_layout = QVBoxLayout(info_widget)
-        info_layout.setSpacing(5)
-        
-        # Event Title
-        title = QLabel(event["title"])
-        title.setFont(QFont("Helvetica", 16, QFont.Bold))
-        title.setStyleSheet("color: #333; border: none;")
-        info_layout.addWidget(title)
-        
-        # Event Date and Time
-        date_str = f"{event['start_date']} {event['start_time']}"
-        date_label = QLabel(f"Ημερομηνία: {date_str}")
-        date_label.setStyleSheet("color: #666; font-size: 14px; border: none;")
-        info_layout.addWidget(date_label)
-        
-        # Location
-        location_label = QLabel(f"Τοποθεσία: {event['location']}")
-        location_label.setStyleSheet("color: #666; font-size: 14px; border: none;")
-        info_layout.addWidget(location_label)
-        
-        # Type
-        type_label = QLabel(f"Τύπος: {event['type']}")
-        type_label.setStyleSheet("color: #666; font-size: 14px; border: none;")
-        info_layout.addWidget(type_label)
-        
-        info_layout.addStretch()
-        event_layout.addWidget(info_widget, stretch=1)
-        
-        # Right side: View Details Button
-        button_widget = QWidget()
-        button_widget.setStyleSheet("border: none;")
-        button_layout = QVBoxLayout(button_widget)
-        button_layout.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        
-        details_btn = QPushButton("Περισσότερα")
-        details_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #D91656;
-                color: white;
-                padding: 8px 20px;
-                border-radius: 4px;
-                font-size: 14px;
-                border: none;
-            }
-            QPushButton:hover {
-                background-color: #640D5F;
-            }
-        """)
-        details_btn.clicked.connect(lambda: self.show_event_details(event))
-        button_layout.addWidget(details_btn)
-        
-        event_layout.addWidget(button_widget)
-        
-        # Add shadow effect
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setColor(QColor(0, 0, 0, 30))
-        shadow.setOffset(0, 2)
-        event_widget.setGraphicsEffect(shadow)
-        
-        return event_widget
+        self.event_browser.set_mode("list")
+        self.event_browser.set_events(events)
 
     def show_event_details(self, event):
         """Show detailed information about an event in a new window."""
-        print(f"Current user: {self.current_user}")  # Debug print
+        log.debug("Current user: %s", self.current_user)
         
         self.detail_window = QWidget()
         self.detail_window.setWindowTitle(f"Προεπισκόπηση Εκδήλωσης")
@@ -736,8 +515,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         # Event image
         if event.get("image"):
             image_label = QLabel()
-            pixmap = QPixmap(event["image"])
-            image_label.setPixmap(pixmap.scaled(300, 200, Qt.KeepAspectRatio))
+            load_into_label(image_label, event["image"], 300, 200)
             layout.addWidget(image_label, alignment=Qt.AlignCenter | Qt.AlignBottom)
         
         # Add spacing below image
@@ -759,26 +537,25 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
 
         # Add ratings if they exist
         try:
-            with open("reviews.json", "r") as f:
-                reviews = json.load(f)
-                event_reviews = [r for r in reviews["event_reviews"] if r["event_id"] == event["event_id"]]
-                if event_reviews:
-                    avg_rating = sum(r["rating"] for r in event_reviews) / len(event_reviews)
-                    rating_label = QLabel(f"<b>Μέση Βαθμολογία:</b> {avg_rating:.1f}/5 ({len(event_reviews)} κριτικές)")
-                    rating_label.setStyleSheet("font-size: 14px; color: #333;")
-                    layout.addWidget(rating_label)
+            reviews = store.reviews()
+            event_reviews = [r for r in reviews["event_reviews"] if r["event_id"] == event["event_id"]]
+            if event_reviews:
+                avg_rating = sum(r["rating"] for r in event_reviews) / len(event_reviews)
+                rating_label = QLabel(f"<b>Μέση Βαθμολογία:</b> {avg_rating:.1f}/5 ({len(event_reviews)} κριτικές)")
+                rating_label.setStyleSheet("font-size: 14px; color: #333;")
+                layout.addWidget(rating_label)
                     
-                    # Show last 3 reviews
-                    if len(event_reviews) > 0:
-                        reviews_group = QGroupBox("Πρόσφατες Κριτικές")
-                        reviews_layout = QVBoxLayout()
-                        for review in sorted(event_reviews, key=lambda x: x["date"], reverse=True)[:3]:
-                            review_text = f"Βαθμολογία: {review['rating']}/5\nΗμερομηνία: {review['date']}\n{review['comments']}"
-                            review_label = QLabel(review_text)
-                            review_label.setWordWrap(True)
-                            reviews_layout.addWidget(review_label)
-                        reviews_group.setLayout(reviews_layout)
-                        layout.addWidget(reviews_group)
+                # Show last 3 reviews
+                if len(event_reviews) > 0:
+                    reviews_group = QGroupBox("Πρόσφατες Κριτικές")
+                    reviews_layout = QVBoxLayout()
+                    for review in sorted(event_reviews, key=lambda x: x["date"], reverse=True)[:3]:
+                        review_text = f"Βαθμολογία: {review['rating']}/5\nΗμερομηνία: {review['date']}\n{review['comments']}"
+                        review_label = QLabel(review_text)
+                        review_label.setWordWrap(True)
+                        reviews_layout.addWidget(review_label)
+                    reviews_group.setLayout(reviews_layout)
+                    layout.addWidget(reviews_group)
         except:
             pass
 
@@ -808,39 +585,35 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
 
         # Review Button (only for attendees and if they have a ticket)
         if self.current_user and self.current_user.get("type") == "attendee":
-            print(f"User is an attendee")  # Debug print
+            log.debug("User is an attendee")
             try:
-                with open("tickets.json", "r") as f:
-                    tickets = json.load(f)
-                    print(f"Event ID being checked: {event['event_id']}")  # Debug print
-                    print(f"User ID being checked: {self.current_user['user_id']}")  # Debug print
-                    print(f"Available tickets: {tickets}")  # Debug print
+                log.debug("Event ID being checked: %s", event['event_id'])
+                log.debug("User ID being checked: %s", self.current_user['user_id'])
                     
-                    user_has_ticket = any(t["user_id"] == self.current_user["user_id"] and 
-                                        t["event_id"] == event["event_id"] for t in tickets)
-                    print(f"User has ticket: {user_has_ticket}")  # Debug print
+                user_has_ticket = store.ticket_index().has_ticket(self.current_user["user_id"], event["event_id"])
+                log.debug("User has ticket: %s", user_has_ticket)
                     
-                    if user_has_ticket:
-                        print("Adding review button")  # Debug print
-                        review_button = QPushButton("Αξιολόγηση")
-                        review_button.setStyleSheet("""
-                            QPushButton {
-                                background-color: #D91656;
-                                color: white;
-                                padding: 10px 20px;
-                                font-size: 14px;
-                                border-radius: 5px;
-                            }
-                            QPushButton:hover {
-                                background-color: #640D5F;
-                            }
-                        """)
-                        review_button.clicked.connect(lambda: self.show_review_modal("event", event["event_id"]))
-                        button_layout.addWidget(review_button)
+                if user_has_ticket:
+                    log.debug("Adding review button")
+                    review_button = QPushButton("Αξιολόγηση")
+                    review_button.setStyleSheet("""
+                        QPushButton {
+                            background-color: #D91656;
+                            color: white;
+                            padding: 10px 20px;
+                            font-size: 14px;
+                            border-radius: 5px;
+                        }
+                        QPushButton:hover {
+                            background-color: #640D5F;
+                        }
+                    """)
+                    review_button.clicked.connect(lambda: self.show_review_modal("event", event["event_id"]))
+                    button_layout.addWidget(review_button)
             except FileNotFoundError:
-                print("tickets.json not found")  # Debug print
+                log.debug("tickets.json not found")
             except json.JSONDecodeError:
-                print("Error decoding tickets.json")  # Debug print
+                log.error("Error decoding tickets.json")
 
         layout.addLayout(button_layout)
         self.detail_window.show()
@@ -886,24 +659,23 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         
         # Load and display vendor ratings
         try:
-            with open("reviews.json", "r") as f:
-                reviews = json.load(f)
-                vendor_reviews = [r for r in reviews["vendor_reviews"] if r["vendor_id"] == vendor_id]
-                if vendor_reviews:
-                    avg_rating = sum(r["rating"] for r in vendor_reviews) / len(vendor_reviews)
-                    details_layout.addWidget(QLabel(f"Average Rating: {avg_rating:.1f}/5 ({len(vendor_reviews)} reviews)"))
+            reviews = store.reviews()
+            vendor_reviews = [r for r in reviews["vendor_reviews"] if r["vendor_id"] == vendor_id]
+            if vendor_reviews:
+                avg_rating = sum(r["rating"] for r in vendor_reviews) / len(vendor_reviews)
+                details_layout.addWidget(QLabel(f"Average Rating: {avg_rating:.1f}/5 ({len(vendor_reviews)} reviews)"))
                     
-                    # Show last 3 reviews
-                    if len(vendor_reviews) > 0:
-                        reviews_group = QGroupBox("Recent Reviews")
-                        reviews_layout = QVBoxLayout()
-                        for review in sorted(vendor_reviews, key=lambda x: x["date"], reverse=True)[:3]:
-                            review_text = f"Rating: {review['rating']}/5\nDate: {review['date']}\n{review['comments']}"
-                            review_label = QLabel(review_text)
-                            review_label.setWordWrap(True)
-                            reviews_layout.addWidget(review_label)
-                        reviews_group.setLayout(reviews_layout)
-                        details_layout.addWidget(reviews_group)
+                # Show last 3 reviews
+                if len(vendor_reviews) > 0:
+                    reviews_group = QGroupBox("Recent Reviews")
+                    reviews_layout = QVBoxLayout()
+                    for review in sorted(vendor_reviews, key=lambda x: x["date"], reverse=True)[:3]:
+                        review_text = f"Rating: {review['rating']}/5\nDate: {review['date']}\n{review['comments']}"
+                        review_label = QLabel(review_text)
+                        review_label.setWordWrap(True)
+                        reviews_layout.addWidget(review_label)
+                    reviews_group.setLayout(reviews_layout)
+                    details_layout.addWidget(reviews_group)
         except:
             pass  # If reviews.json doesn't exist yet
         
@@ -927,97 +699,47 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         detail_window.setLayout(layout)
         detail_window.show()
 
-    def calculate_total_pages(self, filtered_events, items_per_page):
-        total_pages_test = len(filtered_events) + items_per_page - 1
-        print("Total_Pages : ", total_pages_test)
-        return (len(filtered_events) + items_per_page - 1) // items_per_page
-    
+    def event_filter_index(self):
+        """Return an EventFilterIndex over self.events."""
+        index = store.event_index()
+        if index.source is not self.events:
+            # self.events is not the store's list (e.g. replaced wholesale): index it separately
+            if self.events_filter_index is None or self.events_filter_index.source is not self.events:
+                self.events_filter_index = EventFilterIndex(self.events)
+            index = self.events_filter_index
+        return index
+
+    @timed("ui.apply_filters")
     def apply_filters(self):
-        # Get filter values
-        from_date_filter = self.from_date_filter_edit.date().toString("dd/MM/yyyy") if self.from_date_filter_edit.date().isValid() else None
-        to_date_filter = self.to_date_filter_edit.date().toString("dd/MM/yyyy") if self.to_date_filter_edit.date().isValid() else None
-        location_filter = self.location_filter_combobox.currentText()
-        type_filter = self.type_filter_combobox.currentText()
-
-        # Debug: Print filter values
-        print("\nFilter Values:")
-        print(f"From Date: {from_date_filter}")
-        print(f"To Date: {to_date_filter}")
-        print(f"Location: {location_filter}")
-        print(f"Type: {type_filter}")
-
-        # Determine items per page based on the display mode
-        if self.display_mode == "grid":
-            tiles_per_row = int(self.tiles_per_row_combobox.currentText())
-            items_per_page = tiles_per_row * 4  # Fixed 4 rows
-        else:
-            items_per_page = int(self.items_per_page_combobox.currentText())
-
-        # Filter events
-        self.filtered_events = []  # Store filtered events as an instance variable
-        for event in self.events:
-            event_date = event["start_date"]
-
-            # Debug: Print event details
-            print(f"\nChecking Event: {event['title']}")
-            print(f"Event Date: {event_date}")
-            print(f"Event Location: {event['location']}")
-            print(f"Event Type: {event['type']}")
-
-            # Check location filter
-            location_match = location_filter == "Όλες" or event["location"] == location_filter
-
-            # Check type filter
-            type_match = type_filter == "Όλα" or event["type"] == type_filter
-
-            # Check date range filters
-            date_match = True
-            if from_date_filter and to_date_filter:
-                date_match = from_date_filter <= event_date <= to_date_filter
-            elif from_date_filter:
-                date_match = event_date >= from_date_filter
-            elif to_date_filter:
-                date_match = event_date <= to_date_filter
-
-            # Debug: Print filter results
-            print(f"Location Match: {location_match}")
-            print(f"Type Match: {type_match}")
-            print(f"Date Match: {date_match}")
-
-            # Add event if it matches ANY of the filters (OR logic)
-            if location_match or type_match or date_match:
-                print("Event Matches Filters!")
-                self.filtered_events.append(event)
-
-        # Debug: Print filtered events
-        print("\nFiltered Events:")
-        for event in self.filtered_events:
-            print(event)
-
-        # Recalculate total pages
-        self.total_pages = self.calculate_total_pages(self.filtered_events, items_per_page)
-
-        # Debug: Print total pages and current page
-        print(f"Total Pages: {self.total_pages}")
-        print(f"Current Page: {self.current_page}")
-
-        # Paginate events
-        start_index = (self.current_page - 1) * items_per_page
-        end_index = start_index + items_per_page
-        paginated_events = self.filtered_events[start_index:end_index]
-
-        # Debug: Print paginated events
-        print("\nPaginated Events:")
-        for event in paginated_events:
-            print(event)
-
-        # Display filtered and paginated events
-        self.display_events(paginated_events)
-
-        # Update pagination buttons and page label
-        self.prev_page_btn.setEnabled(self.current_page > 1)
-        self.next_page_btn.setEnabled(self.current_page < self.total_pages)
-        self.page_label.setText(f"{self.current_page}/{self.total_pages}")
+        # Get filter values; None means "any"
+        from_date_filter = self.from_date_filter_edit.date().toPyDate() if self.from_date_filter_edit.date().isValid() else None
+        to_date_filter = self.to_date_filter_edit.date().toPyDate() if self.to_date_filter_edit.date().isValid() else None
+        location_filter = self.location_filter_combobox.currentData()
+        type_filter = self.type_filter_combobox.currentData()
+
+        # Events must match every filter (AND)
+        index = self.event_filter_index()
+        self.filtered_events = index.match(from_date_filter, to_date_filter, location_filter, type_filter)
+        self.update_filter_counts(index.facet_counts(from_date_filter, to_date_filter, location_filter, type_filter))
+
+        log.debug("Filters: %s - %s, %s, %s: %s events", from_date_filter, to_date_filter, location_filter, type_filter, len(self.filtered_events))
+
+        # Display every filtered event; the view only paints the visible cards
+        self.display_events(self.filtered_events)
+        self.results_label.setText(f"{len(self.filtered_events)} εκδηλώσεις")
+
+    def update_filter_counts(self, counts):
+        """Show how many events each location and type choice would give."""
+        for combobox, facet in ((self.location_filter_combobox, "location"), (self.type_filter_combobox, "type")):
+            facet_counts = counts[facet]
+            known = {combobox.itemData(i) for i in range(combobox.count())}
+            for value in sorted(v for v in facet_counts if v not in known and v):
+                combobox.addItem(value, value)  # a value the fixed choices do not list
+            for i in range(combobox.count()):
+                value = combobox.itemData(i)
+                n = sum(facet_counts.values()) if value is None else facet_counts.get(value, 0)
+                label = combobox.itemText(i).rsplit(" (", 1)[0]
+                combobox.setItemText(i, f"{label} ({n})")
 
     def reset_filters(self):
         # Reset date filters
@@ -1025,13 +747,10 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         self.to_date_filter_edit.setDate(QDate.currentDate().addDays(21))  # Default: three weeks after
 
         # Reset location filter
-        self.location_filter_combobox.setCurrentText("Όλες")
+        self.location_filter_combobox.setCurrentIndex(0)  # Όλες
 
         # Reset type filter
-        self.type_filter_combobox.setCurrentText("Όλα")
-
-        # Reset items per page (for list mode)
-        self.items_per_page_combobox.setCurrentText("5")
+        self.type_filter_combobox.setCurrentIndex(0)  # Όλα
 
         # Reset tiles per row (for grid mode)
         self.tiles_per_row_combobox.setCurrentText("3")
@@ -1039,16 +758,6 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         # Reapply filters
         self.apply_filters()
 
-    def next_page(self):
-        if self.current_page < self.total_pages:
-            self.current_page += 1
-            self.apply_filters()
-
-    def prev_page(self):
-        if self.current_page > 1:
-            self.current_page -= 1
-            self.apply_filters()
-
     #endregion
 
     # region Login Section #
@@ -1184,16 +893,18 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         if email and password:
             user = self.authenticate_user(email, password)
             if user:
+                # Work on a copy so the cached users list keeps the stored values
+                user = dict(user)
                 # Convert user type to lowercase for consistency
                 user["type"] = user["type"].lower()
                 self.current_user = user
                 
-                # Debug print for user login
-                print(f"Debug - User logged in: ID={user['user_id']}, Type={user['type']}, Name={user['name']} {user['surname']}")
+                # Log the user login
+                log.debug("User logged in: ID=%s, Type=%s, Name=%s %s", user['user_id'], user['type'], user['name'], user['surname'])
                 
-                # Start notification timer
-                if hasattr(self, 'notification_timer'):
-                    self.notification_timer.start(5000)  # Check every 5 seconds
+                # Start notification delivery
+                if hasattr(self, 'notification_watcher'):
+                    self.notification_watcher.start()
                 
                 QMessageBox.information(self, "Σύνδεση", "Συνδεθήκατε με επιτυχία!")
                 self.redirect_to_dashboard(user.get("type", "guest"))
@@ -1225,9 +936,9 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         # Reset the app state
         self.current_user = None
 
-        # Stop notification timer
-        if hasattr(self, 'notification_timer'):
-            self.notification_timer.stop()
+        # Stop notification delivery
+        if hasattr(self, 'notification_watcher'):
+            self.notification_watcher.stop()
 
         # Clean up organizer-specific attributes
         if hasattr(self, 'organizer_events_layout'):
@@ -1265,6 +976,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         self.logoff_btn.hide()
 
     def authenticate_user(self, email, password):
+        self.users = load_users()  # Cheap: only re-read when users.json changed
         for user in self.users:
             if user["email"] == email and user["password"] == password:
                 return user
@@ -1824,15 +1536,9 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
                 item.widget().deleteLater()
         
         try:
-            # Load tickets
-            with open("tickets.json", "r") as f:
-                tickets = json.load(f)
-            
-            # Filter tickets for current user
-            user_tickets = [t for t in tickets if t["user_id"] == self.current_user["user_id"]]
-            
-            # Get events for these tickets
-            my_events = [e for e in self.events if any(t["event_id"] == e["event_id"] for t in user_tickets)]
+            # Events the current user holds tickets for
+            event_ids = store.ticket_index().event_ids_for_user(self.current_user["user_id"])
+            my_events = [e for e in self.events if e["event_id"] in event_ids]
             
             if not my_events:
                 no_events_label = QLabel("You don't have any event tickets yet.")
@@ -1886,9 +1592,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
                 image_layout.setContentsMargins(0, 0, 0, 0)
                 
                 image_label = QLabel()
-                pixmap = QPixmap(event.get("image", "event_images/default_event.jpg"))
-                scaled_pixmap = pixmap.scaled(180, 180, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                image_label.setPixmap(scaled_pixmap)
+                load_into_label(image_label, event.get("image", "event_images/default_event.jpg"), 180, 180)
                 image_label.setAlignment(Qt.AlignVCenter)
                 image_layout.addWidget(image_label)
                 event_layout.addWidget(image_container)
@@ -1977,9 +1681,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         
         # Event Image
         image_label = QLabel()
-        pixmap = QPixmap(event.get("image", "event_images/default_event.jpg"))
-        scaled_pixmap = pixmap.scaled(400, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        image_label.setPixmap(scaled_pixmap)
+        load_into_label(image_label, event.get("image", "event_images/default_event.jpg"), 400, 300)
         content_layout.addWidget(image_label, alignment=Qt.AlignCenter)
         
         # Event Details Section
@@ -2030,58 +1732,57 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
 
         # Add ratings if they exist
         try:
-            with open("reviews.json", "r") as f:
-                reviews = json.load(f)
-                event_reviews = [r for r in reviews["event_reviews"] if r["event_id"] == event["event_id"]]
-                if event_reviews:
-                    # Reviews Section
-                    reviews_group = QGroupBox("Κριτικές")
-                    reviews_group.setStyleSheet("""
-                        QGroupBox {
-                            font-size: 16px;
-                            padding: 15px;
-                            border: 1px solid #ddd;
-                            border-radius: 5px;
-                            margin-top: 10px;
-                        }
-                        QGroupBox::title {
-                            color: #D91656;
-                            padding: 0 10px;
-                        }
-                    """)
-                    reviews_layout = QVBoxLayout()
+            reviews = store.reviews()
+            event_reviews = [r for r in reviews["event_reviews"] if r["event_id"] == event["event_id"]]
+            if event_reviews:
+                # Reviews Section
+                reviews_group = QGroupBox("Κριτικές")
+                reviews_group.setStyleSheet("""
+                    QGroupBox {
+                        font-size: 16px;
+                        padding: 15px;
+                        border: 1px solid #ddd;
+                        border-radius: 5px;
+                        margin-top: 10px;
+                    }
+                    QGroupBox::title {
+                        color: #D91656;
+                        padding: 0 10px;
+                    }
+                """)
+                reviews_layout = QVBoxLayout()
                     
-                    # Average Rating
-                    avg_rating = sum(r["rating"] for r in event_reviews) / len(event_reviews)
-                    rating_text = f"""
-                    <p style='font-size: 16px;'>
-                    <b>Μέση Βαθμολογία:</b> {avg_rating:.1f}/5 ({len(event_reviews)} κριτικές)
-                    </p>
-                    """
-                    rating_label = QLabel(rating_text)
-                    rating_label.setStyleSheet("color: #333;")
-                    reviews_layout.addWidget(rating_label)
+                # Average Rating
+                avg_rating = sum(r["rating"] for r in event_reviews) / len(event_reviews)
+                rating_text = f"""
+                <p style='font-size: 16px;'>
+                <b>Μέση Βαθμολογία:</b> {avg_rating:.1f}/5 ({len(event_reviews)} κριτικές)
+                </p>
+                """
+                rating_label = QLabel(rating_text)
+                rating_label.setStyleSheet("color: #333;")
+                reviews_layout.addWidget(rating_label)
                     
-                    # Show last 3 reviews
-                    if len(event_reviews) > 0:
-                        reviews_layout.addWidget(QLabel("<b>Πρόσφατες Κριτικές:</b>"))
-                        for review in sorted(event_reviews, key=lambda x: x["date"], reverse=True)[:3]:
-                            review_text = f"""
-                            <div style='background-color: #f8f8f8; padding: 10px; border-radius: 5px; margin: 5px 0;'>
-                            <p style='font-size: 14px; margin: 5px 0;'>
-                            <b>Βαθμολογία:</b> {review['rating']}/5<br>
-                            <b>Ημερομηνία:</b> {review['date']}<br>
-                            <b>Σχόλια:</b><br>{review['comments']}
-                            </p>
-                            </div>
-                            """
-                            review_label = QLabel(review_text)
-                            review_label.setWordWrap(True)
-                            review_label.setStyleSheet("color: #333;")
-                            reviews_layout.addWidget(review_label)
+                # Show last 3 reviews
+                if len(event_reviews) > 0:
+                    reviews_layout.addWidget(QLabel("<b>Πρόσφατες Κριτικές:</b>"))
+                    for review in sorted(event_reviews, key=lambda x: x["date"], reverse=True)[:3]:
+                        review_text = f"""
+                        <div style='background-color: #f8f8f8; padding: 10px; border-radius: 5px; margin: 5px 0;'>
+                        <p style='font-size: 14px; margin: 5px 0;'>
+                        <b>Βαθμολογία:</b> {review['rating']}/5<br>
+                        <b>Ημερομηνία:</b> {review['date']}<br>
+                        <b>Σχόλια:</b><br>{review['comments']}
+                        </p>
+                        </div>
+                        """
+                        review_label = QLabel(review_text)
+                        review_label.setWordWrap(True)
+                        review_label.setStyleSheet("color: #333;")
+                        reviews_layout.addWidget(review_label)
                     
-                        reviews_group.setLayout(reviews_layout)
-                    content_layout.addWidget(reviews_group)
+                    reviews_group.setLayout(reviews_layout)
+                content_layout.addWidget(reviews_group)
         except:
             pass
 
@@ -2114,31 +1815,28 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
 
         # Review Button (only if they have a ticket)
         try:
-            with open("tickets.json", "r") as f:
-                tickets = json.load(f)
-                user_has_ticket = any(t["user_id"] == self.current_user["user_id"] and 
-                                    t["event_id"] == event["event_id"] for t in tickets)
-                if user_has_ticket:
-                    review_button = QPushButton("Αξιολόγηση")
-                    review_button.setStyleSheet("""
-                        QPushButton {
-                            background-color: #D91656;
-                            color: white;
-                            padding: 12px 30px;
-                            font-size: 16px;
-                            border-radius: 5px;
-                            min-width: 150px;
-                        }
-                        QPushButton:hover {
-                            background-color: #640D5F;
-                        }
-                    """)
-                    review_button.clicked.connect(lambda: self.show_review_modal("event", event["event_id"]))
-                    center_layout.addWidget(review_button)
+            user_has_ticket = store.ticket_index().has_ticket(self.current_user["user_id"], event["event_id"])
+            if user_has_ticket:
+                review_button = QPushButton("Αξιολόγηση")
+                review_button.setStyleSheet("""
+                    QPushButton {
+                        background-color: #D91656;
+                        color: white;
+                        padding: 12px 30px;
+                        font-size: 16px;
+                        border-radius: 5px;
+                        min-width: 150px;
+                    }
+                    QPushButton:hover {
+                        background-color: #640D5F;
+                    }
+                """)
+                review_button.clicked.connect(lambda: self.show_review_modal("event", event["event_id"]))
+                center_layout.addWidget(review_button)
         except FileNotFoundError:
-            print("tickets.json not found")
+            log.debug("tickets.json not found")
         except json.JSONDecodeError:
-            print("Error decoding tickets.json")
+            log.error("Error decoding tickets.json")
 
         # Add center widget to main layout with stretches on both sides
         buttons_layout.addStretch(1)
@@ -2158,7 +1856,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         if not self.current_user:
             return
         getDate = datetime.now().date()
-        print(getDate)
+        log.debug("Finding events from %s", getDate)
         # Filter events created by the current user
         attendee_find_events = [find_events for find_events in self.events if datetime.strptime(find_events.get("start_date"), "%d/%m/%Y").date() >= getDate]
 
@@ -2200,9 +1898,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
 
             # Load event image
             event_image_label = QLabel()
-            pixmap = QPixmap(image_path)
-            pixmap = pixmap.scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation)  # Resize image
-            event_image_label.setPixmap(pixmap)
+            load_into_label(event_image_label, image_path, 100, 100)
 
             # Event details layout
             details_layout = QVBoxLayout()
@@ -2236,19 +1932,19 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
 
     def show_events_tab(self):
         """Show and load the Find Events tab content."""
-        print("Debug - Loading Find Events tab")
+        log.debug("Loading Find Events tab")
         
         # Get the Find Events tab
         find_events_tab = self.private_tabs.get("Find Events")
         if not find_events_tab:
-            print("Debug - Find Events tab not found")
+            log.debug("Find Events tab not found")
             return
             
         self.tabs.setCurrentWidget(find_events_tab)
         
         # Get the current date for filtering
         current_date = datetime.now().date()
-        print(f"Debug - Current date: {current_date}")
+        log.debug("Current date: %s", current_date)
         
         # Filter upcoming events
         upcoming_events = [
@@ -2256,7 +1952,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
             if datetime.strptime(event["start_date"], "%d/%m/%Y").date() >= current_date
         ]
         
-        print(f"Debug - Found {len(upcoming_events)} upcoming events")
+        log.debug("Found %s upcoming events", len(upcoming_events))
         
         # Clear existing layout
         layout = find_events_tab.layout()
@@ -2355,9 +2051,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         
         # Event image
         image_label = QLabel()
-        image = QPixmap(event.get("image", "event_images/default_event.jpg"))
-        scaled_pixmap = image.scaled(180, 180, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        image_label.setPixmap(scaled_pixmap)
+        load_into_label(image_label, event.get("image", "event_images/default_event.jpg"), 180, 180)
         image_layout.addWidget(image_label, 0, Qt.AlignTop)
         event_layout.addWidget(image_container)
         
@@ -2424,14 +2118,13 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         """Show event details in the stacked widget for attendees with ticket purchase option."""
         # Reload the event data to get the latest ticket quantities
         try:
-            with open("events.json", "r", encoding="utf-8") as f:
-                events = json.load(f)
-                for e in events:
-                    if e["event_id"] == event["event_id"]:
-                        event = e
-                        break
+            events = store.events()
+            for e in events:
+                if e["event_id"] == event["event_id"]:
+                    event = e
+                    break
         except Exception as e:
-            print(f"Error reloading event data: {str(e)}")
+            log.error("Error reloading event data: %s", e)
 
         # Clear previous content
         while self.attendee_event_details_layout.count():
@@ -2457,9 +2150,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         
         # Event Image
         image_label = QLabel()
-        pixmap = QPixmap(event.get("image", "event_images/default_event.jpg"))
-        scaled_pixmap = pixmap.scaled(400, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        image_label.setPixmap(scaled_pixmap)
+        load_into_label(image_label, event.get("image", "event_images/default_event.jpg"), 400, 300)
         content_layout.addWidget(image_label, alignment=Qt.AlignCenter)
         
         # Event Details Section
@@ -2510,58 +2201,57 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
 
         # Add ratings if they exist
         try:
-            with open("reviews.json", "r") as f:
-                reviews = json.load(f)
-                event_reviews = [r for r in reviews["event_reviews"] if r["event_id"] == event["event_id"]]
-                if event_reviews:
-                    # Reviews Section
-                    reviews_group = QGroupBox("Κριτικές")
-                    reviews_group.setStyleSheet("""
-                        QGroupBox {
-                            font-size: 16px;
-                            padding: 15px;
-                            border: 1px solid #ddd;
-                            border-radius: 5px;
-                            margin-top: 10px;
-                        }
-                        QGroupBox::title {
-                            color: #D91656;
-                            padding: 0 10px;
-                        }
-                    """)
-                    reviews_layout = QVBoxLayout()
+            reviews = store.reviews()
+            event_reviews = [r for r in reviews["event_reviews"] if r["event_id"] == event["event_id"]]
+            if event_reviews:
+                # Reviews Section
+                reviews_group = QGroupBox("Κριτικές")
+                reviews_group.setStyleSheet("""
+                    QGroupBox {
+                        font-size: 16px;
+                        padding: 15px;
+                        border: 1px solid #ddd;
+                        border-radius: 5px;
+                        margin-top: 10px;
+                    }
+                    QGroupBox::title {
+                        color: #D91656;
+                        padding: 0 10px;
+                    }
+                """)
+                reviews_layout = QVBoxLayout()
                     
-                    # Average Rating
-                    avg_rating = sum(r["rating"] for r in event_reviews) / len(event_reviews)
-                    rating_text = f"""
-                    <p style='font-size: 16px;'>
-                    <b>Μέση Βαθμολογία:</b> {avg_rating:.1f}/5 ({len(event_reviews)} κριτικές)
-                    </p>
-                    """
-                    rating_label = QLabel(rating_text)
-                    rating_label.setStyleSheet("color: #333;")
-                    reviews_layout.addWidget(rating_label)
+                # Average Rating
+                avg_rating = sum(r["rating"] for r in event_reviews) / len(event_reviews)
+                rating_text = f"""
+                <p style='font-size: 16px;'>
+                <b>Μέση Βαθμολογία:</b> {avg_rating:.1f}/5 ({len(event_reviews)} κριτικές)
+                </p>
+                """
+                rating_label = QLabel(rating_text)
+                rating_label.setStyleSheet("color: #333;")
+                reviews_layout.addWidget(rating_label)
                     
-                    # Show last 3 reviews
-                    if len(event_reviews) > 0:
-                        reviews_layout.addWidget(QLabel("<b>Πρόσφατες Κριτικές:</b>"))
-                        for review in sorted(event_reviews, key=lambda x: x["date"], reverse=True)[:3]:
-                            review_text = f"""
-                            <div style='background-color: #f8f8f8; padding: 10px; border-radius: 5px; margin: 5px 0;'>
-                            <p style='font-size: 14px; margin: 5px 0;'>
-                            <b>Βαθμολογία:</b> {review['rating']}/5<br>
-                            <b>Ημερομηνία:</b> {review['date']}<br>
-                            <b>Σχόλια:</b><br>{review['comments']}
-                            </p>
-                            </div>
-                            """
-                            review_label = QLabel(review_text)
-                            review_label.setWordWrap(True)
-                            review_label.setStyleSheet("color: #333;")
-                            reviews_layout.addWidget(review_label)
+                # Show last 3 reviews
+                if len(event_reviews) > 0:
+                    reviews_layout.addWidget(QLabel("<b>Πρόσφατες Κριτικές:</b>"))
+                    for review in sorted(event_reviews, key=lambda x: x["date"], reverse=True)[:3]:
+                        review_text = f"""
+                        <div style='background-color: #f8f8f8; padding: 10px; border-radius: 5px; margin: 5px 0;'>
+                        <p style='font-size: 14px; margin: 5px 0;'>
+                        <b>Βαθμολογία:</b> {review['rating']}/5<br>
+                        <b>Ημερομηνία:</b> {review['date']}<br>
+                        <b>Σχόλια:</b><br>{review['comments']}
+                        </p>
+                        </div>
+                        """
+                        review_label = QLabel(review_text)
+                        review_label.setWordWrap(True)
+                        review_label.setStyleSheet("color: #333;")
+                        reviews_layout.addWidget(review_label)
                     
-                    reviews_group.setLayout(reviews_layout)
-                    content_layout.addWidget(reviews_group)
+                reviews_group.setLayout(reviews_layout)
+                content_layout.addWidget(reviews_group)
         except:
             pass
 
@@ -2651,25 +2341,25 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
 
     def show_organizer_my_events_tab(self):
         """Show the My Events tab and display events the organizer has created."""
-        print("Debug - Loading organizer my events tab")
+        log.debug("Loading organizer my events tab")
         
         # Security check: Only allow organizers to access this function
         if not self.current_user or self.current_user.get("type") != "organizer":
-            print(f"Debug - Access denied. User type: {self.current_user.get('type') if self.current_user else 'None'}")
+            log.debug("Access denied. User type: %s", self.current_user.get('type') if self.current_user else 'None')
             QMessageBox.warning(self, "Access Denied", "Only organizers can access this functionality.")
             return
         
         # Switch to the My Events tab
         my_events_tab = self.private_tabs.get("My Events")
         if not my_events_tab:
-            print("Debug - My Events tab not found")
+            log.debug("My Events tab not found")
             return
             
         self.tabs.setCurrentWidget(my_events_tab)
         
         # Ensure we have the organizer_events_layout
         if not hasattr(self, 'organizer_events_layout'):
-            print("Debug - Creating new organizer_events_layout")
+            log.debug("Creating new organizer_events_layout")
             scroll_area = QScrollArea()
             scroll_area.setWidgetResizable(True)
             scroll_area.setStyleSheet("border: none;")
@@ -2693,18 +2383,18 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
             self.organizer_event_details_widget.deleteLater()
             delattr(self, 'organizer_event_details_widget')
         
-        print("Debug - Loading events for organizer:", self.current_user["user_id"])
+        log.debug("Loading events for organizer: %s", self.current_user['user_id'])
         # Filter events created by the current user
         my_events = [event for event in self.events if event.get("organizer_id") == self.current_user["user_id"]]
         
         if not my_events:
-            print("Debug - No events found for organizer")
+            log.debug("No events found for organizer")
             no_events_label = QLabel("You haven't created any events yet.")
             no_events_label.setStyleSheet("font-size: 14px; color: #666;")
             self.organizer_events_layout.addWidget(no_events_label)
             return
         
-        print(f"Debug - Found {len(my_events)} events")
+        log.debug("Found %s events", len(my_events))
         
         # Create a stacked widget to hold both the events list and event details
         self.organizer_events_stack = QStackedWidget()
@@ -2762,9 +2452,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         image_layout.setContentsMargins(0, 0, 0, 0)
         # Event image
         image_label = QLabel()
-        image = QPixmap(event.get("image", "event_images/default_event.jpg"))
-        scaled_pixmap = image.scaled(180, 180, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        image_label.setPixmap(scaled_pixmap)
+        load_into_label(image_label, event.get("image", "event_images/default_event.jpg"), 180, 180)
         image_layout.setAlignment(Qt.AlignTop)
         image_layout.addWidget(image_label)
         event_layout.addWidget(image_container)
@@ -2834,7 +2522,9 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         # Find the index of the tab with the given name
         index = -1
         for i in range(self.tabs.count()):
-            if self.tabs.tabText(i) == tab_name:
+            text = self.tabs.tabText(i)
+            # Tabs may carry a count, e.g. "Notifications (3)"
+            if text == tab_name or text.startswith(tab_name + " ("):
                 index = i
                 return index
     #endregion
@@ -2921,8 +2611,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         
         # Event Image
         image_label = QLabel()
-        image = QPixmap(event.get("image", "event_images/default_event.jpg"))
-        image_label.setPixmap(image.scaled(400, 300, Qt.KeepAspectRatio))
+        load_into_label(image_label, event.get("image", "event_images/default_event.jpg"), 400, 300)
         layout.addWidget(image_label, alignment=Qt.AlignCenter)
         
         # Event Details
@@ -2949,74 +2638,72 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         
         # Load vendor information
         try:
-            with open("services.json", "r") as f:
-                services = json.load(f)
-                event_services = [s for s in services["services"] if s.get("event_id") == event["event_id"]]
+            services = store.load("services")
+            event_services = [s for s in services["services"] if s.get("event_id") == event["event_id"]]
                 
-                if event_services:
-                    for service in event_services:
-                        vendor_details = QLabel(
-                            f"<p><b>Όνομα:</b> {service['vendor_name']}</p>"
-                            f"<p><b>Υπηρεσία:</b> {service['name']}</p>"
-                            f"<p><b>Τύπος:</b> {service['type']}</p>"
-                            f"<p><b>Περιγραφή:</b> {service['description']}</p>"
-                            f"<p><b>Τιμολόγηση:</b> {service['price']}€ ({service['pricing_type']})</p>"
-                        )
-                        vendor_details.setStyleSheet("font-size: 14px; color: #333;")
-                        vendor_details.setWordWrap(True)
-                        vendor_layout.addWidget(vendor_details)
+            if event_services:
+                for service in event_services:
+                    vendor_details = QLabel(
+                        f"<p><b>Όνομα:</b> {service['vendor_name']}</p>"
+                        f"<p><b>Υπηρεσία:</b> {service['name']}</p>"
+                        f"<p><b>Τύπος:</b> {service['type']}</p>"
+                        f"<p><b>Περιγραφή:</b> {service['description']}</p>"
+                        f"<p><b>Τιμολόγηση:</b> {service['price']}€ ({service['pricing_type']})</p>"
+                    )
+                    vendor_details.setStyleSheet("font-size: 14px; color: #333;")
+                    vendor_details.setWordWrap(True)
+                    vendor_layout.addWidget(vendor_details)
                         
-                        if show_vendor_review:
-                            # Check if event has passed
-                            event_date = datetime.strptime(event["start_date"], "%d/%m/%Y").date()
-                            if event_date <= datetime.now().date():
-                                review_btn = QPushButton("Αξιολόγηση Vendor")
-                                review_btn.setStyleSheet("""
-                                    QPushButton {
-                                        background-color: #FFB200;
-                                        color: white;
-                                        padding: 10px 20px;
-                                        font-size: 14px;
-                                        border-radius: 5px;
-                                        border: none;
-                                    }
-                                    QPushButton:hover {
-                                        background-color: #EB5B00;
-                                    }
-                                """)
-                                review_btn.clicked.connect(
-                                    lambda checked, e=event["event_id"], v=service["vendor_id"]: 
-                                    self.show_review_modal("vendor", e, v)
-                                )
-                                vendor_layout.addWidget(review_btn)
+                    if show_vendor_review:
+                        # Check if event has passed
+                        event_date = datetime.strptime(event["start_date"], "%d/%m/%Y").date()
+                        if event_date <= datetime.now().date():
+                            review_btn = QPushButton("Αξιολόγηση Vendor")
+                            review_btn.setStyleSheet("""
+                                QPushButton {
+                                    background-color: #FFB200;
+                                    color: white;
+                                    padding: 10px 20px;
+                                    font-size: 14px;
+                                    border-radius: 5px;
+                                    border: none;
+                                }
+                                QPushButton:hover {
+                                    background-color: #EB5B00;
+                                }
+                            """)
+                            review_btn.clicked.connect(
+                                lambda checked, e=event["event_id"], v=service["vendor_id"]: 
+                                self.show_review_modal("vendor", e, v)
+                            )
+                            vendor_layout.addWidget(review_btn)
                                 
-                                # Add vendor ratings if they exist
-                                try:
-                                    with open("reviews.json", "r") as f:
-                                        reviews = json.load(f)
-                                        vendor_reviews = [r for r in reviews["vendor_reviews"] 
-                                                        if r["vendor_id"] == service["vendor_id"]]
-                                        if vendor_reviews:
-                                            avg_rating = sum(r["rating"] for r in vendor_reviews) / len(vendor_reviews)
-                                            rating_label = QLabel(
-                                                f"<p><b>Μέση Βαθμολογία Vendor:</b> {avg_rating:.1f}/5 "
-                                                f"({len(vendor_reviews)} κριτικές)</p>"
-                                            )
-                                            rating_label.setStyleSheet("font-size: 14px; color: #333;")
-                                            vendor_layout.addWidget(rating_label)
-                                except:
-                                    pass
-                            else:
-                                notice = QLabel(
-                                    "Η αξιολόγηση του vendor θα είναι διαθέσιμη μετά την ολοκλήρωση της εκδήλωσης."
-                                )
-                                notice.setStyleSheet("font-size: 14px; color: #666; font-style: italic;")
-                                notice.setWordWrap(True)
-                                vendor_layout.addWidget(notice)
-                else:
-                    no_vendor = QLabel("Δεν έχουν ορισθεί vendors για την εκδήλωση ακόμα.")
-                    no_vendor.setStyleSheet("font-size: 14px; color: #666; font-style: italic;")
-                    vendor_layout.addWidget(no_vendor)
+                            # Add vendor ratings if they exist
+                            try:
+                                reviews = store.reviews()
+                                vendor_reviews = [r for r in reviews["vendor_reviews"] 
+                                                if r["vendor_id"] == service["vendor_id"]]
+                                if vendor_reviews:
+                                    avg_rating = sum(r["rating"] for r in vendor_reviews) / len(vendor_reviews)
+                                    rating_label = QLabel(
+                                        f"<p><b>Μέση Βαθμολογία Vendor:</b> {avg_rating:.1f}/5 "
+                                        f"({len(vendor_reviews)} κριτικές)</p>"
+                                    )
+                                    rating_label.setStyleSheet("font-size: 14px; color: #333;")
+                                    vendor_layout.addWidget(rating_label)
+                            except:
+                                pass
+                        else:
+                            notice = QLabel(
+                                "Η αξιολόγηση του vendor θα είναι διαθέσιμη μετά την ολοκλήρωση της εκδήλωσης."
+                            )
+                            notice.setStyleSheet("font-size: 14px; color: #666; font-style: italic;")
+                            notice.setWordWrap(True)
+                            vendor_layout.addWidget(notice)
+            else:
+                no_vendor = QLabel("Δεν έχουν ορισθεί vendors για την εκδήλωση ακόμα.")
+                no_vendor.setStyleSheet("font-size: 14px; color: #666; font-style: italic;")
+                vendor_layout.addWidget(no_vendor)
         except Exception as e:
             error_label = QLabel("Σφάλμα κατά τη φόρτωση των πληροφοριών του vendor.")
             error_label.setStyleSheet("font-size: 14px; color: #D91656;")
@@ -3047,11 +2734,11 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
 
     def show_organizer_event_details_in_stack(self, event):
         """Show event details in the stack for organizers."""
-        print(f"Debug - Showing details for event {event['event_id']}")
+        log.debug("Showing details for event %s", event['event_id'])
         
         # Security check: Only allow organizers to access this function
         if not self.current_user or self.current_user.get("type") != "organizer":
-            print(f"Debug - Access denied. User type: {self.current_user.get('type') if self.current_user else 'None'}")
+            log.debug("Access denied. User type: %s", self.current_user.get('type') if self.current_user else 'None')
             QMessageBox.warning(self, "Access Denied", "Only organizers can access this functionality.")
             return
         
@@ -3079,9 +2766,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         
         # Event Image
         image_label = QLabel()
-        pixmap = QPixmap(event.get("image", "event_images/default_event.jpg"))
-        scaled_pixmap = pixmap.scaled(400, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        image_label.setPixmap(scaled_pixmap)
+        load_into_label(image_label, event.get("image", "event_images/default_event.jpg"), 400, 300)
         image_label.setAlignment(Qt.AlignCenter)
         content_layout.addWidget(image_label, alignment=Qt.AlignCenter)
         
@@ -3119,12 +2804,33 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         details_layout.addWidget(details_label)
         details_group.setLayout(details_layout)
         content_layout.addWidget(details_group)
+
+        # Cancelling the event refunds every ticket holder
+        if is_cancelled(event):
+            cancelled_label = QLabel(f"Η εκδήλωση ακυρώθηκε στις {event.get('cancelled_at', '')}")
+            cancelled_label.setStyleSheet("color: #D91656; font-size: 16px; font-weight: bold;")
+            content_layout.addWidget(cancelled_label, alignment=Qt.AlignCenter)
+        else:
+            cancel_event_btn = QPushButton("Ακύρωση Εκδήλωσης")
+            cancel_event_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #c62828;
+                    color: white;
+                    padding: 10px 20px;
+                    font-size: 14px;
+                    border-radius: 5px;
+                }
+                QPushButton:hover {
+                    background-color: #8e0000;
+                }
+            """)
+            cancel_event_btn.clicked.connect(lambda: self.confirm_cancel_event(event))
+            content_layout.addWidget(cancel_event_btn, alignment=Qt.AlignRight)
         
         # Load vendor information
         try:
-            with open("services.json", "r", encoding='utf-8') as f:
-                services = json.load(f)["services"]
-                event_services = [s for s in services if s.get("event_id") == event["event_id"]]
+            services = store.services()
+            event_services = [s for s in services if s.get("event_id") == event["event_id"]]
                 
             if event_services:
                 # Vendor Information Section
@@ -3277,16 +2983,70 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
                 content_layout.addWidget(buttons_container)
                 
         except Exception as e:
-            print(f"Error loading vendor information: {e}")
+            log.error("Error loading vendor information: %s", e)
             
         scroll.setWidget(content_widget)
         self.organizer_event_details_layout.addWidget(scroll)
         self.organizer_events_stack.setCurrentIndex(1)
 
+    def confirm_cancel_event(self, event):
+        """Ask how to pay the holders back, then cancel the event on the I/O thread."""
+        choices = ["Επιστροφή χρημάτων", "Πίστωση στον λογαριασμό των κατόχων"]
+        choice, ok = QInputDialog.getItem(
+            self, "Ακύρωση Εκδήλωσης",
+            f"Η εκδήλωση '{event['title']}' θα ακυρωθεί και όλα τα εισιτήριά της θα επιστραφούν.\n"
+            "Πώς θα αποζημιωθούν οι κάτοχοι;", choices, 0, False)
+        if not ok:
+            return
+        refund_type = "refund" if choice == choices[0] else "credit"
+        reason, ok = QInputDialog.getText(self, "Ακύρωση Εκδήλωσης", "Λόγος ακύρωσης (προαιρετικά):")
+        if not ok:
+            return
+
+        description = "Ακύρωση εκδήλωσης..."
+        self.cancel_progress = QProgressDialog(description, None, 0, 0, self)
+        self.cancel_progress.setWindowTitle("Ακύρωση Εκδήλωσης")
+        self.cancel_progress.setWindowModality(Qt.WindowModal)
+        self.cancel_progress.setMinimumDuration(0)
+        self.cancel_progress.show()
+        io_executor().progress.connect(self.show_cancel_progress)
+        io_executor().submit(
+            cancel_event, event["event_id"], refund_type, reason.strip(),
+            on_success=lambda result: self.on_event_cancelled(event, result),
+            on_error=self.on_event_cancel_failed,
+            description=description,
+            report_progress=True,
+        )
+
+    def show_cancel_progress(self, description, done, total):
+        if self.cancel_progress is not None:
+            self.cancel_progress.setMaximum(total)
+            self.cancel_progress.setValue(done)
+
+    def finish_cancel_progress(self):
+        io_executor().progress.disconnect(self.show_cancel_progress)
+        self.cancel_progress.close()
+        self.cancel_progress = None
+
+    def on_event_cancelled(self, event, result):
+        self.finish_cancel_progress()
+        self.reload_events_data()
+        QMessageBox.information(
+            self, "Ακύρωση Εκδήλωσης",
+            f"Η εκδήλωση '{event['title']}' ακυρώθηκε.\n"
+            f"Επιστράφηκαν {result['tickets']} εισιτήρια σε {result['holders']} κατόχους "
+            f"({result['amount']:.2f}€).")
+        self.organizer_events_stack.setCurrentIndex(0)
+        self.show_organizer_my_events_tab()
+
+    def on_event_cancel_failed(self, error):
+        self.finish_cancel_progress()
+        QMessageBox.warning(self, "Σφάλμα", f"Η ακύρωση της εκδήλωσης απέτυχε: {error}")
+
     def on_tab_changed(self, index):
         """Handle tab changes and ensure content is loaded."""
         current_tab_text = self.tabs.tabText(index)
-        print(f"Debug - Switching to tab: {current_tab_text}")
+        log.debug("Switching to tab: %s", current_tab_text)
         
         # Handle different tab switches
         if current_tab_text == "My Events" and self.current_user:
@@ -3309,11 +3069,11 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
 
     def show_available_vendors(self, event):
         """Show available vendors for an event with filtering options."""
-        print(f"Debug - Showing available vendors for event {event['event_id']}")
+        log.debug("Showing available vendors for event %s", event['event_id'])
         
         # Security check: Only allow organizers to access this function
         if not self.current_user or self.current_user.get("type") != "organizer":
-            print(f"Debug - Access denied. User type: {self.current_user.get('type') if self.current_user else 'None'}")
+            log.debug("Access denied. User type: %s", self.current_user.get('type') if self.current_user else 'None')
             QMessageBox.warning(self, "Access Denied", "Only organizers can access this functionality.")
             return
         
@@ -3575,7 +3335,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
 
     def apply_vendor_filters(self, event):
         """Apply filters to the vendor list."""
-        print("Debug - Applying vendor filters")
+        log.debug("Applying vendor filters")
         self.display_filtered_vendors(event)
         
     def display_filtered_vendors(self, event):
@@ -3588,8 +3348,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
 
         try:
             # Load services data
-            with open("services.json", "r", encoding='utf-8') as f:
-                services = json.load(f)["services"]
+            services = store.services()
 
             # Filter out services that are already assigned to events
             available_services = [s for s in services if not s.get("event_id")]
@@ -3609,47 +3368,20 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
                 return
 
             # Filter services based on criteria
-            filtered_services = []
-            for service in available_services:
-                # Type filter
-                selected_types = [cb.text() for cb in self.type_checkboxes if cb.isChecked()]
-                if selected_types and "Όλα" not in selected_types and service['type'] not in selected_types:
-                    continue
-
-                # Pricing policy filter
-                selected_policies = [cb.text() for cb in self.pricing_checkboxes if cb.isChecked()]
-                if selected_policies and service.get('pricing_type') not in selected_policies:
-                    continue
-
-                # Cost filter
-                try:
-                    min_cost = float(self.cost_min.text()) if self.cost_min.text() else 0
-                    max_cost = float(self.cost_max.text()) if self.cost_max.text() else float('inf')
-                    service_cost = float(service['price'])
-                    if not (min_cost <= service_cost <= max_cost):
-                        continue
-                except ValueError:
-                    pass
-
-                # Rating filter
-                selected_ratings = [cb.text() for cb in self.rating_checkboxes if cb.isChecked()]
-                if selected_ratings:
-                    try:
-                        with open("reviews.json", "r") as f:
-                            reviews = json.load(f)
-                            vendor_reviews = [r for r in reviews["vendor_reviews"] if r["vendor_id"] == service["vendor_id"]]
-                            if vendor_reviews:
-                                avg_rating = sum(r["rating"] for r in vendor_reviews) / len(vendor_reviews)
-                                min_rating = min(int(r.split("+")[0]) for r in selected_ratings)
-                                if avg_rating < min_rating:
-                                    continue
-                            else:
-                                continue  # Skip if no reviews and rating filter is active
-                    except (FileNotFoundError, KeyError, json.JSONDecodeError):
-                        if selected_ratings:
-                            continue  # Skip if can't verify rating and rating filter is active
-
-                filtered_services.append(service)
+            selected_types = [cb.text() for cb in self.type_checkboxes if cb.isChecked()]
+            if "Όλα" in selected_types:
+                selected_types = []
+            selected_policies = [cb.text() for cb in self.pricing_checkboxes if cb.isChecked()]
+            try:
+                min_cost = float(self.cost_min.text()) if self.cost_min.text() else 0
+                max_cost = float(self.cost_max.text()) if self.cost_max.text() else float('inf')
+            except ValueError:
+                min_cost, max_cost = 0, float('inf')
+            selected_ratings = [cb.text() for cb in self.rating_checkboxes if cb.isChecked()]
+            min_rating = min(int(r.split("+")[0]) for r in selected_ratings) if selected_ratings else None
+
+            filtered_services = filter_vendor_services(
+                selected_types, selected_policies, min_cost, max_cost, min_rating)
 
             if not filtered_services:
                 no_results = QLabel("Δεν βρέθηκαν υπηρεσίες για τα επιλεγμένα φίλτρα")
@@ -3686,7 +3418,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
             """)
             self.vendors_layout.addWidget(error_label, alignment=Qt.AlignCenter)
         except Exception as e:
-            print(f"Error loading services: {str(e)}")
+            log.error("Error loading services: %s", e)
             error_label = QLabel(f"Σφάλμα κατά τη φόρτωση των υπηρεσιών: {str(e)}")
             error_label.setStyleSheet("color: red;")
             self.vendors_layout.addWidget(error_label)
@@ -3726,13 +3458,8 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         """)
         
         if service.get('media_path'):
-            pixmap = QPixmap(service['media_path'])
-            if not pixmap.isNull():
-                pixmap = pixmap.scaled(180, 180, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                image_label.setPixmap(pixmap)
-            else:
-                image_label.setText("No Image")
-                image_label.setAlignment(Qt.AlignCenter)
+            image_label.setAlignment(Qt.AlignCenter)
+            load_into_label(image_label, service['media_path'], 180, 180, missing_text="No Image")
         else:
             image_label.setText("No Image")
             image_label.setAlignment(Qt.AlignCenter)
@@ -3821,12 +3548,9 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         # Service image at the top
         if service.get('media_path'):
             image_label = QLabel()
-            pixmap = QPixmap(service['media_path'])
-            if not pixmap.isNull():
-                pixmap = pixmap.scaled(400, 250, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                image_label.setPixmap(pixmap)
-                image_label.setAlignment(Qt.AlignCenter)
-                layout.addWidget(image_label)
+            image_label.setAlignment(Qt.AlignCenter)
+            load_into_label(image_label, service['media_path'], 400, 250)
+            layout.addWidget(image_label)
         
         # Service Title
         title = QLabel(service["name"])
@@ -3975,7 +3699,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
                     "An error occurred while sending the request."
                 )
         except Exception as e:
-            print(f"Error in request_collaboration: {e}")
+            log.error("Error in request_collaboration: %s", e)
             QMessageBox.warning(
                 self,
                 "Error",
@@ -4004,146 +3728,49 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         back_btn.setStyleSheet(self.get_back_button_style())
         return back_btn
 
+    def show_busy(self, busy, description):
+        """Show a busy cursor and status message while background writes run."""
+        if busy and not QApplication.overrideCursor():
+            QApplication.setOverrideCursor(Qt.BusyCursor)
+        elif not busy and QApplication.overrideCursor():
+            QApplication.restoreOverrideCursor()
+        if busy:
+            self.statusBar().showMessage(description)
+        else:
+            self.statusBar().clearMessage()
+
     def add_notification(self, user_id, title, message, category=None, additional_data=None):
         """Add a notification for a user."""
         try:
-            # Load existing notifications
-            try:
-                with open("notifications.json", "r", encoding='utf-8') as f:
-                    notifications_data = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError):
-                notifications_data = {"notifications": []}
-            
-            # Create new notification
-            notification = {
-                "notification_id": f"notif_{datetime.now().strftime('%Y%m%d%H%M%S')}",
-                "user_id": user_id,
-                "title": title,
-                "message": message,
-                "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-                "read": False,
-                "category": category
-            }
-
-            # Add additional data if provided
-            if additional_data:
-                notification.update(additional_data)
-            
-            # Add new notification
-            notifications_data["notifications"].append(notification)
-            
-            # Save updated data
-            with open("notifications.json", "w", encoding='utf-8') as f:
-                json.dump(notifications_data, f, ensure_ascii=False, indent=4)
-            
-            # Update notifications tab if it exists and belongs to the target user
-            if (hasattr(self, 'current_user') and 
-                self.current_user and 
-                self.current_user["user_id"] == user_id and 
-                "Notifications" in self.private_tabs):
-                self.private_tabs["Notifications"].load_notifications()
-            
+            notification = create_notification(user_id, title, message, category, additional_data)
+
+            # Save the new notification on the I/O thread; the notification
+            # watcher refreshes the target user's tab once it is written
+            io_executor().submit(
+                store.append, "notifications", notification,
+                on_error=lambda e: log.error("Error adding notification: %s", e),
+                description="Αποστολή ειδοποίησης...",
+            )
             return True
         except Exception as e:
-            print(f"Error adding notification: {e}")
+            log.error("Error adding notification: %s", e)
             return False
 
-    def check_notifications(self):
-        """Check for unread notifications for the current user."""
-        if not hasattr(self, 'current_user'):
-            return
-        
-        try:
-            with open("notifications.json", "r", encoding='utf-8') as f:
-                data = json.load(f)
-                unread = [n for n in data["notifications"] 
-                         if n["user_id"] == self.current_user["user_id"] and not n.get("read", False)]
-                
-                if unread and "Notifications" in self.private_tabs:
-                    # Update the notifications tab
-                    self.private_tabs["Notifications"].load_notifications()
-                    
-                    # Update tab text to show unread count
-                    notifications_index = self.get_tab_index("Notifications")
-                    if notifications_index >= 0:
-                        self.tabs.setTabText(notifications_index, f"Notifications ({len(unread)})")
-                        
-                    # Show collaboration requests immediately
-                    for notification in unread:
-                        if notification.get("category") == "Collaboration Requests":
-                            self.show_collaboration_request(notification)
-                            self.mark_notification_as_read(notification["notification_id"])
-        except FileNotFoundError:
-            pass
-        except Exception as e:
-            print(f"Error checking notifications: {e}")
-
     def mark_notification_as_read(self, notification_id):
         """Mark a notification as read."""
-        try:
-            with open("notifications.json", "r", encoding='utf-8') as f:
-                data = json.load(f)
-            
-            notification = next((n for n in data["notifications"] 
-                               if n["notification_id"] == notification_id), None)
-            if notification:
-                notification["read"] = True
-                
-                with open("notifications.json", "w", encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=4)
-                    
-                # Update notifications tab if it exists
-                if "Notifications" in self.private_tabs:
-                    self.private_tabs["Notifications"].load_notifications()
-                    
-                    # Update tab text to show unread count
-                    notifications_index = self.get_tab_index("Notifications")
-                    if notifications_index >= 0:
-                        unread_count = len([n for n in data["notifications"] 
-                                          if n["user_id"] == self.current_user["user_id"] and 
-                                          not n.get("read", False)])
-                        if unread_count > 0:
-                            self.tabs.setTabText(notifications_index, f"Notifications ({unread_count})")
-                        else:
-                            self.tabs.setTabText(notifications_index, "Notifications")
-                    
-        except Exception as e:
-            print(f"Error marking notification as read: {e}")
+        # Saved on the I/O thread; the tab and its unread count refresh once written
+        io_executor().submit(
+            mark_read, notification_id,
+            on_success=lambda notification: self.on_notification_read(),
+            on_error=lambda e: log.error("Error marking notification as read: %s", e),
+            description="Ενημέρωση ειδοποίησης...",
+        )
 
-    def show_collaboration_request(self, notification):
-        """Show the collaboration request details dialog."""
-        try:
-            # Get request data from the notification
-            collab_data = notification.get("collaboration_request", {})
-            request_id = collab_data.get("request_id")
-            
-            if not request_id:
-                return
-            
-            # Get request details from collaboration_requests.json
-            with open("collaboration_requests.json", "r") as f:
-                data = json.load(f)
-                request = next((r for r in data["requests"] if r["request_id"] == request_id), None)
-            
-            if not request or request["status"] != "pending":
-                return
-            
-            # Get event info from notification
-            event = collab_data.get("event_info")
-            if not event:
-                return
-            
-            # Get service info from notification
-            service = collab_data.get("service_info")
-            if not service:
-                return
-            
-            # Show the collaboration request details dialog - pass the notification
-            dialog = CollaborationRequestDetailsDialog(request, event, service, self, notification)
-            dialog.exec_()
-            
-        except Exception as e:
-            print(f"Error showing collaboration request: {e}")
+    def on_notification_read(self):
+        # Update notifications tab if it exists
+        if "Notifications" in self.private_tabs:
+            self.private_tabs["Notifications"].load_notifications()
+            self.update_notification_badge()
 
     def add_notification_tab(self):
         """Add the notifications tab to the current user's dashboard."""
@@ -4155,160 +3782,47 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
     def handle_collaboration_response(self, notification, response):
         """Handle vendor's response to a collaboration request."""
         try:
-            collab_data = notification.get("collaboration_request", {})
-            request_id = collab_data.get("request_id")
-            
-            if not request_id:
+            if not notification.get("collaboration_request", {}).get("request_id"):
                 QMessageBox.warning(self, "Σφάλμα", "Δεν βρέθηκαν στοιχεία αιτήματος.")
                 return
 
-            # Load collaboration requests
-            with open("collaboration_requests.json", "r", encoding='utf-8') as f:
-                data = json.load(f)
-                requests = data.get("requests", [])
-
-            # Find and update the specific request
-            request = next((r for r in requests if r["request_id"] == request_id), None)
-            if request:
-                request["status"] = response
-                request["response_date"] = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-                
-                # Save updated requests
-                with open("collaboration_requests.json", "w", encoding='utf-8') as f:
-                    json.dump({"requests": requests}, f, ensure_ascii=False, indent=4)
-
-                # Get detailed information for notifications
-                organizer_info = collab_data.get("organizer_info", {})
-                event_info = collab_data.get("event_info", {})
-                service_info = collab_data.get("service_info", {})
-                vendor_name = f"{self.current_user['name']} {self.current_user['surname']}"
-
-                if response == "accepted":
-                    # Update service status if accepted
-                    with open("services.json", "r", encoding='utf-8') as f:
-                        services_data = json.load(f)
-                        service = next((s for s in services_data["services"] 
-                                      if s["service_id"] == service_info.get("id")), None)
-                        if service:
-                            service["event_id"] = event_info.get("id")
-                            service["status"] = "assigned"
-                            service["assigned_date"] = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-                            
-                    with open("services.json", "w", encoding='utf-8') as f:
-                        json.dump(services_data, f, ensure_ascii=False, indent=4)
-
-                    # Send acceptance notification to organizer
-                    self.add_notification(
-                        organizer_info.get("id"),
-                        "Αίτημα Συνεργασίας Εγκρίθηκε! ✅",
-                        f"Ο vendor {vendor_name} αποδέχτηκε το αίτημα συνεργασίας για την υπηρεσία '{service_info.get('name', '')}' στην εκδήλωση '{event_info.get('title', '')}'.",
-                        category="Collaboration Requests",
-                        additional_data={
-                            "collaboration_response": {
-                                "status": "accepted",
-                                "vendor_name": vendor_name,
-                                "service_name": service_info.get("name", ""),
-                                "event_title": event_info.get("title", ""),
-                                "response_date": datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-                            }
-                        }
-                    )
-
-                    QMessageBox.information(
-                        self,
-                        "Επιτυχία",
-                        f"Αποδεχτήκατε επιτυχώς το αίτημα συνεργασίας!\n\nΗ υπηρεσία '{service_info.get('name', '')}' έχει ανατεθεί στην εκδήλωση '{event_info.get('title', '')}'.\n\nΟ διοργανωτής θα ειδοποιηθεί για την αποδοχή σας."
-                    )
-
-                else:  # rejected
-                    # Send rejection notification to organizer
-                    self.add_notification(
-                        organizer_info.get("id"),
-                        "Αίτημα Συνεργασίας Απορρίφθηκε ❌",
-                        f"Ο vendor {vendor_name} απέρριψε το αίτημα συνεργασίας για την υπηρεσία '{service_info.get('name', '')}' στην εκδήλωση '{event_info.get('title', '')}'.",
-                        category="Collaboration Requests",
-                        additional_data={
-                            "collaboration_response": {
-                                "status": "rejected",
-                                "vendor_name": vendor_name,
-                                "service_name": service_info.get("name", ""),
-                                "event_title": event_info.get("title", ""),
-                                "response_date": datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-                            }
-                        }
-                    )
-
-                    QMessageBox.information(
-                        self,
-                        "Απόρριψη Καταγράφηκε",
-                        f"Απορρίψατε το αίτημα συνεργασίας για την υπηρεσία '{service_info.get('name', '')}'.\n\nΟ διοργανωτής θα ειδοποιηθεί για την απόρριψη."
-                    )
+            try:
+                respond_to_collaboration(notification, response, self.current_user)
+            except ValueError:
+                QMessageBox.warning(self, "Σφάλμα", "Δεν βρέθηκε το αίτημα συνεργασίας.")
+                return
 
-                # Mark the original notification as deleted and refresh the notifications tab
-                try:
-                    with open("notifications.json", "r", encoding='utf-8') as f:
-                        notif_data = json.load(f)
-                    
-                    for notif in notif_data["notifications"]:
-                        if notif.get("notification_id") == notification.get("notification_id"):
-                            notif["deleted"] = True
-                            break
-                    
-                    with open("notifications.json", "w", encoding='utf-8') as f:
-                        json.dump(notif_data, f, ensure_ascii=False, indent=4)
-                    
-                    # Refresh the notifications tab to remove the processed notification
-                    if "Notifications" in self.private_tabs:
-                        self.private_tabs["Notifications"].load_notifications()
-                        
-                        # Update tab text to show unread count
-                        notifications_index = self.get_tab_index("Notifications")
-                        if notifications_index >= 0:
-                            unread_count = len([n for n in notif_data["notifications"] 
-                                              if n["user_id"] == self.current_user["user_id"] and 
-                                              not n.get("read", False) and not n.get("deleted", False)])
-                            if unread_count > 0:
-                                self.tabs.setTabText(notifications_index, f"Notifications ({unread_count})")
-                            else:
-                                self.tabs.setTabText(notifications_index, "Notifications")
-                        
-                except Exception as e:
-                    print(f"Error marking notification as deleted: {e}")
+            service_info = notification["collaboration_request"].get("service_info", {})
+            event_info = notification["collaboration_request"].get("event_info", {})
+            if response == "accepted":
+                QMessageBox.information(
+                    self,
+                    "Επιτυχία",
+                    f"Αποδεχτήκατε επιτυχώς το αίτημα συνεργασίας!\n\nΗ υπηρεσία '{service_info.get('name', '')}' έχει ανατεθεί στην εκδήλωση '{event_info.get('title', '')}'.\n\nΟ διοργανωτής θα ειδοποιηθεί για την αποδοχή σας."
+                )
+            else:  # rejected
+                QMessageBox.information(
+                    self,
+                    "Απόρριψη Καταγράφηκε",
+                    f"Απορρίψατε το αίτημα συνεργασίας για την υπηρεσία '{service_info.get('name', '')}'.\n\nΟ διοργανωτής θα ειδοποιηθεί για την απόρριψη."
+                )
 
-            else:
-                QMessageBox.warning(self, "Σφάλμα", "Δεν βρέθηκε το αίτημα συνεργασίας.")
+            # Refresh the notifications tab to remove the processed notification
+            try:
+                if "Notifications" in self.private_tabs:
+                    self.private_tabs["Notifications"].load_notifications()
+                    self.update_notification_badge()
+            except Exception as e:
+                log.error("Error refreshing notifications: %s", e)
 
         except Exception as e:
-            print(f"Error handling collaboration response: {e}")
+            log.error("Error handling collaboration response: %s", e)
             QMessageBox.warning(
                 self,
                 "Σφάλμα",
                 f"Παρουσιάστηκε σφάλμα κατά την επεξεργασία της απάντησης: {str(e)}"
             )
 
-
-
-    def mark_notification_as_read(self, notification_id):
-        """Mark a notification as read."""
-        try:
-            with open("notifications.json", "r", encoding='utf-8') as f:
-                data = json.load(f)
-                
-            notification = next((n for n in data["notifications"] 
-                               if n["notification_id"] == notification_id), None)
-            if notification:
-                notification["read"] = True
-                
-                with open("notifications.json", "w", encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=4)
-                    
-                # Update notifications tab if it exists
-                if "Notifications" in self.private_tabs:
-                    self.private_tabs["Notifications"].load_notifications()
-                    
-        except Exception as e:
-            print(f"Error marking notification as read: {e}")
-
     def update_ui_after_login(self, user_type):
         """Update UI after successful login."""
         # Hide the Login Tab
@@ -4330,43 +3844,43 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
         # Add notifications tab for all user types
         self.add_notification_tab()
 
+    def update_notification_badge(self):
+        """Show the current user's unread count on the Notifications tab."""
+        if "Notifications" not in self.private_tabs or not self.current_user:
+            return
+        # The tab text carries the count, so look the tab up by widget
+        notifications_index = self.tabs.indexOf(self.private_tabs["Notifications"])
+        if notifications_index < 0:
+            return
+        unread_count = store.notification_index().unread_count(self.current_user["user_id"])
+        self.tabs.setTabText(notifications_index,
+                             f"Notifications ({unread_count})" if unread_count else "Notifications")
+
+    @timed("ui.check_notifications")
     def check_notifications(self):
-        """Check for new notifications periodically."""
+        """Update the notifications badge and tab after notifications changed."""
         if not self.current_user:
             return
 
         try:
-            with open("notifications.json", "r", encoding='utf-8') as f:
-                data = json.load(f)
-                
-            # Check for unread notifications for current user
+            index = store.notification_index()
             current_user_id = self.current_user["user_id"]
-            current_notifications = [n for n in data["notifications"] 
-                                  if n["user_id"] == current_user_id]
-            unread = [n for n in current_notifications if not n.get("read", False)]
             
             if "Notifications" in self.private_tabs:
                 # Update the notifications tab
                 notifications_tab = self.private_tabs["Notifications"]
+                notifications_tab.refresh_category_counts()
                 
                 # Update tab text to show unread count
-                notifications_index = self.get_tab_index("Notifications")
-                if notifications_index >= 0:
-                    self.tabs.setTabText(notifications_index, 
-                                       f"Notifications ({len(unread)})" if unread else "Notifications")
-                    
-                    # If we're on the notifications tab, refresh the display
-                    if self.tabs.currentIndex() == notifications_index:
-                        notifications_tab.load_notifications(notifications_tab.category_combo.currentText())
+                self.update_notification_badge()
+                
+                # If we're on the notifications tab, refresh the display
+                if self.tabs.currentWidget() is notifications_tab:
+                    notifications_tab.load_notifications(notifications_tab.selected_category())
                 
                 # Show system tray notification for new unread notifications
-                if unread:
-                    # Get the most recent unread notification
-                    newest_unread = max(
-                        unread,
-                        key=lambda x: datetime.strptime(x['timestamp'], "%d/%m/%Y %H:%M:%S")
-                    )
-                    
+                newest_unread = index.newest_unread(current_user_id)
+                if newest_unread:
                     # Show system tray notification
                     if hasattr(self, 'tray_icon'):
                         self.tray_icon.showMessage(
@@ -4377,7 +3891,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
                         )
                     
         except Exception as e:
-            print(f"Error checking notifications: {e}")
+            log.error("Error checking notifications: %s", e)
 
     def show_review_response_modal(self, notification):
         """Show modal for responding to a review."""
@@ -4391,8 +3905,7 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
 
     def save_notifications(self):
         try:
-            with open('notifications.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = store.load("notifications")
             
             # Filter out expired notifications (older than 30 days)
             current_time = datetime.now()
@@ -4404,33 +3917,29 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
             
             data['notifications'] = notifications
             
-            with open('notifications.json', 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+            store.save("notifications", data)
                 
         except Exception as e:
-            print(f"Error saving notifications: {str(e)}")
+            log.error("Error saving notifications: %s", e)
             
     def cleanup_old_notifications(self):
         """This method now only removes notifications that have been explicitly marked for deletion"""
         try:
-            with open('notifications.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = store.load("notifications")
             
             # Only remove notifications that have been explicitly marked for deletion
             notifications = [notif for notif in data['notifications'] if not notif.get('deleted', False)]
             data['notifications'] = notifications
             
-            with open('notifications.json', 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+            store.save("notifications", data)
                 
         except Exception as e:
-            print(f"Error cleaning up notifications: {str(e)}")
+            log.error("Error cleaning up notifications: %s", e)
 
     def load_notifications(self, category="All Notifications"):
         """Load notifications with improved error handling and sorting"""
         try:
-            with open('notifications.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = store.load("notifications")
             
             # Get notifications for current user that haven't been deleted
             current_user_id = self.parent.current_user.get('id')
@@ -4452,135 +3961,9 @@ class EventManagementApp(QMainWindow, TicketManagementMixin):
             return notifications
             
         except Exception as e:
-            print(f"Error loading notifications: {str(e)}")
+            log.error("Error loading notifications: %s", e)
             return []
 
-    def handle_transfer_response(self, notification, accepted):
-        """Handle the response to a ticket transfer request."""
-        try:
-            print("Debug - Starting transfer response handling")
-            print(f"Debug - Notification data: {notification}")
-            print(f"Debug - Response: {'Accept' if accepted else 'Reject'}")
-            
-            # Get transfer request data
-            with open("ticket_transfer_requests.json", "r", encoding="utf-8") as f:
-                transfer_data = json.load(f)
-            
-            request = next((req for req in transfer_data["transfer_requests"] 
-                          if req["request_id"] == notification["transfer_request_id"]), None)
-            
-            if not request:
-                raise ValueError("Transfer request not found")
-            
-            print(f"Debug - Found transfer request: {request}")
-            
-            # Update request status
-            request["status"] = "accepted" if accepted else "rejected"
-            
-            if accepted:
-                print("Debug - Processing acceptance")
-                # Get tickets data
-                with open("tickets.json", "r", encoding="utf-8") as f:
-                    tickets_data = json.load(f)
-                
-                print("Debug - Current tickets data:", tickets_data)
-                
-                # Keep track of new tickets to add
-                new_tickets = []
-                
-                # Transfer tickets from sender to recipient
-                for ticket_item in request["tickets"]:
-                    ticket_id = ticket_item["ticket"]["ticket_id"]
-                    ticket_type = ticket_item["ticket"]["ticket_type"]
-                    transfer_quantity = ticket_item["quantity"]
-                    print(f"Debug - Processing ticket {ticket_id}, type {ticket_type}, quantity {transfer_quantity}")
-                    
-                    # Find the sender's ticket in the tickets data
-                    sender_ticket = next((t for t in tickets_data if t["ticket_id"] == ticket_id and 
-                                        t["ticket_type"] == ticket_type and 
-                                        t["user_id"] == request["sender"]["user_id"]), None)
-                    
-                    if sender_ticket:
-                        print(f"Debug - Found sender's ticket: {sender_ticket}")
-                        
-                        # Calculate remaining quantity for sender
-                        remaining_quantity = sender_ticket["quantity_bought"] - transfer_quantity
-                        
-                        if remaining_quantity > 0:
-                            # Update sender's quantity
-                            sender_ticket["quantity_bought"] = remaining_quantity
-                            print(f"Debug - Updated sender's quantity to: {remaining_quantity}")
-                        else:
-                            # Remove sender's ticket entry if no tickets remain
-                            tickets_data.remove(sender_ticket)
-                            print("Debug - Removed sender's ticket entry (no tickets remain)")
-                        
-                        # Create new ticket entry for recipient
-                        new_ticket = sender_ticket.copy()
-                        new_ticket["user_id"] = request["recipient"]["user_id"]
-                        new_ticket["quantity_bought"] = transfer_quantity
-                        new_tickets.append(new_ticket)
-                        print(f"Debug - Created new ticket for recipient: {new_ticket}")
-                
-                # Add new tickets to tickets_data
-                tickets_data.extend(new_tickets)
-                print(f"Debug - Added {len(new_tickets)} new tickets for recipient")
-                
-                # Save updated tickets data
-                with open("tickets.json", "w", encoding="utf-8") as f:
-                    json.dump(tickets_data, f, indent=4, ensure_ascii=False)
-                print("Debug - Saved updated tickets data")
-            
-            # Save updated transfer request data
-            with open("ticket_transfer_requests.json", "w", encoding="utf-8") as f:
-                json.dump(transfer_data, f, indent=4, ensure_ascii=False)
-            print("Debug - Saved updated transfer request data")
-            
-            # Delete the notification for the recipient
-            with open("notifications.json", "r", encoding="utf-8") as f:
-                notifications_data = json.load(f)
-            
-            # Remove the notification
-            notifications_data["notifications"] = [
-                n for n in notifications_data["notifications"] 
-                if n["notification_id"] != notification["notification_id"]
-            ]
-            
-            # Save updated notifications
-            with open("notifications.json", "w", encoding="utf-8") as f:
-                json.dump(notifications_data, f, indent=4, ensure_ascii=False)
-            print("Debug - Deleted recipient's notification")
-            
-            # Create notification for sender
-            response_message = "αποδέχτηκε" if accepted else "απέρριψε"
-            self.add_notification(
-                request["sender"]["user_id"],
-                "Απάντηση σε Αίτημα Μεταφοράς Εισιτηρίων",
-                f"Ο χρήστης {request['recipient']['email']} {response_message} το αίτημα μεταφοράς εισιτηρίων.",
-                "Ticket Transfers"
-            )
-            print("Debug - Created notification for sender")
-            
-            # Show success message
-            QMessageBox.information(
-                self,
-                "Επιτυχία",
-                "Η απάντηση στο αίτημα μεταφοράς εισιτηρίων ολοκληρώθηκε με επιτυχία."
-            )
-            
-            # Refresh notifications display
-            self.load_notifications()
-            print("Debug - Refreshed notifications display")
-            
-        except Exception as e:
-            print(f"Error handling transfer response: {str(e)}")
-            print(f"Debug - Full error details:", e)
-            QMessageBox.critical(
-                self,
-                "Σφάλμα",
-                f"Παρουσιάστηκε σφάλμα κατά την επεξεργασία της απάντησης: {str(e)}"
-            )
-
     def handle_login_success(self, user):
         """Handle successful login."""
         self.current_user = user
@@ -5183,9 +4566,12 @@ class CreateEventModal(QWidget):
              # Αποθήκευση path για μελλοντική χρήση
             self.image_path = save_path.replace("\\", "/")  # Πάντα forward slashes
 
+            # Make the thumbnail now so cards never decode the full image
+            image_cache.invalidate(save_path)
+            ensure_thumbnail(save_path)
+
             # Display the image preview
-            pixmap = QPixmap(save_path)
-            self.image_label.setPixmap(pixmap.scaled(200, 200, Qt.KeepAspectRatio))
+            self.image_label.setPixmap(cached_pixmap(save_path, 200, 200))
             self.image_label.setText("")
             
     def preview_event(self):
@@ -5240,8 +4626,7 @@ class CreateEventModal(QWidget):
         # Εικόνα
         if self.image_path:
             image_label = QLabel()
-            pixmap = QPixmap(self.image_path)
-            image_label.setPixmap(pixmap.scaled(300, 200, Qt.KeepAspectRatio))
+            image_label.setPixmap(cached_pixmap(self.image_path, 300, 200))
             layout.addWidget(image_label, alignment=Qt.AlignCenter | Qt.AlignBottom)
         
         # Προσθήκη κενό κάτω από την εικόνα
@@ -5367,7 +4752,7 @@ class CreateEventModal(QWidget):
 
         # Create new event
         new_event = {
-            "event_id": len(self.parent.events) + 1,
+            "event_id": ids.next_id("events"),
             "title": event_name,
             "start_date": event_start_date,
             "end_date": event_end_date,
@@ -5540,8 +4925,9 @@ class NotificationsTab(QWidget):
 
     def update_categories(self):
         """Update filter categories based on user type."""
+        self.category_combo.blockSignals(True)
         self.category_combo.clear()
-        self.category_combo.addItem("All Notifications")
+        self.category_combo.addItem("All Notifications", "All Notifications")
 
         user_type = self.parent.current_user.get("type") if self.parent.current_user else None
         
@@ -5566,7 +4952,29 @@ class NotificationsTab(QWidget):
         else:
             categories = []
 
-        self.category_combo.addItems(categories)
+        for category in categories:
+            self.category_combo.addItem(category, category)
+        self.category_combo.blockSignals(False)
+        self.refresh_category_counts()
+
+    def refresh_category_counts(self):
+        """Show the unread count next to each category."""
+        if not self.parent.current_user:
+            return
+        index = store.notification_index()
+        user_id = self.parent.current_user["user_id"]
+        counts = index.category_counts(user_id)
+        for i in range(self.category_combo.count()):
+            category = self.category_combo.itemData(i)
+            if category == "All Notifications":
+                count = index.unread_count(user_id)
+            else:
+                count = counts.get(category, 0)
+            self.category_combo.setItemText(i, f"{category} ({count})" if count else category)
+
+    def selected_category(self):
+        """Return the category chosen in the filter (without its count)."""
+        return self.category_combo.currentData() or "All Notifications"
 
     def create_notification_card(self, notification):
         """Create a card widget for a notification."""
@@ -5739,16 +5147,15 @@ class NotificationsTab(QWidget):
                 request_id = collab_data.get("request_id")
                 
                 if request_id:
-                    with open("collaboration_requests.json", "r") as f:
-                        data = json.load(f)
-                        request = next((r for r in data["requests"] if r["request_id"] == request_id and r["status"] == "pending"), None)
+                    data = store.load("collaboration_requests")
+                    request = next((r for r in data["requests"] if r["request_id"] == request_id and r["status"] == "pending"), None)
                         
-                        if request:
-                            # Add collaboration action buttons
-                            self.add_collaboration_actions(layout, notification, dialog)
-                            action_buttons_added = True
+                    if request:
+                        # Add collaboration action buttons
+                        self.add_collaboration_actions(layout, notification, dialog)
+                        action_buttons_added = True
             except Exception as e:
-                print(f"Error adding collaboration action buttons: {e}")
+                log.error("Error adding collaboration action buttons: %s", e)
 
         elif notification.get("type") == "ticket_transfer":
             # Add action buttons for ticket transfer
@@ -5794,8 +5201,7 @@ class NotificationsTab(QWidget):
             import json
             from datetime import datetime
             
-            with open("reviews.json", "r", encoding='utf-8') as f:
-                reviews = json.load(f)
+            reviews = store.reviews()
             
             # Determine which review list to search based on category
             if notification.get("category") == "Service Reviews":
@@ -5832,7 +5238,7 @@ class NotificationsTab(QWidget):
                 }
                 
         except Exception as e:
-            print(f"Error fetching review data: {e}")
+            log.error("Error fetching review data: %s", e)
         
         return None
 
@@ -5941,89 +5347,88 @@ class NotificationsTab(QWidget):
         if notification.get("type") == "ticket_transfer":
             # Check if this is a pending transfer request
             try:
-                with open("ticket_transfer_requests.json", "r", encoding="utf-8") as f:
-                    transfer_data = json.load(f)
-                    request = next((req for req in transfer_data["transfer_requests"] 
-                                  if req["request_id"] == notification.get("transfer_request_id") 
-                                  and req["status"] == "pending"), None)
-                    if request:
-                        # Add action buttons
-                        buttons_widget = QWidget()
-                        buttons_widget.setStyleSheet("background-color: #f8f9fa; padding: 15px; border-radius: 10px;")
-                        buttons_layout = QHBoxLayout(buttons_widget)
-                        buttons_layout.setSpacing(15)
-
-                        # Back button (grey)
-                        back_btn = QPushButton("Πίσω")
-                        back_btn.setStyleSheet("""
-                            QPushButton {
-                                background-color: #6c757d;
-                                color: white;
-                                padding: 12px 25px;
-                                border-radius: 8px;
-                                font-size: 14px;
-                                font-weight: bold;
-                                min-width: 100px;
-                            }
-                            QPushButton:hover {
-                                background-color: #5a6268;
-                            }
-                        """)
-                        back_btn.clicked.connect(dialog.close)
-
-                        # Reject button (red)
-                        reject_btn = QPushButton("Απόρριψη")
-                        reject_btn.setStyleSheet("""
-                            QPushButton {
-                                background-color: #dc3545;
-                                color: white;
-                                padding: 12px 25px;
-                                border-radius: 8px;
-                                font-size: 14px;
-                                font-weight: bold;
-                                min-width: 100px;
-                            }
-                            QPushButton:hover {
-                                background-color: #c82333;
-                            }
-                        """)
-                        reject_btn.clicked.connect(lambda: [
-                            self.parent.handle_transfer_response(notification, False),
-                            dialog.close(),
-                            self.load_notifications()
-                        ])
-
-                        # Accept button (green)
-                        accept_btn = QPushButton("Αποδοχή")
-                        accept_btn.setStyleSheet("""
-                            QPushButton {
-                                background-color: #28a745;
-                                color: white;
-                                padding: 12px 25px;
-                                border-radius: 8px;
-                                font-size: 14px;
-                                font-weight: bold;
-                                min-width: 100px;
-                            }
-                            QPushButton:hover {
-                                background-color: #218838;
-                            }
-                        """)
-                        accept_btn.clicked.connect(lambda: [
-                            self.parent.handle_transfer_response(notification, True),
-                            dialog.close(),
-                            self.load_notifications()
-                        ])
-
-                        buttons_layout.addWidget(back_btn)
-                        buttons_layout.addStretch()
-                        buttons_layout.addWidget(reject_btn)
-                        buttons_layout.addWidget(accept_btn)
-                        layout.addWidget(buttons_widget)
-                        return True  # Indicate that buttons were added
+                transfer_data = store.load("transfer_requests")
+                request = next((req for req in transfer_data["transfer_requests"] 
+                              if req["request_id"] == notification.get("transfer_request_id") 
+                              and req["status"] == "pending"), None)
+                if request:
+                    # Add action buttons
+                    buttons_widget = QWidget()
+                    buttons_widget.setStyleSheet("background-color: #f8f9fa; padding: 15px; border-radius: 10px;")
+                    buttons_layout = QHBoxLayout(buttons_widget)
+                    buttons_layout.setSpacing(15)
+
+                    # Back button (grey)
+                    back_btn = QPushButton("Πίσω")
+                    back_btn.setStyleSheet("""
+                        QPushButton {
+                            background-color: #6c757d;
+                            color: white;
+                            padding: 12px 25px;
+                            border-radius: 8px;
+                            font-size: 14px;
+                            font-weight: bold;
+                            min-width: 100px;
+                        }
+                        QPushButton:hover {
+                            background-color: #5a6268;
+                        }
+                    """)
+                    back_btn.clicked.connect(dialog.close)
+
+                    # Reject button (red)
+                    reject_btn = QPushButton("Απόρριψη")
+                    reject_btn.setStyleSheet("""
+                        QPushButton {
+                            background-color: #dc3545;
+                            color: white;
+                            padding: 12px 25px;
+                            border-radius: 8px;
+                            font-size: 14px;
+                            font-weight: bold;
+                            min-width: 100px;
+                        }
+                        QPushButton:hover {
+                            background-color: #c82333;
+                        }
+                    """)
+                    reject_btn.clicked.connect(lambda: [
+                        self.parent.handle_transfer_response(notification, False),
+                        dialog.close(),
+                        self.load_notifications()
+                    ])
+
+                    # Accept button (green)
+                    accept_btn = QPushButton("Αποδοχή")
+                    accept_btn.setStyleSheet("""
+                        QPushButton {
+                            background-color: #28a745;
+                            color: white;
+                            padding: 12px 25px;
+                            border-radius: 8px;
+                            font-size: 14px;
+                            font-weight: bold;
+                            min-width: 100px;
+                        }
+                        QPushButton:hover {
+                            background-color: #218838;
+                        }
+                    """)
+                    accept_btn.clicked.connect(lambda: [
+                        self.parent.handle_transfer_response(notification, True),
+                        dialog.close(),
+                        self.load_notifications()
+                    ])
+
+                    buttons_layout.addWidget(back_btn)
+                    buttons_layout.addStretch()
+                    buttons_layout.addWidget(reject_btn)
+                    buttons_layout.addWidget(accept_btn)
+                    layout.addWidget(buttons_widget)
+                    return True  # Indicate that buttons were added
                         
             except Exception as e:
-                print(f"Error adding transfer action buttons: {e}")
+                log.error("Error adding transfer action buttons: %s", e)
         
         # Handle other ticket actions
         elif notification.get("can_modify", False):
@@ -6052,8 +5457,7 @@ class NotificationsTab(QWidget):
 
     def filter_notifications(self):
         """Filter notifications based on selected category."""
-        selected_category = self.category_combo.currentText()
-        self.load_notifications(category=selected_category)
+        self.load_notifications(category=self.selected_category())
 
     def load_notifications(self, category="All Notifications"):
         """Load notifications for the current user."""
@@ -6064,48 +5468,37 @@ class NotificationsTab(QWidget):
                 item.widget().deleteLater()
 
         try:
-            with open("notifications.json", "r", encoding='utf-8') as f:
-                data = json.load(f)
-                notifications = data.get("notifications", [])
-
-                # Filter notifications for current user (exclude deleted ones)
-                user_notifications = [
-                    n for n in notifications
-                    if n["user_id"] == self.parent.current_user["user_id"] and not n.get("deleted", False)
-                ]
-
-                # Apply category filter if not "All"
-                if category != "All Notifications":
-                    user_notifications = [
-                        n for n in user_notifications
-                        if n.get("category", "") == category
-                    ]
-
-                if not user_notifications:
-                    no_notifications = QLabel("You have no new notifications")
-                    no_notifications.setStyleSheet("""
-                        color: #666;
-                        font-size: 16px;
-                        padding: 20px;
-                        background-color: #f5f5f5;
-                        border-radius: 4px;
-                    """)
-                    self.notifications_layout.addWidget(no_notifications, alignment=Qt.AlignCenter)
-                    return
+            # Notifications of the current user (deleted ones are not indexed as visible)
+            user_notifications = store.notification_index().visible(
+                self.parent.current_user["user_id"],
+                None if category == "All Notifications" else category
+            )
 
-                # Sort notifications by timestamp (newest first)
-                user_notifications.sort(
-                    key=lambda x: datetime.strptime(x["timestamp"], "%d/%m/%Y %H:%M:%S"),
-                    reverse=True
-                )
+            if not user_notifications:
+                no_notifications = QLabel("You have no new notifications")
+                no_notifications.setStyleSheet("""
+                    color: #666;
+                    font-size: 16px;
+                    padding: 20px;
+                    background-color: #f5f5f5;
+                    border-radius: 4px;
+                """)
+                self.notifications_layout.addWidget(no_notifications, alignment=Qt.AlignCenter)
+                return
 
-                # Create notification cards
-                for notification in user_notifications:
-                    card = self.create_notification_card(notification)
-                    self.notifications_layout.addWidget(card)
+            # Sort notifications by timestamp (newest first)
+            user_notifications.sort(
+                key=lambda x: datetime.strptime(x["timestamp"], "%d/%m/%Y %H:%M:%S"),
+                reverse=True
+            )
+
+            # Create notification cards
+            for notification in user_notifications:
+                card = self.create_notification_card(notification)
+                self.notifications_layout.addWidget(card)
 
-                # Add stretch at the end
-                self.notifications_layout.addStretch()
+            # Add stretch at the end
+            self.notifications_layout.addStretch()
 
         except FileNotFoundError:
             error_label = QLabel("No notifications found")
@@ -7,9 +7,11 @@ from PyQt5.QtWidgets import (
     QTextEdit, QComboBox, QFormLayout, QFileDialog, QMessageBox,
     QDateEdit, QSpinBox, QDoubleSpinBox, QScrollArea, QSizePolicy
 )
-from PyQt5.QtGui import QFont, QPixmap
+from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt, QDate, QDateTime
 from models import load_services, save_services
+from image_cache import cached_pixmap, ensure_thumbnail, image_cache
+from services.ids import ids
 
 
 class AddServicesModal(QWidget):
@@ -319,10 +321,11 @@ class AddServicesModal(QWidget):
             # Update label with file name
             self.media_label.setText(file_name)
             
-            # If it's an image, show preview
+            # If it's an image, make its thumbnail now so cards never decode the full file
             if file_name.lower().endswith(('.png', '.jpg', '.jpeg')):
-                pixmap = QPixmap(save_path)
-                self.media_label.setPixmap(pixmap.scaled(200, 200, Qt.KeepAspectRatio))
+                image_cache.invalidate(save_path)
+                ensure_thumbnail(save_path)
+                self.media_label.setPixmap(cached_pixmap(save_path, 200, 200))
 
     def preview_service(self):
         """Show a preview of the service before creation."""
@@ -360,8 +363,7 @@ class AddServicesModal(QWidget):
         # Show media preview if available
         if self.media_path and self.media_path.lower().endswith(('.png', '.jpg', '.jpeg')):
             image_label = QLabel()
-            pixmap = QPixmap(self.media_path)
-            image_label.setPixmap(pixmap.scaled(300, 200, Qt.KeepAspectRatio))
+            image_label.setPixmap(cached_pixmap(self.media_path, 300, 200))
             layout.addWidget(image_label, alignment=Qt.AlignCenter)
             layout.addSpacing(20)
 
@@ -453,7 +455,7 @@ class AddServicesModal(QWidget):
 
         # Create new service object
         new_service = {
-            "service_id": len(self.services) + 1,
+            "service_id": ids.next_id("services"),
             "name": self.service_name.text().strip(),
             "type": self.service_type.currentText(),
             "description": self.description.toPlainText().strip(),
@@ -0,0 +1,27 @@
+import argparse
+
+from services.waiting_room import waiting_room
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open, close or inspect the waiting room of a high-demand event.")
+    parser.add_argument("action", choices=["open", "close", "status"])
+    parser.add_argument("event_id", type=int)
+    parser.add_argument("--rate", type=float, default=1.0, help="buyers admitted per second (open)")
+    args = parser.parse_args()
+
+    if args.action == "open":
+        waiting_room.open(args.event_id, args.rate)
+    elif args.action == "close":
+        waiting_room.close(args.event_id)
+
+    summary = waiting_room.summary(args.event_id)
+    if summary is None:
+        print(f"Event {args.event_id}: no waiting room, buyers check out directly")
+    else:
+        print(f"Event {args.event_id}: {summary['rate']:g} buyers/s, {summary['joined']} joined, "
+              f"{summary['admitted']} admitted, {summary['waiting']} waiting")
+
+
+if __name__ == "__main__":
+    main()